@@ -23,6 +23,9 @@ Data structures
 
     BaseMesh
     Mesh
+    CompactBaseMesh
+    CompactMesh
+    MeshCache
 
 Algorithms
 ----------
@@ -33,11 +36,17 @@ Algorithms
 
     mesh_bounding_box
     mesh_bounding_box_xy
+    mesh_bvh_numpy
+    mesh_cached
     mesh_connected_components
     mesh_contours_numpy
     mesh_delete_duplicate_vertices
     mesh_dual
+    mesh_faces_areas_numpy
+    mesh_faces_centroids_numpy
+    mesh_faces_normals_numpy
     mesh_flip_cycles
+    mesh_from_arrays_numpy
     mesh_geodesic_distances_numpy
     mesh_is_connected
     mesh_isolines_numpy
@@ -47,18 +56,25 @@ Algorithms
     mesh_planarize_faces
     mesh_quads_to_triangles
     mesh_smooth_centroid
+    mesh_smooth_centroid_numpy
     mesh_smooth_area
+    mesh_smooth_area_numpy
+    mesh_smooth_cotangent_numpy
     mesh_subdivide
     mesh_subdivide_tri
     mesh_subdivide_corner
     mesh_subdivide_quad
     mesh_subdivide_catmullclark
     mesh_subdivide_doosabin
+    mesh_to_arrays_numpy
     mesh_transform
     mesh_transformed
     mesh_transform_numpy
     mesh_transformed_numpy
     mesh_unify_cycles
+    mesh_vertex_array_numpy
+    mesh_vertices_areas_numpy
+    mesh_vertices_normals_numpy
     mesh_weld
 
 Matrices
@@ -147,6 +163,16 @@ be used for the representation of subdivided/partitioned polyhedra.
 
     VolMesh
 
+Serialisation
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    datastructure_from_binary_numpy
+    datastructure_to_binary_numpy
+
 Mixins
 ======
 
@@ -162,6 +188,7 @@ Mixins
     EdgeFilter
     FaceFilter
 
+    FromToBinary
     FromToData
     FromToJson
     FromToPickle
@@ -184,6 +211,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from compas import IPY
+
 
 class Datastructure(object):
     pass
@@ -193,6 +222,8 @@ from ._mixins import *  # noqa: F401 F402 F403
 from .network import *  # noqa: F401 F402 F403
 from .mesh import *  # noqa: F401 F402 F403
 from .volmesh import *  # noqa: F401 F402 F403
+if not IPY:
+    from .binary_numpy import *  # noqa: F401 F402 F403
 
 
 __all__ = [name for name in dir() if not name.startswith('_')]
@@ -11,6 +11,7 @@ except NameError:
 
 
 __all__ = [
+    'FromToBinary',
     'FromToData',
     'FromToJson',
     'FromToPickle',
@@ -148,6 +149,59 @@ class FromToPickle(object):
         self.dump(filepath)
 
 
+class FromToBinary(object):
+
+    __module__ = 'compas.datastructures'
+
+    @classmethod
+    def from_binary(cls, filepath):
+        """Construct a datastructure from the data contained in a binary file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+
+        Returns
+        -------
+        object
+            An object of type ``cls``.
+
+        Note
+        ----
+        This constructor method is meant to be used in conjuction with the
+        corresponding *to_binary* method.
+        It requires NumPy.
+
+        See Also
+        --------
+        :func:`compas.datastructures.datastructure_from_binary_numpy`
+
+        """
+        from compas.datastructures.binary_numpy import datastructure_from_binary_numpy
+        return datastructure_from_binary_numpy(filepath, cls=cls)
+
+    def to_binary(self, filepath):
+        """Write the data of the data structure to a binary file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the binary file.
+
+        Note
+        ----
+        This method requires NumPy.
+
+        See Also
+        --------
+        :func:`compas.datastructures.datastructure_to_binary_numpy`
+
+        """
+        from compas.datastructures.binary_numpy import datastructure_to_binary_numpy
+        datastructure_to_binary_numpy(self, filepath)
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -0,0 +1,509 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+
+from ast import literal_eval
+
+from numpy import asarray
+from numpy import bool_
+from numpy import cumsum
+from numpy import float64
+from numpy import frombuffer
+from numpy import int64
+from numpy import r_
+from numpy import uint8
+
+from compas.files import CBIN
+
+
+__all__ = [
+    'datastructure_to_binary_numpy',
+    'datastructure_from_binary_numpy',
+]
+
+
+MISSING = object()
+
+
+# ==============================================================================
+# tables
+# ==============================================================================
+
+
+def _json_array(values):
+    return frombuffer(json.dumps(values).encode('utf-8'), dtype=uint8)
+
+
+def _json_values(array):
+    return json.loads(array.tobytes().decode('utf-8'))
+
+
+def _column_dtype(values):
+    # the dtype of a column of scalar values, or None if it should be stored as JSON
+    types = set(type(value) for value in values)
+    if not types:
+        return None
+    if types == {bool}:
+        return bool_
+    if types == {int}:
+        return int64
+    if types <= {int, float}:
+        return float64
+    return None
+
+
+def _encode_table(name, keys, attrs, arrays, skip=()):
+    """Encode the keys and attributes of the elements of a data structure as arrays.
+
+    Keys that are all integers are stored as an integer array.
+    Other keys are stored as JSON-encoded representations.
+    Every attribute is stored as a separate column:
+    an array of booleans, integers or floats if all values are of such types,
+    otherwise an array of JSON-encoded values.
+    If not all elements have the attribute, a boolean mask of the elements that do is stored as well.
+
+    """
+    table = {'count': len(keys), 'columns': {}}
+    if all(type(key) is int for key in keys):
+        arrays[name + '.keys'] = asarray(keys, dtype=int64)
+        table['keys'] = 'int'
+    else:
+        arrays[name + '.keys'] = _json_array([repr(key) for key in keys])
+        table['keys'] = 'repr'
+    names = []
+    seen = set(skip)
+    for attr in attrs:
+        for column in attr:
+            if column not in seen:
+                seen.add(column)
+                names.append(column)
+    for column in names:
+        values = [attr.get(column, MISSING) for attr in attrs]
+        mask = [value is not MISSING for value in values]
+        present = values if all(mask) else [value for value in values if value is not MISSING]
+        dtype = _column_dtype(present)
+        if not all(mask):
+            arrays['{}.mask.{}'.format(name, column)] = asarray(mask, dtype=bool_)
+        if dtype is None:
+            arrays['{}.json.{}'.format(name, column)] = _json_array(present)
+            table['columns'][column] = 'json'
+        else:
+            arrays['{}.attr.{}'.format(name, column)] = asarray(present, dtype=dtype)
+            table['columns'][column] = 'array'
+    return table
+
+
+def _decode_keys(name, table, arrays):
+    if table['keys'] == 'int':
+        return arrays[name + '.keys'].tolist()
+    return [literal_eval(key) for key in _json_values(arrays[name + '.keys'])]
+
+
+def _decode_attributes(name, table, arrays, attrs=None):
+    """Decode the attributes of the elements of a data structure into a list of dicts."""
+    n = table['count']
+    if attrs is None:
+        attrs = [{} for _ in range(n)]
+    for column, kind in table['columns'].items():
+        if kind == 'json':
+            values = _json_values(arrays['{}.json.{}'.format(name, column)])
+        else:
+            values = arrays['{}.attr.{}'.format(name, column)].tolist()
+        mask = '{}.mask.{}'.format(name, column)
+        if mask in arrays:
+            for attr, value in zip((attr for attr, present in zip(attrs, arrays[mask].tolist()) if present), values):
+                attr[column] = value
+        else:
+            for attr, value in zip(attrs, values):
+                attr[column] = value
+    return attrs
+
+
+def _vertex_attributes(table, arrays):
+    xyz = arrays['vertex.xyz'].tolist()
+    attrs = [{'x': x, 'y': y, 'z': z} for x, y, z in xyz]
+    return _decode_attributes('vertex', table, arrays, attrs)
+
+
+def _encode_data(name, keys, data, arrays):
+    # the attributes of the elements in a sparse data dict,
+    # with a mask of the elements that have an entry, if not all of them do
+    present = [key in data for key in keys]
+    if not all(present):
+        arrays[name + '.present'] = asarray(present, dtype=bool_)
+    return [data.get(key) or {} for key in keys]
+
+
+def _decode_data(name, keys, table, arrays):
+    attrs = _decode_attributes(name, table, arrays)
+    mask = name + '.present'
+    if mask in arrays:
+        return {key: attr for key, attr, present in zip(keys, attrs, arrays[mask].tolist()) if present}
+    return dict(zip(keys, attrs))
+
+
+def _encode_cycles(name, cycles, key_index, arrays):
+    degree = [len(cycle) for cycle in cycles]
+    arrays[name + '.vertices'] = asarray([key_index[key] for cycle in cycles for key in cycle], dtype=int64)
+    arrays[name + '.offsets'] = r_[0, cumsum(degree, dtype=int64)].astype(int64)
+
+
+def _decode_cycles(name, keys, arrays):
+    vertices = arrays[name + '.vertices'].tolist()
+    offsets = arrays[name + '.offsets'].tolist()
+    vertices = [keys[index] for index in vertices]
+    return [vertices[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+# ==============================================================================
+# mesh
+# ==============================================================================
+
+
+def _mesh_to_arrays(mesh, arrays):
+    from compas.datastructures.mesh.core.arrays_numpy import mesh_vertex_array_numpy
+
+    keys = list(mesh.vertices())
+    key_index = {key: index for index, key in enumerate(keys)}
+    fkeys = list(mesh.faces())
+    edges = [uv for uv in mesh.edgedata if uv[0] in key_index and uv[1] in key_index]
+
+    arrays['vertex.xyz'] = mesh_vertex_array_numpy(mesh)
+    _encode_cycles('face', [mesh.face_vertices(fkey) for fkey in fkeys], key_index, arrays)
+    arrays['edge.uv'] = asarray([[key_index[u], key_index[v]] for u, v in edges], dtype=int64).reshape((-1, 2))
+    return {
+        'type': 'mesh',
+        'attributes': mesh.attributes,
+        'dva': mesh.default_vertex_attributes,
+        'dea': mesh.default_edge_attributes,
+        'dfa': mesh.default_face_attributes,
+        'max_int_key': mesh._max_int_key,
+        'max_int_fkey': mesh._max_int_fkey,
+        'tables': {
+            'vertex': _encode_table('vertex', keys, [mesh.vertex[key] for key in keys], arrays, skip=('x', 'y', 'z')),
+            'face': _encode_table('face', fkeys, _encode_data('face', fkeys, mesh.facedata, arrays), arrays),
+            'edge': _encode_table('edge', list(range(len(edges))), [mesh.edgedata[uv] for uv in edges], arrays),
+        }
+    }
+
+
+def _mesh_from_arrays(cls, meta, arrays):
+    from compas.datastructures.mesh.core.arrays_numpy import halfedge_arrays_numpy
+    from compas.datastructures.mesh.core.arrays_numpy import mesh_from_arrays_numpy
+    from compas.datastructures.mesh.core.compact import CompactBaseMesh
+
+    tables = meta['tables']
+    keys = _decode_keys('vertex', tables['vertex'], arrays)
+    fkeys = _decode_keys('face', tables['face'], arrays)
+    n = len(keys)
+    m = len(fkeys)
+    faces = arrays['face.vertices']
+    offsets = arrays['face.offsets']
+
+    if issubclass(cls, CompactBaseMesh):
+        if keys != list(range(n)) or fkeys != list(range(m)):
+            raise ValueError('Meshes with array-backed storage require consecutive integer keys.')
+        mesh = mesh_from_arrays_numpy(arrays['vertex.xyz'], faces, offsets, cls=cls)
+        for key, attr in enumerate(_decode_attributes('vertex', tables['vertex'], arrays)):
+            if attr:
+                mesh.vertex[key].update(attr)
+    else:
+        mesh = cls()
+        mesh.vertex = dict(zip(keys, _vertex_attributes(tables['vertex'], arrays)))
+        mesh.face = dict(zip(fkeys, _decode_cycles('face', keys, arrays)))
+        mesh.halfedge = {key: {} for key in keys}
+        u, v, f = halfedge_arrays_numpy(asarray(faces), asarray(offsets), n)
+        for start, end, face in zip(u.tolist(), v.tolist(), f.tolist()):
+            mesh.halfedge[keys[start]][keys[end]] = None if face < 0 else fkeys[face]
+
+    mesh.facedata = _decode_data('face', fkeys, tables['face'], arrays)
+    uv = arrays['edge.uv'].tolist()
+    edgedata = _decode_attributes('edge', tables['edge'], arrays)
+    mesh.edgedata = {(keys[u], keys[v]): attr for (u, v), attr in zip(uv, edgedata)}
+
+    mesh.attributes.update(meta['attributes'])
+    mesh.default_vertex_attributes.update(meta['dva'])
+    mesh.default_edge_attributes.update(meta['dea'])
+    mesh.default_face_attributes.update(meta['dfa'])
+    mesh._max_int_key = meta['max_int_key']
+    mesh._max_int_fkey = meta['max_int_fkey']
+    mesh.cache.invalidate_topology()
+    return mesh
+
+
+# ==============================================================================
+# network
+# ==============================================================================
+
+
+def _network_to_arrays(network, arrays):
+    keys = list(network.vertices())
+    key_index = {key: index for index, key in enumerate(keys)}
+    edges = [(u, v) for u in network.edge for v in network.edge[u]]
+
+    arrays['vertex.xyz'] = asarray([[network.vertex[key][axis] for axis in 'xyz'] for key in keys], dtype=float64).reshape((-1, 3))
+    arrays['edge.uv'] = asarray([[key_index[u], key_index[v]] for u, v in edges], dtype=int64).reshape((-1, 2))
+    return {
+        'type': 'network',
+        'attributes': network.attributes,
+        'dva': network.default_vertex_attributes,
+        'dea': network.default_edge_attributes,
+        'max_int_key': network._max_int_key,
+        'tables': {
+            'vertex': _encode_table('vertex', keys, [network.vertex[key] for key in keys], arrays, skip=('x', 'y', 'z')),
+            'edge': _encode_table('edge', list(range(len(edges))), [network.edge[u][v] for u, v in edges], arrays),
+        }
+    }
+
+
+def _network_from_arrays(cls, meta, arrays):
+    tables = meta['tables']
+    keys = _decode_keys('vertex', tables['vertex'], arrays)
+    network = cls()
+    network.vertex = dict(zip(keys, _vertex_attributes(tables['vertex'], arrays)))
+    network.edge = {key: {} for key in keys}
+    network.halfedge = {key: {} for key in keys}
+    edgedata = _decode_attributes('edge', tables['edge'], arrays)
+    for (u, v), attr in zip(arrays['edge.uv'].tolist(), edgedata):
+        u, v = keys[u], keys[v]
+        network.edge[u][v] = attr
+        network.halfedge[u][v] = None
+        network.halfedge[v][u] = None
+
+    network.attributes.update(meta['attributes'])
+    network.default_vertex_attributes.update(meta['dva'])
+    network.default_edge_attributes.update(meta['dea'])
+    network._max_int_key = meta['max_int_key']
+    return network
+
+
+# ==============================================================================
+# volmesh
+# ==============================================================================
+
+
+def _volmesh_to_arrays(volmesh, arrays):
+    keys = list(volmesh.vertex)
+    key_index = {key: index for index, key in enumerate(keys)}
+    fkeys = list(volmesh.halfface)
+    fkey_index = {fkey: index for index, fkey in enumerate(fkeys)}
+    ckeys = list(volmesh.cell)
+    edges = [(u, v) for u in volmesh.edge for v in volmesh.edge[u]]
+
+    cells = []
+    for ckey in ckeys:
+        halffaces = []
+        for u in volmesh.cell[ckey]:
+            for fkey in volmesh.cell[ckey][u].values():
+                if fkey not in halffaces:
+                    halffaces.append(fkey)
+        cells.append(halffaces)
+
+    arrays['vertex.xyz'] = asarray([[volmesh.vertex[key][axis] for axis in 'xyz'] for key in keys], dtype=float64).reshape((-1, 3))
+    _encode_cycles('face', [volmesh.halfface[fkey] for fkey in fkeys], key_index, arrays)
+    _encode_cycles('cell', cells, fkey_index, arrays)
+    arrays['edge.uv'] = asarray([[key_index[u], key_index[v]] for u, v in edges], dtype=int64).reshape((-1, 2))
+    return {
+        'type': 'volmesh',
+        'attributes': volmesh.attributes,
+        'dva': volmesh.default_vertex_attributes,
+        'dea': volmesh.default_edge_attributes,
+        'dfa': volmesh.default_face_attributes,
+        'dca': volmesh.default_cell_attributes,
+        'max_int_vkey': volmesh._max_int_vkey,
+        'max_int_fkey': volmesh._max_int_fkey,
+        'max_int_ckey': volmesh._max_int_ckey,
+        'tables': {
+            'vertex': _encode_table('vertex', keys, [volmesh.vertex[key] for key in keys], arrays, skip=('x', 'y', 'z')),
+            'face': _encode_table('face', fkeys, _encode_data('face', fkeys, volmesh.facedata, arrays), arrays),
+            'cell': _encode_table('cell', ckeys, _encode_data('cell', ckeys, volmesh.celldata, arrays), arrays),
+            'edge': _encode_table('edge', list(range(len(edges))), [volmesh.edge[u][v] for u, v in edges], arrays),
+        }
+    }
+
+
+def _volmesh_from_arrays(cls, meta, arrays):
+    tables = meta['tables']
+    keys = _decode_keys('vertex', tables['vertex'], arrays)
+    fkeys = _decode_keys('face', tables['face'], arrays)
+    ckeys = _decode_keys('cell', tables['cell'], arrays)
+    volmesh = cls()
+    volmesh.vertex = dict(zip(keys, _vertex_attributes(tables['vertex'], arrays)))
+    volmesh.edge = {key: {} for key in keys}
+    volmesh.plane = {key: {} for key in keys}
+
+    for (u, v), attr in zip(arrays['edge.uv'].tolist(), _decode_attributes('edge', tables['edge'], arrays)):
+        volmesh.edge[keys[u]][keys[v]] = attr
+
+    halffaces = _decode_cycles('face', keys, arrays)
+    volmesh.halfface = dict(zip(fkeys, halffaces))
+    volmesh.facedata = _decode_data('face', fkeys, tables['face'], arrays)
+    plane = volmesh.plane
+    for vertices in halffaces:
+        for i in range(-2, len(vertices) - 2):
+            u, v, w = vertices[i], vertices[i + 1], vertices[i + 2]
+            plane[u].setdefault(v, {}).setdefault(w, None)
+            plane[w].setdefault(v, {}).setdefault(u, None)
+
+    volmesh.cell = {}
+    for ckey, cell in zip(ckeys, _decode_cycles('cell', fkeys, arrays)):
+        volmesh.cell[ckey] = {}
+        for fkey in cell:
+            vertices = volmesh.halfface[fkey]
+            for i in range(-2, len(vertices) - 2):
+                u, v, w = vertices[i], vertices[i + 1], vertices[i + 2]
+                volmesh.cell[ckey].setdefault(u, {})[v] = fkey
+                plane[u][v][w] = ckey
+    volmesh.celldata = _decode_data('cell', ckeys, tables['cell'], arrays)
+
+    volmesh.attributes.update(meta['attributes'])
+    volmesh.default_vertex_attributes.update(meta['dva'])
+    volmesh.default_edge_attributes.update(meta['dea'])
+    volmesh.default_face_attributes.update(meta['dfa'])
+    volmesh.default_cell_attributes.update(meta['dca'])
+    volmesh._max_int_vkey = meta['max_int_vkey']
+    volmesh._max_int_fkey = meta['max_int_fkey']
+    volmesh._max_int_ckey = meta['max_int_ckey']
+    return volmesh
+
+
+# ==============================================================================
+# dispatch
+# ==============================================================================
+
+
+def _types():
+    from compas.datastructures import BaseMesh
+    from compas.datastructures import Mesh
+    from compas.datastructures import Network
+    from compas.datastructures import VolMesh
+    return [
+        ('mesh', BaseMesh, Mesh, _mesh_to_arrays, _mesh_from_arrays),
+        ('network', Network, Network, _network_to_arrays, _network_from_arrays),
+        ('volmesh', VolMesh, VolMesh, _volmesh_to_arrays, _volmesh_from_arrays),
+    ]
+
+
+def datastructure_to_binary_numpy(datastructure, filepath):
+    """Write a data structure to a binary file.
+
+    Parameters
+    ----------
+    datastructure : Mesh, Network or VolMesh
+        The data structure.
+    filepath : str
+        Path to the file.
+
+    Raises
+    ------
+    TypeError
+        If the type of data structure is not supported.
+
+    Notes
+    -----
+    The data structure is stored in a :class:`compas.files.CBIN` file.
+    The coordinates of the vertices and the vertex cycles of faces and cells are stored as typed arrays.
+    Every attribute of the vertices, faces, edges and cells is stored as a separate column,
+    as a typed array if all its values are booleans, integers or floats,
+    and otherwise as JSON.
+    Columns with a mix of integers and floats are stored as floats.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'mesh.cbin')
+    >>> datastructure_to_binary_numpy(mesh, filepath)
+    >>> other = datastructure_from_binary_numpy(filepath)
+    >>> other.number_of_faces()
+    6
+
+    """
+    for name, base, default, encode, decode in _types():
+        if isinstance(datastructure, base):
+            arrays = {}
+            meta = encode(datastructure, arrays)
+            CBIN(filepath).write(meta, arrays)
+            return
+    raise TypeError('Data structures of type {} can not be stored in binary format.'.format(type(datastructure)))
+
+
+def datastructure_from_binary_numpy(filepath, cls=None):
+    """Read a data structure from a binary file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    cls : type, optional
+        The type of data structure.
+        Default is the basic type of data structure stored in the file,
+        i.e. :class:`Mesh`, :class:`Network`, or :class:`VolMesh`.
+
+    Returns
+    -------
+    Mesh, Network or VolMesh
+        The data structure.
+
+    Notes
+    -----
+    The arrays of the file are memory-mapped,
+    such that only the parts of the file that are needed are read from disk.
+    The arrays of the file can also be accessed directly through :class:`compas.files.CBIN`,
+    without constructing the data structure.
+
+    """
+    cbin = CBIN(filepath)
+    meta = cbin.meta
+    for name, base, default, encode, decode in _types():
+        if meta.get('type') == name:
+            return decode(cls or default, meta, cbin.arrays)
+    raise ValueError('The file does not contain a supported data structure: {}'.format(filepath))
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+    import time
+
+    from compas.datastructures import Mesh
+    from compas.datastructures import mesh_subdivide_quad
+
+    mesh = Mesh.from_polyhedron(6)
+    for _ in range(8):
+        mesh = mesh_subdivide_quad(mesh)
+    mesh.update_default_vertex_attributes({'is_fixed': False, 'px': 0.0})
+    mesh.update_default_face_attributes({'color': [255, 0, 0]})
+    for fkey in mesh.faces():
+        mesh.facedata[fkey] = {'color': [255, 0, 0]}
+
+    directory = tempfile.gettempdir()
+
+    print('faces: {}'.format(mesh.number_of_faces()))
+
+    t0 = time.time()
+    mesh.to_json(os.path.join(directory, 'mesh.json'))
+    t1 = time.time()
+    Mesh.from_json(os.path.join(directory, 'mesh.json'))
+    t2 = time.time()
+    print('json:   write {0:.2f}s read {1:.2f}s size {2:.1f}MB'.format(
+        t1 - t0, t2 - t1, os.path.getsize(os.path.join(directory, 'mesh.json')) / 1e6))
+
+    t0 = time.time()
+    datastructure_to_binary_numpy(mesh, os.path.join(directory, 'mesh.cbin'))
+    t1 = time.time()
+    datastructure_from_binary_numpy(os.path.join(directory, 'mesh.cbin'))
+    t2 = time.time()
+    CBIN(os.path.join(directory, 'mesh.cbin')).arrays['vertex.xyz']
+    t3 = time.time()
+    print('binary: write {0:.2f}s read {1:.2f}s size {2:.1f}MB open {3:.4f}s'.format(
+        t1 - t0, t2 - t1, os.path.getsize(os.path.join(directory, 'mesh.cbin')) / 1e6, t3 - t2))
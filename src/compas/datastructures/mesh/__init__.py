@@ -11,6 +11,7 @@ from ._mesh import *  # noqa: F401 F403
 from .bbox import *  # noqa: F401 F403
 if not IPY:
     from .bbox_numpy import *  # noqa: F401 F403
+    from .bvh_numpy import *  # noqa: F401 F403
 from .combinatorics import *  # noqa: F401 F403
 if not IPY:
     from .contours_numpy import *  # noqa: F401 F403
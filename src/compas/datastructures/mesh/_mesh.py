@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 
 from compas.datastructures.mesh.core import BaseMesh
+from compas.datastructures.mesh.core import CompactBaseMesh
 from compas.datastructures.mesh.core import mesh_collapse_edge
 from compas.datastructures.mesh.core import mesh_split_edge
 from compas.datastructures.mesh.core import mesh_split_face
@@ -21,7 +22,7 @@ from compas.datastructures.mesh.transformations import mesh_transform
 from compas.datastructures.mesh.transformations import mesh_transformed
 
 
-__all__ = ['Mesh']
+__all__ = ['Mesh', 'CompactMesh']
 
 
 class Mesh(BaseMesh):
@@ -61,6 +62,21 @@ class Mesh(BaseMesh):
         pass
 
 
+class CompactMesh(CompactBaseMesh, Mesh):
+    """Implementation of the mesh data structure with compact, array-backed storage.
+
+    The compact mesh provides the same algorithms as :class:`Mesh`,
+    but stores its geometry and topology in arrays rather than in nested dictionaries.
+    See :class:`CompactBaseMesh` for details.
+
+    Examples
+    --------
+    >>> mesh = CompactMesh.from_polyhedron(6)
+    """
+
+    __module__ = "compas.datastructures"
+
+
 # =============================================================================
 # Main
 # =============================================================================
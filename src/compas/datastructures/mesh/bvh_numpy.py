@@ -0,0 +1,59 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from compas.geometry import BVHNumpy
+
+from compas.datastructures.mesh.core.arrays_numpy import mesh_vertex_array_numpy
+
+
+__all__ = [
+    'mesh_bvh_numpy'
+]
+
+
+def mesh_bvh_numpy(mesh, leafsize=8):
+    """Get a bounding volume hierarchy of the faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    leafsize : int, optional
+        The maximum number of triangles in a leaf of the hierarchy.
+        Default is ``8``.
+
+    Returns
+    -------
+    compas.geometry.BVHNumpy
+        The hierarchy.
+        The faces reported by its queries are indices into the list of faces of the mesh.
+
+    Notes
+    -----
+    The hierarchy is stored in the cache of the mesh.
+    It is rebuilt only if the topology of the mesh changes.
+    If only the vertices have moved, its bounding boxes are refitted.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Mesh
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> bvh = mesh_bvh_numpy(mesh)
+    >>> bvh is mesh_bvh_numpy(mesh)
+    True
+
+    """
+    bvh = mesh.cache.get(('bvh', leafsize), lambda: BVHNumpy.from_mesh(mesh, leafsize))
+    mesh.cache.get(('bvh', leafsize, 'boxes'), lambda: bvh.refit(mesh_vertex_array_numpy(mesh)), geometric=True)
+    return bvh
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,358 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from array import array
+
+from numpy import arange
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cumsum
+from numpy import diff
+from numpy import float64
+from numpy import frombuffer
+from numpy import full
+from numpy import int32
+from numpy import int64
+from numpy import lexsort
+from numpy import r_
+from numpy import repeat
+from numpy import searchsorted
+
+from compas.datastructures.mesh.core.basemesh import BaseMesh
+from compas.datastructures.mesh.core.cache import mesh_cached
+from compas.datastructures.mesh.core.compact import CompactBaseMesh
+
+
+__all__ = [
+    'face_arrays_numpy',
+    'halfedge_arrays_numpy',
+    'mesh_from_arrays_numpy',
+    'mesh_to_arrays_numpy',
+    'mesh_vertex_array_numpy',
+]
+
+
+def face_arrays_numpy(faces, offsets=None):
+    """Convert face data to a flat array of vertex indices and an array of offsets.
+
+    Parameters
+    ----------
+    faces : array-like
+        An ``(m, k)`` array of vertex indices of faces with the same degree,
+        or, if ``offsets`` is provided, a flat array of the vertex indices of all faces.
+    offsets : array-like, optional
+        An array of ``m + 1`` offsets into the flat array of vertex indices,
+        such that the vertices of face ``i`` are ``faces[offsets[i]:offsets[i + 1]]``.
+
+    Returns
+    -------
+    tuple
+        The flat array of vertex indices and the array of offsets.
+
+    Examples
+    --------
+    >>> faces, offsets = face_arrays_numpy([[0, 1, 2], [2, 1, 3]])
+    >>> faces.tolist()
+    [0, 1, 2, 2, 1, 3]
+    >>> offsets.tolist()
+    [0, 3, 6]
+
+    """
+    if offsets is None:
+        faces = asarray(faces, dtype=int64)
+        if faces.ndim != 2:
+            raise ValueError('Faces of different degree require an array of offsets.')
+        m, k = faces.shape
+        return faces.ravel(), arange(0, m * k + 1, k, dtype=int64)
+    faces = asarray(faces, dtype=int64).ravel()
+    offsets = asarray(offsets, dtype=int64).ravel()
+    if offsets[0] != 0 or offsets[-1] != len(faces):
+        raise ValueError('The offsets should start at zero and end at the number of face vertices.')
+    return faces, offsets
+
+
+def halfedge_arrays_numpy(faces, offsets, n=None):
+    """Compute the halfedges of a collection of faces in a few vectorized passes.
+
+    Parameters
+    ----------
+    faces : array
+        The flat array of vertex indices of all faces.
+    offsets : array
+        The offsets of the faces into the flat array of vertex indices.
+    n : int, optional
+        The number of vertices.
+        Default is the highest vertex index plus one.
+
+    Returns
+    -------
+    tuple
+        Three arrays with the start vertex, end vertex and face of every halfedge.
+        Halfedges on the outside of a boundary have face ``-1``.
+
+    Notes
+    -----
+    The halfedges are sorted by start vertex and, per start vertex, in the order
+    in which they would be created by adding the faces to a mesh one by one.
+    The result is therefore identical to the halfedge dictionary of a mesh
+    constructed with :meth:`BaseMesh.from_vertices_and_faces`.
+
+    """
+    if n is None:
+        n = int(faces.max()) + 1 if len(faces) else 0
+    m = len(offsets) - 1
+    degree = diff(offsets)
+    fkeys = repeat(arange(m, dtype=int64), degree)
+    nxt = arange(1, len(faces) + 1)
+    nxt[offsets[1:] - 1] = offsets[:-1]
+    u = faces
+    v = faces[nxt]
+    keep = u != v
+    u, v, fkeys = u[keep], v[keep], fkeys[keep]
+    h = len(u)
+    # every halfedge of a face creates its opposite as well, if it doesn't exist yet
+    # the position of a halfedge in the list of its start vertex is determined
+    # by the first of these events involving the halfedge
+    code = concatenate((u * n + v, v * n + u))
+    time = concatenate((2 * arange(h), 2 * arange(h) + 1))
+    order = lexsort((time, code))
+    code_sorted = code[order]
+    first = r_[True, code_sorted[1:] != code_sorted[:-1]]
+    unique = code_sorted[first]
+    position = time[order][first]
+    # the face of a halfedge is the face of the last face halfedge event
+    face = full(len(unique), -1, dtype=int64)
+    code = code[:h]
+    order = lexsort((arange(h), code))
+    code_sorted = code[order]
+    last = r_[code_sorted[1:] != code_sorted[:-1], True]
+    face[searchsorted(unique, code_sorted[last])] = fkeys[order][last]
+    start = unique // n
+    end = unique % n
+    order = lexsort((position, start))
+    return start[order], end[order], face[order]
+
+
+def mesh_from_arrays_numpy(vertices, faces, offsets=None, cls=None):
+    """Construct a mesh from arrays of vertex coordinates and face vertex indices.
+
+    Parameters
+    ----------
+    vertices : array-like
+        An ``(n, 3)`` array of vertex coordinates.
+    faces : array-like
+        An ``(m, k)`` array of vertex indices of faces with the same degree,
+        or, if ``offsets`` is provided, a flat array of the vertex indices of all faces.
+    offsets : array-like, optional
+        An array of ``m + 1`` offsets into the flat array of vertex indices.
+    cls : type, optional
+        The type of mesh.
+        Default is :class:`BaseMesh`.
+
+    Returns
+    -------
+    Mesh
+        A mesh object, identical to a mesh constructed from the same data with
+        :meth:`BaseMesh.from_vertices_and_faces`.
+
+    Raises
+    ------
+    ValueError
+        If a face has less than three vertices or refers to a vertex that doesn't exist.
+
+    Notes
+    -----
+    The halfedges of the mesh are computed in vectorized passes over the face arrays.
+    For meshes with array-backed storage (:class:`CompactBaseMesh`), the result
+    is written directly into the storage arrays.
+    For the regular mesh, the nested dictionaries are filled in a single loop
+    over the precomputed halfedges.
+
+    Examples
+    --------
+    >>> mesh = mesh_from_arrays_numpy([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    >>> mesh.number_of_edges()
+    4
+
+    """
+    cls = cls or BaseMesh
+    vertices = asarray(vertices, dtype=float64).reshape((-1, 3))
+    faces, offsets = face_arrays_numpy(faces, offsets)
+    n = len(vertices)
+    m = len(offsets) - 1
+    degree = diff(offsets)
+    if m and degree.min() < 3:
+        raise ValueError('Every face should have at least three vertices.')
+    if len(faces) and (faces.min() < 0 or faces.max() >= n):
+        raise ValueError('The faces refer to vertices that do not exist.')
+    u, v, f = halfedge_arrays_numpy(faces, offsets, n)
+    mesh = cls()
+    mesh._max_int_key = n - 1
+    mesh._max_int_fkey = m - 1
+    if issubclass(cls, CompactBaseMesh):
+        _fill_compact_storage(mesh, vertices, faces, offsets, u, v, f)
+        return mesh
+    mesh.vertex = {key: {'x': x, 'y': y, 'z': z} for key, (x, y, z) in enumerate(vertices.tolist())}
+    halfedge = {key: {} for key in range(n)}
+    for start, end, fkey in zip(u.tolist(), v.tolist(), f.tolist()):
+        halfedge[start][end] = None if fkey < 0 else fkey
+    mesh.halfedge = halfedge
+    faces = faces.tolist()
+    offsets = offsets.tolist()
+    mesh.face = {fkey: faces[offsets[fkey]:offsets[fkey + 1]] for fkey in range(m)}
+    mesh.facedata = {fkey: {} for fkey in range(m)}
+    return mesh
+
+
+def _int_array(values):
+    return array('i', asarray(values, dtype=int32).tobytes())
+
+
+def _fill_compact_storage(mesh, vertices, faces, offsets, u, v, f):
+    n = len(vertices)
+    m = len(offsets) - 1
+    h = len(u)
+    vertex = mesh.vertex
+    vertex.xyz = array('d', vertices.ravel().tobytes())
+    vertex.alive = bytearray(b'\x01') * n
+    vertex.count = n
+    face = mesh.face
+    face.vertices = _int_array(faces)
+    face.start = _int_array(offsets[:-1])
+    face.degree = _int_array(diff(offsets))
+    face.count = m
+    halfedge = mesh.halfedge
+    counts = bincount(u, minlength=n)
+    first = cumsum(counts) - counts
+    head = full(n, -1, dtype=int64)
+    tail = full(n, -1, dtype=int64)
+    head[counts > 0] = first[counts > 0]
+    tail[counts > 0] = (first + counts - 1)[counts > 0]
+    nxt = arange(1, h + 1, dtype=int64)
+    nxt[tail[counts > 0]] = -1
+    halfedge.head = _int_array(head)
+    halfedge.tail = _int_array(tail)
+    halfedge.degree = _int_array(counts)
+    halfedge.rows = bytearray(b'\x01') * n
+    halfedge.count = n
+    halfedge.vertex = _int_array(v)
+    halfedge.face = _int_array(f)
+    halfedge.next = _int_array(nxt)
+
+
+def mesh_to_arrays_numpy(mesh):
+    """Convert a mesh to arrays of vertex coordinates and face vertex indices.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    tuple
+        A 3-tuple containing
+
+        * an ``(n, 3)`` array of vertex coordinates,
+        * an ``(m, k)`` array of vertex indices, if all faces have the same degree,
+          or a flat array of the vertex indices of all faces, otherwise, and
+        * ``None`` if all faces have the same degree, or an array of ``m + 1`` face offsets, otherwise.
+
+    Notes
+    -----
+    The vertex indices refer to the position of the vertices in the list of
+    vertex keys (see :meth:`key_index`), as in :meth:`to_vertices_and_faces`.
+    The result can be used with :func:`mesh_from_arrays_numpy` to reconstruct the mesh.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> vertices, faces, offsets = mesh_to_arrays_numpy(mesh)
+    >>> vertices.shape, faces.shape, offsets
+    ((8, 3), (6, 4), None)
+
+    """
+    vertices = mesh_vertex_array_numpy(mesh)
+    faces, degree = _mesh_face_arrays(mesh)
+    faces = faces.copy()
+    if len(degree) and degree.min() == degree.max():
+        return vertices, faces.reshape((-1, degree[0])), None
+    return vertices, faces, r_[0, cumsum(degree)]
+
+
+def mesh_vertex_array_numpy(mesh):
+    """Collect the coordinates of the vertices of a mesh in an array.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        An ``(n, 3)`` array of vertex coordinates, in the order of :meth:`vertices`.
+
+    """
+    if isinstance(mesh, CompactBaseMesh):
+        vertex = mesh.vertex
+        alive = frombuffer(bytes(vertex.alive), dtype='u1').astype(bool)
+        xyz = frombuffer(vertex.xyz, dtype=float64).reshape((-1, 3))
+        return xyz[:len(alive)][alive].copy()
+    return asarray([[attr['x'], attr['y'], attr['z']] for attr in mesh.vertex.values()], dtype=float64).reshape((-1, 3))
+
+
+@mesh_cached('face_arrays')
+def _mesh_face_arrays(mesh):
+    # the flat array of vertex indices of all faces and the array of face degrees
+    # the arrays are cached until the topology of the mesh changes
+    if isinstance(mesh, CompactBaseMesh):
+        vertex = mesh.vertex
+        face = mesh.face
+        alive = frombuffer(bytes(vertex.alive), dtype='u1').astype(bool)
+        index = cumsum(alive) - 1
+        start = frombuffer(face.start, dtype=int32).astype(int64)
+        degree = frombuffer(face.degree, dtype=int32).astype(int64)
+        used = degree > 0
+        start = start[used]
+        degree = degree[used]
+        position = repeat(start - (cumsum(degree) - degree), degree) + arange(degree.sum())
+        faces = index[frombuffer(face.vertices, dtype=int32)[position]]
+    else:
+        key_index = mesh.key_index()
+        cycles = [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+        faces = asarray([key_index[key] for cycle in cycles for key in cycle], dtype=int64)
+        degree = asarray([len(cycle) for cycle in cycles], dtype=int64)
+    faces.flags.writeable = False
+    degree.flags.writeable = False
+    return faces, degree
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import time
+
+    from numpy import random
+
+    n = 500
+
+    i, j = divmod(arange(n * n), n)
+    vertices = random.rand((n + 1) ** 2, 3)
+    faces = asarray([i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1]).T
+
+    for cls in (BaseMesh, CompactBaseMesh):
+        t0 = time.time()
+        mesh = cls.from_vertices_and_faces(vertices.tolist(), faces.tolist())
+        t1 = time.time()
+        mesh = cls.from_arrays(vertices, faces)
+        t2 = time.time()
+        mesh.to_arrays()
+        t3 = time.time()
+        print('{0:<16} faces: {1} from_vertices_and_faces: {2:.2f}s from_arrays: {3:.2f}s to_arrays: {4:.2f}s'.format(
+            cls.__name__, mesh.number_of_faces(), t1 - t0, t2 - t1, t3 - t2))
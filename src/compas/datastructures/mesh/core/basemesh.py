@@ -11,6 +11,7 @@ from copy import deepcopy
 from math import pi
 from ast import literal_eval
 
+from compas import IPY
 from compas.datastructures import Datastructure
 
 from compas.datastructures._mixins import EdgeFilter
@@ -20,10 +21,14 @@ from compas.datastructures._mixins import EdgeMappings
 from compas.datastructures._mixins import FaceFilter
 from compas.datastructures._mixins import FaceHelpers
 from compas.datastructures._mixins import FaceMappings
+from compas.datastructures._mixins import FromToBinary
 from compas.datastructures._mixins import VertexFilter
 from compas.datastructures._mixins import VertexHelpers
 from compas.datastructures._mixins import VertexMappings
 
+from compas.datastructures.mesh.core.cache import MeshCache
+from compas.datastructures.mesh.core.cache import _copy
+
 from compas.files import OBJ
 from compas.files import OFF
 from compas.files import PLY
@@ -57,6 +62,9 @@ from compas.utilities import window
 __all__ = ['BaseMesh']
 
 
+XYZ = ('x', 'y', 'z')
+
+
 class AttributeView(object):
     """Mixin for attribute dict views."""
 
@@ -98,6 +106,84 @@ class VertexAttributeView(AttributeView, collections.MutableMapping):
             yield key
 
 
+class VertexAttributeDict(dict):
+    """Attribute dict of a vertex that notifies a mesh cache of changes to the coordinates."""
+
+    __slots__ = ('cache', )
+
+    def __init__(self, cache, *args, **kwargs):
+        super(VertexAttributeDict, self).__init__(*args, **kwargs)
+        self.cache = cache
+
+    def __reduce__(self):
+        return VertexAttributeDict, (self.cache, dict(self))
+
+    def __setitem__(self, name, value):
+        super(VertexAttributeDict, self).__setitem__(name, value)
+        if name in XYZ:
+            self.cache.invalidate_geometry()
+
+    def __delitem__(self, name):
+        super(VertexAttributeDict, self).__delitem__(name)
+        if name in XYZ:
+            self.cache.invalidate_geometry()
+
+    def update(self, *args, **kwargs):
+        attr = dict(*args, **kwargs)
+        super(VertexAttributeDict, self).update(attr)
+        if any(name in attr for name in XYZ):
+            self.cache.invalidate_geometry()
+
+    def setdefault(self, name, value=None):
+        if name not in self:
+            self[name] = value
+        return self[name]
+
+    def pop(self, name, *default):
+        value = super(VertexAttributeDict, self).pop(name, *default)
+        if name in XYZ:
+            self.cache.invalidate_geometry()
+        return value
+
+    def popitem(self):
+        item = super(VertexAttributeDict, self).popitem()
+        self.cache.invalidate_geometry()
+        return item
+
+    def clear(self):
+        super(VertexAttributeDict, self).clear()
+        self.cache.invalidate_geometry()
+
+
+class VertexDict(dict):
+    """Vertex dict of a mesh that stores the attributes of the vertices in :class:`VertexAttributeDict` objects."""
+
+    __slots__ = ('cache', )
+
+    def __init__(self, cache, vertex=None):
+        super(VertexDict, self).__init__()
+        self.cache = cache
+        if vertex:
+            for key, attr in vertex.items():
+                dict.__setitem__(self, key, VertexAttributeDict(cache, attr))
+
+    def __reduce__(self):
+        return VertexDict, (self.cache, dict(self))
+
+    def __setitem__(self, key, attr):
+        super(VertexDict, self).__setitem__(key, VertexAttributeDict(self.cache, attr))
+        self.cache.invalidate_geometry()
+
+    def update(self, *args, **kwargs):
+        for key, attr in dict(*args, **kwargs).items():
+            self[key] = attr
+
+    def setdefault(self, key, attr=None):
+        if key not in self:
+            self[key] = attr or {}
+        return self[key]
+
+
 class FaceAttributeView(AttributeView, collections.MutableMapping):
     """Mutable Mapping that provides a read/write view of the custom attributes of a face
     combined with the default attributes of all faces."""
@@ -156,7 +242,8 @@ class EdgeAttributeView(AttributeView, collections.MutableMapping):
                 yield name
 
 
-class BaseMesh(EdgeGeometry,
+class BaseMesh(FromToBinary,
+               EdgeGeometry,
                FaceHelpers,
                FaceFilter,
                EdgeHelpers,
@@ -187,6 +274,9 @@ class BaseMesh(EdgeGeometry,
         The default data attributes assigned to every new edge.
     default_face_attributes : dict
         The default data attributes assigned to every new face.
+    cache : :class:`compas.datastructures.MeshCache`
+        Cache of derived data, such as mappings, matrices, normals and areas,
+        that is invalidated automatically when the mesh changes.
     name : str
         The name of the mesh.
         Shorthand for ``mesh.attributes['name']``
@@ -222,6 +312,7 @@ class BaseMesh(EdgeGeometry,
 
     def __init__(self):
         super(BaseMesh, self).__init__()
+        self.cache = MeshCache()
         self._key_to_str = False
         self._max_int_key = -1
         self._max_int_fkey = -1
@@ -285,6 +376,25 @@ class BaseMesh(EdgeGeometry,
     def adjacency(self):
         return self.halfedge
 
+    @property
+    def vertex(self):
+        """dict : The vertex dict, mapping vertex keys to vertex attribute dicts.
+
+        Any dict assigned to this property is converted to a :class:`VertexDict`,
+        such that changes to the vertex coordinates invalidate the cache of the mesh.
+        """
+        return self._vertex
+
+    @vertex.setter
+    def vertex(self, vertex):
+        self._vertex = VertexDict(self.cache, vertex)
+        self.cache.invalidate_topology()
+
+    @vertex.deleter
+    def vertex(self):
+        self._vertex = VertexDict(self.cache)
+        self.cache.invalidate_topology()
+
     @property
     def data(self):
         """dict : A data dict representing the mesh data structure for serialisation.
@@ -362,6 +472,7 @@ class BaseMesh(EdgeGeometry,
         self.halfedge = {}
         self.facedata = {}
         self.edgedata = {}
+        self.cache.invalidate_topology()
 
         for key, attr in iter(vertex.items()):
             self.add_vertex(literal_eval(key), attr_dict=attr)
@@ -522,10 +633,15 @@ class BaseMesh(EdgeGeometry,
         * mesh.obj
         * quadmesh.obj
 
+        If NumPy is available, local files are read in chunks with :class:`compas.files.OBJReaderNumpy`
+        and the mesh is constructed from the resulting arrays with :meth:`from_arrays`.
+
         Examples
         --------
         >>>
         """
+        if not IPY and not filepath.startswith('http'):
+            return cls._from_obj_numpy(filepath, precision)
         obj = OBJ(filepath, precision)
         obj.read()
         vertices = obj.vertices
@@ -537,6 +653,28 @@ class BaseMesh(EdgeGeometry,
             lines = [(vertices[u], vertices[v], 0) for u, v in edges]
             return cls.from_lines(lines)
 
+    @classmethod
+    def _from_obj_numpy(cls, filepath, precision=None):
+        from compas.files.obj_numpy import OBJReaderNumpy
+        from compas.files.obj_numpy import OBJParserNumpy
+        reader = OBJReaderNumpy(filepath)
+        reader.read()
+        parser = OBJParserNumpy(reader, precision)
+        parser.parse()
+        vertices = parser.vertices
+        faces = parser.faces
+        offsets = parser.face_offsets
+        if len(offsets) > 1:
+            if (faces[offsets[1:] - 1] == faces[offsets[:-1]]).any():
+                # closed vertex cycles are opened by add_face
+                faces = [faces[i:j].tolist() for i, j in zip(offsets[:-1], offsets[1:])]
+                return cls.from_vertices_and_faces(vertices.tolist(), faces)
+            return cls.from_arrays(vertices, faces, offsets)
+        if len(parser.lines):
+            vertices = vertices.tolist()
+            lines = [(vertices[u], vertices[v], 0) for u, v in parser.lines.tolist()]
+            return cls.from_lines(lines)
+
     def to_obj(self, filepath):
         """Write the mesh to an OBJ file.
 
@@ -808,6 +946,66 @@ class BaseMesh(EdgeGeometry,
         faces = [[key_index[key] for key in self.face_vertices(fkey)] for fkey in self.faces()]
         return vertices, faces
 
+    @classmethod
+    def from_arrays(cls, vertices, faces, offsets=None):
+        """Construct a mesh object from arrays of vertex coordinates and face vertex indices.
+
+        Parameters
+        ----------
+        vertices : array-like
+            An ``(n, 3)`` array of vertex coordinates.
+        faces : array-like
+            An ``(m, k)`` array of vertex indices of faces with the same degree,
+            or, if ``offsets`` is provided, a flat array of the vertex indices of all faces.
+        offsets : array-like, optional
+            An array of ``m + 1`` offsets into the flat array of vertex indices,
+            such that the vertices of face ``i`` are ``faces[offsets[i]:offsets[i + 1]]``.
+
+        Returns
+        -------
+        Mesh
+            A mesh object.
+
+        Notes
+        -----
+        This constructor requires NumPy.
+        The halfedges are computed in vectorized passes over the face arrays,
+        which is much faster than adding the faces one by one for large meshes.
+        See :func:`compas.datastructures.mesh_from_arrays_numpy`.
+
+        Examples
+        --------
+        >>>
+        """
+        from compas.datastructures.mesh.core.arrays_numpy import mesh_from_arrays_numpy
+        return mesh_from_arrays_numpy(vertices, faces, offsets, cls=cls)
+
+    def to_arrays(self):
+        """Return the vertices and faces of a mesh as arrays.
+
+        Returns
+        -------
+        tuple
+            A 3-tuple containing
+
+            * an ``(n, 3)`` array of vertex coordinates,
+            * an ``(m, k)`` array of vertex indices if all faces have the same degree,
+              or a flat array of the vertex indices of all faces otherwise, and
+            * ``None`` if all faces have the same degree,
+              or an array of ``m + 1`` face offsets otherwise.
+
+        Notes
+        -----
+        This method requires NumPy.
+        The result can be used with :meth:`from_arrays` to reconstruct the mesh.
+
+        Examples
+        --------
+        >>>
+        """
+        from compas.datastructures.mesh.core.arrays_numpy import mesh_to_arrays_numpy
+        return mesh_to_arrays_numpy(self)
+
     @classmethod
     def from_polyhedron(cls, f):
         """Construct a mesh from a platonic solid.
@@ -950,6 +1148,43 @@ class BaseMesh(EdgeGeometry,
         self.facedata = {}
         self._max_int_key = -1
         self._max_int_fkey = -1
+        self.cache.invalidate_topology()
+
+    # --------------------------------------------------------------------------
+    # mappings
+    # --------------------------------------------------------------------------
+
+    def key_index(self):
+        """Returns a dictionary that maps vertex dictionary keys to the
+        corresponding index in a vertex list or array.
+
+        Returns
+        -------
+        dict
+            A dictionary of key-index pairs.
+
+        Notes
+        -----
+        The mapping is cached until the topology of the mesh changes,
+        and should therefore not be modified.
+        """
+        return self.cache.get('key_index', lambda: {key: index for index, key in enumerate(self.vertices())})
+
+    def uv_index(self):
+        """Returns a dictionary that maps edge keys (i.e. pairs of vertex keys)
+        to the corresponding edge index in a list or array of edges.
+
+        Returns
+        -------
+        dict
+            A dictionary of uv-index pairs.
+
+        Notes
+        -----
+        The mapping is cached until the topology of the mesh changes,
+        and should therefore not be modified.
+        """
+        return self.cache.get('uv_index', lambda: {(u, v): index for index, (u, v) in enumerate(self.edges())})
 
     # --------------------------------------------------------------------------
     # builders
@@ -1005,6 +1240,7 @@ class BaseMesh(EdgeGeometry,
         attr = attr_dict or {}
         attr.update(kwattr)
         self.vertex[key].update(attr)
+        self.cache.invalidate_topology()
         return key
 
     def add_face(self, vertices, fkey=None, attr_dict=None, **kwattr):
@@ -1063,6 +1299,7 @@ class BaseMesh(EdgeGeometry,
             self.halfedge[u][v] = fkey
             if u not in self.halfedge[v]:
                 self.halfedge[v][u] = None
+        self.cache.invalidate_topology()
         return fkey
 
     # --------------------------------------------------------------------------
@@ -1112,6 +1349,7 @@ class BaseMesh(EdgeGeometry,
                         del self.edgedata[n, nbr]
         del self.halfedge[key]
         del self.vertex[key]
+        self.cache.invalidate_topology()
 
     def insert_vertex(self, fkey, key=None, xyz=None, return_fkeys=False):
         """Insert a vertex in the specified face.
@@ -1151,6 +1389,9 @@ class BaseMesh(EdgeGeometry,
         for u, v in self.face_halfedges(fkey):
             fkeys.append(self.add_face([u, v, w]))
         del self.face[fkey]
+        if fkey in self.facedata:
+            del self.facedata[fkey]
+        self.cache.invalidate_topology()
         if return_fkeys:
             return w, fkeys
         return w
@@ -1179,6 +1420,7 @@ class BaseMesh(EdgeGeometry,
         del self.face[fkey]
         if fkey in self.facedata:
             del self.facedata[fkey]
+        self.cache.invalidate_topology()
 
     def cull_vertices(self):
         """Remove all unused vertices from the mesh object.
@@ -1190,6 +1432,7 @@ class BaseMesh(EdgeGeometry,
                 if not self.halfedge[u]:
                     del self.vertex[u]
                     del self.halfedge[u]
+        self.cache.invalidate_topology()
 
     # --------------------------------------------------------------------------
     # accessors
@@ -2818,6 +3061,117 @@ class BaseMesh(EdgeGeometry,
         """
         return scale_vector(sum_vectors([scale_vector(self.face_normal(fkey), self.face_area(fkey)) for fkey in self.faces()]), 1. / self.area())
 
+    def faces_centroids(self):
+        """Compute the centroids of all faces.
+
+        Returns
+        -------
+        list
+            The coordinates of the centroids, in the order of :meth:`faces`.
+
+        Notes
+        -----
+        The centroids are computed in bulk with NumPy, if available.
+        The result is cached until the mesh changes, and returned as a copy of the cached list.
+        """
+        def compute():
+            if not IPY:
+                from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_centroids_numpy
+                return mesh_faces_centroids_numpy(self).tolist()
+            return [self.face_centroid(fkey) for fkey in self.faces()]
+
+        return _copy(self.cache.get('faces_centroids', compute, True))
+
+    def faces_normals(self, unitized=True):
+        """Compute the normals of all faces.
+
+        Parameters
+        ----------
+        unitized : bool, optional
+            Unitize the normal vectors.
+            Default is ``True``.
+
+        Returns
+        -------
+        list
+            The normal vectors, in the order of :meth:`faces`.
+
+        Notes
+        -----
+        The normals are computed in bulk with NumPy, if available.
+        The result is cached until the mesh changes, and returned as a copy of the cached list.
+        """
+        def compute():
+            if not IPY:
+                from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_normals_numpy
+                return mesh_faces_normals_numpy(self, unitized).tolist()
+            return [self.face_normal(fkey, unitized) for fkey in self.faces()]
+
+        return _copy(self.cache.get(('faces_normals', unitized), compute, True))
+
+    def faces_areas(self):
+        """Compute the areas of all faces.
+
+        Returns
+        -------
+        list
+            The face areas, in the order of :meth:`faces`.
+
+        Notes
+        -----
+        The areas are computed in bulk with NumPy, if available.
+        The result is cached until the mesh changes, and returned as a copy of the cached list.
+        """
+        def compute():
+            if not IPY:
+                from compas.datastructures.mesh.core.geometry_numpy import mesh_faces_areas_numpy
+                return mesh_faces_areas_numpy(self).tolist()
+            return [self.face_area(fkey) for fkey in self.faces()]
+
+        return _copy(self.cache.get('faces_areas', compute, True))
+
+    def vertices_normals(self):
+        """Compute the normals of all vertices.
+
+        Returns
+        -------
+        list
+            The normal vectors, in the order of :meth:`vertices`.
+
+        Notes
+        -----
+        The normals are computed in bulk with NumPy, if available.
+        The result is cached until the mesh changes, and returned as a copy of the cached list.
+        """
+        def compute():
+            if not IPY:
+                from compas.datastructures.mesh.core.geometry_numpy import mesh_vertices_normals_numpy
+                return mesh_vertices_normals_numpy(self).tolist()
+            return [self.vertex_normal(key) for key in self.vertices()]
+
+        return _copy(self.cache.get('vertices_normals', compute, True))
+
+    def vertices_areas(self):
+        """Compute the tributary areas of all vertices.
+
+        Returns
+        -------
+        list
+            The vertex areas, in the order of :meth:`vertices`.
+
+        Notes
+        -----
+        The areas are computed in bulk with NumPy, if available.
+        The result is cached until the mesh changes, and returned as a copy of the cached list.
+        """
+        def compute():
+            if not IPY:
+                from compas.datastructures.mesh.core.geometry_numpy import mesh_vertices_areas_numpy
+                return mesh_vertices_areas_numpy(self).tolist()
+            return [self.vertex_area(key) for key in self.vertices()]
+
+        return _copy(self.cache.get('vertices_areas', compute, True))
+
     # --------------------------------------------------------------------------
     # vertex geometry
     # --------------------------------------------------------------------------
@@ -0,0 +1,185 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import functools
+
+
+__all__ = [
+    'MeshCache',
+    'mesh_cached',
+]
+
+
+class MeshCache(object):
+    """Cache of data derived from the topology and geometry of a mesh.
+
+    Every entry of the cache is stored together with the values of the mutation
+    counters of the mesh at the time the entry was computed.
+    An entry is only reused if the counters have not changed since.
+
+    Attributes
+    ----------
+    topology : int
+        Counter of changes to the topology of the mesh.
+    geometry : int
+        Counter of changes to the vertex coordinates of the mesh.
+    entries : dict
+        The cached values, with the counters they were computed at.
+    hits : int
+        The number of lookups served from the cache.
+    misses : int
+        The number of lookups that required (re)computation.
+
+    Notes
+    -----
+    The counters are updated by the methods of the mesh that add or delete
+    vertices and faces.
+    The geometry counter is updated by the vertex storage of the mesh
+    whenever a coordinate is written, also through the vertex dictionaries,
+    such as ``mesh.vertex[key]['x'] = x``, and by the transformations of the mesh.
+    Code that modifies the halfedge or face dictionaries of the mesh directly
+    should call :meth:`invalidate_topology` afterwards,
+    and code that writes into the coordinate array of a compact mesh directly
+    should call :meth:`invalidate_geometry` afterwards.
+
+    Cached values are shared between lookups and should be treated as read-only.
+    Functions decorated with :func:`mesh_cached`, and the bulk geometry methods of the mesh,
+    such as :meth:`BaseMesh.faces_normals`, therefore return copies of the cached values.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> key_index = mesh.key_index()
+    >>> key_index = mesh.key_index()
+    >>> mesh.cache.hits, mesh.cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(self):
+        self.topology = 0
+        self.geometry = 0
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate_topology(self):
+        """Invalidate all entries, because the topology of the mesh has changed."""
+        self.topology += 1
+
+    def invalidate_geometry(self):
+        """Invalidate the entries that depend on the vertex coordinates."""
+        self.geometry += 1
+
+    def get(self, key, compute, geometric=False):
+        """Get a cached value, or compute and cache it if it is missing or invalid.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the entry.
+        compute : callable
+            Function without arguments that computes the value.
+        geometric : bool, optional
+            If ``True``, the value depends on the vertex coordinates as well as
+            the topology of the mesh.
+            Default is ``False``.
+
+        Returns
+        -------
+        object
+            The (cached) value.
+        """
+        version = (self.topology, self.geometry) if geometric else (self.topology, )
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        self.entries[key] = version, value
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Statistics of the use of the cache.
+
+        Returns
+        -------
+        dict
+            The number of hits, misses and entries, and the hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'ratio': self.hits / lookups if lookups else 0.0}
+
+
+def _copy(value):
+    # a copy of an array, a sparse matrix, or a list of rows
+    if hasattr(value, 'shape'):
+        return value.copy()
+    if isinstance(value, list):
+        return [row[:] if isinstance(row, list) else row for row in value]
+    return value
+
+
+def mesh_cached(name, geometric=False):
+    """Decorator for caching the result of a function of a mesh in the cache of the mesh.
+
+    Parameters
+    ----------
+    name : str
+        The name of the cache entry.
+        Additional arguments of the function are added to the key of the entry,
+        and should therefore be hashable.
+    geometric : bool, optional
+        If ``True``, the result depends on the vertex coordinates as well as
+        the topology of the mesh.
+        Default is ``False``.
+
+    Notes
+    -----
+    The mesh should be the first argument of the decorated function.
+    Objects without a cache are passed through to the undecorated function.
+    Arrays, sparse matrices and lists of rows are returned as copies of the cached values,
+    such that they can be modified without affecting the cache.
+
+    Examples
+    --------
+    >>> @mesh_cached('degrees')
+    ... def mesh_vertex_degrees(mesh):
+    ...     return [mesh.vertex_degree(key) for key in mesh.vertices()]
+    ...
+
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(mesh, *args, **kwargs):
+            cache = getattr(mesh, 'cache', None)
+            if not isinstance(cache, MeshCache):
+                return func(mesh, *args, **kwargs)
+            key = (name, ) + args + tuple(sorted(kwargs.items()))
+            return _copy(cache.get(key, lambda: func(mesh, *args, **kwargs), geometric))
+        return wrapper
+    return decorator
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+
+    from compas.datastructures import Mesh  # noqa: F401
+
+    doctest.testmod(globs=globals())
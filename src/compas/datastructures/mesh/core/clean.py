@@ -2,7 +2,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.utilities import geometric_key
+from compas import IPY
+from compas.geometry import weld_points
+from compas.utilities import tolerance_from_precision
 
 
 __all__ = [
@@ -22,12 +24,18 @@ def mesh_delete_duplicate_vertices(mesh, precision=None):
         individual numbers in the string (truncation after the decimal point).
         Supported values are any float precision, or decimal integer (``'d'``).
         Default is ``'3f'``.
+        Vertices closer than the corresponding tolerance (e.g. ``0.0005`` for ``'3f'``) are merged.
 
     Returns
     -------
     None
         The mesh is modified in-place.
 
+    Notes
+    -----
+    Duplicate vertices are found with :func:`compas.geometry.weld_points`.
+    Of every group of duplicates, the last vertex is kept.
+
     Examples
     --------
     >>> import compas
@@ -45,24 +53,32 @@ def mesh_delete_duplicate_vertices(mesh, precision=None):
     36
 
     """
-    key_gkey = {key: geometric_key(mesh.vertex_attributes(key, 'xyz'), precision=precision) for key in mesh.vertices()}
-    gkey_key = {gkey: key for key, gkey in iter(key_gkey.items())}
-
-    for key in list(mesh.vertices()):
-        test = gkey_key[key_gkey[key]]
-        if test != key:
-            del mesh.vertex[key]
-            del mesh.halfedge[key]
-            for u in mesh.halfedge:
-                nbrs = list(mesh.halfedge[u].keys())
-                for v in nbrs:
-                    if v == key:
-                        del mesh.halfedge[u][v]
-
-    for fkey in mesh.faces():
+    keys = list(mesh.vertices())
+    xyz = mesh.vertices_attributes('xyz', keys=keys)
+    if IPY:
+        unique, remap = weld_points(xyz, tolerance_from_precision(precision))
+    else:
+        from compas.geometry import weld_points_numpy
+        unique, remap = weld_points_numpy(xyz, tolerance_from_precision(precision))
+    last = {int(index): key for key, index in zip(keys, remap)}
+    key_key = {key: last[int(index)] for key, index in zip(keys, remap)}
+
+    fkeys = set()
+    for key in keys:
+        if key_key[key] == key:
+            continue
+        for nbr, fkey in list(mesh.halfedge[key].items()):
+            if fkey is not None:
+                fkeys.add(fkey)
+            if nbr in mesh.halfedge and key in mesh.halfedge[nbr]:
+                del mesh.halfedge[nbr][key]
+        del mesh.vertex[key]
+        del mesh.halfedge[key]
+
+    for fkey in fkeys:
         seen = set()
         face = []
-        for key in [gkey_key[key_gkey[key]] for key in mesh.face_vertices(fkey)]:
+        for key in [key_key[key] for key in mesh.face_vertices(fkey)]:
             if key not in seen:
                 seen.add(key)
                 face.append(key)
@@ -72,6 +88,8 @@ def mesh_delete_duplicate_vertices(mesh, precision=None):
             if u not in mesh.halfedge[v]:
                 mesh.halfedge[v][u] = None
 
+    mesh.cache.invalidate_topology()
+
 
 # ==============================================================================
 # Main
@@ -0,0 +1,809 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from array import array
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+from compas.datastructures.mesh.core.basemesh import BaseMesh
+
+
+__all__ = [
+    'CompactBaseMesh',
+    'VertexStorage',
+    'FaceStorage',
+    'HalfedgeStorage',
+]
+
+
+AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def _check_key(key):
+    key = int(key)
+    if key < 0:
+        raise ValueError('Keys of a compact mesh should be non-negative integers: {}'.format(key))
+    return key
+
+
+# ==============================================================================
+# Vertices
+# ==============================================================================
+
+
+class VertexRow(MutableMapping):
+    """Read/write view of the attributes of one vertex in a vertex storage.
+
+    The coordinates are read from and written to the coordinate array of the storage.
+    All other attributes are stored sparsely.
+    """
+
+    __slots__ = ('storage', 'key')
+
+    def __init__(self, storage, key):
+        self.storage = storage
+        self.key = key
+
+    def __getitem__(self, name):
+        if name in AXES:
+            return self.storage.xyz[3 * self.key + AXES[name]]
+        return self.storage.attr[self.key][name]
+
+    def __setitem__(self, name, value):
+        if name in AXES:
+            self.storage.xyz[3 * self.key + AXES[name]] = value
+            self.storage.changed()
+        else:
+            self.storage.attr.setdefault(self.key, {})[name] = value
+
+    def __delitem__(self, name):
+        if name in AXES:
+            self.storage.xyz[3 * self.key + AXES[name]] = 0.0
+            self.storage.changed()
+            return
+        attr = self.storage.attr[self.key]
+        del attr[name]
+        if not attr:
+            del self.storage.attr[self.key]
+
+    def __contains__(self, name):
+        if name in AXES:
+            return True
+        return name in self.storage.attr.get(self.key, ())
+
+    def __iter__(self):
+        for name in 'xyz':
+            yield name
+        for name in self.storage.attr.get(self.key, ()):
+            yield name
+
+    def __len__(self):
+        return 3 + len(self.storage.attr.get(self.key, ()))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class VertexStorage(MutableMapping):
+    """Mapping of vertex keys to vertex attributes, backed by a contiguous coordinate array.
+
+    Attributes
+    ----------
+    xyz : array.array
+        The coordinates of the vertices as a flat array of doubles.
+        The coordinates of vertex ``key`` are stored at ``3 * key`` to ``3 * key + 2``.
+    alive : bytearray
+        Flags indicating which rows of the coordinate array are in use.
+    attr : dict
+        Sparse storage of the attributes other than the coordinates.
+    cache : :class:`MeshCache`
+        The cache of the mesh, which is notified of changes to the coordinates.
+
+    Notes
+    -----
+    The vertex keys are used directly as row indices.
+    They should therefore be non-negative integers.
+    The vertices are iterated in order of their keys.
+    """
+
+    def __init__(self, cache=None):
+        self.xyz = array('d')
+        self.alive = bytearray()
+        self.attr = {}
+        self.count = 0
+        self.cache = cache
+
+    def changed(self):
+        """Notify the cache of a change to the coordinates."""
+        if self.cache is not None:
+            self.cache.invalidate_geometry()
+
+    def reserve(self, key):
+        """Make sure the storage has a row for a given key."""
+        n = len(self.alive)
+        if key >= n:
+            size = max(key + 1, 2 * n)
+            self.xyz.extend(array('d', [0.0]) * (3 * (size - n)))
+            self.alive.extend(bytearray(size - n))
+
+    def __contains__(self, key):
+        try:
+            return self.alive[key] == 1 if key >= 0 else False
+        except (IndexError, TypeError):
+            return False
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return VertexRow(self, key)
+
+    def __setitem__(self, key, attr):
+        key = _check_key(key)
+        self.reserve(key)
+        if not self.alive[key]:
+            self.alive[key] = 1
+            self.count += 1
+        i = 3 * key
+        self.xyz[i:i + 3] = array('d', [float(attr.get(axis, 0.0)) for axis in 'xyz'])
+        self.changed()
+        other = {name: value for name, value in attr.items() if name not in AXES}
+        if other:
+            self.attr[key] = other
+        else:
+            self.attr.pop(key, None)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.alive[key] = 0
+        self.count -= 1
+        i = 3 * key
+        self.xyz[i:i + 3] = array('d', [0.0, 0.0, 0.0])
+        self.changed()
+        self.attr.pop(key, None)
+
+    def __iter__(self):
+        alive = self.alive
+        for key in range(len(alive)):
+            if alive[key]:
+                yield key
+
+    def __len__(self):
+        return self.count
+
+    def coordinates(self, key):
+        """The coordinates of a vertex as a list."""
+        if key not in self:
+            raise KeyError(key)
+        i = 3 * key
+        return self.xyz[i:i + 3].tolist()
+
+
+# ==============================================================================
+# Faces
+# ==============================================================================
+
+
+class FaceStorage(MutableMapping):
+    """Mapping of face keys to vertex cycles, backed by CSR-style index arrays.
+
+    Attributes
+    ----------
+    vertices : array.array
+        The vertices of all faces, concatenated.
+    start : array.array
+        Per face key, the position of its first vertex in ``vertices``.
+    degree : array.array
+        Per face key, the number of vertices of the face.
+        Unused rows have degree zero.
+
+    Notes
+    -----
+    Replacing a face by a face of a different degree appends the new cycle to
+    ``vertices``. The unused space is reclaimed automatically when it exceeds
+    half of the size of the array.
+    """
+
+    def __init__(self):
+        self.vertices = array('i')
+        self.start = array('i')
+        self.degree = array('i')
+        self.count = 0
+        self.garbage = 0
+
+    def reserve(self, fkey):
+        """Make sure the storage has a row for a given key."""
+        n = len(self.degree)
+        if fkey >= n:
+            size = max(fkey + 1, 2 * n)
+            self.start.extend(array('i', [0]) * (size - n))
+            self.degree.extend(array('i', [0]) * (size - n))
+
+    def __contains__(self, fkey):
+        try:
+            return self.degree[fkey] > 0 if fkey >= 0 else False
+        except (IndexError, TypeError):
+            return False
+
+    def __getitem__(self, fkey):
+        if fkey not in self:
+            raise KeyError(fkey)
+        i = self.start[fkey]
+        return self.vertices[i:i + self.degree[fkey]].tolist()
+
+    def __setitem__(self, fkey, vertices):
+        fkey = _check_key(fkey)
+        self.reserve(fkey)
+        n = len(vertices)
+        if n == 0:
+            raise ValueError('A face should have at least one vertex.')
+        d = self.degree[fkey]
+        if d == n:
+            i = self.start[fkey]
+            self.vertices[i:i + n] = array('i', vertices)
+            return
+        if d:
+            self.garbage += d
+        else:
+            self.count += 1
+        self.start[fkey] = len(self.vertices)
+        self.degree[fkey] = n
+        self.vertices.extend(vertices)
+        if self.garbage > len(self.vertices) // 2:
+            self.compact()
+
+    def __delitem__(self, fkey):
+        if fkey not in self:
+            raise KeyError(fkey)
+        self.garbage += self.degree[fkey]
+        self.degree[fkey] = 0
+        self.count -= 1
+
+    def __iter__(self):
+        degree = self.degree
+        for fkey in range(len(degree)):
+            if degree[fkey]:
+                yield fkey
+
+    def __len__(self):
+        return self.count
+
+    def compact(self):
+        """Remove the unused space from the array of face vertices."""
+        vertices = array('i')
+        for fkey in self:
+            i = self.start[fkey]
+            self.start[fkey] = len(vertices)
+            vertices.extend(self.vertices[i:i + self.degree[fkey]])
+        self.vertices = vertices
+        self.garbage = 0
+
+
+# ==============================================================================
+# Halfedges
+# ==============================================================================
+
+
+class HalfedgeRow(MutableMapping):
+    """Read/write view of the outgoing halfedges of one vertex in a halfedge storage."""
+
+    __slots__ = ('storage', 'key')
+
+    def __init__(self, storage, key):
+        self.storage = storage
+        self.key = key
+
+    def __getitem__(self, v):
+        slot = self.storage.find(self.key, v)
+        if slot < 0:
+            raise KeyError(v)
+        face = self.storage.face[slot]
+        return None if face < 0 else face
+
+    def __setitem__(self, v, fkey):
+        self.storage.insert(self.key, v, fkey)
+
+    def __delitem__(self, v):
+        self.storage.remove(self.key, v)
+
+    def __contains__(self, v):
+        return self.storage.find(self.key, v) >= 0
+
+    def __iter__(self):
+        storage = self.storage
+        slot = storage.head[self.key]
+        while slot >= 0:
+            nxt = storage.next[slot]
+            yield storage.vertex[slot]
+            slot = nxt
+
+    def __len__(self):
+        return self.storage.degree[self.key]
+
+    def items(self):
+        storage = self.storage
+        items = []
+        slot = storage.head[self.key]
+        while slot >= 0:
+            face = storage.face[slot]
+            items.append((storage.vertex[slot], None if face < 0 else face))
+            slot = storage.next[slot]
+        return items
+
+    def values(self):
+        return [face for _, face in self.items()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class HalfedgeStorage(MutableMapping):
+    """Mapping of vertex keys to their outgoing halfedges, backed by integer arrays.
+
+    The outgoing halfedges of every vertex form a singly linked list of slots,
+    in order of insertion. Every slot stores the end vertex of the halfedge, the
+    face to which the halfedge belongs (``-1`` for ``None``) and the next slot.
+
+    Attributes
+    ----------
+    head : array.array
+        Per vertex key, the first slot of its list, or ``-1``.
+    tail : array.array
+        Per vertex key, the last slot of its list, or ``-1``.
+    degree : array.array
+        Per vertex key, the number of outgoing halfedges.
+    rows : bytearray
+        Flags indicating which vertex keys have a row in the mapping.
+    vertex : array.array
+        Per slot, the end vertex of the halfedge.
+    face : array.array
+        Per slot, the face of the halfedge.
+    next : array.array
+        Per slot, the next slot in the list of the start vertex.
+    """
+
+    def __init__(self):
+        self.head = array('i')
+        self.tail = array('i')
+        self.degree = array('i')
+        self.rows = bytearray()
+        self.count = 0
+        self.vertex = array('i')
+        self.face = array('i')
+        self.next = array('i')
+        self.free = array('i')
+
+    def reserve(self, key):
+        """Make sure the storage has a row for a given key."""
+        n = len(self.rows)
+        if key >= n:
+            size = max(key + 1, 2 * n)
+            self.head.extend(array('i', [-1]) * (size - n))
+            self.tail.extend(array('i', [-1]) * (size - n))
+            self.degree.extend(array('i', [0]) * (size - n))
+            self.rows.extend(bytearray(size - n))
+
+    def find(self, u, v):
+        """Find the slot of the halfedge from ``u`` to ``v``, or return ``-1``."""
+        if u not in self:
+            return -1
+        vertex = self.vertex
+        nxt = self.next
+        slot = self.head[u]
+        while slot >= 0:
+            if vertex[slot] == v:
+                return slot
+            slot = nxt[slot]
+        return -1
+
+    def insert(self, u, v, fkey):
+        """Add the halfedge from ``u`` to ``v``, or update the face it belongs to."""
+        if u not in self:
+            raise KeyError(u)
+        face = -1 if fkey is None else fkey
+        slot = self.find(u, v)
+        if slot >= 0:
+            self.face[slot] = face
+            return
+        self.append(u, v, face)
+
+    def append(self, u, v, face):
+        """Append a new halfedge from ``u`` to ``v`` to the list of ``u``, without checking for duplicates."""
+        if self.free:
+            slot = self.free.pop()
+            self.vertex[slot] = v
+            self.face[slot] = face
+            self.next[slot] = -1
+        else:
+            slot = len(self.vertex)
+            self.vertex.append(v)
+            self.face.append(face)
+            self.next.append(-1)
+        tail = self.tail[u]
+        if tail < 0:
+            self.head[u] = slot
+        else:
+            self.next[tail] = slot
+        self.tail[u] = slot
+        self.degree[u] += 1
+
+    def remove(self, u, v):
+        """Remove the halfedge from ``u`` to ``v``."""
+        if u not in self:
+            raise KeyError(u)
+        vertex = self.vertex
+        nxt = self.next
+        prev = -1
+        slot = self.head[u]
+        while slot >= 0:
+            if vertex[slot] == v:
+                break
+            prev = slot
+            slot = nxt[slot]
+        else:
+            raise KeyError(v)
+        if prev < 0:
+            self.head[u] = nxt[slot]
+        else:
+            nxt[prev] = nxt[slot]
+        if self.tail[u] == slot:
+            self.tail[u] = prev
+        self.degree[u] -= 1
+        self.free.append(slot)
+
+    def __contains__(self, key):
+        try:
+            return self.rows[key] == 1 if key >= 0 else False
+        except (IndexError, TypeError):
+            return False
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return HalfedgeRow(self, key)
+
+    def __setitem__(self, key, nbrs):
+        key = _check_key(key)
+        self.reserve(key)
+        if self.rows[key]:
+            self.clear_row(key)
+        else:
+            self.rows[key] = 1
+            self.count += 1
+        for v, fkey in nbrs.items():
+            self.insert(key, v, fkey)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.clear_row(key)
+        self.rows[key] = 0
+        self.count -= 1
+
+    def __iter__(self):
+        rows = self.rows
+        for key in range(len(rows)):
+            if rows[key]:
+                yield key
+
+    def __len__(self):
+        return self.count
+
+    def clear_row(self, key):
+        """Remove all outgoing halfedges of a vertex."""
+        slot = self.head[key]
+        while slot >= 0:
+            self.free.append(slot)
+            slot = self.next[slot]
+        self.head[key] = -1
+        self.tail[key] = -1
+        self.degree[key] = 0
+
+
+# ==============================================================================
+# Mesh
+# ==============================================================================
+
+
+class CompactBaseMesh(BaseMesh):
+    """Mesh with array-backed storage of coordinates, faces and halfedges.
+
+    The compact mesh has the same interface as :class:`BaseMesh`,
+    but instead of nested dictionaries it uses
+
+    * a contiguous array of doubles for the vertex coordinates,
+    * a pair of CSR-style integer arrays for the face cycles, and
+    * integer arrays for the halfedges.
+
+    This reduces memory use considerably for large meshes,
+    at the cost of slightly slower access to individual elements.
+
+    Notes
+    -----
+    Vertex and face keys are used as row indices of the storage arrays
+    and should therefore be (reasonably dense) non-negative integers.
+    Vertices and faces are iterated in order of their keys.
+
+    Attributes other than the vertex coordinates are stored sparsely,
+    in dictionaries, as in the base mesh.
+
+    Examples
+    --------
+    >>> mesh = CompactBaseMesh.from_polyhedron(6)
+    >>> mesh.number_of_vertices(), mesh.number_of_faces()
+    (8, 6)
+    >>> mesh.vertex_neighbors(0) == BaseMesh.from_polyhedron(6).vertex_neighbors(0)
+    True
+
+    """
+
+    __module__ = 'compas.datastructures'
+
+    # --------------------------------------------------------------------------
+    # storage
+    # --------------------------------------------------------------------------
+
+    @property
+    def vertex(self):
+        """:class:`VertexStorage` : The vertex storage of the mesh."""
+        return self._vertex
+
+    @vertex.setter
+    def vertex(self, vertex):
+        if isinstance(vertex, VertexStorage):
+            vertex.cache = self.cache
+            self._vertex = vertex
+        else:
+            self._vertex = VertexStorage(self.cache)
+            for key, attr in vertex.items():
+                self._vertex[key] = attr
+        self.cache.invalidate_topology()
+
+    @vertex.deleter
+    def vertex(self):
+        self._vertex = VertexStorage(self.cache)
+        self.cache.invalidate_topology()
+
+    @property
+    def face(self):
+        """:class:`FaceStorage` : The face storage of the mesh."""
+        return self._face
+
+    @face.setter
+    def face(self, face):
+        if isinstance(face, FaceStorage):
+            self._face = face
+            return
+        self._face = FaceStorage()
+        for fkey, vertices in face.items():
+            self._face[fkey] = vertices
+
+    @face.deleter
+    def face(self):
+        self._face = FaceStorage()
+
+    @property
+    def halfedge(self):
+        """:class:`HalfedgeStorage` : The halfedge storage of the mesh."""
+        return self._halfedge
+
+    @halfedge.setter
+    def halfedge(self, halfedge):
+        if isinstance(halfedge, HalfedgeStorage):
+            self._halfedge = halfedge
+            return
+        self._halfedge = HalfedgeStorage()
+        for key, nbrs in halfedge.items():
+            self._halfedge[key] = nbrs
+
+    @halfedge.deleter
+    def halfedge(self):
+        self._halfedge = HalfedgeStorage()
+
+    @property
+    def data(self):
+        """dict : A data dict representing the mesh data structure for serialisation.
+
+        The data has the same structure as the data of a :class:`BaseMesh`.
+        """
+        data = BaseMesh.data.fget(self)
+        data['vertex'] = {key: dict(attr) for key, attr in data['vertex'].items()}
+        return data
+
+    @data.setter
+    def data(self, data):
+        BaseMesh.data.fset(self, data)
+
+    # --------------------------------------------------------------------------
+    # constructors
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_vertices_and_faces(cls, vertices, faces):
+        """Construct a mesh object from a list of vertices and faces.
+
+        Parameters
+        ----------
+        vertices : list, dict
+            A list of vertices, represented by their XYZ coordinates,
+            or a dictionary of vertex keys pointing to their XYZ coordinates.
+        faces : list, dict
+            A list of faces, represented by a list of indices referencing the list of vertex coordinates,
+            or a dictionary of face keys pointing to a list of indices referencing the list of vertex coordinates.
+
+        Returns
+        -------
+        Mesh
+            A mesh object.
+
+        Notes
+        -----
+        Lists of vertices and faces are written directly into the storage arrays.
+        Dictionaries are added one by one.
+        """
+        if hasattr(vertices, 'items') or hasattr(faces, 'items'):
+            return super(CompactBaseMesh, cls).from_vertices_and_faces(vertices, faces)
+        mesh = cls()
+        vertex = mesh.vertex
+        halfedge = mesh.halfedge
+        xyz = array('d')
+        for point in vertices:
+            xyz.extend(point[:3])
+        n = len(xyz) // 3
+        vertex.xyz = xyz
+        vertex.alive = bytearray(b'\x01') * n
+        vertex.count = n
+        halfedge.reserve(n - 1)
+        halfedge.rows[:] = bytearray(b'\x01') * n
+        halfedge.count = n
+        mesh._max_int_key = n - 1
+        for face in faces:
+            mesh.add_face(face)
+        return mesh
+
+    # --------------------------------------------------------------------------
+    # builders
+    # --------------------------------------------------------------------------
+
+    def add_vertex(self, key=None, attr_dict=None, **kwattr):
+        """Add a vertex to the mesh object.
+
+        Parameters
+        ----------
+        key : int, optional
+            The vertex identifier.
+        attr_dict : dict, optional
+            Vertex attributes.
+        kwattr : dict, optional
+            Additional named vertex attributes.
+            Named vertex attributes overwrite corresponding attributes in the
+            attribute dict (``attr_dict``).
+
+        Returns
+        -------
+        int
+            The identifier of the vertex.
+        """
+        if key is None:
+            key = self._max_int_key = self._max_int_key + 1
+        key = _check_key(key)
+        if key > self._max_int_key:
+            self._max_int_key = key
+        if key not in self.vertex:
+            self.vertex[key] = {}
+            self.halfedge[key] = {}
+        attr = attr_dict or {}
+        attr.update(kwattr)
+        self.vertex[key].update(attr)
+        self.cache.invalidate_topology()
+        return key
+
+    def add_face(self, vertices, fkey=None, attr_dict=None, **kwattr):
+        """Add a face to the mesh object.
+
+        Parameters
+        ----------
+        vertices : list
+            A list of vertex keys.
+        attr_dict : dict, optional
+            Face attributes.
+        kwattr : dict, optional
+            Additional named face attributes.
+            Named face attributes overwrite corresponding attributes in the
+            attribute dict (``attr_dict``).
+
+        Returns
+        -------
+        int
+            The key of the face.
+
+        Notes
+        -----
+        Face attributes are only stored if they are not empty.
+        """
+        if len(vertices) < 3:
+            return
+        if vertices[-1] == vertices[0]:
+            vertices = vertices[:-1]
+        vertices = [int(key) for key in vertices]
+        if fkey is None:
+            fkey = self._max_int_fkey = self._max_int_fkey + 1
+        fkey = _check_key(fkey)
+        if fkey > self._max_int_fkey:
+            self._max_int_fkey = fkey
+        attr = attr_dict or {}
+        attr.update(kwattr)
+        self.face[fkey] = vertices
+        if attr:
+            self.facedata.setdefault(fkey, attr)
+        halfedge = self.halfedge
+        n = len(vertices)
+        for i in range(n):
+            u = vertices[i]
+            v = vertices[(i + 1) % n]
+            if u == v:
+                continue
+            halfedge.insert(u, v, fkey)
+            if halfedge.find(v, u) < 0:
+                halfedge.append(v, u, -1)
+        self.cache.invalidate_topology()
+        return fkey
+
+    # --------------------------------------------------------------------------
+    # vertex geometry
+    # --------------------------------------------------------------------------
+
+    def vertex_coordinates(self, key, axes='xyz'):
+        """Return the coordinates of a vertex.
+
+        Parameters
+        ----------
+        key : int
+            The identifier of the vertex.
+        axes : str, optional
+            The axes along which to take the coordinates.
+            Should be a combination of ``'x'``, ``'y'``, ``'z'``.
+            Default is ``'xyz'``.
+
+        Returns
+        -------
+        list
+            Coordinates of the vertex.
+        """
+        xyz = self.vertex.coordinates(key)
+        if axes == 'xyz':
+            return xyz
+        return [xyz[AXES[axis]] for axis in axes]
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import time
+    import tracemalloc
+
+    n = 300
+
+    vertices = [[i, j, 0.0] for i in range(n + 1) for j in range(n + 1)]
+    faces = [[i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1] for i in range(n) for j in range(n)]
+
+    for cls in (BaseMesh, CompactBaseMesh):
+        tracemalloc.start()
+        t0 = time.time()
+        mesh = cls.from_vertices_and_faces(vertices, faces)
+        t1 = time.time()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        t2 = time.time()
+        for key in mesh.vertices():
+            mesh.vertex_neighbors(key)
+        t3 = time.time()
+        print('{0:<16} faces: {1} build: {2:.2f}s memory: {3:.1f}MB neighbors: {4:.2f}s'.format(
+            cls.__name__, mesh.number_of_faces(), t1 - t0, memory / 1e6, t3 - t2))
@@ -0,0 +1,290 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import add
+from numpy import arange
+from numpy import bincount
+from numpy import cross
+from numpy import cumsum
+from numpy import errstate
+from numpy import repeat
+from numpy import sqrt
+from numpy import where
+from numpy import zeros
+
+from compas.datastructures.mesh.core.arrays_numpy import _mesh_face_arrays
+from compas.datastructures.mesh.core.arrays_numpy import mesh_vertex_array_numpy
+
+
+__all__ = [
+    'mesh_faces_centroids_numpy',
+    'mesh_faces_normals_numpy',
+    'mesh_faces_areas_numpy',
+    'mesh_vertices_normals_numpy',
+    'mesh_vertices_areas_numpy',
+]
+
+
+def _length(vectors):
+    return sqrt((vectors ** 2).sum(axis=1))
+
+
+def _corners(mesh):
+    # the vertex coordinates, the flat array of face vertex indices,
+    # the face of every face corner, the previous corner of every face corner,
+    # and the start and degree of every face
+    xyz = mesh_vertex_array_numpy(mesh)
+    faces, degree = _mesh_face_arrays(mesh)
+    start = cumsum(degree) - degree
+    face = repeat(arange(len(degree)), degree)
+    previous = arange(-1, len(faces) - 1)
+    previous[start] = start + degree - 1
+    return xyz, faces, face, previous, start, degree
+
+
+def _centroids(xyz, faces, start, degree):
+    if not len(degree):
+        return zeros((0, 3))
+    return add.reduceat(xyz[faces], start, axis=0) / degree[:, None]
+
+
+def _cross_products(xyz, faces, face, previous, centroids):
+    # the cross products of the vectors from the face centroid
+    # to the previous and current corner of every face corner
+    points = xyz[faces] - centroids[face]
+    return cross(points[previous], points)
+
+
+def mesh_faces_centroids_numpy(mesh):
+    """Compute the centroids of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        An ``(m, 3)`` array of face centroids, in the order of :meth:`faces`.
+
+    Notes
+    -----
+    The result is the same as the result of :meth:`face_centroid` for every face.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> centroids = mesh_faces_centroids_numpy(mesh)
+    >>> centroids.shape
+    (6, 3)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    return _centroids(xyz, faces, start, degree)
+
+
+def mesh_faces_normals_numpy(mesh, unitized=True):
+    """Compute the normals of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    unitized : bool, optional
+        Unitize the normal vectors.
+        Default is ``True``.
+
+    Returns
+    -------
+    array
+        An ``(m, 3)`` array of face normals, in the order of :meth:`faces`.
+
+    Notes
+    -----
+    The result is the same as the result of :meth:`face_normal` for every face.
+    The normal of a face is the sum of the cross products of the vectors from
+    the centroid of the face to consecutive pairs of its corners,
+    such that faces of any degree are handled in the same pass.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> normals = mesh_faces_normals_numpy(mesh)
+    >>> normals.shape
+    (6, 3)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    if not len(degree):
+        return zeros((0, 3))
+    centroids = _centroids(xyz, faces, start, degree)
+    normals = add.reduceat(_cross_products(xyz, faces, face, previous, centroids), start, axis=0)
+    if not unitized:
+        return normals
+    return normals / _length(normals)[:, None]
+
+
+def mesh_faces_areas_numpy(mesh):
+    """Compute the areas of all faces of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        An array of ``m`` face areas, in the order of :meth:`faces`.
+
+    Notes
+    -----
+    The result is the same as the result of :meth:`face_area` for every face.
+    Every face is split into triangles connecting the centroid of the face to its edges.
+    The areas of the triangles oriented opposite to the first triangle of the face
+    are subtracted from the total.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> areas = mesh_faces_areas_numpy(mesh)
+    >>> areas.shape
+    (6,)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    if not len(degree):
+        return zeros(0)
+    centroids = _centroids(xyz, faces, start, degree)
+    return _areas(_cross_products(xyz, faces, face, previous, centroids), face, start)
+
+
+def _areas(normals, face, start):
+    # the areas of the faces from the cross products of their face corners
+    sign = where((normals * normals[start][face]).sum(axis=1) > 0, 1.0, -1.0)
+    sign[start] = 1.0
+    return 0.5 * add.reduceat(sign * _length(normals), start)
+
+
+def mesh_vertices_normals_numpy(mesh):
+    """Compute the normals of all vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        An ``(n, 3)`` array of vertex normals, in the order of :meth:`vertices`.
+
+    Notes
+    -----
+    The result is the same as the result of :meth:`vertex_normal` for every vertex,
+    i.e. the normalized average of the (non-unitized) normals of the faces around the vertex.
+    The normals of vertices without faces are zero vectors.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> normals = mesh_vertices_normals_numpy(mesh)
+    >>> normals.shape
+    (8, 3)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    normals = zeros((len(xyz), 3))
+    if not len(degree):
+        return normals
+    fnormals = mesh_faces_normals_numpy(mesh, unitized=False)
+    for axis in range(3):
+        normals[:, axis] = bincount(faces, weights=fnormals[face, axis], minlength=len(xyz))
+    length = _length(normals)
+    with errstate(divide='ignore', invalid='ignore'):
+        normals = where(length[:, None] > 0, normals / length[:, None], 0.0)
+    return normals
+
+
+def mesh_vertices_areas_numpy(mesh):
+    """Compute the tributary areas of all vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        An array of ``n`` vertex areas, in the order of :meth:`vertices`.
+
+    Notes
+    -----
+    The result is the same as the result of :meth:`vertex_area` for every vertex.
+    Every face edge contributes to the areas of both of its vertices,
+    through the triangle formed with the centroid of the face.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(6)
+    >>> areas = mesh_vertices_areas_numpy(mesh)
+    >>> areas.shape
+    (8,)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    if not len(degree):
+        return zeros(len(xyz))
+    centroids = _centroids(xyz, faces, start, degree)
+    u = faces[previous]
+    v = faces
+    c = centroids[face]
+    a = _length(cross(xyz[v] - xyz[u], c - xyz[u]))
+    b = _length(cross(xyz[u] - xyz[v], c - xyz[v]))
+    areas = bincount(u, weights=a, minlength=len(xyz)) + bincount(v, weights=b, minlength=len(xyz))
+    return 0.25 * areas
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import time
+
+    from numpy import asarray
+    from numpy import random
+
+    from compas.datastructures import Mesh
+
+    n = 200
+
+    i, j = divmod(arange(n * n), n)
+    vertices = random.rand((n + 1) ** 2, 3)
+    faces = asarray([i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1]).T
+    mesh = Mesh.from_arrays(vertices, faces)
+
+    queries = [
+        ('face_centroid', mesh.face_centroid, mesh.faces, mesh_faces_centroids_numpy),
+        ('face_normal', mesh.face_normal, mesh.faces, mesh_faces_normals_numpy),
+        ('face_area', mesh.face_area, mesh.faces, mesh_faces_areas_numpy),
+        ('vertex_normal', mesh.vertex_normal, mesh.vertices, mesh_vertices_normals_numpy),
+        ('vertex_area', mesh.vertex_area, mesh.vertices, mesh_vertices_areas_numpy),
+    ]
+
+    for name, scalar, keys, vectorized in queries:
+        mesh.cache.clear()
+        t0 = time.time()
+        expected = [scalar(key) for key in keys()]
+        t1 = time.time()
+        result = vectorized(mesh)
+        t2 = time.time()
+        result = vectorized(mesh)
+        t3 = time.time()
+        error = abs(result - asarray(expected)).max()
+        print('{0:<16} scalar: {1:.3f}s vectorized: {2:.3f}s (first call: {3:.3f}s) max error: {4:.1e}'.format(
+            name, t1 - t0, t3 - t2, t2 - t1, error))
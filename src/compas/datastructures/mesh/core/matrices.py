@@ -20,6 +20,8 @@ from compas.numerical import degree_matrix
 from compas.numerical import connectivity_matrix
 from compas.numerical import face_matrix
 
+from compas.datastructures.mesh.core.cache import mesh_cached
+
 
 __all__ = [
     'mesh_adjacency_matrix',
@@ -32,6 +34,7 @@ __all__ = [
 ]
 
 
+@mesh_cached('adjacency_matrix')
 def mesh_adjacency_matrix(mesh, rtype='array'):
     """Creates a vertex adjacency matrix from a Mesh datastructure.
 
@@ -63,6 +66,7 @@ def mesh_adjacency_matrix(mesh, rtype='array'):
     return adjacency_matrix(adjacency, rtype=rtype)
 
 
+@mesh_cached('connectivity_matrix')
 def mesh_connectivity_matrix(mesh, rtype='array'):
     """Creates a connectivity matrix from a Mesh datastructure.
 
@@ -98,6 +102,7 @@ def mesh_connectivity_matrix(mesh, rtype='array'):
     return connectivity_matrix(edges, rtype=rtype)
 
 
+@mesh_cached('degree_matrix')
 def mesh_degree_matrix(mesh, rtype='array'):
     """Creates a vertex degree matrix from a Mesh datastructure.
 
@@ -135,6 +140,7 @@ def mesh_degree_matrix(mesh, rtype='array'):
     return degree_matrix(adjacency, rtype=rtype)
 
 
+@mesh_cached('face_matrix')
 def mesh_face_matrix(mesh, rtype='array'):
     r"""Construct the face matrix from a Mesh datastructure.
 
@@ -192,6 +198,7 @@ def mesh_face_matrix(mesh, rtype='array'):
     return face_matrix(face_vertices, rtype=rtype)
 
 
+@mesh_cached('laplacian_matrix')
 def mesh_laplacian_matrix(mesh, rtype='csr'):
     r"""Construct a Laplacian matrix with uniform weights from a mesh data structure.
 
@@ -338,6 +345,7 @@ def trimesh_edge_cotangents(mesh, u, v):
     return a, b
 
 
+@mesh_cached('cotangent_laplacian_matrix', geometric=True)
 def trimesh_cotangent_laplacian_matrix(mesh, rtype='csr'):
     r"""Construct the Laplacian of a triangular mesh with cotangent weights.
 
@@ -432,6 +440,7 @@ def trimesh_positive_cotangent_laplacian_matrix(mesh):
     raise NotImplementedError
 
 
+@mesh_cached('vertexarea_matrix', geometric=True)
 def trimesh_vertexarea_matrix(mesh):
     """Compute the n x n diagonal matrix of per-vertex voronoi areas.
 
@@ -151,6 +151,7 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
             # u > v > d => u > d
             d = mesh.face_vertex_descendant(fkey, v)
             face.remove(v)
+            mesh.face[fkey] = face
             del mesh.halfedge[u][v]
             del mesh.halfedge[v][d]
             mesh.halfedge[u][d] = fkey
@@ -180,6 +181,7 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
             # a > v > u => a > u
             a = mesh.face_vertex_ancestor(fkey, v)
             face.remove(v)
+            mesh.face[fkey] = face
             del mesh.halfedge[a][v]
             del mesh.halfedge[v][u]
             mesh.halfedge[a][u] = fkey
@@ -195,6 +197,7 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
             face = mesh.face[fkey]
             a = mesh.face_vertex_ancestor(fkey, v)
             face[face.index(v)] = u
+            mesh.face[fkey] = face
 
             if v in mesh.halfedge[a]:
                 del mesh.halfedge[a][v]
@@ -214,6 +217,8 @@ def mesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
     del mesh.halfedge[v]
     del mesh.vertex[v]
 
+    mesh.cache.invalidate_topology()
+
 
 # split this up into more efficient cases
 # - both not on boundary
@@ -369,6 +374,8 @@ def trimesh_collapse_edge(mesh, u, v, t=0.5, allow_boundary=False, fixed=None):
                 mesh.halfedge[nu][u] = mesh.halfedge[nu][v]
                 del mesh.halfedge[nu][v]
 
+    mesh.cache.invalidate_topology()
+
     return True
 
 
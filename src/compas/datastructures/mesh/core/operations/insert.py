@@ -66,6 +66,7 @@ def mesh_add_vertex_to_face_edge(mesh, key, fkey, v):
         del mesh.edgedata[u, v]
     if (v, u) in mesh.edgedata:
         del mesh.edgedata[v, u]
+    mesh.cache.invalidate_topology()
 
 
 def mesh_insert_vertex_on_edge(mesh, u, v, vkey=None):
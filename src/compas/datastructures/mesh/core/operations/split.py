@@ -65,8 +65,10 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
 
     # update the UV face if it is not the `None` face
     if fkey_uv is not None:
-        j = mesh.face[fkey_uv].index(v)
-        mesh.face[fkey_uv].insert(j, w)
+        vertices = mesh.face[fkey_uv]
+        j = vertices.index(v)
+        vertices.insert(j, w)
+        mesh.face[fkey_uv] = vertices
 
     # split half-edge VU
     mesh.halfedge[v][w] = fkey_vu
@@ -75,8 +77,12 @@ def mesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
 
     # update the VU face if it is not the `None` face
     if fkey_vu is not None:
-        i = mesh.face[fkey_vu].index(u)
-        mesh.face[fkey_vu].insert(i, w)
+        vertices = mesh.face[fkey_vu]
+        i = vertices.index(u)
+        vertices.insert(i, w)
+        mesh.face[fkey_vu] = vertices
+
+    mesh.cache.invalidate_topology()
 
     return w
 
@@ -153,6 +159,8 @@ def trimesh_split_edge(mesh, u, v, t=0.5, allow_boundary=False):
         del mesh.halfedge[v][u]
         del mesh.face[fkey_vu]
 
+    mesh.cache.invalidate_topology()
+
     # return the key of the split vertex
     return w
 
@@ -195,6 +203,8 @@ def mesh_split_face(mesh, fkey, u, v):
 
     del mesh.face[fkey]
 
+    mesh.cache.invalidate_topology()
+
     return f, g
 
 
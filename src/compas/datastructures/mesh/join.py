@@ -2,8 +2,10 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from compas import IPY
+from compas.geometry import weld_points
 from compas.utilities import pairwise
-from compas.utilities import geometric_key
+from compas.utilities import tolerance_from_precision
 
 __all__ = [
     'mesh_weld',
@@ -20,7 +22,8 @@ def mesh_weld(mesh, precision=None, cls=None):
     mesh : Mesh
         A mesh.
     precision: str (None)
-        Tolerance distance for welding.
+        The precision of the geometric keys corresponding to the tolerance distance for welding,
+        e.g. ``'3f'`` for a tolerance of ``0.0005``.
     cls : type (None)
         Type of the welded mesh.
         This defaults to the type of the first mesh in the list.
@@ -30,16 +33,26 @@ def mesh_weld(mesh, precision=None, cls=None):
     mesh
         The welded mesh.
 
+    Notes
+    -----
+    Vertices are merged with :func:`compas.geometry.weld_points`,
+    into a vertex with the coordinates of the last of the merged vertices.
+
     """
     if cls is None:
         cls = type(mesh)
 
-    geo = geometric_key
-    key_xyz = {key: mesh.vertex_coordinates(key) for key in mesh.vertices()}
-    gkey_key = {geo(xyz, precision): key for key, xyz in key_xyz.items()}
-    gkey_index = {gkey: index for index, gkey in enumerate(gkey_key)}
-    vertices = [key_xyz[key] for gkey, key in gkey_key.items()]
-    faces = [[gkey_index[geo(key_xyz[key], precision)] for key in mesh.face_vertices(fkey)] for fkey in mesh.faces()]
+    keys = list(mesh.vertices())
+    xyz = mesh.vertices_attributes('xyz', keys=keys)
+    if IPY:
+        unique, remap = weld_points(xyz, tolerance_from_precision(precision))
+    else:
+        from compas.geometry import weld_points_numpy
+        unique, remap = weld_points_numpy(xyz, tolerance_from_precision(precision))
+    key_index = {key: int(index) for key, index in zip(keys, remap)}
+    last = {int(index): i for i, index in enumerate(remap)}
+    vertices = [xyz[last[i]] for i in range(len(unique))]
+    faces = [[key_index[key] for key in mesh.face_vertices(fkey)] for fkey in mesh.faces()]
     faces[:] = [[u for u, v in pairwise(face + face[:1]) if u != v] for face in faces]
 
     return cls.from_vertices_and_faces(vertices, faces)
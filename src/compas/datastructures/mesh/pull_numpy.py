@@ -17,17 +17,47 @@ from compas.geometry import cross_vectors
 from compas.geometry import is_ccw_xy
 from compas.geometry import is_point_in_triangle
 
+from compas.datastructures.mesh.bvh_numpy import mesh_bvh_numpy
+
 
 __all__ = [
     'mesh_pull_points_numpy'
 ]
 
 
-def mesh_pull_points_numpy(mesh, points):
+def mesh_pull_points_numpy(mesh, points, bvh=False):
+    """Pull points onto a mesh.
+
+    Parameters
+    ----------
+    mesh : compas.datastructures.Mesh
+        A mesh object.
+    points : array-like
+        The XYZ coordinates of the points.
+    bvh : bool, optional
+        If ``True``, find the exact closest points on the mesh
+        with a bounding volume hierarchy of its faces.
+        Otherwise, only the faces around the closest vertex of every point are considered.
+        Default is ``False``.
+
+    Returns
+    -------
+    list
+        The XYZ coordinates of the pulled points.
+
+    Notes
+    -----
+    The hierarchy is cached on the mesh (see :func:`mesh_bvh_numpy`),
+    so repeated calls do not rebuild it, as long as the topology of the mesh does not change.
+
+    """
+    if bvh:
+        faces, closest, distances = mesh_bvh_numpy(mesh).closest_points(points)
+        return closest.tolist()
     # preprocess
     i_k = mesh.index_key()
     fk_fi = {fkey: index for index, fkey in enumerate(mesh.faces())}
-    vertices = array(mesh.get_vertices_attributes('xyz'), dtype=float64).reshape((-1, 3))
+    vertices = array(mesh.vertices_attributes('xyz'), dtype=float64).reshape((-1, 3))
     triangles = array([mesh.face_coordinates(fkey) for fkey in mesh.faces()], dtype=float64)
     points = array(points, dtype=float64).reshape((-1, 3))
     closest_vis = argmin(distance_matrix(points, vertices), axis=1)
@@ -226,7 +256,7 @@ if __name__ == "__main__":
     mesh = Mesh.from_obj(compas.get('hypar.obj'))
     target = mesh.copy()
 
-    points = mesh.get_vertices_attributes('xyz')
+    points = mesh.vertices_attributes('xyz')
     points[:] = [[x, y, 0] for x, y, z in points]
 
     mesh_quads_to_triangles(target)
@@ -1,9 +1,219 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
 from numpy import array
+from numpy import bincount
+from numpy import concatenate
+from numpy import cross
+from numpy import errstate
+from numpy import ones
+from numpy import r_
+from numpy import sqrt
+from numpy import where
+
+from scipy.sparse import coo_matrix
+from scipy.sparse import diags
 
 from compas.datastructures.mesh.core import trimesh_cotangent_laplacian_matrix
+from compas.datastructures.mesh.core.arrays_numpy import halfedge_arrays_numpy
+from compas.datastructures.mesh.core.geometry_numpy import _areas
+from compas.datastructures.mesh.core.geometry_numpy import _corners
+from compas.datastructures.mesh.core.geometry_numpy import _cross_products
+
+
+__all__ = [
+    'mesh_smooth_centroid_numpy',
+    'mesh_smooth_area_numpy',
+    'mesh_smooth_cotangent_numpy',
+    'trimesh_smooth_laplacian_cotangent',
+]
+
+
+def mesh_smooth_centroid_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a mesh by moving every free vertex to the centroid of its neighbors, using NumPy.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+
+    Notes
+    -----
+    The result is the same as that of :func:`mesh_smooth_centroid`.
+    The smoothing operator, including the damping and the fixed vertices,
+    is assembled once as a sparse matrix with uniform weights,
+    such that every iteration is a single sparse matrix-vector product with the array of vertex coordinates.
+
+    The vertex coordinates of the mesh are updated after every iteration if a callback is provided,
+    and only at the end otherwise.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+    >>> fixed = [key for key in mesh.vertices() if mesh.vertex_degree(key) == 2]
+    >>> mesh_smooth_centroid_numpy(mesh, fixed=fixed)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    u, v, _ = halfedge_arrays_numpy(faces, r_[start, len(faces)], len(xyz))
+    weights = 1.0 / bincount(u, minlength=len(xyz))[u]
+    W = coo_matrix((weights, (u, v)), shape=(len(xyz), len(xyz)))
+    S = _smoothing_operator(mesh, W, fixed, damping)
+    _smooth(mesh, xyz, S.dot, kmax, callback, callback_args)
+
+
+def mesh_smooth_area_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a mesh by moving each vertex to the barycenter of the centroids of the surrounding faces,
+    weighted by area, using NumPy.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+
+    Notes
+    -----
+    The result is the same as that of :func:`mesh_smooth_area`,
+    except that vertices without faces are not moved.
+    The sparse matrices that map vertex coordinates to face centroids and
+    face values to vertices are assembled once.
+    In every iteration, only the face areas are recomputed, in a single vectorized pass.
+
+    The vertex coordinates of the mesh are updated after every iteration if a callback is provided,
+    and only at the end otherwise.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_obj(compas.get('faces.obj'))
+    >>> fixed = [key for key in mesh.vertices() if mesh.vertex_degree(key) == 2]
+    >>> mesh_smooth_area_numpy(mesh, fixed=fixed)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    n = len(xyz)
+    m = len(degree)
+    # face centroids from vertex coordinates, and the sum of face values per vertex
+    C = coo_matrix((1.0 / degree[face], (face, faces)), shape=(m, n)).tocsr()
+    F = coo_matrix((ones(len(faces)), (faces, face)), shape=(n, m)).tocsr()
+    free = _free(mesh, fixed)
+    free[bincount(faces, minlength=n) == 0] = False
+
+    def step(X):
+        if not m:
+            return X
+        centroids = C.dot(X)
+        areas = _areas(_cross_products(X, faces, face, previous, centroids), face, start)
+        A = F.dot(areas)
+        with errstate(divide='ignore', invalid='ignore'):
+            target = F.dot(areas[:, None] * centroids) / A[:, None]
+        X = X.copy()
+        X[free] += damping * (target[free] - X[free])
+        return X
 
+    _smooth(mesh, xyz, step, kmax, callback, callback_args)
 
-__all__ = ['trimesh_smooth_laplacian_cotangent']
+
+def mesh_smooth_cotangent_numpy(mesh, fixed=None, kmax=100, damping=0.5, callback=None, callback_args=None):
+    """Smooth a triangle mesh by moving every free vertex to the average of its neighbors, with cotangent weights.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A triangle mesh.
+    fixed : list, optional
+        The fixed vertices of the mesh.
+    kmax : int, optional
+        The maximum number of iterations.
+    damping : float, optional
+        The damping factor.
+    callback : callable, optional
+        A user-defined callback function to be executed after every iteration.
+    callback_args : list, optional
+        A list of arguments to be passed to the callback.
+
+    Raises
+    ------
+    Exception
+        If a callback is provided, but it is not callable.
+    ValueError
+        If the mesh is not a triangle mesh.
+
+    Notes
+    -----
+    The weight of a neighbor is the sum of the cotangents of the angles opposite the edge to the neighbor,
+    divided by the sum of the weights of all neighbors, as in :func:`trimesh_cotangent_laplacian_matrix`.
+    The weights are computed once, for the initial geometry of the mesh,
+    and the smoothing operator is assembled as a single sparse matrix.
+    This fairs the mesh while preserving the distribution of the vertices
+    better than smoothing with uniform weights.
+
+    The vertex coordinates of the mesh are updated after every iteration if a callback is provided,
+    and only at the end otherwise.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_polyhedron(20)
+    >>> mesh_smooth_cotangent_numpy(mesh, kmax=10)
+
+    """
+    xyz, faces, face, previous, start, degree = _corners(mesh)
+    if len(degree) and (degree != 3).any():
+        raise ValueError('Cotangent smoothing requires a triangle mesh.')
+    triangles = faces.reshape((-1, 3))
+    rows = []
+    cols = []
+    data = []
+    for i in range(3):
+        a = triangles[:, i]
+        b = triangles[:, (i + 1) % 3]
+        c = triangles[:, (i + 2) % 3]
+        # the cotangent of the angle at a, opposite the edge bc
+        ab = xyz[b] - xyz[a]
+        ac = xyz[c] - xyz[a]
+        length = sqrt((cross(ab, ac) ** 2).sum(axis=1))
+        with errstate(divide='ignore', invalid='ignore'):
+            cotangent = where(length > 0, (ab * ac).sum(axis=1) / length, 0.0)
+        rows += [b, c]
+        cols += [c, b]
+        data += [cotangent, cotangent]
+    n = len(xyz)
+    W = coo_matrix((concatenate(data), (concatenate(rows), concatenate(cols))), shape=(n, n)).tocsr()
+    total = array(W.sum(axis=1)).ravel()
+    with errstate(divide='ignore'):
+        W = diags(where(total != 0, 1.0 / total, 0.0)).dot(W)
+    S = _smoothing_operator(mesh, W, fixed, damping)
+    _smooth(mesh, xyz, S.dot, kmax, callback, callback_args)
 
 
 def trimesh_smooth_laplacian_cotangent(trimesh, fixed, kmax=10):
@@ -32,9 +242,81 @@ def trimesh_smooth_laplacian_cotangent(trimesh, fixed, kmax=10):
             attr['z'] = V[key][2]
 
 
-# =============================================================================
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+
+def _free(mesh, fixed):
+    # a boolean mask of the free vertices, in the order of the vertices
+    key_index = mesh.key_index()
+    free = ones(mesh.number_of_vertices(), dtype=bool)
+    free[[key_index[key] for key in fixed or []]] = False
+    return free
+
+
+def _smoothing_operator(mesh, W, fixed, damping):
+    # the sparse matrix that performs one iteration of smoothing with the weight matrix W,
+    # such that free vertices with neighbors move towards the weighted average of their neighbors
+    # and all other vertices stay in place
+    W = W.tocsr()
+    free = _free(mesh, fixed) & (array(abs(W).sum(axis=1)).ravel() > 0)
+    scale = where(free, damping, 0.0)
+    return (diags(1.0 - scale) + diags(scale).dot(W)).tocsr()
+
+
+def _smooth(mesh, xyz, step, kmax, callback, callback_args):
+    if callback:
+        if not callable(callback):
+            raise Exception('Callback is not callable.')
+    for k in range(kmax):
+        xyz = step(xyz)
+        if callback:
+            _set_vertices_coordinates(mesh, xyz)
+            callback(k, callback_args)
+    if not callback:
+        _set_vertices_coordinates(mesh, xyz)
+
+
+def _set_vertices_coordinates(mesh, xyz):
+    for key, (x, y, z) in zip(mesh.vertices(), xyz.tolist()):
+        attr = mesh.vertex[key]
+        attr['x'] = x
+        attr['y'] = y
+        attr['z'] = z
+    mesh.cache.invalidate_geometry()
+
+
+# ==============================================================================
 # Main
-# =============================================================================
+# ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import time
+
+    from compas.datastructures import Mesh
+    from compas.datastructures import mesh_smooth_area
+    from compas.datastructures import mesh_smooth_centroid
+
+    for n in (30, 100, 320):
+        # a grid of quads with a rough surface
+        vertices = [[i, j, 0.1 * ((i * 7919 + j * 104729) % 13)] for i in range(n) for j in range(n)]
+        faces = [[i * n + j, (i + 1) * n + j, (i + 1) * n + j + 1, i * n + j + 1] for i in range(n - 1) for j in range(n - 1)]
+        mesh = Mesh.from_vertices_and_faces(vertices, faces)
+        fixed = [key for key in mesh.vertices() if mesh.is_vertex_on_boundary(key)]
+
+        for smooth, smooth_numpy in ((mesh_smooth_centroid, mesh_smooth_centroid_numpy),
+                                     (mesh_smooth_area, mesh_smooth_area_numpy)):
+            other = mesh.copy()
+            t0 = time.time()
+            smooth_numpy(other, fixed=fixed, kmax=100)
+            t1 = time.time()
+            line = 'vertices: {0:>7} {1:<20} numpy: {2:.2f}s'.format(mesh.number_of_vertices(), smooth.__name__, t1 - t0)
+            if n <= 100:
+                other = mesh.copy()
+                t0 = time.time()
+                smooth(other, fixed=fixed, kmax=100)
+                t1 = time.time()
+                line += ' python: {0:.2f}s'.format(t1 - t0)
+            print(line)
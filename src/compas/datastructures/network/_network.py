@@ -9,12 +9,14 @@ import collections
 from copy import deepcopy
 from ast import literal_eval
 
+from compas import IPY
 from compas.files import OBJ
 
-from compas.utilities import geometric_key
+from compas.utilities import tolerance_from_precision
 
 from compas.geometry import centroid_points
 from compas.geometry import subtract_vectors
+from compas.geometry import weld_points
 
 from compas.datastructures import Datastructure
 
@@ -27,6 +29,7 @@ from compas.datastructures._mixins import EdgeHelpers
 from compas.datastructures._mixins import EdgeGeometry
 from compas.datastructures._mixins import EdgeMappings
 from compas.datastructures._mixins import EdgeFilter
+from compas.datastructures._mixins import FromToBinary
 from compas.datastructures._mixins import FromToData
 from compas.datastructures._mixins import FromToJson
 
@@ -49,7 +52,8 @@ Network summary
 """
 
 
-class Network(FromToJson,
+class Network(FromToBinary,
+              FromToJson,
               FromToData,
               EdgeGeometry,
               EdgeHelpers,
@@ -354,6 +358,7 @@ class Network(FromToJson,
             Path to the OBJ file.
         precision: str, optional
             The precision of the geometric map that is used to connect the lines.
+            End points closer than the corresponding tolerance (e.g. ``0.0005`` for ``'3f'``) are merged.
 
         Returns
         -------
@@ -397,6 +402,8 @@ class Network(FromToJson,
             A list of pairs of point coordinates.
         precision: str, optional
             The precision of the geometric map that is used to connect the lines.
+            End points closer than the corresponding tolerance (e.g. ``0.0005`` for ``'3f'``) are merged,
+            into a vertex with the coordinates of the last of the merged points.
 
         Returns
         -------
@@ -419,24 +426,18 @@ class Network(FromToJson,
 
         """
         network = cls()
-        edges = []
-        vertex = {}
-        for line in lines:
-            sp = line[0]
-            ep = line[1]
-            a = geometric_key(sp, precision)
-            b = geometric_key(ep, precision)
-            vertex[a] = sp
-            vertex[b] = ep
-            edges.append((a, b))
-        key_index = dict((k, i) for i, k in enumerate(iter(vertex)))
-        for key, xyz in iter(vertex.items()):
-            i = key_index[key]
-            network.add_vertex(i, x=xyz[0], y=xyz[1], z=xyz[2])
-        for u, v in edges:
-            i = key_index[u]
-            j = key_index[v]
-            network.add_edge(i, j)
+        points = [point for line in lines for point in line[:2]]
+        if IPY:
+            unique, remap = weld_points(points, tolerance_from_precision(precision))
+        else:
+            from compas.geometry import weld_points_numpy
+            unique, remap = weld_points_numpy(points, tolerance_from_precision(precision))
+        last = {int(index): i for i, index in enumerate(remap)}
+        for i in range(len(unique)):
+            x, y, z = points[last[i]]
+            network.add_vertex(i, x=x, y=y, z=z)
+        for i in range(0, len(remap), 2):
+            network.add_edge(int(remap[i]), int(remap[i + 1]))
         return network
 
     @classmethod
@@ -24,6 +24,94 @@ __all__ = [
 ]
 
 
+def _find_crossings(edges, xy, first=False):
+    """Find the pairs of crossing edges with a uniform grid as broad phase.
+
+    Parameters
+    ----------
+    edges : list
+        The edges, as pairs of vertex keys.
+    xy : dict
+        The XY coordinates of the vertices, by vertex key.
+    first : bool, optional
+        If True, stop at the first crossing.
+        Default is ``False``.
+
+    Returns
+    -------
+    list
+        The pairs of crossing edges.
+
+    Notes
+    -----
+    Every edge is added to the cells of the grid that overlap its bounding box.
+    Only edges in the same cell, with overlapping bounding boxes and without common vertices,
+    are tested for intersection.
+    A pair of edges is only tested in the cell that contains the lower left corner of the overlap of their bounding boxes,
+    such that it is tested once.
+    For edges of similar length, this takes ``O(E + K)`` instead of ``O(E^2)`` tests,
+    with ``E`` the number of edges and ``K`` the number of pairs of edges that are close to each other.
+
+    """
+    if len(edges) < 2:
+        return []
+
+    boxes = []
+    for u, v in edges:
+        a = xy[u]
+        b = xy[v]
+        boxes.append((min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1])))
+
+    xmin = min(box[0] for box in boxes)
+    ymin = min(box[1] for box in boxes)
+    xmax = max(box[2] for box in boxes)
+    ymax = max(box[3] for box in boxes)
+
+    # the size of the cells is the average size of the bounding boxes of the edges
+    # but not so small that there are many more cells than edges
+    size = sum(max(box[2] - box[0], box[3] - box[1]) for box in boxes) / len(boxes)
+    size = max(size, ((xmax - xmin) * (ymax - ymin) / (4 * len(edges))) ** 0.5, 1e-12)
+
+    grid = {}
+    for index, box in enumerate(boxes):
+        i0 = int((box[0] - xmin) / size)
+        j0 = int((box[1] - ymin) / size)
+        i1 = int((box[2] - xmin) / size)
+        j1 = int((box[3] - ymin) / size)
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                if (i, j) in grid:
+                    grid[i, j].append(index)
+                else:
+                    grid[i, j] = [index]
+
+    crossings = []
+    for (i, j), indices in grid.items():
+        for n, e1 in enumerate(indices):
+            u1, v1 = edges[e1]
+            box1 = boxes[e1]
+            for e2 in indices[n + 1:]:
+                u2, v2 = edges[e2]
+                if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
+                    continue
+                box2 = boxes[e2]
+                x = max(box1[0], box2[0])
+                y = max(box1[1], box2[1])
+                if x > min(box1[2], box2[2]) or y > min(box1[3], box2[3]):
+                    continue
+                if int((x - xmin) / size) != i or int((y - ymin) / size) != j:
+                    continue
+                if is_intersection_segment_segment_xy((xy[u1], xy[v1]), (xy[u2], xy[v2])):
+                    crossings.append((edges[e1], edges[e2]))
+                    if first:
+                        return crossings
+    return crossings
+
+
+def _network_xy(network):
+    return {key: (attr['x'], attr['y']) for key, attr in network.vertices(True)}
+
+
 def network_is_crossed(network):
     """Verify if a network has crossing edges.
 
@@ -43,33 +131,11 @@ def network_is_crossed(network):
     This algorithm assumes that the network lies in the XY plane.
 
     """
-    for u1, v1 in network.edges():
-        for u2, v2 in network.edges():
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                a = network.vertex[u1]['x'], network.vertex[u1]['y']
-                b = network.vertex[v1]['x'], network.vertex[v1]['y']
-                c = network.vertex[u2]['x'], network.vertex[u2]['y']
-                d = network.vertex[v2]['x'], network.vertex[v2]['y']
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    return True
-    return False
+    return bool(_find_crossings(list(network.edges()), _network_xy(network), first=True))
 
 
 def _network_are_edges_crossed(edges, vertices):
-    for u1, v1 in edges:
-        for u2, v2 in edges:
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                a = vertices[u1]
-                b = vertices[v1]
-                c = vertices[u2]
-                d = vertices[v2]
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    return True
-    return False
+    return bool(_find_crossings(edges, vertices, first=True))
 
 
 def network_count_crossings(network):
@@ -110,24 +176,11 @@ def network_find_crossings(network):
     -----
     This algorithm assumes that the network lies in the XY plane.
 
+    Only pairs of edges that are close to each other are tested for intersection,
+    using a uniform grid with cells of about the size of the edges.
+
     """
-    crossings = set()
-    for u1, v1 in network.edges():
-        for u2, v2 in network.edges():
-            if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
-                continue
-            else:
-                if ((u1, v1), (u2, v2)) in crossings:
-                    continue
-                if ((u2, v2), (u1, v1)) in crossings:
-                    continue
-                a = network.vertex_coordinates(u1, 'xy')
-                b = network.vertex_coordinates(v1, 'xy')
-                c = network.vertex_coordinates(u2, 'xy')
-                d = network.vertex_coordinates(v2, 'xy')
-                if is_intersection_segment_segment_xy((a, b), (c, d)):
-                    crossings.add(((u1, v1), (u2, v2)))
-    return list(crossings)
+    return _find_crossings(list(network.edges()), _network_xy(network))
 
 
 def network_is_xy(network):
@@ -378,25 +431,52 @@ def network_embed_in_plane(network, fix=None, straightline=True):
 
 if __name__ == '__main__':
 
-    import compas
+    import random
+    import time
 
     from compas.datastructures import Network
-    from compas_plotters import NetworkPlotter
-
-    network = Network.from_obj(compas.get('lines.obj'))
-
-    network.add_edge(6, 15)
 
-    if not network_is_planar(network):
-        crossings = network_find_crossings(network)
-    else:
+    def brute_force(edges, xy):
+        # the previous implementation, which tests all pairs of edges
         crossings = []
-
-    print(crossings)
-
-    plotter = NetworkPlotter(network)
-
-    plotter.draw_vertices(radius=0.15, text={key: key for key in network.vertices()})
-    plotter.draw_edges(color={edge: '#ff0000' for edges in crossings for edge in edges})
-
-    plotter.show()
+        for n, (u1, v1) in enumerate(edges):
+            for u2, v2 in edges[n + 1:]:
+                if u1 == u2 or v1 == v2 or u1 == v2 or u2 == v1:
+                    continue
+                if is_intersection_segment_segment_xy((xy[u1], xy[v1]), (xy[u2], xy[v2])):
+                    crossings.append(((u1, v1), (u2, v2)))
+        return crossings
+
+    def street_network(n):
+        # a jittered grid of n * n vertices with a few long diagonal edges
+        random.seed(0)
+        network = Network()
+        for i in range(n):
+            for j in range(n):
+                network.add_vertex(i * n + j, x=i + random.random() * 0.5, y=j + random.random() * 0.5, z=0.0)
+        for i in range(n):
+            for j in range(n):
+                if i < n - 1:
+                    network.add_edge(i * n + j, (i + 1) * n + j)
+                if j < n - 1:
+                    network.add_edge(i * n + j, i * n + j + 1)
+                if i < n - 1 and j < n - 1 and random.random() < 0.1:
+                    network.add_edge(i * n + j, (i + 1) * n + j + 1)
+        for _ in range(n // 10):
+            u, v = random.sample(range(n * n), 2)
+            network.add_edge(u, v)
+        return network
+
+    for n in (30, 160):
+        network = street_network(n)
+        edges = list(network.edges())
+        t0 = time.time()
+        crossings = network_find_crossings(network)
+        t1 = time.time()
+        line = '{0} edges, {1} crossings: grid {2:.2f}s'.format(len(edges), len(crossings), t1 - t0)
+        if len(edges) < 5000:
+            previous = brute_force(edges, _network_xy(network))
+            t2 = time.time()
+            assert set(map(frozenset, crossings)) == set(map(frozenset, previous))
+            line += ' all pairs {0:.2f}s'.format(t2 - t1)
+        print(line)
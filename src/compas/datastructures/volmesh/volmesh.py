@@ -36,6 +36,7 @@ from compas.datastructures._mixins import FaceAttributesManagement
 from compas.datastructures._mixins import FaceHelpers
 from compas.datastructures._mixins import FaceFilter
 
+from compas.datastructures._mixins import FromToBinary
 from compas.datastructures._mixins import FromToData
 from compas.datastructures._mixins import FromToJson
 from compas.datastructures._mixins import FromToPickle
@@ -61,7 +62,8 @@ Volesh summary
 """
 
 
-class VolMesh(FromToPickle,
+class VolMesh(FromToBinary,
+              FromToPickle,
               FromToJson,
               FromToData,
               VertexFilter,
@@ -6,6 +6,17 @@ files
 .. currentmodule:: compas.files
 
 
+CBIN
+====
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    CBIN
+    CBINReader
+    CBINWriter
+
 OBJ
 ===
 
@@ -16,6 +27,8 @@ OBJ
     OBJ
     OBJReader
     OBJParser
+    OBJReaderNumpy
+    OBJParserNumpy
 
 PLY
 ===
@@ -65,11 +78,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
+
 from .amf import *  # noqa: F401 F403
+if not compas.IPY:
+    from .cbin_numpy import *  # noqa: F401 F403
 from .dxf import *  # noqa: F401 F403
 from .gltf import *  # noqa: F401 F403
 from .las import *  # noqa: F401 F403
 from .obj import *  # noqa: F401 F403
+if not compas.IPY:
+    from .obj_numpy import *  # noqa: F401 F403
 from .off import *  # noqa: F401 F403
 from .ply import *  # noqa: F401 F403
 from .stl import *  # noqa: F401 F403
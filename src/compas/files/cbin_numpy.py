@@ -0,0 +1,232 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import json
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from numpy import ascontiguousarray
+from numpy import dtype as _dtype
+from numpy import memmap
+from numpy import zeros
+
+
+__all__ = [
+    'CBIN',
+    'CBINReader',
+    'CBINWriter',
+]
+
+
+MAGIC = b'CBIN\x00\x01\x00\x00'
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class CBIN(object):
+    """Read and write files in the binary container format of COMPAS.
+
+    A CBIN file contains named, typed arrays and JSON metadata.
+    It consists of an 8-byte signature, the size of the header as an unsigned 64-bit integer,
+    the header as UTF-8 encoded JSON, and the data of the arrays.
+    The data of every array starts at an offset that is a multiple of 64 bytes,
+    such that all arrays can be memory-mapped.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> from numpy import arange
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'example.cbin')
+    >>> CBIN(filepath).write({'name': 'example'}, {'values': arange(5.0)})
+    >>> cbin = CBIN(filepath)
+    >>> cbin.meta
+    {'name': 'example'}
+    >>> cbin.arrays['values'].tolist()
+    [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._reader = None
+
+    def read(self):
+        self._reader = CBINReader(self.filepath)
+        self._reader.open()
+
+    @property
+    def reader(self):
+        if not self._reader:
+            self.read()
+        return self._reader
+
+    @property
+    def meta(self):
+        """dict : The metadata stored in the file."""
+        return self.reader.meta
+
+    @property
+    def arrays(self):
+        """Mapping : The arrays stored in the file, memory-mapped on first access."""
+        return self.reader.arrays
+
+    def write(self, meta, arrays):
+        """Write metadata and arrays to the file.
+
+        Parameters
+        ----------
+        meta : dict
+            JSON serialisable metadata.
+        arrays : dict
+            A dict of named arrays of numeric or boolean type.
+
+        """
+        self._reader = None
+        writer = CBINWriter(self.filepath, meta, arrays)
+        writer.write()
+
+
+class CBINReader(object):
+    """Reader for the header of CBIN files, with lazy access to the arrays.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+
+    Attributes
+    ----------
+    meta : dict
+        The metadata stored in the file.
+    blocks : dict
+        The dtype, shape and offset of every array.
+    arrays : Mapping
+        The arrays stored in the file.
+        Arrays are memory-mapped in read-only mode the first time they are accessed,
+        such that only the data of the arrays that are used is read from disk.
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.meta = None
+        self.blocks = None
+        self.start = None
+        self.arrays = None
+
+    def open(self):
+        with open(self.filepath, 'rb') as fo:
+            if fo.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Not a CBIN file: {}'.format(self.filepath))
+            size, = struct.unpack('<Q', fo.read(8))
+            header = json.loads(fo.read(size).decode('utf-8'))
+        self.meta = header['meta']
+        self.blocks = header['arrays']
+        self.start = _aligned(len(MAGIC) + 8 + size)
+        self.arrays = CBINArrays(self)
+
+    def array(self, name):
+        """Memory-map an array of the file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        numpy.memmap
+            The read-only array.
+
+        """
+        block = self.blocks[name]
+        shape = tuple(block['shape'])
+        dtype = _dtype(block['dtype'])
+        if not all(shape):
+            return zeros(shape, dtype=dtype)
+        return memmap(self.filepath, dtype=dtype, mode='r', offset=self.start + block['offset'], shape=shape)
+
+
+class CBINArrays(Mapping):
+    """Read-only mapping of the names of the arrays of a CBIN file to the memory-mapped arrays."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.cache = {}
+
+    def __getitem__(self, name):
+        if name not in self.cache:
+            self.cache[name] = self.reader.array(name)
+        return self.cache[name]
+
+    def __iter__(self):
+        return iter(self.reader.blocks)
+
+    def __len__(self):
+        return len(self.reader.blocks)
+
+
+class CBINWriter(object):
+    """Writer for CBIN files.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    meta : dict
+        JSON serialisable metadata.
+    arrays : dict
+        A dict of named arrays of numeric or boolean type.
+
+    """
+
+    def __init__(self, filepath, meta, arrays):
+        self.filepath = filepath
+        self.meta = meta
+        self.arrays = arrays
+
+    def write(self):
+        arrays = []
+        blocks = {}
+        offset = 0
+        for name, data in self.arrays.items():
+            data = ascontiguousarray(data)
+            if data.dtype.hasobject:
+                raise ValueError('Arrays of objects can not be stored: {}'.format(name))
+            data = data.astype(data.dtype.newbyteorder('<'), copy=False)
+            blocks[name] = {'dtype': data.dtype.str, 'shape': list(data.shape), 'offset': offset}
+            arrays.append((offset, data))
+            offset = _aligned(offset + data.nbytes)
+        header = json.dumps({'meta': self.meta, 'arrays': blocks}).encode('utf-8')
+        start = _aligned(len(MAGIC) + 8 + len(header))
+        with open(self.filepath, 'wb') as fo:
+            fo.write(MAGIC)
+            fo.write(struct.pack('<Q', len(header)))
+            fo.write(header)
+            for offset, data in arrays:
+                fo.seek(start + offset)
+                data.tofile(fo)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    doctest.testmod(globs=globals())
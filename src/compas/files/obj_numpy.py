@@ -0,0 +1,427 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import abs as _abs
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cumsum
+from numpy import diff
+from numpy import empty
+from numpy import float64
+from numpy import floor
+from numpy import frombuffer
+from numpy import fromstring
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import ones
+from numpy import r_
+from numpy import repeat
+from numpy import rint
+from numpy import searchsorted
+from numpy import trunc
+from numpy import uint8
+from numpy import where
+from numpy import zeros
+
+import compas
+
+from compas.utilities import geometric_key
+
+
+__all__ = [
+    'OBJReaderNumpy',
+    'OBJParserNumpy',
+]
+
+
+NEWLINE = ord('\n')
+WHITESPACE = [ord(c) for c in ' \t\r\n\v\f']
+SLASH = ord('/')
+
+STATEMENTS = ['v', 'f', 'l', 'deg', 'curv']
+V, F, L, DEG, CURV = range(1, len(STATEMENTS) + 1)
+
+
+class OBJReaderNumpy(object):
+    """Read the vertices, faces and lines of an *obj* file into arrays.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    chunksize : int, optional
+        The approximate number of bytes that is read and parsed at once.
+        Default is ``2 ** 22``.
+
+    Attributes
+    ----------
+    vertices : array
+        An ``(n, 3)`` array of vertex coordinates.
+    weights : array
+        An array of ``n`` vertex weights.
+    faces : array
+        A flat array of the zero-based vertex indices of all faces.
+    face_offsets : array
+        An array of ``m + 1`` offsets into the flat array of face vertex indices.
+    lines : array
+        A flat array of the zero-based vertex indices of all lines.
+    line_offsets : array
+        An array of offsets into the flat array of line vertex indices.
+
+    Notes
+    -----
+    The file is read in binary chunks of complete lines.
+    In every chunk, the statements are classified and the vertex coordinates
+    and vertex indices of all statements of the same type are parsed at once,
+    such that the full text of the file never has to be held in memory.
+
+    Only vertex coordinates (``v``), faces (``f``), lines (``l``) and curves of degree one (``curv``) are read,
+    following the same rules as :class:`compas.files.OBJReader`.
+    Texture and normal indices of face vertices are ignored,
+    and negative (relative) vertex indices are resolved.
+
+    Examples
+    --------
+    >>> reader = OBJReaderNumpy(compas.get('faces.obj'))
+    >>> reader.read()
+    >>> reader.vertices.shape
+    (36, 3)
+    >>> len(reader.face_offsets) - 1
+    25
+
+    """
+
+    def __init__(self, filepath, chunksize=2 ** 22):
+        self.filepath = filepath
+        self.chunksize = chunksize
+        self.vertices = None
+        self.weights = None
+        self.faces = None
+        self.face_offsets = None
+        self.lines = None
+        self.line_offsets = None
+
+    def chunks(self):
+        """Iterate over the contents of the file in chunks of complete lines.
+
+        Yields
+        ------
+        bytes
+            A chunk of lines, with continuation lines joined.
+
+        """
+        rest = b''
+        with open(self.filepath, 'rb') as fo:
+            while True:
+                data = fo.read(self.chunksize)
+                if not data:
+                    break
+                data = rest + data
+                # cut after the last newline that doesn't end a continuation line
+                end = data.rfind(b'\n')
+                while (end > 0 and data[end - 1:end] == b'\\') or (end > 1 and data[end - 2:end] == b'\\\r'):
+                    end = data.rfind(b'\n', 0, end)
+                if end < 0:
+                    rest = data
+                    continue
+                rest = data[end + 1:]
+                yield _join_continuations(data[:end + 1])
+        if rest:
+            yield _join_continuations(rest + b'\n')
+
+    def read(self):
+        """Read the vertices, faces and lines of the file."""
+        vertices = []
+        weights = []
+        faces = []
+        face_degrees = []
+        lines = []
+        line_degrees = []
+        count = 0
+        deg = None
+        for chunk in self.chunks():
+            chunk = _parse_chunk(chunk, count, deg)
+            vertices.append(chunk[0])
+            weights.append(chunk[1])
+            faces.append(chunk[2])
+            face_degrees.append(chunk[3])
+            lines.append(chunk[4])
+            line_degrees.append(chunk[5])
+            count += len(chunk[0])
+            deg = chunk[6]
+        self.vertices = concatenate(vertices) if vertices else zeros((0, 3), dtype=float64)
+        self.weights = concatenate(weights) if weights else zeros(0, dtype=float64)
+        self.faces = concatenate(faces) if faces else zeros(0, dtype=int64)
+        self.face_offsets = r_[0, cumsum(concatenate(face_degrees))] if faces else zeros(1, dtype=int64)
+        self.lines = concatenate(lines) if lines else zeros(0, dtype=int64)
+        self.line_offsets = r_[0, cumsum(concatenate(line_degrees))] if lines else zeros(1, dtype=int64)
+
+
+class OBJParserNumpy(object):
+    """Merge the vertices read by an :class:`OBJReaderNumpy` and remap the faces and lines.
+
+    Parameters
+    ----------
+    reader : OBJReaderNumpy
+        The reader.
+    precision : str, optional
+        The precision of the geometric keys that are used to merge vertices.
+        Default is the global precision setting (``compas.PRECISION``).
+
+    Attributes
+    ----------
+    vertices : array
+        An ``(n, 3)`` array with the coordinates of the unique vertices.
+    faces : array
+        A flat array of the vertex indices of all faces.
+    face_offsets : array
+        An array of ``m + 1`` offsets into the flat array of face vertex indices.
+    lines : array
+        A ``(k, 2)`` array of the vertex indices of the lines with two vertices.
+    polylines : array
+        A flat array of the vertex indices of the lines with more than two vertices.
+    polyline_offsets : array
+        An array of offsets into the flat array of polyline vertex indices.
+
+    Notes
+    -----
+    The result is the same as that of :class:`compas.files.OBJParser`:
+    vertices with the same geometric key are merged,
+    the unique vertices are ordered by their first occurrence,
+    and they have the coordinates of their last occurrence.
+    The geometric keys are computed in bulk as integers, rather than as strings.
+
+    """
+
+    def __init__(self, reader, precision=None):
+        self.reader = reader
+        self.precision = precision
+        self.vertices = None
+        self.faces = None
+        self.face_offsets = None
+        self.lines = None
+        self.polylines = None
+        self.polyline_offsets = None
+
+    def parse(self):
+        X = self.reader.vertices
+        keys = _geometric_keys(X, self.precision)
+        last, index = _unique_rows(keys)
+        self.vertices = X[last]
+        self.faces = index[self.reader.faces]
+        self.face_offsets = self.reader.face_offsets
+        lines = index[self.reader.lines]
+        offsets = self.reader.line_offsets
+        degree = diff(offsets)
+        position = repeat(degree == 2, degree)
+        self.lines = lines[position].reshape((-1, 2))
+        self.polylines = lines[~position]
+        self.polyline_offsets = r_[0, cumsum(degree[degree > 2])]
+
+
+def _join_continuations(data):
+    if b'\\' not in data:
+        return data
+    return data.replace(b'\\\r\n', b' ').replace(b'\\\n', b' ')
+
+
+def _parse_chunk(data, count, deg):
+    # parse the vertices, faces and lines of a chunk of complete lines
+    # count is the number of vertices read before the chunk, to resolve relative indices,
+    # and deg the first value of the last freeform degree statement before the chunk
+    text = frombuffer(data, dtype=uint8).copy()
+    size = len(text)
+    ws = zeros(size, dtype=bool)
+    for c in WHITESPACE:
+        ws |= text == c
+    newline = text == NEWLINE
+    line = cumsum(newline) - newline
+    nlines = int(newline.sum())
+    # the start of every token, and the first token of every line
+    start = ~ws
+    start[1:] &= ws[:-1]
+    start = start.nonzero()[0]
+    tokenline = line[start]
+    headtoken = r_[True, tokenline[1:] != tokenline[:-1]].nonzero()[0]
+    head = start[headtoken]
+    headline = tokenline[headtoken]
+    linehead = zeros(nlines, dtype=int64)
+    linehead[headline] = headtoken
+    ntokens = bincount(tokenline, minlength=nlines) - 1
+    # classify the lines by their first token
+    kind = zeros(nlines, dtype=uint8)
+    for code, name in enumerate(STATEMENTS, 1):
+        kind[headline[_match(text, ws, head, name)]] = code
+    # blank out the statement names, and the texture and normal indices of face vertices
+    text[head] = ord(' ')
+    blank = text == SLASH
+    # degree-one curves are lines through their control points
+    degrees = ((kind == DEG) & (ntokens > 0)).nonzero()[0]
+    curves = (kind == CURV).nonzero()[0]
+    values = [deg]
+    if len(degrees):
+        wsindex = ws.nonzero()[0]
+        first = start[linehead[degrees] + 1]
+        for i, j in zip(first, wsindex[searchsorted(wsindex, first)]):
+            values.append(int(data[i:j]))
+        deg = values[-1]
+    if len(curves):
+        linear = curves[(asarray(values)[searchsorted(degrees, curves)] == 1) & (ntokens[curves] >= 4)]
+        # the curve name and the two curve parameters
+        blank[start[concatenate([linehead[linear] + i for i in range(3)])]] = True
+        kind[linear] = L
+        ntokens[linear] -= 2
+    if blank.any():
+        index = arange(size)
+        last_blank = maximum.accumulate(where(blank, index, -1))
+        last_ws = maximum.accumulate(where(ws, index, -1))
+        text[last_blank > last_ws] = ord(' ')
+    # vertex coordinates, with or without weight
+    vertex = (kind == V) & ((ntokens == 3) | (ntokens == 4))
+    degree = ntokens[vertex]
+    values = _parse_values(text, line, vertex, degree.sum(), float64)
+    if (degree == 3).all():
+        xyz = values.reshape((-1, 3))
+        w = ones(len(xyz), dtype=float64)
+    else:
+        rows = repeat(cumsum(degree) - degree, 3) + arange(3 * len(degree)) % 3
+        xyz = values[rows].reshape((-1, 3))
+        w = ones(len(xyz), dtype=float64)
+        w[degree == 4] = values[(cumsum(degree) - 1)[degree == 4]]
+    # faces and lines, with relative indices resolved using the number of vertices before every line
+    before = count + cumsum(vertex) - vertex
+    polygons = []
+    for code, minimum_degree in ((F, 3), (L, 2)):
+        selected = (kind == code) & (ntokens >= minimum_degree)
+        degree = ntokens[selected]
+        indices = _parse_values(text, line, selected, degree.sum(), int64)
+        relative = indices < 0
+        indices[~relative] -= 1
+        if relative.any():
+            indices[relative] += repeat(before[selected], degree)[relative]
+        polygons.append((indices, degree))
+    (faces, face_degrees), (lines, line_degrees) = polygons
+    return xyz, w, faces, face_degrees, lines, line_degrees, deg
+
+
+def _match(text, ws, head, name):
+    # the tokens starting at head that are equal to name
+    match = ws[minimum(head + len(name), len(text) - 1)]
+    for i, c in enumerate(name):
+        match &= text[minimum(head + i, len(text) - 1)] == ord(c)
+    return match
+
+
+def _parse_values(text, line, selected, count, dtype):
+    # parse all tokens of the selected lines at once
+    if not count:
+        return zeros(0, dtype=dtype)
+    data = text[selected[line]].tobytes()
+    values = fromstring(data, dtype=dtype, sep=' ')
+    if len(values) != count:
+        # fromstring stops at the first token it can't parse
+        values = array([float(token) for token in data.split()]).astype(dtype)
+    return values
+
+
+def _geometric_keys(X, precision=None):
+    # integer equivalents of the geometric keys of the rows of X
+    # such that two rows have the same keys if and only if they have the same geometric key
+    if not precision:
+        precision = compas.PRECISION
+    if precision == 'd':
+        keys = trunc(X)
+        if not len(X) or _abs(keys).max() < 2 ** 62:
+            return keys.astype(int64)
+    elif precision[-1] == 'f' and precision[:-1].isdigit():
+        digits = int(precision[:-1])
+        scaled = X * 10.0 ** digits
+        if not len(X) or _abs(scaled).max() < 2 ** 52:
+            keys = rint(scaled)
+            # near ties, the rounding of the scaled value may differ from the rounding of the formatted string
+            ties = _abs(scaled - floor(scaled) - 0.5) < 1e-15 * (1 + _abs(scaled))
+            for i, j in zip(*ties.nonzero()):
+                keys[i, j] = int('{0:.{1}f}'.format(X[i, j], digits).replace('.', ''))
+            return keys.astype(int64)
+    # all other formats
+    index = {}
+    keys = [index.setdefault(geometric_key(xyz, precision), len(index)) for xyz in X.tolist()]
+    return asarray(keys, dtype=int64).reshape((-1, 1))
+
+
+def _unique_rows(A):
+    # the index of the last occurrence of every unique row, in the order of first occurrence,
+    # and the unique row of every row
+    n = len(A)
+    if not n:
+        return zeros(0, dtype=int64), zeros(0, dtype=int64)
+    order = lexsort(A.T[::-1])
+    S = A[order]
+    flag = r_[True, (S[1:] != S[:-1]).any(axis=1)]
+    group = cumsum(flag) - 1
+    first = order[flag]
+    last = order[r_[flag[1:], True]]
+    rank = empty(len(first), dtype=int64)
+    rank[first.argsort()] = arange(len(first))
+    index = empty(n, dtype=int64)
+    index[order] = rank[group]
+    return last[first.argsort()], index
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+    import time
+
+    from compas.datastructures import Mesh
+    from compas.files import OBJ
+
+    # copies of the grid of faces_big.obj, side by side
+    reader = OBJReaderNumpy(compas.get('faces_big.obj'))
+    reader.read()
+    xyz = reader.vertices
+    quads = reader.faces.reshape((-1, 4)) + 1
+    dx = xyz[:, 0].max() - xyz[:, 0].min() + 1.0
+
+    for copies in (10, 100, 400):
+        filepath = os.path.join(tempfile.gettempdir(), 'faces_big_{}.obj'.format(copies))
+        with open(filepath, 'w') as fo:
+            for i in range(copies):
+                for x, y, z in xyz.tolist():
+                    fo.write('v {0} {1} {2}\n'.format(x + i * dx, y, z))
+            for i in range(copies):
+                for a, b, c, d in (quads + i * len(xyz)).tolist():
+                    fo.write('f {0} {1} {2} {3}\n'.format(a, b, c, d))
+
+        t0 = time.time()
+        reader = OBJReaderNumpy(filepath)
+        reader.read()
+        parser = OBJParserNumpy(reader)
+        parser.parse()
+        t1 = time.time()
+        mesh = Mesh.from_arrays(parser.vertices, parser.faces, parser.face_offsets)
+        t2 = time.time()
+        print('faces: {0:>8} size: {1:>5.0f}MB numpy: read {2:.2f}s, mesh {3:.2f}s'.format(
+            mesh.number_of_faces(), os.path.getsize(filepath) / 1e6, t1 - t0, t2 - t1))
+
+        if copies <= 100:
+            t0 = time.time()
+            obj = OBJ(filepath)
+            obj.read()
+            t1 = time.time()
+            mesh = Mesh.from_vertices_and_faces(obj.vertices, obj.faces)
+            t2 = time.time()
+            print('{0:>30} python: read {1:.2f}s, mesh {2:.2f}s'.format('', t1 - t0, t2 - t1))
+
+        os.remove(filepath)
@@ -255,6 +255,7 @@ Pointclouds
     convex_hull_xy_numpy
     delaunay_from_points
     delaunay_from_points_numpy
+    delaunay_incremental_numpy
     icp_numpy
     oriented_bounding_box_numpy
     oriented_bounding_box_xy_numpy
@@ -302,6 +303,9 @@ Proximity
     :toctree: generated/
     :nosignatures:
 
+    BVHNumpy
+    KDTree
+    KDTreeNumpy
     closest_point_in_cloud
     closest_point_in_cloud_xy
     closest_point_on_line
@@ -311,6 +315,8 @@ Proximity
     closest_point_on_polyline_xy
     closest_point_on_segment
     closest_point_on_segment_xy
+    weld_points
+    weld_points_numpy
 
 Intersections
 =============
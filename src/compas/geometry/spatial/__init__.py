@@ -2,6 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
+
 from .kdtree import *  # noqa: F401 F403
+from .weld import *  # noqa: F401 F403
+if not compas.IPY:
+    from .kdtree_numpy import *  # noqa: F401 F403
+    from .bvh_numpy import *  # noqa: F401 F403
+    from .weld_numpy import *  # noqa: F401 F403
 
 __all__ = [name for name in dir() if not name.startswith('_')]
@@ -0,0 +1,611 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import abs
+from numpy import arange
+from numpy import argmax
+from numpy import argpartition
+from numpy import argsort
+from numpy import arccos
+from numpy import asarray
+from numpy import bincount
+from numpy import clip
+from numpy import concatenate
+from numpy import cross
+from numpy import einsum
+from numpy import errstate
+from numpy import float64
+from numpy import fmax
+from numpy import fmin
+from numpy import full
+from numpy import inf
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import r_
+from numpy import repeat
+from numpy import sign
+from numpy import sort
+from numpy import sqrt
+from numpy import unique
+from numpy import where
+from numpy import zeros
+
+
+__all__ = [
+    'BVHNumpy'
+]
+
+
+def _dot(a, b):
+    return einsum('ij,ij->i', a, b)
+
+
+def _unitized(vectors):
+    length = sqrt(_dot(vectors, vectors))
+    with errstate(divide='ignore', invalid='ignore'):
+        return where(length[:, None] > 0, vectors / length[:, None], 0.0)
+
+
+def _closest_points_on_triangles(p, a, b, c):
+    # closest points on triangles abc to points p,
+    # and the region of the triangle containing them
+    # 0: face, 1-3: vertex a, b, c, 4-6: edge ab, bc, ca
+    # see Ericson, C. Real-Time Collision Detection. 2005. Section 5.1.5.
+    ab = b - a
+    ac = c - a
+    ap = p - a
+    bp = p - b
+    cp = p - c
+    d1 = _dot(ab, ap)
+    d2 = _dot(ac, ap)
+    d3 = _dot(ab, bp)
+    d4 = _dot(ac, bp)
+    d5 = _dot(ab, cp)
+    d6 = _dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+    result = zeros(p.shape)
+    region = full(len(p), -1, dtype=int64)
+
+    def assign(mask, points, code):
+        mask = mask & (region < 0)
+        result[mask] = points[mask]
+        region[mask] = code
+
+    with errstate(divide='ignore', invalid='ignore'):
+        assign((d1 <= 0) & (d2 <= 0), a, 1)
+        assign((d3 >= 0) & (d4 <= d3), b, 2)
+        assign((d6 >= 0) & (d5 <= d6), c, 3)
+        v = d1 / (d1 - d3)
+        assign((vc <= 0) & (d1 >= 0) & (d3 <= 0), a + v[:, None] * ab, 4)
+        w = d2 / (d2 - d6)
+        assign((vb <= 0) & (d2 >= 0) & (d6 <= 0), a + w[:, None] * ac, 6)
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        assign((va <= 0) & ((d4 - d3) >= 0) & ((d5 - d6) >= 0), b + w[:, None] * (c - b), 5)
+        denom = 1.0 / (va + vb + vc)
+        v = vb * denom
+        w = vc * denom
+        assign(region < 0, a + v[:, None] * ab + w[:, None] * ac, 0)
+    return result, region
+
+
+class BVHNumpy(object):
+    """A bounding volume hierarchy of axis-aligned boxes over a collection of triangles.
+
+    Parameters
+    ----------
+    vertices : array-like, optional
+        The XYZ coordinates of the vertices of the triangles.
+    triangles : array-like, optional
+        The vertex indices of the triangles.
+        If vertices and triangles are provided, the hierarchy is built automatically.
+    faces : array-like, optional
+        The face to which every triangle belongs, reported by the queries.
+        Default is the index of the triangle.
+    leafsize : int, optional
+        The maximum number of triangles in a leaf of the hierarchy.
+        Default is ``8``.
+
+    Attributes
+    ----------
+    xyz : array
+        The ``(n, 3)`` array of vertex coordinates.
+    triangles : array
+        The ``(m, 3)`` array of vertex indices of the triangles.
+    faces : array
+        The face of every triangle.
+    order : array
+        The indices of the triangles in tree order.
+        The triangles of every node occupy a contiguous range of this array.
+    lo : array
+        The start of the range of triangles of every node.
+    hi : array
+        The end of the range of triangles of every node.
+    left : array
+        The left child of every node, or ``-1`` for leaves.
+    right : array
+        The right child of every node, or ``-1`` for leaves.
+    depth : array
+        The depth of every node.
+    bmin : array
+        The lower corner of the bounding box of every node.
+    bmax : array
+        The upper corner of the bounding box of every node.
+
+    Notes
+    -----
+    The hierarchy is built top-down, by splitting the triangles of every node
+    at the median of their centroids along the axis of largest extent.
+
+    When the vertices move, but the triangles stay the same,
+    the bounding boxes can be updated with :meth:`refit`, without rebuilding the hierarchy.
+    This takes a few vectorized passes over the triangles and the levels of the tree.
+
+    All queries are batched.
+    The hierarchy is traversed breadth-first for all query rays or points simultaneously,
+    keeping only the (query, node) pairs that can improve the current result.
+
+    Signed distances are computed with angle-weighted pseudonormals [1]_,
+    and are positive on the side of the triangles into which their normals point.
+
+    References
+    ----------
+    .. [1] Baerentzen, J. A. and Aanaes, H. *Signed distance computation using the angle weighted pseudonormal*.
+           IEEE Transactions on Visualization and Computer Graphics 11(3), 2005.
+
+    Examples
+    --------
+    >>> vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    >>> bvh = BVHNumpy(vertices, [[0, 1, 2], [0, 2, 3]])
+    >>> faces, t, points = bvh.intersect_rays([[0.25, 0.75, 1.0]], [[0, 0, -1]])
+    >>> faces.tolist(), t.tolist()
+    ([1], [1.0])
+    >>> faces, points, distances = bvh.closest_points([[2.0, 0.5, 0.0]])
+    >>> points.tolist(), distances.tolist()
+    ([[1.0, 0.5, 0.0]], [1.0])
+
+    """
+
+    chunksize = 4096
+
+    def __init__(self, vertices=None, triangles=None, faces=None, leafsize=8):
+        self.leafsize = leafsize
+        self.xyz = zeros((0, 3))
+        self.triangles = zeros((0, 3), dtype=int64)
+        self.faces = zeros(0, dtype=int64)
+        self.order = zeros(0, dtype=int64)
+        self.lo = zeros(0, dtype=int64)
+        self.hi = zeros(0, dtype=int64)
+        self.left = zeros(0, dtype=int64)
+        self.right = zeros(0, dtype=int64)
+        self.depth = zeros(0, dtype=int64)
+        self.bmin = zeros((0, 3))
+        self.bmax = zeros((0, 3))
+        self._pseudonormals = None
+        if vertices is not None and triangles is not None:
+            self.build(vertices, triangles, faces)
+
+    @classmethod
+    def from_mesh(cls, mesh, leafsize=8):
+        """Construct a hierarchy over the faces of a mesh.
+
+        Parameters
+        ----------
+        mesh : compas.datastructures.Mesh
+            A mesh object.
+        leafsize : int, optional
+            The maximum number of triangles in a leaf of the hierarchy.
+            Default is ``8``.
+
+        Returns
+        -------
+        BVHNumpy
+            The hierarchy.
+            The faces reported by the queries are indices into the list of faces of the mesh.
+
+        Notes
+        -----
+        Faces with more than three vertices are triangulated as a fan around their first vertex.
+
+        """
+        vertices, faces, offsets = mesh.to_arrays()
+        if offsets is None:
+            k = faces.shape[1]
+            offsets = arange(0, faces.size + 1, k)
+            faces = faces.ravel()
+        start = offsets[:-1]
+        degree = offsets[1:] - start
+        count = degree - 2
+        face = repeat(arange(len(degree)), count)
+        corner = arange(count.sum()) - repeat(r_[0, count.cumsum()[:-1]], count) + 1
+        first = start[face]
+        triangles = asarray([faces[first], faces[first + corner], faces[first + corner + 1]]).T
+        return cls(vertices, triangles, face, leafsize=leafsize)
+
+    def build(self, vertices, triangles, faces=None):
+        """Build the hierarchy.
+
+        Parameters
+        ----------
+        vertices : array-like
+            The XYZ coordinates of the vertices of the triangles.
+        triangles : array-like
+            The vertex indices of the triangles.
+        faces : array-like, optional
+            The face to which every triangle belongs.
+
+        """
+        self.xyz = asarray(vertices, dtype=float64).reshape((-1, 3))
+        self.triangles = asarray(triangles, dtype=int64).reshape((-1, 3))
+        m = len(self.triangles)
+        self.faces = arange(m) if faces is None else asarray(faces, dtype=int64)
+        centroids = self.xyz[self.triangles].mean(axis=1)
+        order = arange(m)
+        lo = [0]
+        hi = [m]
+        left = [-1]
+        right = [-1]
+        depth = [0]
+        stack = [0] if m else []
+        while stack:
+            node = stack.pop()
+            a, b = lo[node], hi[node]
+            if b - a <= self.leafsize:
+                continue
+            points = centroids[order[a:b]]
+            k = int(argmax(points.max(axis=0) - points.min(axis=0)))
+            mid = (a + b) // 2
+            order[a:b] = order[a:b][argpartition(points[:, k], mid - a)]
+            for start, end in ((a, mid), (mid, b)):
+                lo.append(start)
+                hi.append(end)
+                left.append(-1)
+                right.append(-1)
+                depth.append(depth[node] + 1)
+                stack.append(len(lo) - 1)
+            left[node] = len(lo) - 2
+            right[node] = len(lo) - 1
+        self.order = order
+        self.lo = asarray(lo if m else [], dtype=int64)
+        self.hi = asarray(hi if m else [], dtype=int64)
+        self.left = asarray(left if m else [], dtype=int64)
+        self.right = asarray(right if m else [], dtype=int64)
+        self.depth = asarray(depth if m else [], dtype=int64)
+        self.refit()
+
+    def refit(self, vertices=None):
+        """Update the bounding boxes of the hierarchy after the vertices have moved.
+
+        Parameters
+        ----------
+        vertices : array-like, optional
+            The new XYZ coordinates of the vertices.
+            If not provided, the current coordinates are used.
+
+        """
+        if vertices is not None:
+            self.xyz = asarray(vertices, dtype=float64).reshape((-1, 3))
+        self._pseudonormals = None
+        n = len(self.lo)
+        self.bmin = zeros((n, 3))
+        self.bmax = zeros((n, 3))
+        if not n:
+            return
+        corners = self.xyz[self.triangles[self.order]]
+        leaves = where(self.left < 0)[0]
+        leaves = leaves[argsort(self.lo[leaves])]
+        self.bmin[leaves] = minimum.reduceat(corners.min(axis=1), self.lo[leaves])
+        self.bmax[leaves] = maximum.reduceat(corners.max(axis=1), self.lo[leaves])
+        internal = where(self.left >= 0)[0]
+        for d in range(int(self.depth.max()) - 1, -1, -1):
+            nodes = internal[self.depth[internal] == d]
+            self.bmin[nodes] = minimum(self.bmin[self.left[nodes]], self.bmin[self.right[nodes]])
+            self.bmax[nodes] = maximum(self.bmax[self.left[nodes]], self.bmax[self.right[nodes]])
+
+    # --------------------------------------------------------------------------
+    # helpers
+    # --------------------------------------------------------------------------
+
+    def _pairs(self, qs, nodes):
+        # the (query, triangle) pairs of the leaves of the given (query, node) pairs
+        lo = self.lo[nodes]
+        size = self.hi[nodes] - lo
+        qs = repeat(qs, size)
+        position = arange(size.sum()) - repeat(size.cumsum() - size, size) + repeat(lo, size)
+        return qs, self.order[position]
+
+    def _box_distances(self, Q, qs, nodes):
+        d = maximum(self.bmin[nodes] - Q[qs], 0) + maximum(Q[qs] - self.bmax[nodes], 0)
+        return _dot(d, d)
+
+    def _centre_distances(self, Q, qs, nodes):
+        d = 0.5 * (self.bmin[nodes] + self.bmax[nodes]) - Q[qs]
+        return _dot(d, d)
+
+    def _expand(self, qs, nodes):
+        internal = self.left[nodes] >= 0
+        qs, nodes = qs[internal], nodes[internal]
+        return concatenate((qs, qs)), concatenate((self.left[nodes], self.right[nodes]))
+
+    # --------------------------------------------------------------------------
+    # queries
+    # --------------------------------------------------------------------------
+
+    def intersect_rays(self, origins, directions, tmax=inf, tol=1e-12):
+        """Compute the first intersection of rays with the triangles.
+
+        Parameters
+        ----------
+        origins : array-like
+            The XYZ coordinates of the origins of the rays.
+        directions : array-like
+            The directions of the rays.
+        tmax : float, optional
+            The maximum ray parameter of an intersection.
+            Default is infinite.
+        tol : float, optional
+            Tolerance for considering a ray parallel to a triangle.
+            Default is ``1e-12``.
+
+        Returns
+        -------
+        tuple
+            The face of the first intersection of every ray (``-1`` if there is none),
+            the ray parameter of the intersection (infinite if there is none),
+            and the XYZ coordinates of the intersection.
+
+        Notes
+        -----
+        Triangles are intersected from both sides, with the algorithm of Moeller and Trumbore.
+        Intersections at negative ray parameters are ignored.
+
+        """
+        O = asarray(origins, dtype=float64).reshape((-1, 3))  # noqa: E741
+        D = asarray(directions, dtype=float64).reshape((-1, 3))
+        r = len(O)
+        best = full(r, float(tmax))
+        found = full(r, -1, dtype=int64)
+        with errstate(divide='ignore', invalid='ignore'):
+            inverse = 1.0 / D
+        qs = arange(r) if len(self.lo) else arange(0)
+        nodes = zeros(len(qs), dtype=int64)
+        while len(qs):
+            with errstate(invalid='ignore'):
+                t1 = (self.bmin[nodes] - O[qs]) * inverse[qs]
+                t2 = (self.bmax[nodes] - O[qs]) * inverse[qs]
+            tnear = fmax.reduce(fmin(t1, t2), axis=1)
+            tfar = fmin.reduce(fmax(t1, t2), axis=1)
+            keep = (tnear <= tfar) & (tfar >= 0) & (tnear <= best[qs])
+            qs, nodes = qs[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                pq, pt = self._pairs(qs[leaf], nodes[leaf])
+                a, b, c = (self.xyz[self.triangles[pt, i]] for i in range(3))
+                e1 = b - a
+                e2 = c - a
+                h = cross(D[pq], e2)
+                det = _dot(e1, h)
+                valid = abs(det) > tol
+                with errstate(divide='ignore', invalid='ignore'):
+                    f = 1.0 / det
+                    s = O[pq] - a
+                    u = f * _dot(s, h)
+                    q = cross(s, e1)
+                    v = f * _dot(D[pq], q)
+                    t = f * _dot(e2, q)
+                hit = valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= best[pq])
+                pq, pt, t = pq[hit], pt[hit], t[hit]
+                if len(pq):
+                    order = lexsort((t, pq))
+                    pq, pt, t = pq[order], pt[order], t[order]
+                    first = r_[True, pq[1:] != pq[:-1]]
+                    pq, pt, t = pq[first], pt[first], t[first]
+                    better = t <= best[pq]
+                    best[pq[better]] = t[better]
+                    found[pq[better]] = pt[better]
+            qs, nodes = self._expand(qs, nodes)
+        faces = where(found >= 0, self.faces[found] if len(self.faces) else found, -1)
+        t = where(found >= 0, best, inf)
+        points = O + where(found[:, None] >= 0, t[:, None], 0.0) * D
+        points[found < 0] = float('nan')
+        return faces, t, points
+
+    def _closest(self, points):
+        # the closest triangle, the closest point and its region, and the squared distance
+        # queries are processed in chunks to bound the number of (query, triangle) pairs
+        Q = asarray(points, dtype=float64).reshape((-1, 3))
+        chunks = [self._closest_chunk(Q[i:i + self.chunksize]) for i in range(0, len(Q), self.chunksize)]
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            return self._closest_chunk(Q)
+        return tuple(concatenate(result) for result in zip(*chunks))
+
+    def _closest_chunk(self, Q):
+        p = len(Q)
+        best = full(p, inf)
+        found = full(p, -1, dtype=int64)
+        closest = full((p, 3), float('nan'))
+        region = full(p, -1, dtype=int64)
+        if not len(self.lo):
+            return found, closest, region, best
+
+        def update(qs, nodes):
+            pq, pt = self._pairs(qs, nodes)
+            if not len(pq):
+                return
+            a, b, c = (self.xyz[self.triangles[pt, i]] for i in range(3))
+            x, code = _closest_points_on_triangles(Q[pq], a, b, c)
+            d2 = _dot(x - Q[pq], x - Q[pq])
+            order = lexsort((d2, pq))
+            first = order[r_[True, pq[order][1:] != pq[order][:-1]]]
+            better = d2[first] < best[pq[first]]
+            first = first[better]
+            best[pq[first]] = d2[first]
+            found[pq[first]] = pt[first]
+            closest[pq[first]] = x[first]
+            region[pq[first]] = code[first]
+
+        # initial bound from the leaf reached by descending into the closest child box
+        home = zeros(p, dtype=int64)
+        qs = arange(p)
+        while len(qs):
+            nodes = home[qs]
+            internal = self.left[nodes] >= 0
+            qs, nodes = qs[internal], nodes[internal]
+            left = self.left[nodes]
+            right = self.right[nodes]
+            dl = self._box_distances(Q, qs, left)
+            dr = self._box_distances(Q, qs, right)
+            cl = self._centre_distances(Q, qs, left)
+            cr = self._centre_distances(Q, qs, right)
+            home[qs] = where((dl < dr) | ((dl == dr) & (cl <= cr)), left, right)
+        update(arange(p), home)
+        qs = arange(p)
+        nodes = zeros(p, dtype=int64)
+        while len(qs):
+            keep = self._box_distances(Q, qs, nodes) < best[qs]
+            qs, nodes = qs[keep], nodes[keep]
+            leaf = (self.left[nodes] < 0) & (nodes != home[qs])
+            if leaf.any():
+                update(qs[leaf], nodes[leaf])
+            qs, nodes = self._expand(qs, nodes)
+        return found, closest, region, best
+
+    def closest_points(self, points):
+        """Compute the closest points on the triangles.
+
+        Parameters
+        ----------
+        points : array-like
+            The XYZ coordinates of the query points.
+
+        Returns
+        -------
+        tuple
+            The face containing the closest point of every query point,
+            the XYZ coordinates of the closest points,
+            and the distances to the closest points.
+
+        """
+        found, closest, region, d2 = self._closest(points)
+        faces = where(found >= 0, self.faces[found] if len(self.faces) else found, -1)
+        return faces, closest, sqrt(d2)
+
+    def _compute_pseudonormals(self):
+        # face normals, angle-weighted vertex pseudonormals,
+        # and edge pseudonormals for every edge of every triangle
+        a, b, c = (self.xyz[self.triangles[:, i]] for i in range(3))
+        normals = _unitized(cross(b - a, c - a))
+        n = len(self.xyz)
+        vertex = zeros((n, 3))
+        for i, (p, q, r) in enumerate(((a, b, c), (b, c, a), (c, a, b))):
+            u = _unitized(q - p)
+            v = _unitized(r - p)
+            angle = arccos(clip(_dot(u, v), -1.0, 1.0))
+            for axis in range(3):
+                vertex[:, axis] += bincount(self.triangles[:, i], weights=angle * normals[:, axis], minlength=n)
+        edges = sort(self.triangles[:, [0, 1, 1, 2, 2, 0]].reshape((-1, 2)), axis=1)
+        _, inverse = unique(edges[:, 0] * n + edges[:, 1], return_inverse=True)
+        summed = zeros((inverse.max() + 1, 3)) if len(inverse) else zeros((0, 3))
+        for axis in range(3):
+            summed[:, axis] = bincount(inverse, weights=repeat(normals[:, axis], 3), minlength=len(summed))
+        edge = summed[inverse].reshape((-1, 3, 3))
+        self._pseudonormals = normals, vertex, edge
+
+    def signed_distances(self, points):
+        """Compute the signed distances of points to the triangles.
+
+        Parameters
+        ----------
+        points : array-like
+            The XYZ coordinates of the query points.
+
+        Returns
+        -------
+        array
+            The signed distance of every query point.
+            Distances are positive on the side into which the normals of the triangles point,
+            and negative on the other side.
+
+        Notes
+        -----
+        For closed, consistently oriented meshes, the sign distinguishes the outside
+        from the inside of the mesh.
+
+        """
+        Q = asarray(points, dtype=float64).reshape((-1, 3))
+        found, closest, region, d2 = self._closest(Q)
+        if self._pseudonormals is None:
+            self._compute_pseudonormals()
+        normals, vertex, edge = self._pseudonormals
+        ok = found >= 0
+        t = found[ok]
+        code = region[ok]
+        pseudonormal = normals[t].copy()
+        for i in range(3):
+            mask = code == i + 1
+            pseudonormal[mask] = vertex[self.triangles[t[mask], i]]
+            mask = code == i + 4
+            pseudonormal[mask] = edge[t[mask], i]
+        distances = sqrt(d2)
+        s = sign(_dot(Q[ok] - closest[ok], pseudonormal))
+        distances[ok] *= where(s < 0, -1.0, 1.0)
+        return distances
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import time
+
+    from numpy import random
+
+    from compas.datastructures import Mesh
+
+    random.seed(0)
+
+    n = 300
+
+    i, j = divmod(arange(n * n), n)
+    u = (arange((n + 1) ** 2) // (n + 1)) / n
+    v = (arange((n + 1) ** 2) % (n + 1)) / n
+    vertices = asarray([u, v, 0.1 * (u - 0.5) ** 2 - 0.1 * (v - 0.5) ** 2]).T
+    faces = asarray([i * (n + 1) + j, (i + 1) * (n + 1) + j, (i + 1) * (n + 1) + j + 1, i * (n + 1) + j + 1]).T
+    mesh = Mesh.from_arrays(vertices, faces)
+
+    t0 = time.time()
+    bvh = BVHNumpy.from_mesh(mesh)
+    t1 = time.time()
+    bvh.refit(vertices + random.rand(*vertices.shape) * 1e-3)
+    t2 = time.time()
+
+    print('faces: {0} build: {1:.2f}s refit: {2:.2f}s'.format(mesh.number_of_faces(), t1 - t0, t2 - t1))
+
+    for m in (1000, 10000, 100000):
+        points = random.rand(m, 3) * [1.0, 1.0, 0.1] - [0.0, 0.0, 0.05]
+        t0 = time.time()
+        bvh.intersect_rays(points, [[0, 0, -1]] * m)
+        t1 = time.time()
+        bvh.closest_points(points)
+        t2 = time.time()
+        bvh.signed_distances(points)
+        t3 = time.time()
+        print('queries: {0:>6} rays: {1:.2f}s closest points: {2:.2f}s signed distances: {3:.2f}s'.format(
+            m, t1 - t0, t2 - t1, t3 - t2))
+
+    # brute force reference for a small number of points
+    points = random.rand(100, 3) * [1.0, 1.0, 0.1] - [0.0, 0.0, 0.05]
+    a, b, c = (bvh.xyz[bvh.triangles[:, i]] for i in range(3))
+    t0 = time.time()
+    for point in points:
+        _closest_points_on_triangles(repeat(point[None, :], len(a), axis=0), a, b, c)
+    t1 = time.time()
+    print('brute force closest points: {0:.2f}s for 100 points'.format(t1 - t0))
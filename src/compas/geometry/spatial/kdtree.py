@@ -4,7 +4,9 @@ from __future__ import division
 
 import collections
 
-from compas.geometry import distance_point_point_sqrd
+from array import array
+from heapq import heappush
+from heapq import heapreplace
 
 
 __all__ = [
@@ -24,15 +26,41 @@ class KDTree(object):
         A list of objects to populate the tree with.
         If objects are provided, the tree is built automatically.
         Defaults to ``None``.
+    leafsize : int, optional
+        The maximum number of points in a leaf of the tree.
+        Default is ``8``.
 
     Attributes
     ----------
     root : Node
         The root node of the built tree.
         This is the median with respect to the different dimensions of the tree.
+    xyz : array
+        The flat array of the coordinates of the points, in tree order.
+    axes : array
+        The splitting axis of every node of the tree.
+    labels : list
+        The labels of the points, in tree order.
+    points : list
+        The points, in tree order.
 
     Notes
     -----
+    The tree is stored implicitly in flat arrays.
+    The points of the subtree of a node occupy a contiguous range of the arrays,
+    with the node itself at the middle of the range,
+    the points of its left subtree before it, and those of its right subtree after it.
+    Every node splits its subtree along the axis of largest spread of its points.
+    Ranges of at most ``leafsize`` points are leaves, and are searched exhaustively.
+
+    The tree is built in ``O(n log n)`` from the points presorted along every axis,
+    by splitting the sorted sequences at every level of the tree rather than sorting them again.
+    Searches are iterative, and find the ``k`` nearest neighbors in a single traversal
+    by keeping the best candidates in a bounded heap.
+
+    The tree works without NumPy, for example in IronPython.
+    See :class:`KDTreeNumpy` for a version with vectorized batch queries.
+
     For more info, see [1]_ and [2]_.
 
     References
@@ -44,6 +72,15 @@ class KDTree(object):
 
     Examples
     --------
+    >>> from compas.geometry import pointcloud
+    >>> cloud = pointcloud(100, (0, 10))
+    >>> tree = KDTree(cloud)
+    >>> xyz, label, distance = tree.nearest_neighbor(cloud[0])
+    >>> label, distance
+    (0, 0.0)
+    >>> len(tree.nearest_neighbors(cloud[0], 5))
+    5
+
     .. plot::
         :include-source:
 
@@ -58,14 +95,7 @@ class KDTree(object):
 
         tree = KDTree(cloud)
 
-        n       = 50
-        nnbrs   = []
-        exclude = set()
-
-        for i in range(n):
-            nnbr = tree.nearest_neighbor(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
+        nnbrs = tree.nearest_neighbors(point, 50)
 
         for nnbr in nnbrs:
             print(nnbr)
@@ -104,11 +134,35 @@ class KDTree(object):
 
     """
 
-    def __init__(self, objects=None):
+    def __init__(self, objects=None, leafsize=8):
         """Initialise a KDTree object."""
-        self.root = None
+        self.leafsize = leafsize
+        self.xyz = array('d')
+        self.axes = array('B')
+        self.labels = []
+        self.points = []
         if objects:
-            self.root = self.build(list([(objects[i], i) for i in range(len(objects))]))
+            self._build([(objects[i], i) for i in range(len(objects))])
+
+    @property
+    def root(self):
+        """Node: The root node of the tree, as a nested structure of nodes."""
+        def node(positions, axis):
+            if not positions:
+                return None
+            if len(positions) > self.leafsize:
+                mid = len(positions) // 2
+                axis = self.axes[positions[mid]]
+            else:
+                # the points of a leaf are split along the axes in turn
+                positions = sorted(positions, key=lambda position: self.xyz[3 * position + axis])
+                mid = len(positions) // 2
+            position = positions[mid]
+            return Node(self.points[position], axis, self.labels[position],
+                        node(positions[:mid], (axis + 1) % 3),
+                        node(positions[mid + 1:], (axis + 1) % 3))
+
+        return node(list(range(len(self.labels))), 0)
 
     def build(self, objects, axis=0):
         """Populate a kd-tree with given objects.
@@ -116,9 +170,10 @@ class KDTree(object):
         Parameters
         ----------
         objects : list
-            The tree objects.
+            The tree objects, as a list of (point, label) pairs.
         axis : int, optional
-            The axis along which to build.
+            The axis along which to split the root node, if the points have
+            the same spread along several axes.
 
         Returns
         -------
@@ -126,20 +181,152 @@ class KDTree(object):
             The root node.
 
         """
-        if not objects:
-            return None
-
-        objects.sort(key=lambda o: o[0][axis])
-        median_idx = len(objects) // 2
-        median_point, median_label = objects[median_idx]
-        next_axis = (axis + 1) % 3
-
-        return Node(
-            median_point,
-            axis,
-            median_label,
-            self.build(objects[:median_idx], next_axis),
-            self.build(objects[median_idx + 1:], next_axis))
+        self._build(objects, axis)
+        return self.root
+
+    def _build(self, objects, axis=0):
+        n = len(objects)
+        leafsize = self.leafsize
+        points = [point for point, _ in objects]
+        labels = [label for _, label in objects]
+        coordinates = [[float(point[i]) for point in points] for i in range(3)]
+        # the indices of the points in the subtree of a node
+        # sorted along every axis
+        orders = [sorted(range(n), key=coordinates[i].__getitem__) for i in range(3)]
+        index = [0] * n
+        axes = [0] * n
+        side = bytearray(n)
+        stack = [(0, n)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= leafsize:
+                index[lo:hi] = orders[0][lo:hi]
+                continue
+            mid = (lo + hi) // 2
+            spread = [coordinates[i][orders[i][hi - 1]] - coordinates[i][orders[i][lo]] for i in range(3)]
+            a = max(range(3), key=lambda i: (spread[i], i == axis))
+            order = orders[a]
+            median = order[mid]
+            index[mid] = median
+            axes[mid] = a
+            for i in order[lo:mid]:
+                side[i] = 0
+            for i in order[mid + 1:hi]:
+                side[i] = 1
+            side[median] = 2
+            for i in range(3):
+                if i == a:
+                    continue
+                segment = orders[i][lo:hi]
+                orders[i][lo:mid] = [j for j in segment if side[j] == 0]
+                orders[i][mid] = median
+                orders[i][mid + 1:hi] = [j for j in segment if side[j] == 1]
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+        self.xyz = array('d', [coordinates[i][j] for j in index for i in range(3)])
+        self.axes = array('B', axes)
+        self.labels = [labels[j] for j in index]
+        self.points = [points[j] for j in index]
+
+    def _search(self, point, number, exclude=None):
+        # find the ``number`` points closest to the base point in a single traversal,
+        # as a sorted list of (d2, position) tuples
+        xyz = self.xyz
+        axes = self.axes
+        labels = self.labels
+        leafsize = self.leafsize
+        base = (float(point[0]), float(point[1]), float(point[2]))
+        x, y, z = base
+        heap = []
+        worst = float('inf')
+        stack = [(0, len(labels), 0.0)]
+        while stack:
+            lo, hi, d2 = stack.pop()
+            if d2 >= worst:
+                continue
+            # descend to the leaf containing the base point
+            # and postpone the far side of every node
+            while hi - lo > leafsize:
+                mid = (lo + hi) // 2
+                i = 3 * mid
+                dx = x - xyz[i]
+                dy = y - xyz[i + 1]
+                dz = z - xyz[i + 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 < worst and (not exclude or labels[mid] not in exclude):
+                    if len(heap) < number:
+                        heappush(heap, (-d2, mid))
+                        if len(heap) == number:
+                            worst = -heap[0][0]
+                    else:
+                        heapreplace(heap, (-d2, mid))
+                        worst = -heap[0][0]
+                a = axes[mid]
+                d = base[a] - xyz[i + a]
+                if d <= 0:
+                    if mid + 1 < hi:
+                        stack.append((mid + 1, hi, d * d))
+                    hi = mid
+                else:
+                    stack.append((lo, mid, d * d))
+                    lo = mid + 1
+            for mid in range(lo, hi):
+                i = 3 * mid
+                dx = x - xyz[i]
+                dy = y - xyz[i + 1]
+                dz = z - xyz[i + 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 < worst and (not exclude or labels[mid] not in exclude):
+                    if len(heap) < number:
+                        heappush(heap, (-d2, mid))
+                        if len(heap) == number:
+                            worst = -heap[0][0]
+                    else:
+                        heapreplace(heap, (-d2, mid))
+                        worst = -heap[0][0]
+        return sorted((-d2, mid) for d2, mid in heap)
+
+    def _search_radius(self, point, radius):
+        # find all points within the radius of the base point,
+        # as a list of (d2, position) tuples
+        xyz = self.xyz
+        axes = self.axes
+        leafsize = self.leafsize
+        base = (float(point[0]), float(point[1]), float(point[2]))
+        x, y, z = base
+        r2 = radius * radius
+        found = []
+        stack = [(0, len(self.labels))]
+        while stack:
+            lo, hi = stack.pop()
+            while hi - lo > leafsize:
+                mid = (lo + hi) // 2
+                i = 3 * mid
+                dx = x - xyz[i]
+                dy = y - xyz[i + 1]
+                dz = z - xyz[i + 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 <= r2:
+                    found.append((d2, mid))
+                a = axes[mid]
+                d = base[a] - xyz[i + a]
+                if d <= 0:
+                    if mid + 1 < hi and d * d <= r2:
+                        stack.append((mid + 1, hi))
+                    hi = mid
+                else:
+                    if d * d <= r2:
+                        stack.append((lo, mid))
+                    lo = mid + 1
+            for mid in range(lo, hi):
+                i = 3 * mid
+                dx = x - xyz[i]
+                dy = y - xyz[i + 1]
+                dz = z - xyz[i + 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 <= r2:
+                    found.append((d2, mid))
+        return found
 
     def nearest_neighbor(self, point, exclude=None):
         """Find the nearest neighbor to a given point,
@@ -150,7 +337,7 @@ class KDTree(object):
         point : list
             XYZ coordinates of the base point.
         exclude : set, optional
-            A set of points to exclude from the search.
+            A set of labels of points to exclude from the search.
             Defaults to an empty set.
 
         Returns
@@ -161,30 +348,9 @@ class KDTree(object):
             Distance to the base point.
 
         """
-        def search(node):
-            if node is None:
-                return
-
-            d2 = distance_point_point_sqrd(point, node.point)
-            if d2 < best[2]:
-                if node.label not in exclude:
-                    best[:] = node.point, node.label, d2
-
-            d = point[node.axis] - node.point[node.axis]
-            if d <= 0:
-                close, far = node.left, node.right
-            else:
-                close, far = node.right, node.left
-
-            search(close)
-            if d ** 2 < best[2]:
-                search(far)
-
-        exclude = exclude or set()
-        best = [None, None, float('inf')]
-        search(self.root)
-        best[2] **= 0.5
-        return best
+        for d2, mid in self._search(point, 1, exclude):
+            return [self.points[mid], self.labels[mid], d2 ** 0.5]
+        return [None, None, float('inf')]
 
     def nearest_neighbors(self, point, number, distance_sort=False):
         """Find the N nearest neighbors to a given point.
@@ -192,7 +358,7 @@ class KDTree(object):
         Parameters
         ----------
         point : list
-            XYZ coordinates of the bbase point.
+            XYZ coordinates of the base point.
         number : int
             The number of nearest neighbors.
         distance_sort : bool, optional
@@ -202,76 +368,99 @@ class KDTree(object):
         Returns
         -------
         list
-            A list of N nearest neighbors.
+            A list of N nearest neighbors,
+            as lists of XYZ coordinates, label and distance to the base point.
+
+        Notes
+        -----
+        The neighbors are always returned in order of increasing distance to the base point.
+        The ``distance_sort`` parameter is kept for backward compatibility.
+
+        """
+        return [[self.points[mid], self.labels[mid], d2 ** 0.5] for d2, mid in self._search(point, number)]
+
+    def radius_neighbors(self, point, radius, distance_sort=False):
+        """Find all neighbors within a given distance of a point.
+
+        Parameters
+        ----------
+        point : list
+            XYZ coordinates of the base point.
+        radius : float
+            The search radius.
+        distance_sort : bool, optional
+            Sort the neighbors by distance to the base point.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            A list of neighbors,
+            as lists of XYZ coordinates, label and distance to the base point.
 
         """
-        nnbrs = []
-        exclude = set()
-        for i in range(number):
-            nnbr = self.nearest_neighbor(point, exclude)
-            nnbrs.append(nnbr)
-            exclude.add(nnbr[1])
+        found = self._search_radius(point, radius)
         if distance_sort:
-            return sorted(nnbrs, key=lambda nnbr: nnbr[2])
-        return nnbrs
+            found.sort()
+        return [[self.points[mid], self.labels[mid], d2 ** 0.5] for d2, mid in found]
 
+    def nearest_neighbors_batch(self, points, number):
+        """Find the N nearest neighbors of every point of a collection of points.
 
-# ==============================================================================
-# Main
-# ==============================================================================
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the base points.
+        number : int
+            The number of nearest neighbors.
 
-if __name__ == '__main__':
+        Returns
+        -------
+        tuple
+            The labels and the distances of the nearest neighbors of every base point,
+            as lists of lists, in order of increasing distance.
+
+        """
+        labels = []
+        distances = []
+        for point in points:
+            found = self._search(point, number)
+            labels.append([self.labels[mid] for _, mid in found])
+            distances.append([d2 ** 0.5 for d2, _ in found])
+        return labels, distances
 
-    from compas.geometry import pointcloud_xy
-    from compas_plotters import Plotter
+    def radius_neighbors_batch(self, points, radius):
+        """Find all neighbors within a given distance of every point of a collection of points.
 
-    plotter = Plotter()
+        Parameters
+        ----------
+        points : list
+            XYZ coordinates of the base points.
+        radius : float
+            The search radius.
 
-    cloud = pointcloud_xy(999, (-500, 500))
-    point = cloud[0]
+        Returns
+        -------
+        tuple
+            The labels and the distances of the neighbors of every base point,
+            as lists of lists, in order of increasing distance.
 
-    tree = KDTree(cloud)
+        """
+        labels = []
+        distances = []
+        for point in points:
+            found = sorted(self._search_radius(point, radius))
+            labels.append([self.labels[mid] for _, mid in found])
+            distances.append([d2 ** 0.5 for d2, _ in found])
+        return labels, distances
 
-    n = 50
-    nnbrs = []
-    exclude = set()
 
-    for i in range(n):
-        nnbr = tree.nearest_neighbor(point, exclude)
-        nnbrs.append(nnbr)
-        exclude.add(nnbr[1])
+# ==============================================================================
+# Main
+# ==============================================================================
 
-    for nnbr in nnbrs:
-        print(nnbr)
+if __name__ == '__main__':
 
-    points = []
-    for index, (x, y, z) in enumerate(cloud):
-        points.append({
-            'pos': [x, y],
-            'facecolor': '#000000',
-            'edgecolor': '#000000',
-            'radius': 1.0
-        })
-    points.append({
-        'pos': point[0:2],
-        'facecolor': '#ff0000',
-        'edgecolor': '#ff0000',
-        'radius': 5.0
-    })
-
-    lines = []
-    for xyz, label, dist in nnbrs:
-        points[label]['facecolor'] = '#00ff00'
-        points[label]['edgecolor'] = '#00ff00'
-        points[label]['radius'] = 3.0
-
-        lines.append({
-            'start': point[0:2],
-            'end': xyz[0:2],
-            'color': '#000000',
-            'width': 0.1,
-        })
+    import doctest
 
-    plotter.draw_lines(lines)
-    plotter.draw_points(points)
-    plotter.show()
+    doctest.testmod(globs=globals())
@@ -0,0 +1,446 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import arange
+from numpy import argmax
+from numpy import argpartition
+from numpy import asarray
+from numpy import concatenate
+from numpy import float64
+from numpy import full
+from numpy import inf
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import r_
+from numpy import repeat
+from numpy import searchsorted
+from numpy import unique
+from numpy import where
+from numpy import zeros
+
+
+__all__ = [
+    'KDTreeNumpy'
+]
+
+
+class KDTreeNumpy(object):
+    """A tree for nearest neighbor search in 3D space, with vectorized batch queries.
+
+    Parameters
+    ----------
+    points : array-like, optional
+        The XYZ coordinates of the points to populate the tree with.
+        If points are provided, the tree is built automatically.
+    leafsize : int, optional
+        The maximum number of points in a leaf of the tree.
+        Default is ``16``.
+
+    Attributes
+    ----------
+    xyz : array
+        The ``(n, 3)`` array of the coordinates of the points.
+    index : array
+        The indices of the points in tree order.
+        The points of every node occupy a contiguous range of this array.
+    lo : array
+        The start of the range of points of every node.
+    hi : array
+        The end of the range of points of every node.
+    left : array
+        The left child of every node, or ``-1`` for leaves.
+    right : array
+        The right child of every node, or ``-1`` for leaves.
+    axis : array
+        The splitting axis of every node.
+    split : array
+        The splitting coordinate of every node.
+    bmin : array
+        The lower corner of the bounding box of the points of every node.
+    bmax : array
+        The upper corner of the bounding box of the points of every node.
+
+    Notes
+    -----
+    The tree is built in ``O(n log n)`` by partitioning the points of every node
+    around the median along the axis of largest extent, with :func:`numpy.argpartition`.
+
+    Batch queries process all base points at once.
+    An initial upper bound on the distance of the neighbors of every base point
+    is obtained from the points of the smallest node containing the base point
+    and at least the requested number of points.
+    Then, the tree is traversed breadth-first for all base points simultaneously,
+    keeping only the (base point, node) pairs for which the bounding box of the node
+    is closer to the base point than the current bound.
+
+    The labels of the points are their indices in the list of points of the tree.
+    See :class:`KDTree` for a version without NumPy.
+
+    Examples
+    --------
+    >>> from compas.geometry import pointcloud
+    >>> cloud = pointcloud(100, (0, 10))
+    >>> tree = KDTreeNumpy(cloud)
+    >>> labels, distances = tree.nearest_neighbors_batch(cloud, 3)
+    >>> labels.shape
+    (100, 3)
+    >>> (labels[:, 0] == arange(100)).all()
+    True
+
+    """
+
+    def __init__(self, points=None, leafsize=16):
+        self.leafsize = leafsize
+        self.xyz = zeros((0, 3))
+        self.index = zeros(0, dtype=int64)
+        self.lo = zeros(0, dtype=int64)
+        self.hi = zeros(0, dtype=int64)
+        self.left = zeros(0, dtype=int64)
+        self.right = zeros(0, dtype=int64)
+        self.axis = zeros(0, dtype=int64)
+        self.split = zeros(0)
+        self.bmin = zeros((0, 3))
+        self.bmax = zeros((0, 3))
+        if points is not None and len(points):
+            self.build(points)
+
+    def build(self, points):
+        """Populate the tree with given points.
+
+        Parameters
+        ----------
+        points : array-like
+            The XYZ coordinates of the points.
+
+        """
+        xyz = asarray(points, dtype=float64).reshape((-1, 3))
+        n = len(xyz)
+        index = arange(n)
+        lo = [0]
+        hi = [n]
+        left = [-1]
+        right = [-1]
+        axis = [0]
+        split = [0.0]
+        bmin = [None]
+        bmax = [None]
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            a, b = lo[node], hi[node]
+            coordinates = xyz[index[a:b]]
+            bmin[node] = coordinates.min(axis=0)
+            bmax[node] = coordinates.max(axis=0)
+            if b - a <= self.leafsize:
+                continue
+            k = int(argmax(bmax[node] - bmin[node]))
+            mid = (a + b) // 2
+            order = argpartition(coordinates[:, k], mid - a)
+            index[a:b] = index[a:b][order]
+            axis[node] = k
+            split[node] = xyz[index[mid], k]
+            for start, end in ((a, mid), (mid, b)):
+                lo.append(start)
+                hi.append(end)
+                left.append(-1)
+                right.append(-1)
+                axis.append(0)
+                split.append(0.0)
+                bmin.append(None)
+                bmax.append(None)
+                stack.append(len(lo) - 1)
+            left[node] = len(lo) - 2
+            right[node] = len(lo) - 1
+        self.xyz = xyz
+        self.index = index
+        self.lo = asarray(lo, dtype=int64)
+        self.hi = asarray(hi, dtype=int64)
+        self.left = asarray(left, dtype=int64)
+        self.right = asarray(right, dtype=int64)
+        self.axis = asarray(axis, dtype=int64)
+        self.split = asarray(split, dtype=float64)
+        self.bmin = asarray(bmin, dtype=float64).reshape((-1, 3))
+        self.bmax = asarray(bmax, dtype=float64).reshape((-1, 3))
+
+    # --------------------------------------------------------------------------
+    # helpers
+    # --------------------------------------------------------------------------
+
+    def _candidates(self, Q, qs, nodes):
+        # the squared distances and indices of the points of the given nodes
+        # to the corresponding base points, padded with infinite distances
+        lo = self.lo[nodes]
+        size = self.hi[nodes] - lo
+        width = int(size.max()) if len(size) else 0
+        position = lo[:, None] + arange(width)
+        valid = arange(width) < size[:, None]
+        position = where(valid, position, lo[:, None])
+        index = self.index[position]
+        d2 = ((self.xyz[index] - Q[qs][:, None, :]) ** 2).sum(axis=2)
+        d2[~valid] = inf
+        return d2, index
+
+    def _box_distances(self, Q, qs, nodes):
+        # the squared distances of the base points to the bounding boxes of the nodes
+        d = maximum(self.bmin[nodes] - Q[qs], 0) + maximum(Q[qs] - self.bmax[nodes], 0)
+        return (d ** 2).sum(axis=1)
+
+    def _merge(self, D, L, qs, d2, index):
+        # merge candidate neighbors into the current best neighbors of the base points
+        k = D.shape[1]
+        unique_qs = unique(qs)
+        cq = concatenate((repeat(qs, d2.shape[1]), repeat(unique_qs, k)))
+        cd = concatenate((d2.ravel(), D[unique_qs].ravel()))
+        ci = concatenate((index.ravel(), L[unique_qs].ravel()))
+        order = lexsort((cd, cq))
+        cq, cd, ci = cq[order], cd[order], ci[order]
+        first = searchsorted(cq, unique_qs)
+        rank = arange(len(cq)) - repeat(first, r_[first[1:], len(cq)] - first)
+        keep = rank < k
+        D[cq[keep], rank[keep]] = cd[keep]
+        L[cq[keep], rank[keep]] = ci[keep]
+
+    # --------------------------------------------------------------------------
+    # batch queries
+    # --------------------------------------------------------------------------
+
+    def nearest_neighbors_batch(self, points, number):
+        """Find the N nearest neighbors of every point of a collection of points.
+
+        Parameters
+        ----------
+        points : array-like
+            XYZ coordinates of the base points.
+        number : int
+            The number of nearest neighbors.
+
+        Returns
+        -------
+        tuple
+            An ``(m, N)`` array with the labels and an ``(m, N)`` array with the distances
+            of the nearest neighbors of the ``m`` base points, in order of increasing distance.
+            If the tree contains less than ``N`` points, the missing labels are ``-1``,
+            and the missing distances are infinite.
+
+        """
+        Q = asarray(points, dtype=float64).reshape((-1, 3))
+        m = len(Q)
+        D = full((m, number), inf)
+        L = full((m, number), -1, dtype=int64)
+        if not len(self.lo) or not number:
+            return L, D
+        # initial bound from the smallest node containing the base point and enough points
+        home = zeros(m, dtype=int64)
+        qs = arange(m)
+        while len(qs):
+            nodes = home[qs]
+            left = self.left[nodes]
+            internal = left >= 0
+            qs, nodes, left = qs[internal], nodes[internal], left[internal]
+            child = where(Q[qs, self.axis[nodes]] < self.split[nodes], left, self.right[nodes])
+            large = self.hi[child] - self.lo[child] >= number
+            qs, child = qs[large], child[large]
+            home[qs] = child
+        d2, index = self._candidates(Q, arange(m), home)
+        self._merge(D, L, arange(m), d2, index)
+        # breadth-first traversal of all (base point, node) pairs that can contain better neighbors
+        hlo = self.lo[home]
+        hhi = self.hi[home]
+        qs = arange(m)
+        nodes = zeros(m, dtype=int64)
+        while len(qs):
+            keep = self._box_distances(Q, qs, nodes) < D[qs, -1]
+            qs, nodes = qs[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            inside = (self.lo[nodes] >= hlo[qs]) & (self.hi[nodes] <= hhi[qs])
+            todo = leaf & ~inside
+            if todo.any():
+                d2, index = self._candidates(Q, qs[todo], nodes[todo])
+                self._merge(D, L, qs[todo], d2, index)
+            qs, nodes = qs[~leaf], nodes[~leaf]
+            qs = concatenate((qs, qs))
+            nodes = concatenate((self.left[nodes], self.right[nodes]))
+        return L, D ** 0.5
+
+    def radius_neighbors_batch(self, points, radius):
+        """Find all neighbors within a given distance of every point of a collection of points.
+
+        Parameters
+        ----------
+        points : array-like
+            XYZ coordinates of the base points.
+        radius : float
+            The search radius.
+
+        Returns
+        -------
+        tuple
+            A list with an array of labels and a list with an array of distances
+            of the neighbors of every base point, in order of increasing distance.
+
+        """
+        Q = asarray(points, dtype=float64).reshape((-1, 3))
+        m = len(Q)
+        r2 = radius ** 2
+        found_q = []
+        found_d = []
+        found_i = []
+        qs = arange(m) if len(self.lo) else arange(0)
+        nodes = zeros(len(qs), dtype=int64)
+        while len(qs):
+            keep = self._box_distances(Q, qs, nodes) <= r2
+            qs, nodes = qs[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            if leaf.any():
+                d2, index = self._candidates(Q, qs[leaf], nodes[leaf])
+                within = d2 <= r2
+                found_q.append(repeat(qs[leaf], d2.shape[1])[within.ravel()])
+                found_d.append(d2[within])
+                found_i.append(index[within])
+            qs, nodes = qs[~leaf], nodes[~leaf]
+            qs = concatenate((qs, qs))
+            nodes = concatenate((self.left[nodes], self.right[nodes]))
+        cq = concatenate(found_q) if found_q else zeros(0, dtype=int64)
+        cd = concatenate(found_d) if found_d else zeros(0)
+        ci = concatenate(found_i) if found_i else zeros(0, dtype=int64)
+        order = lexsort((cd, cq))
+        cq, cd, ci = cq[order], cd[order], ci[order]
+        bounds = searchsorted(cq, arange(m + 1))
+        labels = [ci[bounds[i]:bounds[i + 1]] for i in range(m)]
+        distances = [cd[bounds[i]:bounds[i + 1]] ** 0.5 for i in range(m)]
+        return labels, distances
+
+    # --------------------------------------------------------------------------
+    # single queries
+    # --------------------------------------------------------------------------
+
+    def nearest_neighbor(self, point, exclude=None):
+        """Find the nearest neighbor to a given point,
+        excluding neighbors that have already been found.
+
+        Parameters
+        ----------
+        point : list
+            XYZ coordinates of the base point.
+        exclude : set, optional
+            A set of labels of points to exclude from the search.
+            Defaults to an empty set.
+
+        Returns
+        -------
+        list:
+            XYZ coordinates of the nearest neighbor.
+            Label of the nearest neighbor.
+            Distance to the base point.
+
+        """
+        exclude = exclude or set()
+        labels, distances = self.nearest_neighbors_batch([point], 1 + len(exclude))
+        for label, distance in zip(labels[0].tolist(), distances[0].tolist()):
+            if label >= 0 and label not in exclude:
+                return [self.xyz[label].tolist(), label, distance]
+        return [None, None, float('inf')]
+
+    def nearest_neighbors(self, point, number, distance_sort=False):
+        """Find the N nearest neighbors to a given point.
+
+        Parameters
+        ----------
+        point : list
+            XYZ coordinates of the base point.
+        number : int
+            The number of nearest neighbors.
+        distance_sort : bool, optional
+            Sort the nearest neighbors by distance to the base point.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            A list of N nearest neighbors,
+            as lists of XYZ coordinates, label and distance to the base point.
+
+        Notes
+        -----
+        The neighbors are always returned in order of increasing distance to the base point.
+
+        """
+        labels, distances = self.nearest_neighbors_batch([point], number)
+        return [[self.xyz[label].tolist(), label, distance] for label, distance in zip(labels[0].tolist(), distances[0].tolist()) if label >= 0]
+
+    def radius_neighbors(self, point, radius, distance_sort=False):
+        """Find all neighbors within a given distance of a point.
+
+        Parameters
+        ----------
+        point : list
+            XYZ coordinates of the base point.
+        radius : float
+            The search radius.
+        distance_sort : bool, optional
+            Sort the neighbors by distance to the base point.
+            Default is ``False``.
+
+        Returns
+        -------
+        list
+            A list of neighbors,
+            as lists of XYZ coordinates, label and distance to the base point.
+
+        Notes
+        -----
+        The neighbors are always returned in order of increasing distance to the base point.
+
+        """
+        labels, distances = self.radius_neighbors_batch([point], radius)
+        return [[self.xyz[label].tolist(), label, distance] for label, distance in zip(labels[0].tolist(), distances[0].tolist())]
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import time
+
+    from numpy import random
+
+    from compas.geometry import KDTree
+
+    random.seed(0)
+
+    for n in (1000, 10000, 100000):
+        cloud = random.rand(n, 3)
+        cloud[:, 2] = 0
+        points = cloud.tolist()
+        queries = points[:1000]
+
+        t0 = time.time()
+        tree = KDTree(points)
+        t1 = time.time()
+        for point in queries:
+            exclude = set()
+            for i in range(10):
+                exclude.add(tree.nearest_neighbor(point, exclude)[1])
+        t2 = time.time()
+        tree.nearest_neighbors_batch(queries, 10)
+        t3 = time.time()
+        tree.radius_neighbors_batch(queries, 0.01)
+        t4 = time.time()
+
+        print('KDTree      n: {0:>6} build: {1:.3f}s 10-NN by exclusion: {2:.3f}s 10-NN: {3:.3f}s radius: {4:.3f}s'.format(
+            n, t1 - t0, t2 - t1, t3 - t2, t4 - t3))
+
+        t0 = time.time()
+        tree = KDTreeNumpy(cloud)
+        t1 = time.time()
+        tree.nearest_neighbors_batch(queries, 10)
+        t2 = time.time()
+        tree.radius_neighbors_batch(queries, 0.01)
+        t3 = time.time()
+
+        print('KDTreeNumpy n: {0:>6} build: {1:.3f}s 10-NN: {2:.3f}s radius: {3:.3f}s'.format(
+            n, t1 - t0, t2 - t1, t3 - t2))
@@ -0,0 +1,94 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from math import floor
+
+from compas.utilities import tolerance_from_precision
+
+
+__all__ = [
+    'weld_points'
+]
+
+
+def weld_points(points, tol=None):
+    """Merge points that are within a tolerance distance of each other.
+
+    Parameters
+    ----------
+    points : list
+        The XYZ coordinates of the points.
+    tol : float, optional
+        The merging distance.
+        Default is the tolerance corresponding to the global precision setting (``compas.PRECISION``).
+
+    Returns
+    -------
+    tuple
+        The indices of the unique points, i.e. of the first point of every group of merged points,
+        and for every point the index of its group in the list of unique points.
+
+    Notes
+    -----
+    The points are visited in order.
+    A point that is closer than the tolerance to the first point of an existing group joins that group,
+    otherwise it is the first point of a new group.
+    If there are several such groups, the point joins the earliest one.
+    Merging is therefore not transitive:
+    all points of a group are closer than the tolerance to its first point,
+    and a chain of points with a spacing just below the tolerance is not merged into a single group.
+
+    The first points of the groups are hashed into a grid of cubic cells with the size of the tolerance.
+    Every point is compared to the first points in its own cell and in the 26 neighbouring cells,
+    such that points closer than the tolerance are always found,
+    even if they are on different sides of a cell boundary.
+
+    See Also
+    --------
+    :func:`compas.geometry.weld_points_numpy`
+
+    Examples
+    --------
+    >>> unique, remap = weld_points([[0, 0, 0], [1, 0, 0], [0.0004, 0, 0], [0.9996, 0, 0]], 0.001)
+    >>> unique
+    [0, 1]
+    >>> remap
+    [0, 1, 0, 1]
+
+    """
+    if tol is None:
+        tol = tolerance_from_precision()
+    tol2 = tol * tol
+    points = [[float(x), float(y), float(z)] for x, y, z in points]
+
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    cells = {}
+    unique = []
+    remap = []
+    for i, (x, y, z) in enumerate(points):
+        cx, cy, cz = int(floor(x / tol)), int(floor(y / tol)), int(floor(z / tol))
+        group = None
+        for dx, dy, dz in offsets:
+            for index in cells.get((cx + dx, cy + dy, cz + dz), ()):
+                if group is not None and index > group:
+                    continue
+                a, b, c = points[unique[index]]
+                if (x - a) ** 2 + (y - b) ** 2 + (z - c) ** 2 < tol2:
+                    group = index
+        if group is None:
+            group = len(unique)
+            unique.append(i)
+            cells.setdefault((cx, cy, cz), []).append(group)
+        remap.append(group)
+    return unique, remap
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,241 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import arange
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import einsum
+from numpy import float64
+from numpy import floor
+from numpy import int64
+from numpy import lexsort
+from numpy import maximum
+from numpy import minimum
+from numpy import ones
+from numpy import r_
+from numpy import repeat
+from numpy import searchsorted
+from numpy import unique
+from numpy import vstack
+from numpy import where
+from numpy import zeros
+
+from compas.utilities import tolerance_from_precision
+
+
+__all__ = [
+    'weld_points_numpy'
+]
+
+
+# the cell itself and half of its 26 neighbours, such that every pair of neighbouring cells is visited once
+OFFSETS = [(0, 0, 0)] + [(dx, dy, dz)
+                         for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                         if (dx, dy, dz) > (0, 0, 0)]
+
+
+def _unique_rows(A):
+    # the unique rows of A in lexicographic order,
+    # the index of the first occurrence of every unique row, and the unique row of every row
+    order = lexsort(A.T[::-1])
+    S = A[order]
+    flag = r_[True, (S[1:] != S[:-1]).any(axis=1)]
+    inverse = zeros(len(A), dtype=int64)
+    inverse[order] = flag.cumsum() - 1
+    return S[flag], order[flag], inverse
+
+
+def _find_rows(U, Q):
+    # the position of every row of Q in the unique, lexicographically sorted rows of U,
+    # and whether it was found
+    k = len(U)
+    A = vstack((U, Q))
+    query = r_[zeros(k, dtype=int64), ones(len(Q), dtype=int64)]
+    order = lexsort((query,) + tuple(A.T[::-1]))
+    # the last row of U at or before every position in the merged order
+    last = maximum.accumulate(where(order < k, order, -1))
+    position = zeros(len(Q), dtype=int64)
+    position[order[order >= k] - k] = last[order >= k]
+    found = (position >= 0) & (U[maximum(position, 0)] == Q).all(axis=1)
+    return position, found
+
+
+def weld_points_numpy(points, tol=None):
+    """Merge points that are within a tolerance distance of each other, using NumPy.
+
+    Parameters
+    ----------
+    points : array-like
+        The XYZ coordinates of the points.
+    tol : float, optional
+        The merging distance.
+        Default is the tolerance corresponding to the global precision setting (``compas.PRECISION``).
+
+    Returns
+    -------
+    tuple
+        An array with the indices of the unique points, i.e. of the first point of every group of merged points,
+        and an array with for every point the index of its group in the array of unique points.
+
+    Notes
+    -----
+    The result is the same as that of :func:`compas.geometry.weld_points`.
+    Points are hashed into a grid of cubic cells with the size of the tolerance,
+    and the candidate pairs of points in the same and in neighbouring cells are generated and tested in bulk.
+    The first points of the groups are then identified in rounds over all pairs that are closer than the tolerance:
+    a point is the first point of a group if none of the earlier points it is paired with is,
+    and it joins a group if one of them is.
+    Points that are still undecided when the rounds stop making progress, e.g. in long chains,
+    are resolved one after the other.
+
+    Exact duplicates are merged first, so that many copies of the same point do not
+    result in a quadratic number of candidate pairs.
+
+    Examples
+    --------
+    >>> unique, remap = weld_points_numpy([[0, 0, 0], [1, 0, 0], [0.0004, 0, 0], [0.9996, 0, 0]], 0.001)
+    >>> unique.tolist()
+    [0, 1]
+    >>> remap.tolist()
+    [0, 1, 0, 1]
+
+    """
+    if tol is None:
+        tol = tolerance_from_precision()
+    P = asarray(points, dtype=float64).reshape((-1, 3))
+    n = len(P)
+    if not n:
+        return zeros(0, dtype=int64), zeros(0, dtype=int64)
+
+    # exact duplicates, in the order of their first occurrence
+    X, first, duplicate = _unique_rows(P)
+    m = len(X)
+    rank = first.argsort()
+    index = zeros(m, dtype=int64)
+    index[rank] = arange(m)
+    X = X[rank]
+    first = first[rank]
+    duplicate = index[duplicate]
+
+    # cells of the distinct points, and the points of every cell as a contiguous range
+    C = floor(X / tol).astype(int64)
+    lo = C.min(axis=0) - 1
+    extent = C.max(axis=0) - lo + 2
+    scalar = float(extent[0]) * float(extent[1]) * float(extent[2]) < 2 ** 62
+    if scalar:
+        # a single integer key per cell, such that neighbouring cells have neighbouring keys
+        stride = asarray([extent[1] * extent[2], extent[2], 1], dtype=int64)
+        keys, cell = unique((C - lo).dot(stride), return_inverse=True)
+    else:
+        cells, _, cell = _unique_rows(C)
+    count = bincount(cell)
+    order = cell.argsort(kind='mergesort')
+    start = concatenate(([0], count.cumsum()[:-1]))
+
+    I = []  # noqa: E741
+    J = []
+    for offset in OFFSETS:
+        # find the neighbouring cells at this offset in the list of cells
+        if scalar:
+            shifted = keys + stride.dot(offset)
+            b = minimum(searchsorted(keys, shifted), len(keys) - 1)
+            found = keys[b] == shifted
+        else:
+            b, found = _find_rows(cells, cells + offset)
+        a = arange(len(count))[found]
+        b = b[found]
+        # all pairs of points of the two cells
+        size = count[a] * count[b]
+        local = arange(size.sum()) - repeat(size.cumsum() - size, size)
+        width = repeat(count[b], size)
+        i = order[repeat(start[a], size) + local // width]
+        j = order[repeat(start[b], size) + local % width]
+        if offset == (0, 0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        d = X[i] - X[j]
+        keep = einsum('ij,ij->i', d, d) < tol * tol
+        I.append(minimum(i[keep], j[keep]))
+        J.append(maximum(i[keep], j[keep]))
+
+    # the earlier and the later point of every pair
+    I = concatenate(I)  # noqa: E741
+    J = concatenate(J)
+    leader = _leaders(I, J, m)
+
+    # every point joins the earliest first point of a group it is paired with
+    group = arange(m)
+    follower = ~leader[J] & leader[I]
+    group[~leader] = m
+    minimum.at(group, J[follower], I[follower])
+
+    number = leader.cumsum() - 1
+    unique_points = first[leader]
+    remap = number[group][duplicate]
+    return unique_points, remap
+
+
+def _leaders(earlier, later, m):
+    # whether every point is the first point of a group,
+    # given the pairs of earlier and later points that are within the tolerance
+    state = zeros(m, dtype=int64)  # undecided, first point of a group, member of a group
+    while True:
+        pending = state[later] == 0
+        earlier, later = earlier[pending], later[pending]
+        undecided = state == 0
+        remaining = undecided.sum()
+        if not remaining:
+            return state == 1
+        leading = zeros(m, dtype=bool)
+        leading[later[state[earlier] == 1]] = True
+        waiting = zeros(m, dtype=bool)
+        waiting[later[state[earlier] == 0]] = True
+        state[undecided & leading] = 2
+        state[undecided & ~leading & ~waiting] = 1
+        if remaining - (state == 0).sum() < 0.01 * remaining:
+            break
+    # the remaining points one after the other, with the earlier points of every later point
+    pending = state[later] == 0
+    earlier, later = earlier[pending], later[pending]
+    order = later.argsort(kind='mergesort')
+    earlier, later = earlier[order], later[order]
+    start = searchsorted(later, arange(m + 1))
+    state = state.tolist()
+    for j in where(asarray(state) == 0)[0].tolist():
+        state[j] = 2 if any(state[i] == 1 for i in earlier[start[j]:start[j + 1]].tolist()) else 1
+    return asarray(state) == 1
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import time
+
+    from numpy import random
+
+    from compas.geometry import weld_points
+
+    random.seed(0)
+
+    for n in (10000, 100000, 1000000):
+        # a grid of points, with jittered copies of every point
+        points = random.randint(0, 1000, (n, 3)) * 0.01
+        points = concatenate((points, points + (random.rand(n, 3) - 0.5) * 1e-4))
+
+        t0 = time.time()
+        unique_points, remap = weld_points_numpy(points, 1e-3)
+        t1 = time.time()
+        print('points: {0:>8} unique: {1:>8} numpy: {2:.2f}s'.format(len(points), len(unique_points), t1 - t0))
+
+        if n <= 100000:
+            t0 = time.time()
+            expected = weld_points(points.tolist(), 1e-3)
+            t1 = time.time()
+            assert expected[0] == unique_points.tolist()
+            assert expected[1] == remap.tolist()
+            print('{0:>41} python: {1:.2f}s'.format('', t1 - t0))
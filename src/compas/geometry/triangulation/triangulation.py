@@ -4,15 +4,11 @@ from __future__ import division
 
 import random
 
-from compas.geometry import centroid_points
-from compas.geometry import distance_point_point
-from compas.geometry import add_vectors
-from compas.geometry import bounding_box
+from collections import deque
+from fractions import Fraction
 
+from compas.geometry import centroid_points
 from compas.geometry import is_point_in_polygon_xy
-from compas.geometry import is_point_in_triangle_xy
-from compas.geometry import is_point_in_circle_xy
-from compas.geometry import circle_from_points_xy
 
 
 __all__ = [
@@ -20,6 +16,563 @@ __all__ = [
 ]
 
 
+# the error bounds of the floating point evaluation of the predicates
+_EPSILON = 2.0 ** -53
+_CCW_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_ICC_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+
+_NEXT = (1, 2, 0)
+_PREV = (2, 0, 1)
+
+
+# ==============================================================================
+# Predicates
+# ==============================================================================
+
+def _sign(value):
+    if value > 0:
+        return 1.0
+    if value < 0:
+        return -1.0
+    return 0.0
+
+
+def _orient(ax, ay, bx, by, cx, cy):
+    # positive if abc is counterclockwise, negative if clockwise, and zero if collinear
+    # the sign is exact, the value is only meaningful as a sign
+    detleft = (ax - cx) * (by - cy)
+    detright = (ay - cy) * (bx - cx)
+    det = detleft - detright
+    if detleft > 0.0:
+        if detright <= 0.0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0.0:
+        if detright >= 0.0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+    errbound = _CCW_ERRBOUND * detsum
+    if det >= errbound or -det >= errbound:
+        return det
+    ax, ay, bx, by, cx, cy = [Fraction(x) for x in (ax, ay, bx, by, cx, cy)]
+    return _sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def _incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    # positive if d is inside the circle through the counterclockwise triangle abc,
+    # negative if it is outside, and zero if it is on the circle
+    adx = ax - dx
+    ady = ay - dy
+    bdx = bx - dx
+    bdy = by - dy
+    cdx = cx - dx
+    cdy = cy - dy
+    alift = adx * adx + ady * ady
+    blift = bdx * bdx + bdy * bdy
+    clift = cdx * cdx + cdy * cdy
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    # the permanent of the error bound is at most the sum of the products of the lifts
+    errbound = _ICC_ERRBOUND * 1.001 * (alift * blift + blift * clift + clift * alift)
+    if det > errbound or -det > errbound:
+        return det
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift +
+                 (abs(cdxady) + abs(adxcdy)) * blift +
+                 (abs(adxbdy) + abs(bdxady)) * clift)
+    errbound = _ICC_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    adx, ady, bdx, bdy, cdx, cdy = [Fraction(a) - Fraction(b) for a, b in ((ax, dx), (ay, dy), (bx, dx), (by, dy), (cx, dx), (cy, dy))]
+    return _sign((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) +
+                 (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy) +
+                 (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def _is_between(X, Y, a, b, p):
+    # p is strictly between a and b, if the three points are collinear
+    if X[a] != X[b]:
+        return X[a] < X[p] < X[b] or X[b] < X[p] < X[a]
+    return Y[a] < Y[p] < Y[b] or Y[b] < Y[p] < Y[a]
+
+
+def _is_crossing(X, Y, a, b, u, v):
+    # the segments ab and uv intersect in a single point in their interiors
+    ou = _orient(X[a], Y[a], X[b], Y[b], X[u], Y[u])
+    ov = _orient(X[a], Y[a], X[b], Y[b], X[v], Y[v])
+    if not ((ou > 0 and ov < 0) or (ou < 0 and ov > 0)):
+        return False
+    oa = _orient(X[u], Y[u], X[v], Y[v], X[a], Y[a])
+    ob = _orient(X[u], Y[u], X[v], Y[v], X[b], Y[b])
+    return (oa > 0 and ob < 0) or (oa < 0 and ob > 0)
+
+
+# ==============================================================================
+# Insertion order
+# ==============================================================================
+
+def _hilbert_key(x, y, m):
+    # the distance along the Hilbert curve through an m * m grid of the cell (x, y)
+    key = 0
+    s = m >> 1
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        key += s * s * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x = m - 1 - x
+                y = m - 1 - y
+            x, y = y, x
+        s >>= 1
+    return key
+
+
+def _brio_rounds(n):
+    # the ends of the rounds of a biased randomized insertion order,
+    # every round twice as large as the one before
+    ends = []
+    end = n
+    while end > 64:
+        ends.append(end)
+        end //= 2
+    ends.append(end)
+    return ends[::-1]
+
+
+def _brio_order(X, Y, seed=0):
+    # a random order of the points, in rounds of increasing size,
+    # with the points of every round along a Hilbert curve
+    n = len(X)
+    if not n:
+        return []
+    bits = min(16, max(1, (n.bit_length() + 1) // 2))
+    m = 1 << bits
+    xmin, xmax = min(X), max(X)
+    ymin, ymax = min(Y), max(Y)
+    sx = (m - 1) / (xmax - xmin) if xmax > xmin else 0.0
+    sy = (m - 1) / (ymax - ymin) if ymax > ymin else 0.0
+    keys = [_hilbert_key(int((x - xmin) * sx), int((y - ymin) * sy), m) for x, y in zip(X, Y)]
+    indices = list(range(n))
+    random.Random(seed).shuffle(indices)
+    order = []
+    start = 0
+    for end in _brio_rounds(n):
+        order += sorted(indices[start:end], key=keys.__getitem__)
+        start = end
+    return order
+
+
+# ==============================================================================
+# Triangulation
+# ==============================================================================
+
+def _first_triangle(X, Y, order):
+    # the first three points in the insertion order that are not collinear,
+    # in counterclockwise order
+    a = order[0]
+    for b in order:
+        if X[b] != X[a] or Y[b] != Y[a]:
+            break
+    else:
+        return None
+    for c in order:
+        o = _orient(X[a], Y[a], X[b], Y[b], X[c], Y[c])
+        if o > 0:
+            return a, b, c
+        if o < 0:
+            return a, c, b
+    return None
+
+
+def _triangulate(X, Y, order):
+    # incremental Delaunay triangulation with ghost triangles
+    # the triangles are stored in flat lists, with three entries per triangle
+    # T contains the vertices in counterclockwise order
+    # N contains the neighbors opposite to the vertices
+    # the ghost triangles of the edges on the convex hull have the vertex at infinity in last position
+    # VT contains a triangle of every vertex, or -1 for the points that were not inserted
+    INF = len(X)
+    first = _first_triangle(X, Y, order)
+    if first is None:
+        return None
+    a, b, c = first
+    T = [a, b, c, b, a, INF, c, b, INF, a, c, INF]
+    N = [2, 3, 1, 3, 2, 0, 1, 3, 0, 2, 1, 0]
+    VT = [-1] * INF
+    VT[a] = VT[b] = VT[c] = 0
+    ccw_errbound = _CCW_ERRBOUND
+    icc_errbound = _ICC_ERRBOUND * 1.001
+    last = 0
+
+    for p in order:
+        if p == a or p == b or p == c:
+            continue
+        px = X[p]
+        py = Y[p]
+
+        # walk from the last new triangle towards the point
+        # the floating point predicates are only evaluated exactly if the result is uncertain
+        t = last
+        while True:
+            i = 3 * t
+            u = T[i]
+            v = T[i + 1]
+            w = T[i + 2]
+            if w == INF:
+                break
+            for j, (e, f) in enumerate(((v, w), (w, u), (u, v))):
+                detleft = (X[e] - px) * (Y[f] - py)
+                detright = (Y[e] - py) * (X[f] - px)
+                det = detleft - detright
+                errbound = ccw_errbound * (abs(detleft) + abs(detright))
+                if det < -errbound or (det <= errbound and _orient(X[e], Y[e], X[f], Y[f], px, py) < 0):
+                    t = N[i + j]
+                    break
+            else:
+                break
+        if w != INF and ((X[u] == px and Y[u] == py) or (X[v] == px and Y[v] == py) or (X[w] == px and Y[w] == py)):
+            # duplicate point
+            continue
+
+        # the cavity of the triangles that have the point inside their circumcircles
+        dead = [t]
+        deadset = set(dead)
+        boundary = []
+        for s in dead:
+            i = 3 * s
+            for j in (0, 1, 2):
+                nb = N[i + j]
+                if nb in deadset:
+                    continue
+                q = 3 * nb
+                u = T[q]
+                v = T[q + 1]
+                w = T[q + 2]
+                if w == INF:
+                    o = _orient(X[u], Y[u], X[v], Y[v], px, py)
+                    conflict = o > 0 or (o == 0 and _is_between(X, Y, u, v, p))
+                else:
+                    adx = X[u] - px
+                    ady = Y[u] - py
+                    bdx = X[v] - px
+                    bdy = Y[v] - py
+                    cdx = X[w] - px
+                    cdy = Y[w] - py
+                    alift = adx * adx + ady * ady
+                    blift = bdx * bdx + bdy * bdy
+                    clift = cdx * cdx + cdy * cdy
+                    det = alift * (bdx * cdy - cdx * bdy) + blift * (cdx * ady - adx * cdy) + clift * (adx * bdy - bdx * ady)
+                    errbound = icc_errbound * (alift * blift + blift * clift + clift * alift)
+                    if det > errbound:
+                        conflict = True
+                    elif det < -errbound:
+                        conflict = False
+                    else:
+                        conflict = _incircle(X[u], Y[u], X[v], Y[v], X[w], Y[w], px, py) > 0
+                if conflict:
+                    deadset.add(nb)
+                    dead.append(nb)
+                else:
+                    back = q if N[q] == s else (q + 1 if N[q + 1] == s else q + 2)
+                    boundary.append((T[i + _NEXT[j]], T[i + _PREV[j]], nb, back))
+
+        # connect the point to the boundary edges of the cavity
+        # there are two more new triangles than triangles in the cavity
+        m = len(N) // 3
+        dead += [m, m + 1]
+        T += [0, 0, 0, 0, 0, 0]
+        N += [0, 0, 0, 0, 0, 0]
+        first = {}
+        links = []
+        for (u, v, nb, back), t in zip(boundary, dead):
+            q = 3 * t
+            if u == INF:
+                T[q], T[q + 1], T[q + 2] = v, p, u
+                qu, qv, qp = q + 2, q, q + 1
+            elif v == INF:
+                T[q], T[q + 1], T[q + 2] = p, u, v
+                qu, qv, qp = q + 1, q + 2, q
+                VT[u] = t
+            else:
+                T[q], T[q + 1], T[q + 2] = u, v, p
+                qu, qv, qp = q, q + 1, q + 2
+                VT[u] = t
+                last = t
+            N[qp] = nb
+            N[back] = t
+            first[u] = t, qv
+            links.append((t, v, qu))
+        for t, v, qu in links:
+            s, qv = first[v]
+            N[qu] = s
+            N[qv] = t
+        VT[p] = last
+
+    return T, N, VT, INF
+
+
+def _faces(T, INF):
+    return [T[i:i + 3] for i in range(0, len(T), 3) if T[i + 2] != INF]
+
+
+# ==============================================================================
+# Constraints
+# ==============================================================================
+
+def _edge_key(u, v):
+    return (u, v) if u < v else (v, u)
+
+
+def _find_edge(T, N, VT, u, v):
+    # the triangle with the halfedge from u to v,
+    # and the position of the vertex opposite to it
+    t = start = VT[u]
+    while True:
+        i = 3 * t
+        j = 0 if T[i] == u else (1 if T[i + 1] == u else 2)
+        if T[i + (j + 1) % 3] == v:
+            return t, (j + 2) % 3
+        t = N[i + (j + 2) % 3]
+        if t == start:
+            return None
+
+
+def _replace_neighbor(N, t, old, new):
+    i = 3 * t
+    if N[i] == old:
+        N[i] = new
+    elif N[i + 1] == old:
+        N[i + 1] = new
+    else:
+        N[i + 2] = new
+
+
+def _opposite(T, N, t, k):
+    # the neighbor of triangle t opposite to its vertex at position k,
+    # and the position of the vertex of the neighbor opposite to t
+    s = N[3 * t + k]
+    j = 3 * s
+    m = 0 if N[j] == t else (1 if N[j + 1] == t else 2)
+    return s, m
+
+
+def _flip(T, N, VT, t, k):
+    # flip the edge opposite to the vertex at position k of triangle t
+    # the triangles (w, u, v) and (x, v, u) become (w, u, x) and (x, v, w)
+    i = 3 * t
+    w = T[i + k]
+    u = T[i + (k + 1) % 3]
+    v = T[i + (k + 2) % 3]
+    tu = N[i + (k + 1) % 3]
+    tv = N[i + (k + 2) % 3]
+    s, m = _opposite(T, N, t, k)
+    j = 3 * s
+    x = T[j + m]
+    sv = N[j + (m + 1) % 3]
+    su = N[j + (m + 2) % 3]
+    T[i], T[i + 1], T[i + 2] = w, u, x
+    N[i], N[i + 1], N[i + 2] = sv, s, tv
+    T[j], T[j + 1], T[j + 2] = x, v, w
+    N[j], N[j + 1], N[j + 2] = tu, t, su
+    _replace_neighbor(N, sv, s, t)
+    _replace_neighbor(N, tu, t, s)
+    VT[u] = VT[w] = t
+    VT[v] = VT[x] = s
+    return w, x
+
+
+def _is_same_direction(X, Y, a, b, c):
+    # c is in the direction of b from a, if the three points are collinear
+    return ((X[b] > X[a]) == (X[c] > X[a]) and (X[b] < X[a]) == (X[c] < X[a]) and
+            (Y[b] > Y[a]) == (Y[c] > Y[a]) and (Y[b] < Y[a]) == (Y[c] < Y[a]))
+
+
+def _crossed_edges(X, Y, T, N, VT, INF, a, b):
+    # the edges crossed by the segment from a to b, from a to b,
+    # up to b or to the first vertex on the segment
+    # the first vertex of every edge is on the right of the segment
+    ax, ay, bx, by = X[a], Y[a], X[b], Y[b]
+    t = start = VT[a]
+    while True:
+        i = 3 * t
+        j = 0 if T[i] == a else (1 if T[i + 1] == a else 2)
+        u = T[i + (j + 1) % 3]
+        v = T[i + (j + 2) % 3]
+        if u != INF and v != INF:
+            ou = _orient(ax, ay, bx, by, X[u], Y[u])
+            ov = _orient(ax, ay, bx, by, X[v], Y[v])
+            if ou == 0 and _is_same_direction(X, Y, a, b, u):
+                return [], u
+            if ov == 0 and _is_same_direction(X, Y, a, b, v):
+                return [], v
+            if ou < 0 and ov > 0:
+                break
+        t = N[i + (j + 2) % 3]
+        if t == start:
+            raise Exception('The segment does not start in the triangulation.')
+    edges = [(u, v)]
+    while True:
+        s, m = _opposite(T, N, t, j)
+        w = T[3 * s + m]
+        if w == b:
+            return edges, b
+        ow = _orient(ax, ay, bx, by, X[w], Y[w])
+        if ow == 0:
+            return edges, w
+        t = s
+        if ow < 0:
+            u = w
+            j = 0 if T[3 * s] == v else (1 if T[3 * s + 1] == v else 2)
+            j = (j + 1) % 3
+        else:
+            v = w
+            j = 0 if T[3 * s] == u else (1 if T[3 * s + 1] == u else 2)
+            j = (j + 2) % 3
+        edges.append((u, v))
+
+
+def _insert_segment(X, Y, T, N, VT, INF, a, b, constrained):
+    # recover the segment from a to b as edges of the triangulation,
+    # by flipping the edges that cross it,
+    # and restore the Delaunay property of the new edges
+    # constrained counts the number of segments of every constrained edge
+    segments = [(a, b)]
+    while segments:
+        a, b = segments.pop()
+        if a == b:
+            continue
+        edges, c = _crossed_edges(X, Y, T, N, VT, INF, a, b)
+        if c != b:
+            segments.append((c, b))
+            b = c
+        key = _edge_key(a, b)
+        constrained[key] = constrained.get(key, 0) + 1
+        queue = deque(edges)
+        new = []
+        while queue:
+            u, v = queue.popleft()
+            t, k = _find_edge(T, N, VT, u, v)
+            w = T[3 * t + k]
+            s, m = _opposite(T, N, t, k)
+            x = T[3 * s + m]
+            convex = (_orient(X[w], Y[w], X[u], Y[u], X[x], Y[x]) > 0 and
+                      _orient(X[x], Y[x], X[v], Y[v], X[w], Y[w]) > 0)
+            if not convex:
+                queue.append((u, v))
+                continue
+            w, x = _flip(T, N, VT, t, k)
+            if _is_crossing(X, Y, a, b, w, x):
+                if _orient(X[a], Y[a], X[b], Y[b], X[w], Y[w]) < 0:
+                    queue.append((w, x))
+                else:
+                    queue.append((x, w))
+            else:
+                new.append((w, x))
+        swapped = True
+        while swapped:
+            swapped = False
+            for index, (u, v) in enumerate(new):
+                if _edge_key(u, v) in constrained:
+                    continue
+                t, k = _find_edge(T, N, VT, u, v)
+                s, m = _opposite(T, N, t, k)
+                i = 3 * t
+                x = T[3 * s + m]
+                if x == INF or T[i + 2] == INF:
+                    continue
+                if _incircle(X[T[i]], Y[T[i]], X[T[i + 1]], Y[T[i + 1]], X[T[i + 2]], Y[T[i + 2]], X[x], Y[x]) > 0:
+                    new[index] = _flip(T, N, VT, t, k)
+                    swapped = True
+
+
+def _polygon_vertices(X, Y, VT, polygons):
+    # the indices of the vertices of the polygons,
+    # or None if not all polygon vertices are triangulation vertices
+    index = {}
+    for i, t in enumerate(VT):
+        if t >= 0:
+            index[X[i], Y[i]] = i
+    vertices = []
+    for polygon in polygons:
+        keys = [index.get((float(point[0]), float(point[1]))) for point in polygon]
+        if None in keys:
+            return None
+        vertices.append(keys)
+    return vertices
+
+
+def _faces_in_polygons(T, N, INF, constrained, odd):
+    # the faces that are separated from the outside by an odd or even number of polygon edges
+    n = len(T) // 3
+    parity = [-1] * n
+    queue = deque()
+    for t in range(n):
+        if T[3 * t + 2] == INF:
+            parity[t] = 0
+            queue.append(t)
+    while queue:
+        t = queue.popleft()
+        i = 3 * t
+        for j in (0, 1, 2):
+            s = N[i + j]
+            if parity[s] < 0:
+                count = constrained.get(_edge_key(T[i + _NEXT[j]], T[i + _PREV[j]]), 0)
+                parity[s] = (parity[t] + count) % 2
+                queue.append(s)
+    return [T[3 * t:3 * t + 3] for t in range(n) if T[3 * t + 2] != INF and parity[t] == odd]
+
+
+def _delaunay_faces(X, Y, order, boundary=None, holes=None, select=None):
+    # the faces of the triangulation of the points, in the given insertion order,
+    # inside the boundary and outside the holes
+    # select is the function that selects the faces by their centroids,
+    # if the vertices of the polygons are not points of the triangulation
+    triangulation = _triangulate(X, Y, order)
+    if triangulation is None:
+        return []
+    T, N, VT, INF = triangulation
+    polygons = ([boundary] if boundary else []) + list(holes or [])
+    vertices = _polygon_vertices(X, Y, VT, polygons) if polygons else None
+    if not polygons:
+        faces = _faces(T, INF)
+    elif vertices is None:
+        faces = (select or _faces_in_polygons_xy)(X, Y, _faces(T, INF), boundary, holes)
+    else:
+        constrained = {}
+        for polygon in vertices:
+            for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+                _insert_segment(X, Y, T, N, VT, INF, a, b, constrained)
+        faces = _faces_in_polygons(T, N, INF, constrained, 1 if boundary else 0)
+    if -1 in VT:
+        # refer to the first of the points with the same coordinates
+        index = {}
+        for i in range(len(X) - 1, -1, -1):
+            index[X[i], Y[i]] = i
+        faces = [[index[X[i], Y[i]] for i in face] for face in faces]
+    return faces
+
+
+def _faces_in_polygons_xy(X, Y, faces, boundary=None, holes=None):
+    # the faces with their centroid inside the boundary and outside the holes
+    result = []
+    for face in faces:
+        centroid = centroid_points([[X[i], Y[i], 0.0] for i in face])
+        if boundary and not is_point_in_polygon_xy(centroid, boundary):
+            continue
+        if holes and any(is_point_in_polygon_xy(centroid, hole) for hole in holes):
+            continue
+        result.append(face)
+    return result
+
+
 def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
     """Computes the delaunay triangulation for a list of points.
 
@@ -31,6 +584,9 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
         list of ordered points describing the outer boundary (optional)
     holes : list of sequences of tuples
         list of polygons (ordered points describing internal holes (optional)
+    tiny : float, optional
+        Not used.
+        The points are no longer perturbed, since the predicates are exact.
 
     Returns
     -------
@@ -40,12 +596,27 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
 
     Notes
     -----
-    For more info, see [1]_.
+    The points are inserted one by one [1]_, in rounds of increasing size,
+    with the points of every round sorted along a Hilbert curve.
+    The triangle that contains the next point is found by walking from the last new triangle,
+    which takes a few steps in this order.
+    The orientation and in-circle tests have an exact sign [2]_,
+    such that collinear and cocircular points are handled correctly.
+    Points with the same XY coordinates are only inserted once.
+
+    If the vertices of the boundary and the holes are points of the triangulation,
+    the edges of the polygons are inserted as constraints [3]_,
+    and only the faces inside the boundary and outside the holes are returned.
+    Otherwise, the faces are selected by their centroids.
 
     References
     ----------
     .. [1] Sloan, S. W., 1987 *A fast algorithm for constructing Delaunay triangulations in the plane*
-           Advances in Engineering Software 9(1): 34-55, 1978.
+           Advances in Engineering Software 9(1): 34-55.
+    .. [2] Shewchuk, J. R., 1997 *Adaptive precision floating-point arithmetic and fast robust geometric predicates*
+           Discrete & Computational Geometry 18(3): 305-363.
+    .. [3] Sloan, S. W., 1993 *A fast algorithm for generating constrained Delaunay triangulations*
+           Computers & Structures 47(3): 441-450.
 
     Example
     -------
@@ -68,115 +639,9 @@ def delaunay_from_points(points, boundary=None, holes=None, tiny=1e-12):
         plotter.show()
 
     """
-    from compas.datastructures import Mesh
-    from compas.datastructures import trimesh_swap_edge
-
-    def super_triangle(coords):
-        centpt = centroid_points(coords)
-        bbpts = bounding_box(coords)
-        dis = distance_point_point(bbpts[0], bbpts[2])
-        dis = dis * 300
-        v1 = (0 * dis, 2 * dis, 0)
-        v2 = (1.73205 * dis, -1.0000000000001 * dis, 0)  # due to numerical issues
-        v3 = (-1.73205 * dis, -1 * dis, 0)
-        pt1 = add_vectors(centpt, v1)
-        pt2 = add_vectors(centpt, v2)
-        pt3 = add_vectors(centpt, v3)
-        return pt1, pt2, pt3
-
-    mesh = Mesh()
-
-    # to avoid numerical issues for perfectly structured point sets
-    points = [(point[0] + random.uniform(-tiny, tiny), point[1] + random.uniform(-tiny, tiny), 0.0) for point in points]
-
-    # create super triangle
-    pt1, pt2, pt3 = super_triangle(points)
-
-    # add super triangle vertices to mesh
-    n = len(points)
-    super_keys = n, n + 1, n + 2
-
-    mesh.add_vertex(super_keys[0], {'x': pt1[0], 'y': pt1[1], 'z': pt1[2]})
-    mesh.add_vertex(super_keys[1], {'x': pt2[0], 'y': pt2[1], 'z': pt2[2]})
-    mesh.add_vertex(super_keys[2], {'x': pt3[0], 'y': pt3[1], 'z': pt3[2]})
-
-    mesh.add_face(super_keys)
-
-    # iterate over points
-    for i, pt in enumerate(points):
-        key = i
-
-        # newtris should be intialised here
-
-        # check in which triangle this point falls
-        for fkey in list(mesh.faces()):
-            # abc = mesh.face_coordinates(fkey) #This is slower
-            # This is faster:
-            keya, keyb, keyc = mesh.face_vertices(fkey)
-
-            dicta = mesh.vertex[keya]
-            dictb = mesh.vertex[keyb]
-            dictc = mesh.vertex[keyc]
-
-            a = [dicta['x'], dicta['y']]
-            b = [dictb['x'], dictb['y']]
-            c = [dictc['x'], dictc['y']]
-
-            if is_point_in_triangle_xy(pt, [a, b, c], True):
-                # generate 3 new triangles (faces) and delete surrounding triangle
-                key, newtris = mesh.insert_vertex(fkey, key=key, xyz=pt, return_fkeys=True)
-                break
-
-        while newtris:
-            fkey = newtris.pop()
-
-            # get opposite_face
-            keys = mesh.face_vertices(fkey)
-            s = list(set(keys) - set([key]))
-            u, v = s[0], s[1]
-            fkey1 = mesh.halfedge[u][v]
-
-            if fkey1 != fkey:
-                fkey_op, u, v = fkey1, u, v
-            else:
-                fkey_op, u, v = mesh.halfedge[v][u], u, v
-
-            if fkey_op:
-                keya, keyb, keyc = mesh.face_vertices(fkey_op)
-                dicta = mesh.vertex[keya]
-                a = [dicta['x'], dicta['y']]
-                dictb = mesh.vertex[keyb]
-                b = [dictb['x'], dictb['y']]
-                dictc = mesh.vertex[keyc]
-                c = [dictc['x'], dictc['y']]
-
-                circle = circle_from_points_xy(a, b, c)
-
-                if is_point_in_circle_xy(pt, circle):
-                    fkey, fkey_op = trimesh_swap_edge(mesh, u, v)
-                    newtris.append(fkey)
-                    newtris.append(fkey_op)
-
-    # Delete faces adjacent to supertriangle
-    for key in super_keys:
-        mesh.delete_vertex(key)
-
-    # Delete faces outside of boundary
-    if boundary:
-        for fkey in list(mesh.faces()):
-            centroid = mesh.face_centroid(fkey)
-            if not is_point_in_polygon_xy(centroid, boundary):
-                mesh.delete_face(fkey)
-
-    # Delete faces inside of inside boundaries
-    if holes:
-        for polygon in holes:
-            for fkey in list(mesh.faces()):
-                centroid = mesh.face_centroid(fkey)
-                if is_point_in_polygon_xy(centroid, polygon):
-                    mesh.delete_face(fkey)
-
-    return [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    X = [float(point[0]) for point in points]
+    Y = [float(point[1]) for point in points]
+    return _delaunay_faces(X, Y, _brio_order(X, Y), boundary, holes)
 
 
 # def voronoi_from_delaunay(delaunay):
@@ -2,17 +2,120 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+from numpy import abs
+from numpy import argsort
+from numpy import array
 from numpy import asarray
+from numpy import concatenate
+from numpy import float64
+from numpy import int64
+from numpy import nonzero
+from numpy import ones
+from numpy import roll
+from numpy import where
+from numpy import zeros
+from numpy.random import RandomState
+
 from scipy.spatial import Voronoi
 from scipy.spatial import Delaunay
 
+from compas.geometry.triangulation.triangulation import _CCW_ERRBOUND
+from compas.geometry.triangulation.triangulation import _brio_rounds
+from compas.geometry.triangulation.triangulation import _delaunay_faces
+from compas.geometry.triangulation.triangulation import _orient
+
 
 __all__ = [
     'delaunay_from_points_numpy',
+    'delaunay_incremental_numpy',
     'voronoi_from_points_numpy',
 ]
 
 
+def _orient_numpy(a, b, c):
+    # for every row, positive if abc is counterclockwise, negative if clockwise, and zero if collinear
+    # the signs are exact, the values are only meaningful as signs
+    # the rows for which the floating point result is uncertain are evaluated exactly
+    a, b, c = [asarray(x, dtype=float64) for x in (a, b, c)]
+    detleft = (a[..., 0] - c[..., 0]) * (b[..., 1] - c[..., 1])
+    detright = (a[..., 1] - c[..., 1]) * (b[..., 0] - c[..., 0])
+    det = detleft - detright
+    errbound = _CCW_ERRBOUND * (abs(detleft) + abs(detright))
+    uncertain = nonzero(abs(det) <= errbound)
+    if len(uncertain[0]):
+        a, b, c = [x[uncertain].tolist() for x in (a, b, c)]
+        det[uncertain] = [_orient(ax, ay, bx, by, cx, cy) for (ax, ay), (bx, by), (cx, cy) in zip(a, b, c)]
+    return det
+
+
+def _hilbert_keys_numpy(x, y, m):
+    # the distances along the Hilbert curve through an m * m grid of the cells (x, y)
+    x = x.copy()
+    y = y.copy()
+    keys = zeros(len(x), dtype=int64)
+    s = m >> 1
+    while s:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+        flip = ~ry & rx
+        x[flip] = m - 1 - x[flip]
+        y[flip] = m - 1 - y[flip]
+        swap = ~ry
+        x[swap], y[swap] = y[swap], x[swap]
+        s >>= 1
+    return keys
+
+
+def _brio_order_numpy(xy, seed=0):
+    # the same order as compas.geometry.triangulation.triangulation._brio_order,
+    # with a different random permutation
+    n = len(xy)
+    if not n:
+        return []
+    bits = min(16, max(1, (n.bit_length() + 1) // 2))
+    m = 1 << bits
+    xymin = xy.min(axis=0)
+    span = xy.max(axis=0) - xymin
+    scale = where(span > 0, (m - 1) / where(span > 0, span, 1.0), 0.0)
+    cells = ((xy - xymin) * scale).astype(int64)
+    keys = _hilbert_keys_numpy(cells[:, 0], cells[:, 1], m)
+    indices = RandomState(seed).permutation(n)
+    order = []
+    start = 0
+    for end in _brio_rounds(n):
+        order.append(indices[start:end][argsort(keys[indices[start:end]], kind='stable')])
+        start = end
+    return concatenate(order).tolist()
+
+
+def _faces_in_polygons_xy_numpy(X, Y, faces, boundary=None, holes=None):
+    # the faces with their centroid inside the boundary and outside the holes
+    faces = array(faces, dtype=int64).reshape((-1, 3))
+    xy = array([X, Y]).T
+    centroids = xy[faces].mean(axis=1)
+    inside = ones(len(faces), dtype=bool)
+    if boundary:
+        inside &= _is_point_in_polygon_xy_numpy(centroids, boundary)
+    for hole in holes or []:
+        inside &= ~_is_point_in_polygon_xy_numpy(centroids, hole)
+    return faces[inside].tolist()
+
+
+def _is_point_in_polygon_xy_numpy(points, polygon):
+    # the winding numbers of the points with respect to the polygon are not zero
+    polygon = asarray(polygon, dtype=float64)[:, :2]
+    winding = zeros(len(points), dtype=int64)
+    for a, b in zip(polygon, roll(polygon, -1, axis=0)):
+        up = (a[1] <= points[:, 1]) & (points[:, 1] < b[1])
+        down = (b[1] <= points[:, 1]) & (points[:, 1] < a[1])
+        crossing = nonzero(up | down)[0]
+        o = _orient_numpy(a, b, points[crossing])
+        winding[crossing[up[crossing] & (o > 0)]] += 1
+        winding[crossing[down[crossing] & (o < 0)]] -= 1
+    return winding != 0
+
+
 def delaunay_from_points_numpy(points):
     """Computes the delaunay triangulation for a list of points using Numpy.
 
@@ -57,6 +160,56 @@ def delaunay_from_points_numpy(points):
     return d.simplices
 
 
+def delaunay_incremental_numpy(points, boundary=None, holes=None):
+    """Computes the delaunay triangulation of a list of points by inserting them one by one.
+
+    Parameters
+    ----------
+    points : sequence of tuple
+        XYZ coordinates of the original points.
+    boundary : sequence of tuple, optional
+        Ordered points describing the outer boundary.
+    holes : list of sequence of tuple, optional
+        Polygons of ordered points describing internal holes.
+
+    Returns
+    -------
+    array
+        The faces of the triangulation, in counterclockwise order.
+        Each face is a triplet of indices referring to the list of point coordinates.
+
+    Notes
+    -----
+    This is the same triangulation as :func:`compas.geometry.delaunay_from_points`,
+    with the spatial sort of the points and the selection of the faces
+    inside the boundary and outside the holes computed with NumPy.
+    The points are inserted in a loop, since every insertion depends on the previous ones.
+
+    For points in general position, the faces are the same as the ones of
+    :func:`delaunay_from_points_numpy`, but the points need not be in general position,
+    and the edges of the boundary and the holes are edges of the triangulation,
+    if their vertices are points of the triangulation.
+
+    Examples
+    --------
+    >>> boundary = [[0.0, 0.0, 0.0], [3.0, 0.0, 0.0], [3.0, 3.0, 0.0], [0.0, 3.0, 0.0]]
+    >>> hole = [[1.0, 1.0, 0.0], [2.0, 1.0, 0.0], [2.0, 2.0, 0.0], [1.0, 2.0, 0.0]]
+    >>> faces = delaunay_incremental_numpy(boundary + hole)
+    >>> len(faces)
+    10
+    >>> faces = delaunay_incremental_numpy(boundary + hole, boundary=boundary, holes=[hole])
+    >>> len(faces)
+    8
+
+    """
+    if not len(points):
+        return zeros((0, 3), dtype=int64)
+    xy = asarray(points, dtype=float64)[:, :2]
+    X, Y = xy.T.tolist()
+    faces = _delaunay_faces(X, Y, _brio_order_numpy(xy), boundary, holes, _faces_in_polygons_xy_numpy)
+    return array(faces, dtype=int64).reshape((-1, 3))
+
+
 def voronoi_from_points_numpy(points):
     """Generate a voronoi diagram from a set of points.
 
@@ -150,16 +303,34 @@ def voronoi_from_points_numpy(points):
 # ==============================================================================
 
 if __name__ == "__main__":
-    from compas.datastructures import Mesh
-    from compas.geometry import pointcloud_xy
-    from compas_plotters import MeshPlotter
 
-    points = pointcloud_xy(10, (0, 50))
-    faces = delaunay_from_points_numpy(points)
+    import doctest
+    import random
+    import time
+
+    from compas.geometry import delaunay_from_points
+
+    doctest.testmod(globs=globals())
+
+    def sorted_faces(faces):
+        return sorted(tuple(sorted(face)) for face in faces)
+
+    random.seed(0)
+
+    for n in (10000, 100000, 1000000):
+        points = [[random.random(), random.random(), 0.0] for _ in range(n)]
 
-    delaunay = Mesh.from_vertices_and_faces(points, faces)
+        t0 = time.time()
+        faces_qhull = delaunay_from_points_numpy(points)
+        t1 = time.time()
+        faces_numpy = delaunay_incremental_numpy(points)
+        t2 = time.time()
+        assert sorted_faces(faces_numpy.tolist()) == sorted_faces(faces_qhull.tolist())
+        print('{0} points: qhull {1:.2f}s incremental numpy {2:.2f}s'.format(n, t1 - t0, t2 - t1))
 
-    plotter = MeshPlotter(delaunay, figsize=(8, 5))
-    plotter.draw_vertices(radius=0.1)
-    plotter.draw_faces()
-    plotter.show()
+        if n <= 100000:
+            t0 = time.time()
+            faces = delaunay_from_points(points)
+            t1 = time.time()
+            assert sorted_faces(faces) == sorted_faces(faces_qhull.tolist())
+            print('{0} points: incremental {1:.2f}s'.format(n, t1 - t0))
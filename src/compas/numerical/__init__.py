@@ -13,14 +13,22 @@ Solvers
     :nosignatures:
 
     devo_numpy
+    devo_numpy_multistart
     dr
     dr_numpy
+    DRNumpy
     drx_numpy
     fd_numpy
+    FDNumpy
     ga
+    ga_numpy
+    GANumpy
+    GACheckpoint
     moga
+    FitnessEvaluator
     pca_numpy
     topop_numpy
+    TopopNumpy
 
 
 Linalg
@@ -3,33 +3,66 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from functools import partial
+
 from numpy import array
 from numpy import argsort
 from numpy import argmin
-from numpy import delete
-from numpy import eye
+from numpy import asarray
 from numpy import floor
 from numpy import max
 from numpy import min
 from numpy import newaxis
 from numpy import ones
-from numpy import reshape
 from numpy import tile
 from numpy import where
-from numpy import zeros
-from numpy.random import choice
-from numpy.random import rand
+from numpy.random import randint
+from numpy.random import RandomState
+import numpy.random
 
 from scipy.optimize import fmin_l_bfgs_b
 
 from time import time
 
 
-__all__ = ['devo_numpy']
+__all__ = [
+    'devo_numpy',
+    'devo_numpy_multistart',
+]
+
+
+def _call(fn, args, u):
+    # module level, such that it can be sent to the workers of a process pool
+    return fn(u, *args)
+
+
+def _call_vectorized(fn, u, *args):
+    # the objective value of a single agent, with a vectorized objective function
+    return fn(u[:, newaxis], *args)[0]
+
+
+def _evaluate(fn, agents, args, vectorized, executor, chunksize):
+    # the objective values of the agents, which are the columns of the array
+    if vectorized:
+        return asarray(fn(agents, *args), dtype=float).ravel()
+    if executor is None:
+        return array([fn(agents[:, i], *args) for i in range(agents.shape[1])], dtype=float)
+    func = partial(_call, fn, args)
+    if chunksize > 1:
+        return array(list(executor.map(func, agents.T, chunksize=chunksize)), dtype=float)
+    return array(list(executor.map(func, agents.T)), dtype=float)
+
+
+def _candidates(population, random_state):
+    # three distinct agents per agent, different from the agent itself
+    inds = random_state.rand(population, population - 1).argpartition(2, axis=1)[:, :3]
+    inds += inds >= array(range(population))[:, newaxis]
+    return inds
 
 
 def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8, CR=0.5, polish=False, args=(),
-               plot=False, frange=[], printout=10, neutrals=0.05, **kwargs):
+               plot=False, frange=[], printout=10, neutrals=0.05, vectorized=False, executor=None, chunksize=1,
+               random_state=None, **kwargs):
     """ Call the Differential Evolution solver.
 
     Parameters
@@ -62,6 +95,18 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
         Print progress to screen.
     neutrals : float
         Fraction of neutral starting agents.
+    vectorized : bool, optional
+        If True, fn is called once per generation with all agents,
+        as an array with shape (number of DoFs, number of agents), and returns an array of objective values.
+        Default is False.
+    executor : concurrent.futures.Executor, optional
+        An executor to evaluate the agents of a generation in parallel, if fn is not vectorized.
+        With a process pool, fn must be defined at the top level of a module.
+    chunksize : int, optional
+        The number of agents sent to a worker of a process pool at once.
+    random_state : numpy.random.RandomState, optional
+        The random number generator of the agents and the cross-overs.
+        Default is ``None``, in which case the global generator of :mod:`numpy.random` is used.
 
     Returns
     -------
@@ -72,6 +117,9 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
 
     Notes
     -----
+    Every generation is evaluated at once, in a single call to a vectorized objective function,
+    with one map over the executor, or one after the other otherwise.
+    A vectorized objective receives the agents as columns, as in :func:`scipy.optimize.differential_evolution`.
 
     References
     ----------
@@ -91,6 +139,9 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
 
     tic = time()
 
+    if random_state is None:
+        random_state = numpy.random
+
     # Heading
     if printout:
         print('\n' + '-' * 50)
@@ -104,19 +155,12 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
     ub = tile(bounds[:, 1][:, newaxis], (1, population))
 
     # Population
-    agents = (rand(k, population) * (ub - lb) + lb)
+    agents = (random_state.rand(k, population) * (ub - lb) + lb)
     agents[:, :int(round(population * neutrals))] *= 0
-    candidates = tile(array(range(population)), (1, population))
-    candidates = reshape(delete(candidates, where(eye(population).ravel() == 1)), (population, population - 1))
 
     # Initial
-    f = zeros(population)
-    for i in range(population):
-        f[i] = fn(agents[:, i], *args)
+    f = _evaluate(fn, agents, args, vectorized, executor, chunksize)
     fopt = min(f)
-    ac = zeros((k, population))
-    bc = zeros((k, population))
-    cc = zeros((k, population))
     ts = 0
     switch = 1
     if printout:
@@ -146,12 +190,7 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
             switch = 0
             elite_agents = argsort(f)[:int(floor(elites * population))]
             population = len(elite_agents)
-            candidates = tile(array(range(population)), (1, population))
-            candidates = reshape(delete(candidates, where(eye(population).ravel() == 1)), (population, population - 1))
             f = f[elite_agents]
-            ac = ac[:, elite_agents]
-            bc = bc[:, elite_agents]
-            cc = cc[:, elite_agents]
             agents = agents[:, elite_agents]
             lb = lb[:, elite_agents]
             ub = ub[:, elite_agents]
@@ -177,22 +216,19 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
                 plt.xlabel('Generations')
                 plt.pause(0.001)
         # Pick candidates
-        for i in range(population):
-            inds = candidates[i, choice(population - 1, 3, replace=False)]
-            ac[:, i] = agents[:, inds[0]]
-            bc[:, i] = agents[:, inds[1]]
-            cc[:, i] = agents[:, inds[2]]
+        inds = _candidates(population, random_state)
+        ac = agents[:, inds[:, 0]]
+        bc = agents[:, inds[:, 1]]
+        cc = agents[:, inds[:, 2]]
         # Update agents
-        ind = rand(k, population) < CR
+        ind = random_state.rand(k, population) < CR
         agents_ = ind * (ac + F * (bc - cc)) + ~ind * agents
         log_lb = agents_ < lb
         log_ub = agents_ > ub
         agents_[log_lb] = lb[log_lb]
         agents_[log_ub] = ub[log_ub]
         # Update f values
-        f_ = zeros(population)
-        for i in range(population):
-            f_[i] = fn(agents_[:, i], *args)
+        f_ = _evaluate(fn, agents_, args, vectorized, executor, chunksize)
         log = where((f - f_) > 0)[0]
         agents[:, log] = agents_[:, log]
         f[log] = f_[log]
@@ -200,9 +236,6 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
         xopt = agents[:, argmin(f)]
         # Reset
         ts += 1
-        ac *= 0
-        bc *= 0
-        cc *= 0
         if printout and (ts % printout == 0):
             print('Generation: {0}  fopt: {1:.5g}'.format(ts, fopt))
         # Limit check
@@ -211,6 +244,8 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
 
     # L-BFGS-B
     if polish:
+        if vectorized:
+            fn = partial(_call_vectorized, fn)
         opt = fmin_l_bfgs_b(fn, xopt, args=args, approx_grad=1, bounds=bounds, iprint=1, pgtol=10**(-6), factr=10000,
                             maxfun=10**5, maxiter=10**5, maxls=200)
         xopt = opt[0]
@@ -231,6 +266,75 @@ def devo_numpy(fn, bounds, population, generations, limit=0, elites=0.2, F=0.8,
     return fopt, list(xopt)
 
 
+def _start(fn, bounds, population, generations, kwargs, random_seed):
+    # module level, such that it can be sent to the workers of a process pool
+    return devo_numpy(fn, bounds, population, generations, random_state=RandomState(random_seed), **kwargs)
+
+
+def devo_numpy_multistart(fn, bounds, population, generations, starts=4, executor=None, seeds=None, **kwargs):
+    """Call the Differential Evolution solver for a number of independent starts.
+
+    Parameters
+    ----------
+    fn : obj
+        The function to evaluate and minimize.
+    bounds : list
+        Lower and upper bounds for each DoF [[lb, ub], ...].
+    population : int
+        Number of starting agents in the population of every start.
+    generations : int
+        Number of cross-over cycles/steps to perform per start.
+    starts : int, optional
+        The number of independent starts.
+        Default is ``4``.
+    executor : concurrent.futures.Executor, optional
+        An executor to run the starts in parallel, such as a pool of processes.
+        Default is ``None``, in which case the starts run one after the other.
+    seeds : list, optional
+        The seeds of the random number generator, one per start.
+        Default is ``None``, in which case random seeds are used.
+    kwargs : dict, optional
+        Additional keyword arguments passed to :func:`devo_numpy`.
+        By default, nothing is printed.
+
+    Returns
+    -------
+    list
+        Per start, the optimal value of the objective function and the values that give the optimum,
+        sorted by optimal value, such that the first item is the best result.
+
+    Notes
+    -----
+    The starts share the executor, one start per task.
+    With a process pool, fn must be defined at the top level of a module,
+    and every start uses its own random number generator, seeded per start,
+    such that the results do not depend on the executor or the number of workers.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as executor:
+            results = devo_numpy_multistart(fn, bounds, 100, 200, starts=8, executor=executor)
+
+        fopt, xopt = results[0]
+
+    """
+    if seeds is None:
+        seeds = randint(0, 2**31 - 1, starts).tolist()
+    if len(seeds) != starts:
+        raise ValueError('The number of seeds does not match the number of starts.')
+    kwargs.setdefault('printout', 0)
+    func = partial(_start, fn, bounds, population, generations, kwargs)
+    if executor is None:
+        results = list(map(func, seeds))
+    else:
+        results = list(executor.map(func, seeds))
+    return sorted(results, key=lambda result: result[0])
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -248,6 +352,32 @@ if __name__ == "__main__":
     res = devo_numpy(f, bounds, 200, 1000, polish=False, plot=False, frange=[0, 100], neutrals=0)
     print(res)
 
+    from concurrent.futures import ProcessPoolExecutor
+    from time import sleep
+
+    # per agent, vectorized, and with a pool of processes, for an objective that takes some time
+
+    def slow(u, *args):
+        sleep(0.001)
+        return rosen(u)
+
+    t0 = time()
+    devo_numpy(f, bounds, 200, 200, printout=0)
+    t1 = time()
+    devo_numpy(rosen, bounds, 200, 200, printout=0, vectorized=True)
+    t2 = time()
+    print('per agent: {0:.2f}s vectorized: {1:.2f}s'.format(t1 - t0, t2 - t1))
+
+    with ProcessPoolExecutor() as executor:
+        t0 = time()
+        devo_numpy(slow, bounds, 200, 50, printout=0)
+        t1 = time()
+        devo_numpy(slow, bounds, 200, 50, printout=0, executor=executor, chunksize=10)
+        t2 = time()
+        devo_numpy_multistart(slow, bounds, 50, 50, starts=8, executor=executor)
+        t3 = time()
+        print('serial: {0:.2f}s executor: {1:.2f}s multistart (8 starts): {2:.2f}s'.format(t1 - t0, t2 - t1, t3 - t2))
+
     # def fn(u, *args):
     #     # Booth's function, fopt=0, uopt=(1, 3)
     #     x = u[0]
@@ -2,19 +2,40 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
+from numpy import arange
 from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cumsum
+from numpy import errstate
+from numpy import float64
+from numpy import full
+from numpy import int64
 from numpy import isnan
 from numpy import isinf
+from numpy import nan
 from numpy import ones
+from numpy import repeat
+from numpy import setdiff1d
+from numpy import sqrt
+from numpy import where
 from numpy import zeros
 from scipy.linalg import norm
+from scipy.sparse import coo_matrix
 from scipy.sparse import diags
 
+from compas.files import CBIN
 from compas.numerical import connectivity_matrix
 from compas.numerical import normrow
 
 
-__all__ = ['dr_numpy']
+__all__ = [
+    'dr_numpy',
+    'DRNumpy',
+]
 
 
 K = [
@@ -229,9 +250,379 @@ def dr_numpy(vertices, edges, fixed, loads, qpre, fpre, lpre, linit, E, radius,
     return x, q, f, l, r
 
 
+class DRNumpy(object):
+    """Dynamic relaxation solver for repeated analyses of the same networks of axial-force members.
+
+    Parameters
+    ----------
+    vertices : list
+        XYZ coordinates of the vertices.
+        The coordinates of the fixed vertices are used as boundary conditions.
+    edges : list
+        Connectivity of the vertices.
+    fixed : list
+        Indices of the fixed vertices.
+    qpre : list, optional
+        Prescribed force densities in the edges.
+    fpre : list, optional
+        Prescribed forces in the edges.
+    lpre : list, optional
+        Prescribed lengths of the edges.
+    linit : list, optional
+        Initial length of the edges.
+        If none of the initial lengths are set, the lengths of the edges in the given geometry are used.
+    E : list, optional
+        Stiffness of the edges.
+    radius : list, optional
+        Radius of the edges.
+
+    Attributes
+    ----------
+    xyz : array
+        The XYZ coordinates of the vertices at the end of the last run.
+    f : array
+        The forces in the edges at the end of the last run.
+    history : dict
+        The convergence history of the last run, with per iteration and per structure
+        the norm of the residual forces (``residual``), the norm of the displacements (``displacement``),
+        and the kinetic energy (``kinetic``), and per iteration the time of the step (``time``).
+        The values of structures that have already converged are NaN.
+        The number of iterations per structure is stored in ``iterations``.
+
+    Notes
+    -----
+    The result of :meth:`relax` is the same as that of :func:`dr_numpy`.
+    The connectivity matrices and the sectional properties are computed once,
+    and the force densities and residual forces are computed with sparse matrix-vector products,
+    instead of assembling the stiffness matrix in every iteration.
+
+    Several independent networks can be combined into a single solver with :meth:`from_solvers`,
+    and relaxed in a single pass over the combined arrays.
+    Every network stops moving when it has converged,
+    such that its result is the same as when it is relaxed separately.
+
+    Examples
+    --------
+    >>> vertices = [[0, 0, 0], [1, 0, 0], [2, 0, 0]]
+    >>> edges = [(0, 1), (1, 2)]
+    >>> solver = DRNumpy(vertices, edges, [0, 2], qpre=[1.0, 1.0])
+    >>> xyz, q, f, l, r = solver.relax([[0, 0, 0], [0, 0, -1.0], [0, 0, 0]])
+    >>> round(xyz[1, 2], 2)
+    -0.5
+    >>> solver.history['residual'].shape[1]
+    1
+
+    """
+
+    def __init__(self, vertices, edges, fixed, qpre=None, fpre=None, lpre=None, linit=None, E=None, radius=None):
+        self.vertices = asarray(vertices, dtype=float64).reshape((-1, 3))
+        self.edges = asarray(edges, dtype=int64).reshape((-1, 2))
+        n = len(self.vertices)
+        m = len(self.edges)
+
+        def edge_attribute(values):
+            if values is None:
+                return zeros((m, 1))
+            return asarray(values, dtype=float64).reshape((-1, 1))
+
+        self.fixed = asarray(fixed, dtype=int64).reshape((-1,))
+        self.free = setdiff1d(arange(n), self.fixed)
+        self.qpre = edge_attribute(qpre)
+        self.fpre = edge_attribute(fpre)
+        self.lpre = edge_attribute(lpre)
+        self.linit = edge_attribute(linit)
+        self.EA = edge_attribute(E) * 3.14159 * edge_attribute(radius) ** 2
+        self.vertex_count = asarray([n], dtype=int64)
+        self.edge_count = asarray([m], dtype=int64)
+        self._connectivity()
+        if all(self.linit == 0):
+            self.linit = normrow(self.C.dot(self.vertices))
+        self.xyz = None
+        self.f = None
+        self.history = None
+
+    def _connectivity(self):
+        n = len(self.vertices)
+        m = len(self.edges)
+        rows = concatenate((arange(m), arange(m)))
+        data = concatenate((-ones(m), ones(m)))
+        self.C = coo_matrix((data, (rows, self.edges.T.ravel())), shape=(m, n)).tocsr()
+        self.Ct = self.C.transpose().tocsr()
+        self.Ct2 = self.Ct.copy()
+        self.Ct2.data **= 2
+        # the structure of every vertex and every edge
+        self.vertex_part = repeat(arange(len(self.vertex_count)), self.vertex_count)
+        self.edge_part = repeat(arange(len(self.edge_count)), self.edge_count)
+
+    @classmethod
+    def from_solvers(cls, solvers):
+        """Combine the networks of several solvers into a single solver.
+
+        Parameters
+        ----------
+        solvers : list
+            A list of :class:`DRNumpy` solvers.
+
+        Returns
+        -------
+        DRNumpy
+            A solver of all networks together.
+            The vertices and edges of the networks are numbered consecutively, in the order of the solvers.
+            Use :meth:`split_vertices` and :meth:`split_edges` to split results per network.
+
+        """
+        solver = cls.__new__(cls)
+        offsets = cumsum([0] + [len(other.vertices) for other in solvers])
+        solver.vertices = concatenate([other.vertices for other in solvers])
+        solver.edges = concatenate([other.edges + offset for other, offset in zip(solvers, offsets)])
+        solver.fixed = concatenate([other.fixed + offset for other, offset in zip(solvers, offsets)])
+        solver.free = concatenate([other.free + offset for other, offset in zip(solvers, offsets)])
+        for name in ('qpre', 'fpre', 'lpre', 'linit', 'EA'):
+            setattr(solver, name, concatenate([getattr(other, name) for other in solvers]))
+        solver.vertex_count = concatenate([other.vertex_count for other in solvers])
+        solver.edge_count = concatenate([other.edge_count for other in solvers])
+        solver._connectivity()
+        solver.xyz = None
+        solver.f = None
+        solver.history = None
+        return solver
+
+    def split_vertices(self, values):
+        """Split an array of vertex values per network.
+
+        Parameters
+        ----------
+        values : array
+            Values of all vertices.
+
+        Returns
+        -------
+        list
+            The values of the vertices per network.
+
+        """
+        return [values[start:end] for start, end in zip(cumsum(self.vertex_count) - self.vertex_count, cumsum(self.vertex_count))]
+
+    def split_edges(self, values):
+        """Split an array of edge values per network.
+
+        Parameters
+        ----------
+        values : array
+            Values of all edges.
+
+        Returns
+        -------
+        list
+            The values of the edges per network.
+
+        """
+        return [values[start:end] for start, end in zip(cumsum(self.edge_count) - self.edge_count, cumsum(self.edge_count))]
+
+    def relax(self, loads, kmax=10000, dt=1.0, tol1=1e-3, tol2=1e-6, c=0.1, warmstart=False, callback=None, callback_args=None):
+        """Compute the equilibrium geometry of the networks.
+
+        Parameters
+        ----------
+        loads : array-like
+            XYZ components of the loads on the vertices.
+        kmax : int, optional
+            The maximum number of iterations.
+        dt : float, optional
+            The time step.
+        tol1 : float, optional
+            The convergence tolerance for the norm of the residual forces.
+        tol2 : float, optional
+            The convergence tolerance for the norm of the displacements.
+        c : float, optional
+            The damping coefficient.
+        warmstart : bool, optional
+            If True, start from the geometry and forces at the end of the previous run, if any,
+            instead of from the initial geometry.
+        callback : callable, optional
+            User-defined function that is called at every iteration,
+            with the iteration number, the coordinates of the vertices, the convergence criteria,
+            and the callback arguments.
+        callback_args : tuple, optional
+            Additional arguments passed to the callback.
+
+        Returns
+        -------
+        xyz : array
+            XYZ coordinates of the equilibrium geometry.
+        q : array
+            Force densities in the edges.
+        f : array
+            Forces in the edges.
+        l : array
+            Lengths of the edges
+        r : array
+            Residual forces.
+
+        """
+        if callback:
+            assert callable(callback), 'The provided callback is not callable.'
+        coeff = Coeff(c)
+        ca = coeff.a
+        cb = coeff.b
+        C = self.C
+        Ct = self.Ct
+        qpre = self.qpre
+        fpre = self.fpre
+        lpre = self.lpre
+        linit = self.linit
+        EA = self.EA
+        free = self.free
+        num_p = len(self.vertex_count)
+        p = asarray(loads, dtype=float64).reshape((-1, 3))
+        if warmstart and self.xyz is not None:
+            x = self.xyz.copy()
+            l = normrow(C.dot(x))  # noqa: E741
+            f = self.f.copy()
+        else:
+            x = self.vertices.copy()
+            l = normrow(C.dot(x))  # noqa: E741
+            f = 1.0 * l
+        q = ones((len(self.edges), 1), dtype=float64)
+        v = zeros(x.shape, dtype=float64)
+        r = zeros(x.shape, dtype=float64)
+        # the structure of every free vertex, and the structures that have not converged
+        part = self.vertex_part[free]
+        active = ones(num_p, dtype=bool)
+        iterations = zeros(num_p, dtype=int64)
+        residual = full((kmax, num_p), nan)
+        displacement = full((kmax, num_p), nan)
+        kinetic = full((kmax, num_p), nan)
+        steptime = zeros(kmax)
+
+        def a(t, v):
+            dx = v * t
+            x[moving] = x0[moving] + dx[moving]
+            # update residual forces
+            r[moving] = p[moving] - Ct.dot(q * C.dot(x))[moving]
+            return cb * r / mass
+
+        B = [1. / 6., 1. / 3., 1. / 3., 1. / 6.]
+        k = -1
+        for k in range(kmax):
+            t0 = time.time()
+            moving = free[active[part]]
+            with errstate(divide='ignore', invalid='ignore'):
+                q_fpre = fpre / l
+                q_lpre = f / lpre
+                q_EA = EA * (l - linit) / (linit * l)
+                q_lpre[isinf(q_lpre)] = 0
+                q_lpre[isnan(q_lpre)] = 0
+                q_EA[isinf(q_EA)] = 0
+                q_EA[isnan(q_EA)] = 0
+                # the force densities of converged structures are not updated
+                q = where(active[self.edge_part][:, None], qpre + q_fpre + q_lpre + q_EA, q)
+                mass = 0.5 * dt ** 2 * self.Ct2.dot(qpre + q_fpre + q_lpre + EA / linit)
+                # RK
+                x0 = x.copy()
+                v0 = ca * v
+                K0 = dt * a(K[0][0] * dt, v0)
+                K1 = dt * a(K[1][0] * dt, v0 + K[1][1] * K0)
+                K2 = dt * a(K[2][0] * dt, v0 + K[2][1] * K0 + K[2][2] * K1)
+                K3 = dt * a(K[3][0] * dt, v0 + K[3][1] * K0 + K[3][2] * K1 + K[3][3] * K2)
+                dv = B[0] * K0 + B[1] * K1 + B[2] * K2 + B[3] * K3
+            v[moving] = v0[moving] + dv[moving]
+            dx = v * dt
+            x[moving] = x0[moving] + dx[moving]
+            # update
+            u = C.dot(x)
+            l = normrow(u)  # noqa: E741
+            f = q * l
+            r = p - Ct.dot(q * u)
+            # crits, per structure
+            crit1 = sqrt(bincount(part, (r[free] ** 2).sum(axis=1), minlength=num_p))
+            crit2 = sqrt(bincount(part, (dx[free] ** 2).sum(axis=1), minlength=num_p))
+            energy = 0.5 * bincount(part, mass[free, 0] * (v[free] ** 2).sum(axis=1), minlength=num_p)
+            residual[k, active] = crit1[active]
+            displacement[k, active] = crit2[active]
+            kinetic[k, active] = energy[active]
+            iterations[active] = k + 1
+            # callback
+            if callback:
+                callback(k, x, [norm(crit1[active]), norm(crit2[active])], callback_args)
+            # convergence
+            active &= ~((crit1 < tol1) | (crit2 < tol2))
+            steptime[k] = time.time() - t0
+            if not active.any():
+                break
+        self.xyz = x
+        self.f = f
+        self.history = {'residual': residual[:k + 1],
+                        'displacement': displacement[:k + 1],
+                        'kinetic': kinetic[:k + 1],
+                        'time': steptime[:k + 1],
+                        'iterations': iterations}
+        return x, q, f, l, r
+
+    def write_history(self, filepath):
+        """Write the convergence history of the last run to a CBIN file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+
+        """
+        CBIN(filepath).write({'vertices': self.vertex_count.tolist(), 'edges': self.edge_count.tolist()}, self.history)
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    from numpy import random
+
+    random.seed(0)
+
+    def grid(n):
+        # a cable net on a square grid, supported along its boundary
+        vertices = [[i, j, 0] for i in range(n) for j in range(n)]
+        edges = [(i * n + j, (i + 1) * n + j) for i in range(n - 1) for j in range(n)]
+        edges += [(i * n + j, i * n + j + 1) for i in range(n) for j in range(n - 1)]
+        fixed = [i * n + j for i in range(n) for j in range(n) if i in (0, n - 1) or j in (0, n - 1)]
+        return vertices, edges, fixed
+
+    structures = []
+    for i in range(20):
+        vertices, edges, fixed = grid(20)
+        m = len(edges)
+        loads = zeros((len(vertices), 3))
+        loads[:, 2] = -0.1 * random.rand(len(vertices))
+        qpre = random.rand(m) + 0.5
+        structures.append((vertices, edges, fixed, loads, qpre))
+
+    t0 = time.time()
+    results = []
+    for vertices, edges, fixed, loads, qpre in structures:
+        m = len(edges)
+        results.append(dr_numpy(vertices, edges, fixed, loads, qpre, zeros(m), zeros(m), zeros(m), zeros(m), zeros(m))[0])
+    t1 = time.time()
+    solvers = [DRNumpy(vertices, edges, fixed, qpre=qpre) for vertices, edges, fixed, loads, qpre in structures]
+    t2 = time.time()
+    for solver, (vertices, edges, fixed, loads, qpre) in zip(solvers, structures):
+        solver.relax(loads)
+    t3 = time.time()
+    batch = DRNumpy.from_solvers(solvers)
+    xyz = batch.relax(concatenate([loads for vertices, edges, fixed, loads, qpre in structures]))[0]
+    t4 = time.time()
+    print('{0} structures dr_numpy: {1:.2f}s DRNumpy: {2:.2f}s (setup {3:.2f}s) batched: {4:.2f}s'.format(
+        len(structures), t1 - t0, t3 - t1, t2 - t1, t4 - t3))
+    print('max difference: {0:.2e}'.format(max(abs(a - b).max() for a, b in zip(batch.split_vertices(xyz), results))))
+    print('iterations: {0}'.format(batch.history['iterations'].tolist()))
+
+    # a small change of the loads, starting from the previous equilibrium
+    solver = solvers[0]
+    loads = structures[0][3] * 1.01
+    solver.relax(loads)
+    cold = solver.history['iterations'][0]
+    solver.relax(structures[0][3])
+    solver.relax(loads, warmstart=True)
+    warm = solver.history['iterations'][0]
+    print('iterations cold start: {0} warm start: {1}'.format(cold, warm))
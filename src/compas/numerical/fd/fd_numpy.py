@@ -2,15 +2,29 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from numpy import arange
+from numpy import argsort
 from numpy import asarray
+from numpy import concatenate
+from numpy import empty
+from numpy import float64
+from numpy import int64
+from numpy import ones
+from numpy import setdiff1d
+from numpy import sqrt
+from scipy.sparse import coo_matrix
 from scipy.sparse import diags
+from scipy.sparse.linalg import splu
 from scipy.sparse.linalg import spsolve
 
 from compas.numerical import connectivity_matrix
 from compas.numerical import normrow
 
 
-__all__ = ['fd_numpy']
+__all__ = [
+    'fd_numpy',
+    'FDNumpy',
+]
 
 
 def fd_numpy(vertices, edges, fixed, q, loads, **kwargs):
@@ -79,6 +93,151 @@ def fd_numpy(vertices, edges, fixed, q, loads, **kwargs):
     return xyz, q, f, l, r
 
 
+class FDNumpy(object):
+    """Force density solver for repeated solutions on the same topology.
+
+    Parameters
+    ----------
+    vertices : list
+        XYZ coordinates of the vertices of the network.
+        The coordinates of the fixed vertices are used as boundary conditions.
+    edges : list
+        Edges between vertices, as pairs of vertex indices.
+    fixed : list
+        Indices of fixed vertices.
+    q : list
+        Force density of edges.
+
+    Attributes
+    ----------
+    q : array
+        The force densities of the edges.
+        Setting the force densities invalidates the factorization of the system,
+        which is recomputed at the next solve, with the fill-reducing ordering of the first factorization.
+    factorizations : int
+        The number of factorizations computed so far.
+
+    Notes
+    -----
+    The result of :meth:`solve` is the same as that of :func:`fd_numpy`.
+    The connectivity matrices of the free and fixed vertices are assembled once,
+    and the sparse LU factorization of the system matrix is reused
+    for all load cases until the force densities change.
+    Multiple load cases are solved as a single system with multiple right-hand sides.
+
+    Examples
+    --------
+    >>> vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 0]]
+    >>> edges = [(0, 4), (1, 4), (2, 4), (3, 4)]
+    >>> solver = FDNumpy(vertices, edges, [0, 1, 2, 3], [1.0, 1.0, 1.0, 1.0])
+    >>> xyz, q, f, l, r = solver.solve([[0, 0, 0]] * 4 + [[0, 0, -1.0]])
+    >>> round(xyz[4, 2], 3)
+    -0.25
+    >>> xyz, q, f, l, r = solver.solve([[[0, 0, 0]] * 4 + [[0, 0, z]] for z in (-1.0, -2.0)])
+    >>> xyz.shape
+    (2, 5, 3)
+
+    """
+
+    def __init__(self, vertices, edges, fixed, q):
+        self.xyz = asarray(vertices, dtype=float64).reshape((-1, 3))
+        edges = asarray(edges, dtype=int64).reshape((-1, 2))
+        n = len(self.xyz)
+        m = len(edges)
+        self.fixed = asarray(fixed, dtype=int64)
+        self.free = setdiff1d(arange(n), self.fixed)
+        self.C = coo_matrix((concatenate((-ones(m), ones(m))), (concatenate((arange(m), arange(m))), edges.T.ravel())), shape=(m, n)).tocsr()
+        self.Ct = self.C.transpose().tocsr()
+        self.Ci = self.C[:, self.free]
+        self.Cit = self.Ci.transpose().tocsr()
+        self.Cf = self.C[:, self.fixed]
+        self.factorizations = 0
+        self._perm = None
+        self._solve = None
+        self.q = q
+
+    @property
+    def q(self):
+        return self._q
+
+    @q.setter
+    def q(self, q):
+        self._q = asarray(q, dtype=float64).reshape((-1, 1))
+        self._solve = None
+
+    def factorize(self):
+        """Compute the factorization of the system matrix for the current force densities."""
+        A = self.Cit.dot(diags(self._q.ravel())).dot(self.Ci).tocsc()
+        options = {'SymmetricMode': True}
+        if self._perm is None:
+            lu = splu(A, permc_spec='MMD_AT_PLUS_A', options=options)
+            self._perm = argsort(lu.perm_c)
+            self._solve = lu.solve
+        else:
+            # the fill-reducing ordering only depends on the topology, and is reused
+            perm = self._perm
+            lu = splu(A[perm][:, perm].tocsc(), permc_spec='NATURAL', options=options)
+
+            def solve(b):
+                x = empty(b.shape)
+                x[perm] = lu.solve(b[perm])
+                return x
+
+            self._solve = solve
+        self.factorizations += 1
+
+    def solve(self, loads):
+        """Compute the equilibrium geometry for one or more load cases.
+
+        Parameters
+        ----------
+        loads : array-like
+            XYZ components of the loads on the vertices, as an ``(n, 3)`` array for a single load case,
+            or as a ``(k, n, 3)`` array for ``k`` load cases.
+
+        Returns
+        -------
+        xyz : array
+            XYZ coordinates of the equilibrium geometry.
+        q : array
+            Force densities in the edges.
+        f : array
+            Forces in the edges.
+        l : array
+            Lengths of the edges
+        r : array
+            Residual forces.
+
+        Notes
+        -----
+        For multiple load cases, ``xyz``, ``f``, ``l`` and ``r`` have an additional first dimension of size ``k``.
+
+        """
+        n = len(self.xyz)
+        p = asarray(loads, dtype=float64)
+        single = p.ndim < 3
+        p = p.reshape((-1, n, 3))
+        k = len(p)
+        if self._solve is None:
+            self.factorize()
+        q = self._q
+        free = self.free
+        fixed = self.fixed
+        # the loads of all load cases side by side, as the columns of a single right-hand side
+        b = p[:, free].transpose((1, 0, 2)) - self.Cit.dot(q * self.Cf.dot(self.xyz[fixed]))[:, None, :]
+        b = b.reshape((len(free), 3 * k))
+        xyz = empty((k, n, 3))
+        xyz[:, fixed] = self.xyz[fixed]
+        xyz[:, free] = self._solve(b).reshape((len(free), k, 3)).transpose((1, 0, 2))
+        uvw = [self.C.dot(X) for X in xyz]
+        l = asarray([sqrt((d ** 2).sum(axis=1)).reshape((-1, 1)) for d in uvw])  # noqa: E741
+        f = q * l
+        r = p - asarray([self.Ct.dot(q * d) for d in uvw])
+        if single:
+            return xyz[0], q, f[0], l[0], r[0]
+        return xyz, q, f, l, r
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
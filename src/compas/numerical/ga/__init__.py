@@ -2,9 +2,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
 
+from .checkpoint import *  # noqa: F401 F403
+from .evaluator import *  # noqa: F401 F403
 from .ga import *  # noqa: F401 F403
 from .moga import *  # noqa: F401 F403
 
+if not compas.IPY:
+    from .ga_numpy import *  # noqa: F401 F403
+
 
 __all__ = [name for name in dir() if not name.startswith('_')]
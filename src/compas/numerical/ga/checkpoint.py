@@ -0,0 +1,304 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import binascii
+import json
+import os
+import struct
+
+
+__all__ = ['GACheckpoint']
+
+
+MAGIC = b'CGALOG\x00\x01'
+RECORD = struct.Struct('<qI')
+ENTRY = struct.Struct('<qQ')
+
+
+class GACheckpoint(object):
+    """Append-only binary log of the populations of a genetic optimisation, one record per generation.
+
+    The log file starts with an 8-byte signature, the size of the metadata as an unsigned 64-bit integer,
+    and the metadata as UTF-8 encoded JSON.
+    Every record consists of the generation number, the number of individuals,
+    the chromosomes of the individuals with the bits packed into bytes, most significant bit first,
+    and the fitness values of the individuals as 64-bit floats.
+
+    An index file next to the log, with the same name and the extension ``.idx``,
+    stores the generation number and the offset of every record.
+    Since the generations of a log are consecutive,
+    any record can be found with a single lookup in the index.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the log file.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> filepath = os.path.join(tempfile.gettempdir(), 'example.galog')
+    >>> checkpoint = GACheckpoint(filepath)
+    >>> checkpoint.create({'num_var': 2, 'num_bin_dig': [2, 3], 'boundaries': [[0, 1], [0, 7]]})
+    >>> checkpoint.append(0, [[[1, 0], [1, 1, 0]], [[0, 1], [0, 0, 1]]], [0.5, 2.0])
+    >>> checkpoint.generations()
+    [0]
+    >>> checkpoint.fit_values(0)
+    [0.5, 2.0]
+    >>> checkpoint.read(0)['decoded']
+    [[1, 3], [2, 4]]
+
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.indexpath = filepath + '.idx'
+        self._meta = None
+
+    @property
+    def meta(self):
+        """dict : The metadata of the optimisation."""
+        if self._meta is None:
+            self._read_header()
+        return self._meta
+
+    @property
+    def num_bytes(self):
+        """int : The number of bytes of the packed chromosome of an individual."""
+        return (sum(self.meta['num_bin_dig']) + 7) // 8
+
+    def exists(self):
+        """Verify that the log and its index exist.
+
+        Returns
+        -------
+        bool
+            True if the log and the index exist.
+
+        """
+        return os.path.exists(self.filepath) and os.path.exists(self.indexpath)
+
+    def create(self, meta):
+        """Create an empty log, replacing any existing log at the same location.
+
+        Parameters
+        ----------
+        meta : dict
+            JSON serialisable metadata of the optimisation.
+            It must contain the number of binary digits per variable (``num_bin_dig``),
+            and the bounds of the variables (``boundaries``).
+
+        """
+        header = json.dumps(meta).encode('utf-8')
+        with open(self.filepath, 'wb') as fo:
+            fo.write(MAGIC)
+            fo.write(struct.pack('<Q', len(header)))
+            fo.write(header)
+        with open(self.indexpath, 'wb'):
+            pass
+        self._meta = None
+
+    def _read_header(self):
+        with open(self.filepath, 'rb') as fo:
+            if fo.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Not a GA checkpoint file: {}'.format(self.filepath))
+            size, = struct.unpack('<Q', fo.read(8))
+            self._meta = json.loads(fo.read(size).decode('utf-8'))
+
+    def _entries(self):
+        # the number of entries of the index, and the generation of the first entry
+        size = os.path.getsize(self.indexpath) // ENTRY.size
+        if not size:
+            return 0, None
+        with open(self.indexpath, 'rb') as fo:
+            first, _ = ENTRY.unpack(fo.read(ENTRY.size))
+        return size, first
+
+    def _offset(self, generation):
+        size, first = self._entries()
+        if not size or not 0 <= generation - first < size:
+            raise KeyError('Generation not in checkpoint: {}'.format(generation))
+        with open(self.indexpath, 'rb') as fo:
+            fo.seek((generation - first) * ENTRY.size)
+            _, offset = ENTRY.unpack(fo.read(ENTRY.size))
+        return offset
+
+    def generations(self):
+        """The generations stored in the log.
+
+        Returns
+        -------
+        list
+            The consecutive generation numbers.
+
+        """
+        size, first = self._entries()
+        if not size:
+            return []
+        return list(range(first, first + size))
+
+    def truncate(self, generation):
+        """Remove all records of generations after a given generation.
+
+        Parameters
+        ----------
+        generation : int
+            The last generation to keep.
+
+        """
+        size, first = self._entries()
+        if not size or generation - first + 1 >= size:
+            return
+        keep = max(generation - first + 1, 0)
+        end = self._offset(first + keep)
+        with open(self.filepath, 'r+b') as fo:
+            fo.truncate(end)
+        with open(self.indexpath, 'r+b') as fo:
+            fo.truncate(keep * ENTRY.size)
+
+    def write(self, generation, num_pop, chromosomes, fit_values):
+        """Append a record in the encoding of the log.
+
+        Parameters
+        ----------
+        generation : int
+            The generation number.
+            It must follow the generation of the last record.
+        num_pop : int
+            The number of individuals.
+        chromosomes : bytes
+            The packed chromosomes of the individuals.
+        fit_values : bytes
+            The fitness values of the individuals, as little-endian 64-bit floats.
+
+        """
+        size, first = self._entries()
+        if size and generation != first + size:
+            raise ValueError('Generation {} does not follow the last generation of the checkpoint: {}'.format(generation, first + size - 1))
+        if len(chromosomes) != num_pop * self.num_bytes or len(fit_values) != num_pop * 8:
+            raise ValueError('The size of the data does not match the number of individuals.')
+        with open(self.filepath, 'ab') as fo:
+            fo.seek(0, os.SEEK_END)
+            offset = fo.tell()
+            fo.write(RECORD.pack(generation, num_pop))
+            fo.write(chromosomes)
+            fo.write(fit_values)
+        with open(self.indexpath, 'ab') as fo:
+            fo.write(ENTRY.pack(generation, offset))
+
+    def append(self, generation, binary, fit_values):
+        """Append the population of a generation to the log.
+
+        Parameters
+        ----------
+        generation : int
+            The generation number.
+            It must follow the generation of the last record.
+        binary : list
+            The binary chromosomes of the individuals, as a list of bits per variable.
+        fit_values : list
+            The fitness values of the individuals.
+
+        """
+        num_bits = self.num_bytes * 8
+        chromosomes = []
+        for individual in binary:
+            bits = ''.join(str(bit) for variable in individual for bit in variable)
+            chromosomes.append(binascii.unhexlify('%0*x' % (num_bits // 4, int(bits.ljust(num_bits, '0'), 2))))
+        num_pop = len(binary)
+        self.write(generation, num_pop, b''.join(chromosomes), struct.pack('<%dd' % num_pop, *fit_values))
+
+    def read_bytes(self, generation, chromosomes=True):
+        """Read a record in the encoding of the log.
+
+        Parameters
+        ----------
+        generation : int
+            The generation number.
+        chromosomes : bool, optional
+            If False, the chromosomes are not read.
+
+        Returns
+        -------
+        tuple
+            The number of individuals, the packed chromosomes, and the fitness values.
+
+        """
+        offset = self._offset(generation)
+        with open(self.filepath, 'rb') as fo:
+            fo.seek(offset)
+            _, num_pop = RECORD.unpack(fo.read(RECORD.size))
+            if chromosomes:
+                data = fo.read(num_pop * self.num_bytes)
+            else:
+                data = None
+                fo.seek(num_pop * self.num_bytes, os.SEEK_CUR)
+            fit_values = fo.read(num_pop * 8)
+        return num_pop, data, fit_values
+
+    def fit_values(self, generation):
+        """Read the fitness values of the population of a generation, without the chromosomes.
+
+        Parameters
+        ----------
+        generation : int
+            The generation number.
+
+        Returns
+        -------
+        list
+            The fitness values.
+
+        """
+        num_pop, _, fit_values = self.read_bytes(generation, chromosomes=False)
+        return list(struct.unpack('<%dd' % num_pop, fit_values))
+
+    def read(self, generation):
+        """Read the population of a generation.
+
+        Parameters
+        ----------
+        generation : int
+            The generation number.
+
+        Returns
+        -------
+        dict
+            The population dictionary, with the binary, decoded and scaled variables, and the fitness values.
+
+        """
+        num_pop, data, fit_values = self.read_bytes(generation)
+        num_bin_dig = self.meta['num_bin_dig']
+        boundaries = self.meta['boundaries']
+        num_bits = self.num_bytes * 8
+        pop = {'binary': [], 'decoded': [], 'scaled': [], 'fit_value': list(struct.unpack('<%dd' % num_pop, fit_values))}
+        for i in range(num_pop):
+            chunk = data[i * self.num_bytes: (i + 1) * self.num_bytes]
+            bits = format(int(binascii.hexlify(chunk), 16), '0{}b'.format(num_bits))
+            start = 0
+            binary = []
+            decoded = []
+            scaled = []
+            for num, (low, high) in zip(num_bin_dig, boundaries):
+                genes = [int(bit) for bit in bits[start:start + num]]
+                value = sum(2 ** u for u, gene in enumerate(genes) if gene == 1)
+                binary.append(genes)
+                decoded.append(value)
+                scaled.append(low + (high - low) * value / float(2 ** num - 1))
+                start += num
+            pop['binary'].append(binary)
+            pop['decoded'].append(decoded)
+            pop['scaled'].append(scaled)
+        return pop
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    doctest.testmod(globs=globals())
@@ -0,0 +1,178 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+from functools import partial
+
+
+__all__ = ['FitnessEvaluator']
+
+
+def _evaluate(fit_functions, fargs, fkwargs, scaled):
+    # module level, such that it can be sent to the workers of a process pool
+    return [fit_function(scaled, *fargs, **fkwargs) for fit_function in fit_functions]
+
+
+class FitnessEvaluator(object):
+    """Evaluator of the fitness of the individuals of a population, for :func:`ga` and :func:`moga`.
+
+    A whole population is evaluated at once.
+    Individuals that were evaluated before, or that occur more than once in the population,
+    are identified by their decoded chromosome and evaluated only once.
+    The remaining individuals are evaluated in the main process,
+    or dispatched to an executor, such as a pool of processes.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        Any object with a ``map`` method with the signature of :meth:`concurrent.futures.Executor.map`.
+        Default is ``None``, in which case the individuals are evaluated one after the other in the main process.
+    chunksize : int, optional
+        The number of individuals sent to a worker of the executor at once.
+        Only applies to process pools.
+        Default is ``1``.
+
+    Attributes
+    ----------
+    cache : dict
+        The fitness values of the evaluated individuals, per decoded chromosome.
+    stats : list
+        Per generation, the number of individuals, the number of fitness function evaluations,
+        the number of individuals found in the cache, the evaluation time in seconds,
+        and the throughput in individuals per second.
+
+    Notes
+    -----
+    With a process pool, the fitness functions and their arguments must be picklable,
+    which means that the fitness functions must be defined at the top level of a module.
+    Every evaluation is also subject to the overhead of sending the data to the worker and back,
+    which only pays off for fitness functions that take considerable time,
+    such as structural analyses.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as executor:
+            evaluator = FitnessEvaluator(executor)
+            ga_ = ga(fit_function, 'min', num_var, boundaries, evaluator=evaluator)
+
+        print(evaluator.stats[-1])
+
+    """
+
+    def __init__(self, executor=None, chunksize=1):
+        self.executor = executor
+        self.chunksize = chunksize
+        self.cache = {}
+        self.stats = []
+
+    def evaluate(self, fit_functions, decoded_pop, scaled_pop, fargs=None, fkwargs=None, generation=None):
+        """Evaluate the fitness of the individuals of a population.
+
+        Parameters
+        ----------
+        fit_functions : list
+            The fitness functions.
+        decoded_pop : list
+            The decoded chromosomes of the individuals, used to identify them.
+        scaled_pop : list
+            The scaled variables of the individuals, passed to the fitness functions.
+        fargs : list, optional
+            Arguments to be fed to the fitness functions.
+        fkwargs : dict, optional
+            Keyword arguments to be fed to the fitness functions.
+        generation : int, optional
+            The generation of the population.
+            Evaluations with the same generation are combined in the statistics.
+
+        Returns
+        -------
+        list
+            For every individual, a list with the values of the fitness functions.
+
+        """
+        fargs = fargs or []
+        fkwargs = fkwargs or {}
+        t0 = time.time()
+        keys = [tuple(decoded) for decoded in decoded_pop]
+        todo = {}
+        for key, scaled in zip(keys, scaled_pop):
+            if key not in self.cache and key not in todo:
+                todo[key] = scaled
+        func = partial(_evaluate, fit_functions, fargs, fkwargs)
+        if self.executor is None:
+            values = map(func, todo.values())
+        elif self.chunksize > 1:
+            values = self.executor.map(func, todo.values(), chunksize=self.chunksize)
+        else:
+            values = self.executor.map(func, todo.values())
+        self.cache.update(zip(todo.keys(), values))
+        t1 = time.time()
+        self.record(generation, len(keys), len(todo), t1 - t0)
+        return [self.cache[key] for key in keys]
+
+    def record(self, generation, num_ind, num_eval, duration):
+        if self.stats and generation is not None and self.stats[-1]['generation'] == generation:
+            stats = self.stats[-1]
+        else:
+            stats = {'generation': generation, 'individuals': 0, 'evaluations': 0, 'hits': 0, 'time': 0.0}
+            self.stats.append(stats)
+        stats['individuals'] += num_ind
+        stats['evaluations'] += num_eval
+        stats['hits'] += num_ind - num_eval
+        stats['time'] += duration
+        stats['throughput'] = stats['individuals'] / stats['time'] if stats['time'] > 0 else float('inf')
+
+    def report(self):
+        """Compile a summary of the evaluation of the last generation.
+
+        Returns
+        -------
+        str
+            The summary.
+
+        """
+        if not self.stats:
+            return ''
+        stats = self.stats[-1]
+        return 'evaluations {} cached {} time {:.3f}s throughput {:.1f}/s'.format(
+            stats['evaluations'], stats['hits'], stats['time'], stats['throughput'])
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from compas.numerical import ga
+
+    def fit_function(X):
+        # a fitness function that takes some time
+        time.sleep(0.01)
+        return sum(x ** 2 for x in X)
+
+    output_path = os.path.join(tempfile.gettempdir(), 'ga_out/')
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+
+    for name, executor in (('serial', None), ('processes', ProcessPoolExecutor(4))):
+        evaluator = FitnessEvaluator(executor)
+        t0 = time.time()
+        ga_ = ga(fit_function, 'min', 5, [(-1, 1)] * 5, num_gen=20, num_pop=40, num_elite=10,
+                 output_path=output_path, print_refresh=100, evaluator=evaluator)
+        t1 = time.time()
+        evaluations = sum(stats['evaluations'] for stats in evaluator.stats)
+        hits = sum(stats['hits'] for stats in evaluator.stats)
+        print('{0:<10} evaluations: {1:>5} cached: {2:>4} time: {3:.2f}s'.format(name, evaluations, hits, t1 - t0))
+        if executor:
+            executor.shutdown()
@@ -7,6 +7,9 @@ import random
 import json
 import copy
 
+from compas.numerical.ga.checkpoint import GACheckpoint
+from compas.numerical.ga.evaluator import FitnessEvaluator
+
 
 __all__ = ['ga']
 
@@ -43,7 +46,8 @@ def ga(fit_function,
        fkwargs=None,
        output_path=None,
        input_path=None,
-       print_refresh=1):
+       print_refresh=1,
+       evaluator=None):
     """Genetic Algorithm optimisation.
 
     Parameters
@@ -98,6 +102,11 @@ def ga(fit_function,
         Path to the fitness function file.
     print_refresh : int
         Print current generation summary every ``print_refresh`` generations.
+    evaluator : :class:`FitnessEvaluator`, optional [None]
+        The evaluator of the fitness of the population.
+        Use an evaluator with an executor, such as a process pool,
+        to evaluate the individuals of a generation in parallel.
+        If None is given, the individuals are evaluated one after the other.
 
     Returns
     -------
@@ -141,6 +150,9 @@ def ga(fit_function,
     ga_.output_path = output_path or ''
     ga_.input_path = input_path or ''
     ga_.print_refresh = print_refresh
+    if evaluator:
+        ga_.evaluator = evaluator
+        ga_.ind_fit_dict = evaluator.cache
     ga_.ga_optimize()
     return ga_
 
@@ -219,6 +231,10 @@ class GA(object):
     ind_fit_dict : dict
         This dictionary keeps track of already evaluated solutions to avoid dupplicate
         fitness function calls.
+    evaluator : :class:`FitnessEvaluator`
+        The evaluator of the fitness of the population.
+    checkpoint : :class:`GACheckpoint`
+        The log of the populations of all generations, in ``GA.output_path``.
 
     """
 
@@ -254,7 +270,9 @@ class GA(object):
         self.start_from_gen = False
         self.total_bin_dig = 0
         self.check_diversity = False
-        self.ind_fit_dict = {}
+        self.evaluator = FitnessEvaluator()
+        self.ind_fit_dict = self.evaluator.cache
+        self.checkpoint = None
         self.print_refresh = 1
 
     def __str__(self):
@@ -292,6 +310,8 @@ class GA(object):
             self.current_pop['binary'] = self.generate_random_bin_pop()
             start_gen_number = 0
 
+        self.open_checkpoint()
+
         for generation in range(start_gen_number, self.num_gen):
 
             self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
@@ -303,8 +323,7 @@ class GA(object):
             else:
                 num = self.num_pop - self.num_elite
 
-            for i in range(num):
-                self.current_pop['fit_value'][i] = self.evaluate_fitness(i)
+            self.evaluate_population(num, generation)
 
             if self.num_pop_init and generation >= self.num_gen_init_pop:
                 self.num_pop = self.num_pop_temp
@@ -316,7 +335,7 @@ class GA(object):
             else:
                 self.get_best_fit()
             if generation % self.print_refresh == 0:
-                print('generation ', generation, ' best fit ', self.best_fit, 'min fit', self.min_fit)
+                print('generation ', generation, ' best fit ', self.best_fit, 'min fit', self.min_fit, self.evaluator.report())
 
             if self.check_diversity:
                 print('num repeated individuals', self.check_pop_diversity())
@@ -335,13 +354,33 @@ class GA(object):
                 print(self)
                 break
 
+    def evaluate_population(self, num, generation=None):
+        """Evaluates the fitness of the first ``num`` individuals of the current population
+        with ``GA.evaluator``, and saves the results in ``GA.current_pop``.
+
+        Parameters
+        ----------
+        num: int
+            The number of individuals to evaluate.
+        generation: int, optional
+            The generation number.
+        """
+        values = self.evaluator.evaluate([self.fit_function],
+                                         self.current_pop['decoded'][:num],
+                                         self.current_pop['scaled'][:num],
+                                         self.fargs,
+                                         self.fkwargs,
+                                         generation)
+        for i in range(num):
+            self.current_pop['fit_value'][i] = values[i][0]
+
     def evaluate_fitness(self, index):
-        chromo = ''.join(str(y) for x in self.current_pop['binary'][index] for y in x)
-        fit = self.ind_fit_dict.setdefault(chromo, None)
-        if not fit:
-            fit = self.fit_function(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs)
-            self.ind_fit_dict[chromo] = fit
-        return fit
+        values = self.evaluator.evaluate([self.fit_function],
+                                         [self.current_pop['decoded'][index]],
+                                         [self.current_pop['scaled'][index]],
+                                         self.fargs,
+                                         self.fkwargs)
+        return values[0][0]
 
     def check_pop_diversity(self):
         seen = []
@@ -648,42 +687,26 @@ class GA(object):
             value = value + 2**i
         return value
 
+    def open_checkpoint(self):
+        """Opens the checkpoint log in ``GA.output_path``. When restarting from ``GA.start_from_gen``
+        with the log of the previous optimization, the generations after ``GA.start_from_gen`` are
+        removed from the log, otherwise a new log is created.
+        """
+        self.checkpoint = GACheckpoint(self.output_path + self.fit_name + '.galog')
+        if self.start_from_gen and self.checkpoint.exists() and self.start_from_gen in self.checkpoint.generations():
+            self.checkpoint.truncate(self.start_from_gen)
+        else:
+            self.checkpoint.create(self.make_ga_input_data())
+
     def write_out_file(self, generation):
-        """Writes the population data for a given generation.
+        """Appends the population data for a given generation to the checkpoint log.
 
         Parameters
         ----------
         generation: int
             The generation number.
         """
-        filename = 'generation_' + "%05d" % generation + '_population' + ".txt"
-        pf_file = open(self.output_path + (str(filename)), "w")
-        pf_file.write('Generation \n')
-        pf_file.write(str(generation) + '\n')
-        pf_file.write('\n')
-
-        pf_file.write('Number of individuals per generation\n')
-        pf_file.write(str(self.num_pop))
-        pf_file.write('\n')
-        pf_file.write('\n')
-
-        pf_file.write('Population scaled variables \n')
-        for i in range(self.num_pop):
-            pf_file.write(str(i) + ',')
-            for f in range(self.num_var):
-                pf_file.write(str(self.current_pop['scaled'][i][f]))
-                pf_file.write(',')
-            pf_file.write('\n')
-        pf_file.write('\n')
-
-        pf_file.write('Population fitness value \n')
-        for i in range(self.num_pop):
-            pf_file.write(str(i) + ',')
-            pf_file.write(str(self.current_pop['fit_value'][i]))
-            pf_file.write('\n')
-        pf_file.write('\n')
-        pf_file.write('\n')
-        pf_file.close()
+        self.checkpoint.append(generation, self.current_pop['binary'], self.current_pop['fit_value'])
 
     def add_elite_to_current(self):
         """Adds the elite population to the current population dictionary.
@@ -759,8 +782,9 @@ class GA(object):
             self.best_fit = max(self.current_pop['fit_value'])
 
     def get_pop_from_pop_file(self, gen):
-        """Reads the population file corresponding to the ``gen`` generation and returns
-        the saved population data. The population file must be in ``GA.input_path``.
+        """Reads the population of the ``gen`` generation from the checkpoint log and returns
+        the saved population data. The checkpoint log, or the population file of an optimization
+        without checkpoint log, must be in ``GA.input_path``.
 
         Parameters
         ----------
@@ -772,6 +796,9 @@ class GA(object):
         file_pop: dict
             The population dictionary contained in the file.
         """
+        checkpoint = GACheckpoint(self.input_path + self.fit_name + '.galog')
+        if checkpoint.exists():
+            return checkpoint.read(gen)
         filename = 'generation_' + "%05d" % gen + '_population' + ".txt"
         filename = self.input_path + filename
         pf_file = open(filename, 'r')
@@ -0,0 +1,471 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import add
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import cumsum
+from numpy import float64
+from numpy import frombuffer
+from numpy import int64
+from numpy import lexsort
+from numpy import ndarray
+from numpy import packbits
+from numpy import random
+from numpy import repeat
+from numpy import uint8
+from numpy import unique
+from numpy import unpackbits
+from numpy import where
+from numpy import zeros
+
+from compas.numerical.ga.checkpoint import GACheckpoint
+from compas.numerical.ga.ga import GA
+
+
+__all__ = ['ga_numpy', 'GANumpy']
+
+
+def ga_numpy(fit_function,
+             fit_type,
+             num_var,
+             boundaries,
+             num_gen=100,
+             num_pop=100,
+             num_elite=10,
+             mutation_probability=0.01,
+             n_cross=1,
+             num_bin_dig=None,
+             num_pop_init=None,
+             num_gen_init_pop=None,
+             start_from_gen=False,
+             min_fit=None,
+             fit_name=None,
+             fargs=None,
+             fkwargs=None,
+             output_path=None,
+             input_path=None,
+             print_refresh=1,
+             evaluator=None):
+    """Genetic Algorithm optimisation, with the population stored in NumPy arrays.
+
+    Parameters
+    ----------
+    fit_function : callable
+        The function used by the :class'GANumpy' to determine the fitness value.
+        The function must have as a first argument a list of variables that determine the
+        fitness value. Other arguments and keyword arguments can be used to feed
+        the function relevant data.
+    fit_type : str
+        String that indicates if the fitness function is to be minimized or maximized.
+        "min" for minimization and "max" for maximization.
+    num_var :  int
+        The number of variables used by the fitness function.
+    boundaries : list
+        The minimum and vaximum values each variable is allowed to have. Must be
+        a ``num_var`` long list of tuples in the form [(min, max),...].
+    num_gen : int, optional [100]
+        The maximum number of generations.
+    num_pop : int, optional [100]
+        The number of individuals in the population. Must be an even number.
+    num_elite : int, optional [10]
+        The number of individuals in the elite population. Must be an even number.
+    mutation_probablity : float, optional [0.001]
+        Float from 0 to 1. Percentage of genes that will be mutated.
+    n_cross: int, optional [1]
+        Number of crossover points used in the crossover operator.
+    num_bin_dig : list, optional [None]
+        Number of genes used to codify each variable. Must be a ``num_var`` long
+        list of intergers. If None is given, each variable will be coded with a
+        8 digit binary number, corresponding to 256 steps.
+    num_pop_init : int, optional [None]
+        The number of individuals in the population for the first ``num_gen_init_pop``
+        generations.
+    num_gen_init_pop : int, optional
+        The number of generations to keep a ``num_pop_init`` size population for.
+    start_from_get : int, optional [None]
+        The generation number to restart a previous optimization process.
+    min_fit : float, optional [None]
+        A target fitness value. If the GA finds a solution with a fitness value
+        equal or better than ``min_fit``, the optimization is stopped.
+    fit_name : str, optional [None]
+        The name of the optimisation. If None is given, the name of the fitness
+        function is used.
+    fargs : list, optional [None]
+        Arguments fo be fed to the fitness function.
+    fkwargs : dict, optional [None]
+        Keyword arguments to be fed to the fitness function.
+    output_path : str, optional [None]
+        Path for the optimization result files.
+    input_path : str, optional [None]
+        Path to the fitness function file.
+    print_refresh : int
+        Print current generation summary every ``print_refresh`` generations.
+    evaluator : :class:`FitnessEvaluator`, optional [None]
+        The evaluator of the fitness of the population.
+        If None is given, the individuals are evaluated one after the other.
+
+    Returns
+    -------
+    ga_ : object
+        The resulting :class'GANumpy' instance.
+
+    Notes
+    -----
+    The algorithm is the same as that of :func:`ga`,
+    but the genetic operators are applied to the whole population at once.
+    The random numbers are drawn from :mod:`numpy.random`,
+    such that the results are reproducible with :func:`numpy.random.seed`.
+
+    Examples
+    --------
+    >>>
+    """
+    ga_ = GANumpy()
+
+    ga_.fit_name = fit_name or fit_function.__name__
+    ga_.fit_type = fit_type
+    ga_.num_gen = num_gen
+    ga_.num_pop = num_pop
+    ga_.num_pop_init = num_pop_init
+    ga_.num_gen_init_pop = num_gen_init_pop
+    ga_.num_elite = num_elite
+    ga_.num_var = num_var
+    ga_.mutation_probability = mutation_probability
+    ga_.n_cross = n_cross
+    ga_.start_from_gen = start_from_gen
+    ga_.min_fit = min_fit
+    ga_.boundaries = boundaries
+    ga_.num_bin_dig = num_bin_dig or [8] * num_var
+    ga_.max_bin_dig = max(ga_.num_bin_dig)
+    ga_.total_bin_dig = sum(ga_.num_bin_dig)
+    ga_.fargs = fargs or {}
+    ga_.fkwargs = fkwargs or {}
+    ga_.fit_function = fit_function
+    ga_.output_path = output_path or ''
+    ga_.input_path = input_path or ''
+    ga_.print_refresh = print_refresh
+    if evaluator:
+        ga_.evaluator = evaluator
+        ga_.ind_fit_dict = evaluator.cache
+    ga_.ga_optimize()
+    return ga_
+
+
+class GANumpy(GA):
+    """Binary coded, single objective genetic algorithm with the population stored in NumPy arrays.
+
+    The binary chromosomes of the population are stored in a matrix of bits with one row per individual,
+    in which the genes of the variables are concatenated.
+    The decoded and scaled variables are stored in matrices with one row per individual and one column per variable,
+    and the fitness values in a vector.
+    Selection, crossover, mutation and decoding are vectorized over the population.
+
+    Notes
+    -----
+    The genetic operators follow the semantics of those of :class:`GA`,
+    with the exception of :meth:`npoint_crossover`, which exchanges the genes between all crossover points
+    for all variables, like :meth:`simple_crossover`.
+
+    """
+
+    def _weights(self):
+        # the value of every bit of the chromosomes in its variable, least significant bit first,
+        # and the index of the first bit of every variable
+        num_bin_dig = asarray(self.num_bin_dig, dtype=int64)
+        start = cumsum(num_bin_dig) - num_bin_dig
+        bit = arange(self.total_bin_dig) - repeat(start, num_bin_dig)
+        return 2 ** bit, start
+
+    def generate_random_bin_pop(self):
+        """Generates random binary population of ``GANumpy.num_pop`` size.
+
+        Returns
+        -------
+        random_bin_pop: array
+            A ``num_pop`` by ``total_bin_dig`` matrix of bits.
+        """
+        return random.randint(0, 2, (self.num_pop, self.total_bin_dig)).astype(uint8)
+
+    def decode_binary_pop(self, bin_pop):
+        """Decodes the binary population, from binary to unscaled variable values
+
+        Parameters
+        ----------
+        bin_pop: array
+            The matrix of bits of the population.
+
+        Returns
+        -------
+        decoded_pop: array
+            A ``num_pop`` by ``num_var`` matrix of integers.
+        """
+        weights, start = self._weights()
+        return add.reduceat(asarray(bin_pop, dtype=int64) * weights, start, axis=1)
+
+    def scale_population(self, decoded_pop):
+        """Scales the decoded population, variable values are scaled according to each
+        of their bounds contained in ``GANumpy.boundaries``.
+
+        Parameters
+        ----------
+        decoded_pop: array
+            The decoded population matrix.
+
+        Returns
+        -------
+        scaled_pop: array
+            The scaled population matrix.
+        """
+        bounds = asarray(self.boundaries, dtype=float64)
+        maxbin = 2.0 ** asarray(self.num_bin_dig, dtype=float64) - 1
+        return bounds[:, 0] + (bounds[:, 1] - bounds[:, 0]) * decoded_pop / maxbin
+
+    def evaluate_population(self, num, generation=None):
+        """Evaluates the fitness of the first ``num`` individuals of the current population
+        with ``GANumpy.evaluator``, and saves the results in ``GANumpy.current_pop``.
+
+        Parameters
+        ----------
+        num: int
+            The number of individuals to evaluate.
+        generation: int, optional
+            The generation number.
+        """
+        fit_value = self.current_pop['fit_value']
+        if not isinstance(fit_value, ndarray) or len(fit_value) != len(self.current_pop['binary']):
+            fit_value = zeros(len(self.current_pop['binary']), dtype=float64)
+        values = self.evaluator.evaluate([self.fit_function],
+                                         self.current_pop['decoded'][:num].tolist(),
+                                         self.current_pop['scaled'][:num].tolist(),
+                                         self.fargs,
+                                         self.fkwargs,
+                                         generation)
+        fit_value[:num] = [value[0] for value in values]
+        self.current_pop['fit_value'] = fit_value
+
+    def evaluate_fitness(self, index):
+        values = self.evaluator.evaluate([self.fit_function],
+                                         [self.current_pop['decoded'][index].tolist()],
+                                         [self.current_pop['scaled'][index].tolist()],
+                                         self.fargs,
+                                         self.fkwargs)
+        return values[0][0]
+
+    def check_pop_diversity(self):
+        return len(self.current_pop['binary']) - len(unique(self.current_pop['binary'], axis=0))
+
+    def tournament_selection(self):
+        """Performs the tournament selection operator on the current population.
+        """
+        num = self.num_pop - self.num_elite
+        pop_a = random.permutation(self.num_pop)[:num]
+        pop_b = random.permutation(self.num_pop)[:num]
+        fit = asarray(self.current_pop['fit_value'], dtype=float64)
+        if self.fit_type == 'min':
+            self.mp_indices = where(fit[pop_a] < fit[pop_b], pop_a, pop_b)
+        elif self.fit_type == 'max':
+            self.mp_indices = where(fit[pop_a] > fit[pop_b], pop_a, pop_b)
+
+    def select_elite_pop(self, pop, num_elite=None):
+        """Saves the elite population in the elite population dictionary
+
+        Parameters
+        ----------
+        pop: dict
+            A population dictionary
+
+        Returns
+        -------
+        elite_pop: dict
+            The elite population dictionary.
+        """
+        if self.fit_type == 'min':
+            sorted_ind = self.get_sorting_indices(self.current_pop['fit_value'])
+        elif self.fit_type == 'max':
+            sorted_ind = self.get_sorting_indices(self.current_pop['fit_value'], reverse=True)
+        else:
+            raise ValueError('User selected fit_type is wrong. Use "min" or "max" only')
+        if not num_elite:
+            num_elite = self.num_elite
+        index = sorted_ind[:num_elite]
+        return {key: asarray(pop[key])[index] for key in ('binary', 'decoded', 'scaled', 'fit_value')}
+
+    def get_sorting_indices(self, fit_values, reverse=False):
+        """Reurns the indices that would sort a list of floats. If floats are
+        repeated in the list, only one instance is considered. The index of
+        repeaded floats are included in the end of the index list.
+
+        Parameters
+        ----------
+        fit_values: array
+            The list of floats to be sorted.
+        reverse: bool
+            If true the sorting will be done from top to bottom.
+
+        Returns
+        -------
+        sorting_index: array
+            The indices that would sort the given list of floats.
+        """
+        values = array(fit_values, dtype=float64)
+        first = zeros(len(values), dtype=bool)
+        first[unique(values, return_index=True)[1]] = True
+        values[~first] = float('-inf') if reverse else float('inf')
+        sorting_index = lexsort((arange(len(values)), values))
+        if reverse:
+            sorting_index = sorting_index[::-1]
+        return sorting_index
+
+    def create_mating_pool(self):
+        """Creates two matrices of cromosomes to be used by the crossover operator.
+        """
+        half = int((self.num_pop - self.num_elite) / 2)
+        self.mating_pool_a = self.current_pop['binary'][self.mp_indices[:half]]
+        self.mating_pool_b = self.current_pop['binary'][self.mp_indices[half:2 * half]]
+
+    def _crossover(self, swap):
+        # children with the genes of a where swap is false and the genes of b where it is true, and vice versa
+        half = len(self.mating_pool_a)
+        a = self.mating_pool_a
+        b = self.mating_pool_b
+        binary = zeros((self.num_pop, self.total_bin_dig), dtype=uint8)
+        binary[:half] = where(swap, b, a)
+        binary[half:2 * half] = where(swap, a, b)
+        self.current_pop = {'binary': binary, 'decoded': [], 'scaled': [], 'fit_value': []}
+
+    def simple_crossover(self):
+        """Performs the simple crossover operator. Individuals in ``GANumpy.mating_pool_a`` are
+        combined with individuals in ``GANumpy.mating_pool_b`` using a single, randomly selected
+        crossover point.
+        """
+        half = len(self.mating_pool_a)
+        cross = random.randint(1, self.total_bin_dig, (half, 1))
+        self._crossover(arange(self.total_bin_dig) >= cross)
+
+    def npoint_crossover(self):
+        """Performs the n-point crossover operator. Individuals in ``GANumpy.mating_pool_a`` are
+        combined with individuals in ``GANumpy.mating_pool_b`` using ``GANumpy.n_cross``, randomly selected
+        crossover points.
+        """
+        half = len(self.mating_pool_a)
+        # distinct crossover points per pair of parents, from 1 to total_bin_dig - 2
+        cross = random.rand(half, self.total_bin_dig - 2).argsort(axis=1)[:, :self.n_cross] + 1
+        # the genes of the first child come from the second parent if an odd number of points is beyond them
+        beyond = (cross[:, :, None] > arange(self.total_bin_dig)).sum(axis=1)
+        self._crossover(beyond % 2 == 1)
+
+    def random_mutation(self):
+        """This mutation operator replaces a gene from 0 to 1 or viceversa
+        with a probability of ``GANumpy.mutation_probability``.
+        """
+        num = self.num_pop - self.num_elite
+        mutate = random.random_sample((num, self.total_bin_dig)) < self.mutation_probability
+        self.current_pop['binary'][:num] ^= mutate.astype(uint8)
+
+    def add_elite_to_current(self):
+        """Adds the elite population to the current population dictionary.
+        """
+        start = self.num_pop - self.num_elite
+        self.current_pop['binary'][start:] = self.elite_pop['binary']
+        self.current_pop['decoded'] = zeros((self.num_pop, self.num_var), dtype=int64)
+        self.current_pop['decoded'][start:] = self.elite_pop['decoded']
+        self.current_pop['scaled'] = zeros((self.num_pop, self.num_var), dtype=float64)
+        self.current_pop['scaled'][start:] = self.elite_pop['scaled']
+        self.current_pop['fit_value'] = zeros(self.num_pop, dtype=float64)
+        self.current_pop['fit_value'][start:] = self.elite_pop['fit_value']
+
+    def get_pop_from_pop_file(self, gen):
+        """Reads the population of the ``gen`` generation from the checkpoint log and returns
+        the saved population data. The checkpoint log, or the population file of an optimization
+        without checkpoint log, must be in ``GANumpy.input_path``.
+
+        Parameters
+        ----------
+        gen: int
+            The generation index.
+
+        Returns
+        -------
+        file_pop: dict
+            The population dictionary contained in the file.
+        """
+        checkpoint = GACheckpoint(self.input_path + self.fit_name + '.galog')
+        if checkpoint.exists():
+            num_pop, chromosomes, fit_values = checkpoint.read_bytes(gen)
+            chromosomes = frombuffer(chromosomes, dtype=uint8).reshape((num_pop, -1))
+            binary = unpackbits(chromosomes, axis=1)[:, :self.total_bin_dig]
+            fit_value = frombuffer(fit_values, dtype='<f8').astype(float64)
+        else:
+            file_pop = super(GANumpy, self).get_pop_from_pop_file(gen)
+            binary = array([[bit for variable in individual for bit in variable] for individual in file_pop['binary']], dtype=uint8)
+            binary = binary.reshape((-1, self.total_bin_dig))
+            fit_value = asarray(file_pop['fit_value'], dtype=float64)
+        decoded = self.decode_binary_pop(binary)
+        return {'binary': binary,
+                'decoded': decoded,
+                'scaled': self.scale_population(decoded),
+                'fit_value': fit_value}
+
+    def get_best_individual_index(self):
+        """Saves the index of the best performing individual of the current population
+         in ``GANumpy.best_individual_index``.
+        """
+        super(GANumpy, self).get_best_individual_index()
+        self.best_individual_index = int(self.best_individual_index)
+
+    def write_out_file(self, generation):
+        """Appends the population data for a given generation to the checkpoint log.
+
+        Parameters
+        ----------
+        generation: int
+            The generation number.
+        """
+        binary = self.current_pop['binary']
+        fit_value = asarray(self.current_pop['fit_value'], dtype='<f8')
+        self.checkpoint.write(generation, len(binary), packbits(binary, axis=1).tobytes(), fit_value.tobytes())
+
+    def __str__(self):
+        current_pop = self.current_pop
+        self.current_pop = {key: asarray(value).tolist() for key, value in current_pop.items()}
+        try:
+            return super(GANumpy, self).__str__()
+        finally:
+            self.current_pop = current_pop
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+    import time
+
+    from compas.numerical import ga
+
+    def fit_function(X):
+        return sum(x ** 2 for x in X)
+
+    output_path = os.path.join(tempfile.gettempdir(), 'ga_out/')
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+
+    for num_pop, num_var in ((100, 10), (1000, 100), (2000, 200)):
+        t0 = time.time()
+        ga_ = ga_numpy(fit_function, 'min', num_var, [(-1, 1)] * num_var, num_gen=10, num_pop=num_pop,
+                       num_elite=10, output_path=output_path, print_refresh=100)
+        t1 = time.time()
+        line = 'individuals: {0:>5} variables: {1:>4} numpy: {2:.2f}s'.format(num_pop, num_var, t1 - t0)
+        if num_pop <= 1000:
+            t0 = time.time()
+            ga(fit_function, 'min', num_var, [(-1, 1)] * num_var, num_gen=10, num_pop=num_pop,
+               num_elite=10, output_path=output_path, print_refresh=100)
+            t1 = time.time()
+            line += ' python: {0:.2f}s'.format(t1 - t0)
+        print(line)
@@ -6,6 +6,8 @@ import re
 import random
 import json
 
+from compas.numerical.ga.evaluator import FitnessEvaluator
+
 
 __all__ = ['moga']
 
@@ -45,7 +47,8 @@ def moga(fit_functions,
          fit_names=None,
          fargs=None,
          fkwargs=None,
-         output_path=None):
+         output_path=None,
+         evaluator=None):
     """Multi-objective Genetic Algorithm optimisation.
 
     Parameters
@@ -85,6 +88,11 @@ def moga(fit_functions,
         Keyword arguments to be fed to the fitness function.
     output_path : str, optional [None]
         Path for the optimization result files.
+    evaluator : :class:`FitnessEvaluator`, optional [None]
+        The evaluator of the fitness of the population.
+        Use an evaluator with an executor, such as a process pool,
+        to evaluate the individuals of a generation in parallel.
+        If None is given, the individuals are evaluated one after the other.
 
     Returns
     -------
@@ -185,6 +193,9 @@ def moga(fit_functions,
     moga.fit_functions = fit_functions
     moga.output_path = output_path or ''
     moga.num_fit_func = len(fit_functions)
+    if evaluator:
+        moga.evaluator = evaluator
+        moga.ind_fit_dict = evaluator.cache
     moga.moga_optimize()
     return moga
 
@@ -258,6 +269,8 @@ class MOGA(object):
     ind_fit_dict : dict
         This dictionary keeps track of already evaluated solutions to avoid dupplicate
         fitness function calls.
+    evaluator : :class:`FitnessEvaluator`
+        The evaluator of the fitness of the population.
     """
 
     def __init__(self):
@@ -293,7 +306,8 @@ class MOGA(object):
         self.fixed_start_pop = None
         self.fargs = {}
         self.fkwargs = {}
-        self.ind_fit_dict = {}
+        self.evaluator = FitnessEvaluator()
+        self.ind_fit_dict = self.evaluator.cache
 
     def __str__(self):
         """Compile a summary of the MOGA."""
@@ -334,24 +348,16 @@ class MOGA(object):
                     self.parent_pop['binary'][i] = self.fixed_start_pop['binary'][i]
                     self.parent_pop['decoded'][i] = self.fixed_start_pop['decoded'][i]
                     self.parent_pop['scaled'][i] = self.fixed_start_pop['scaled'][i]
-            self.parent_pop['fit_values'] = [[[]] * self.num_fit_func for i in range(self.num_pop)]
-            for i in range(self.num_pop):
-                for j in range(self.num_fit_func):
-                    fit_func = self.fit_functions[j]
-                    self.parent_pop['fit_values'][i][j] = fit_func(self.parent_pop['scaled'][i], **self.fkwargs)
+            self.parent_pop['fit_values'] = self.evaluate_population(self.parent_pop, start_gen_number)
 
         self.current_pop['binary'] = self.generate_random_bin_pop()
 
         for generation in range(start_gen_number, self.num_gen):
-            print('generation ', generation)
+            print('generation ', generation, self.evaluator.report())
 
             self.current_pop['decoded'] = self.decode_binary_pop(self.current_pop['binary'])
             self.current_pop['scaled'] = self.scale_population(self.current_pop['decoded'])
-            self.current_pop['fit_values'] = [[[]] * self.num_fit_func for i in range(self.num_pop)]
-            for i in range(self.num_pop):
-                for j in range(self.num_fit_func):
-                    fit_func = self.fit_functions[j]
-                    self.current_pop['fit_values'][i][j] = fit_func(self.current_pop['scaled'][i], **self.fkwargs)
+            self.current_pop['fit_values'] = self.evaluate_population(self.current_pop, generation)
 
             self.combine_populations()
             self.non_dom_sort()
@@ -372,13 +378,38 @@ class MOGA(object):
             else:
                 print(self)
 
+    def evaluate_population(self, pop, generation=None):
+        """Evaluates the fitness of all individuals of a population with ``MOGA.evaluator``.
+
+        Parameters
+        ----------
+        pop: dict
+            A population dictionary.
+        generation: int, optional
+            The generation number.
+
+        Returns
+        -------
+        fit_values: list
+            For every individual, the list of fitness values.
+        """
+        decoded = [[pop['decoded'][i][j] for j in range(self.num_var)] for i in range(self.num_pop)]
+        scaled = [pop['scaled'][i] for i in range(self.num_pop)]
+        values = self.evaluator.evaluate(self.fit_functions,
+                                         decoded,
+                                         scaled,
+                                         self.fargs,
+                                         self.fkwargs,
+                                         generation)
+        return [list(fit_values) for fit_values in values]
+
     def evaluate_fitness(self, index, fit_func):
-        chromo = ''.join(str(y) for x in self.current_pop['binary'][index] for y in x)
-        fit = self.ind_fit_dict.setdefault(chromo, None)
-        if not fit:
-            fit = fit_func(self.current_pop['scaled'][index], *self.fargs, **self.fkwargs)
-            self.ind_fit_dict[chromo] = fit
-        return fit
+        values = self.evaluator.evaluate(self.fit_functions,
+                                         [[self.current_pop['decoded'][index][j] for j in range(self.num_var)]],
+                                         [self.current_pop['scaled'][index]],
+                                         self.fargs,
+                                         self.fkwargs)
+        return values[0][self.fit_functions.index(fit_func)]
 
     def write_out_file(self, generation):
         """This function writes a file containing all of the population data for
@@ -390,7 +421,7 @@ class MOGA(object):
             The generation to write the population data of.
         """
         filename = 'generation ' + "%03d" % generation + '_pareto_front' + ".pareto"
-        pf_file = open(self.output_path + (str(filename)), "wb")
+        pf_file = open(self.output_path + (str(filename)), "w")
         pf_file.write('Generation \n')
         pf_file.write(str(generation) + '\n')
         pf_file.write('\n')
@@ -978,7 +1009,7 @@ class MOGA(object):
         for name in self.fit_names:
             filename += name + '-'
         filename += '.json'
-        with open(self.output_path + filename, 'wb+') as fh:
+        with open(self.output_path + filename, 'w+') as fh:
             json.dump(data, fh)
 
     def write_gen_json_file(self, generation):
@@ -994,8 +1025,8 @@ class MOGA(object):
         """
         data = self.make_gen_data()
         filename = 'generation ' + "%03d" % generation + '_pareto_front' + ".json"
-        fh = open(self.output_path + filename, 'wb+')
-        json.dump(data, fh)
+        with open(self.output_path + filename, 'w+') as fh:
+            json.dump(data, fh)
 
     def create_fixed_start_pop(self, scaled=None, binary=None):
         """This function creates a population to start the MOGA from a given scaled
@@ -3,34 +3,58 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
 from numpy import abs
+from numpy import arange
+from numpy import argsort
 from numpy import asarray
 from numpy import array
+from numpy import bincount
 from numpy import ceil
+from numpy import concatenate
 from numpy import dot
+from numpy import einsum
+from numpy import empty
+from numpy import float64
+from numpy import full
 from numpy import hstack
 from numpy import kron
 from numpy import max
 from numpy import maximum
+from numpy import meshgrid
 from numpy import min
 from numpy import minimum
 from numpy import int64
 from numpy import newaxis
 from numpy import ones
+from numpy import prod
 from numpy import ravel
 from numpy import reshape
+from numpy import setdiff1d
 from numpy import sqrt
 from numpy import squeeze
 from numpy import sum
 from numpy import tile
+from numpy import unique
 from numpy import vstack
 from numpy import zeros
 
 from scipy.sparse import coo_matrix
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import splu
 from scipy.sparse.linalg import spsolve
 
+try:
+    from sksparse.cholmod import cholesky
+except ImportError:
+    cholesky = None
+
 
-__all__ = ['topop_numpy']
+__all__ = [
+    'topop_numpy',
+    'TopopNumpy',
+]
 
 
 def topop_numpy(nelx, nely, loads, supports, volfrac=0.5, penal=3, rmin=1.5, callback=None):
@@ -228,9 +252,389 @@ def topop_numpy(nelx, nely, loads, supports, volfrac=0.5, penal=3, rmin=1.5, cal
     return x
 
 
+def _element_stiffness_2d(v):
+    # the stiffness matrix of a square bilinear element in plane stress, with unit modulus, as in topop_numpy
+    A11 = array([[12, +3, -6, -3], [+3, 12, +3, +0], [-6, +3, 12, -3], [-3, +0, -3, 12]])
+    A12 = array([[-6, -3, +0, +3], [-3, -6, -3, -6], [+0, -3, -6, +3], [+3, -6, +3, -6]])
+    B11 = array([[-4, +3, -2, +9], [+3, -4, -9, +4], [-2, -9, -4, -3], [+9, +4, -3, -4]])
+    B12 = array([[+2, -3, +4, -9], [-3, +2, +9, -2], [+4, +9, +2, +3], [-9, -2, +3, +2]])
+    A = vstack([hstack([A11, A12]), hstack([A12.T, A11])])
+    B = vstack([hstack([B11, B12]), hstack([B12.T, B11])])
+    return 1 / (1 - v**2) / 24 * (A + v * B)
+
+
+# the corners of a hexahedral element, as offsets of the vertex with the smallest indices
+CORNERS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+
+
+def _element_stiffness_3d(v):
+    # the stiffness matrix of a cubic trilinear element, with unit modulus,
+    # integrated with 2x2x2 Gauss points
+    D = zeros((6, 6))
+    D[:3, :3] = v
+    D[[0, 1, 2], [0, 1, 2]] = 1 - v
+    D[[3, 4, 5], [3, 4, 5]] = 0.5 - v
+    D /= (1 + v) * (1 - 2 * v)
+    signs = 2 * asarray(CORNERS, dtype=float64) - 1
+    Ke = zeros((24, 24))
+    g = 1 / sqrt(3)
+    for point in signs * g:
+        # derivatives of the shape functions with respect to x, y and z, for a unit cube
+        dN = zeros((3, 8))
+        for i in range(3):
+            j, k = [axis for axis in range(3) if axis != i]
+            dN[i] = 2 * signs[:, i] / 8 * (1 + signs[:, j] * point[j]) * (1 + signs[:, k] * point[k])
+        B = zeros((6, 24))
+        B[0, 0::3] = dN[0]
+        B[1, 1::3] = dN[1]
+        B[2, 2::3] = dN[2]
+        B[3, 0::3] = dN[1]
+        B[3, 1::3] = dN[0]
+        B[4, 1::3] = dN[2]
+        B[4, 2::3] = dN[1]
+        B[5, 0::3] = dN[2]
+        B[5, 2::3] = dN[0]
+        Ke += B.T.dot(D).dot(B) / 8
+    return Ke
+
+
+class TopopNumpy(object):
+    """Topology optimisation on 2D grids of quadrilateral elements and 3D grids of hexahedral elements,
+    for repeated solutions of large grids.
+
+    Parameters
+    ----------
+    shape : tuple
+        The number of elements in x and y, or in x, y and z.
+    loads : dict
+        {'i-j': [Px, Py]} in 2D, or {'i-j-k': [Px, Py, Pz]} in 3D.
+    supports : dict
+        {'i-j': [Bx, By]} in 2D, or {'i-j-k': [Bx, By, Bz]} in 3D. 1=fixed, 0=free.
+    penal : float, optional
+        Penalisation power.
+    rmin : float, optional
+        Filter radius.
+
+    Attributes
+    ----------
+    history : dict
+        Per iteration of the last optimisation, the compliance (``compliance``), the volume fraction (``volume``),
+        the largest change of the densities (``change``), and the time spent on the solution of the system (``time``).
+    factorizations : int
+        The number of numerical factorizations computed so far.
+
+    Notes
+    -----
+    In 2D, the result of :meth:`optimize` is the same as that of :func:`topop_numpy`.
+    The vertices are numbered in columns, and the density array has the shape ``(nely, nelx)``.
+    In 3D, the vertices are numbered in columns per layer in z, and the density array has the shape ``(nely, nelx, nelz)``.
+
+    The positions of all element stiffness entries in the compressed global stiffness matrix of the free degrees of freedom,
+    and the density filter, are computed once.
+    In every iteration, the global stiffness matrix is assembled by summing the scaled element stiffness entries into these positions,
+    and factorized numerically with the fill-reducing ordering of the first factorization.
+    If ``scikit-sparse`` is installed, the factorization is a sparse Cholesky factorization with CHOLMOD,
+    reusing the symbolic analysis, otherwise a sparse LU factorization with SuperLU.
+
+    Examples
+    --------
+    >>> solver = TopopNumpy((20, 10), {'20-0': [0, -1]}, {'0-{}'.format(j): [1, 1] for j in range(11)})
+    >>> x = solver.optimize(volfrac=0.4)
+    >>> x.shape
+    (10, 20)
+
+    """
+
+    def __init__(self, shape, loads, supports, penal=3, rmin=1.5):
+        self.shape = tuple(int(n) for n in shape)
+        self.dim = len(self.shape)
+        self.penal = penal
+        self.rmin = rmin
+        self.E = 1.
+        self.Emin = 10**(-10)
+        self.nu = 0.3
+        self.factorizations = 0
+        self.history = None
+        self._elements()
+        self._boundary_conditions(loads, supports)
+        self._filter()
+        self._assembly(arange(len(self.free)))
+        self._order = None
+        self._factor = None
+
+    def _elements(self):
+        ne = prod(self.shape)
+        if self.dim == 2:
+            nelx, nely = self.shape
+            nx = nelx + 1
+            ny = nely + 1
+            self.num_nodes = nx * ny
+            self.Ke = _element_stiffness_2d(self.nu)
+            nodes = reshape(range(1, self.num_nodes + 1), (ny, nx), order='F')
+            eVec = tile(reshape(2 * nodes[:-1, :-1], (ne, 1), order='F'), (1, 8))
+            self.edof = eVec + tile(hstack([array([0, 1]), 2 * nely + array([2, 3, 0, 1]), array([-2, -1])]), (ne, 1))
+        elif self.dim == 3:
+            nelx, nely, nelz = self.shape
+            nx = nelx + 1
+            ny = nely + 1
+            nz = nelz + 1
+            self.num_nodes = nx * ny * nz
+            self.Ke = _element_stiffness_3d(self.nu)
+            # the indices of the elements in the order of the densities
+            iy, ix, iz = [a.ravel(order='F') for a in meshgrid(arange(nely), arange(nelx), arange(nelz), indexing='ij')]
+            corners = [((iz + dz) * nx + ix + dx) * ny + iy + dy for dx, dy, dz in CORNERS]
+            self.edof = (3 * asarray(corners).T[:, :, None] + arange(3)).reshape((ne, 24))
+        else:
+            raise ValueError('The shape of the grid must have two or three dimensions.')
+        self.edof = self.edof.astype(int64)
+
+    def _node(self, key):
+        index = [int(i) for i in key.split('-')]
+        if self.dim == 2:
+            jb, ib = index
+            return jb * (self.shape[1] + 1) + ib
+        jb, ib, kb = index
+        return (kb * (self.shape[0] + 1) + jb) * (self.shape[1] + 1) + ib
+
+    def _boundary_conditions(self, loads, supports):
+        d = self.dim
+        ndof = d * self.num_nodes
+        fixed = []
+        for support, B in supports.items():
+            node = self._node(support)
+            fixed += [d * node + i for i in range(d) if B[i]]
+        self.fixed = unique(asarray(fixed, dtype=int64))
+        self.free = setdiff1d(arange(ndof), self.fixed)
+        self.F = zeros(ndof)
+        for load, P in loads.items():
+            node = self._node(load)
+            self.F[d * node: d * node + d] += P
+
+    def _filter(self):
+        # the density filter, for all pairs of elements within the filter radius
+        shape = self.shape[1:2] + self.shape[0:1] + self.shape[2:]
+        ne = prod(shape)
+        r = int(ceil(self.rmin)) - 1
+        index = arange(ne).reshape(shape, order='F')
+        rows = []
+        cols = []
+        data = []
+        for offset in zip(*[a.ravel() for a in meshgrid(*[arange(-r, r + 1)] * self.dim, indexing='ij')]):
+            weight = self.rmin - sqrt(sum(asarray(offset) ** 2))
+            if weight <= 0:
+                continue
+            # the elements for which the element at the offset is inside the grid
+            a = index[tuple(slice(max([0, -o]), n - max([0, o])) for o, n in zip(offset, shape))]
+            b = index[tuple(slice(max([0, o]), n - max([0, -o])) for o, n in zip(offset, shape))]
+            rows.append(a.ravel())
+            cols.append(b.ravel())
+            data.append(full(a.size, weight))
+        self.H = coo_matrix((concatenate(data), (concatenate(rows), concatenate(cols))), shape=(ne, ne)).tocsr()
+        self.Hs = asarray(self.H.sum(axis=1)).ravel()
+
+    def _assembly(self, renumber):
+        # the position of every element stiffness entry of the free degrees of freedom
+        # in the data of the compressed stiffness matrix, with the free degrees of freedom renumbered
+        ndof = self.dim * self.num_nodes
+        index = full(ndof, -1, dtype=int64)
+        index[self.free] = renumber
+        n = len(self.free)
+        d = self.edof.shape[1]
+        rows = index[self.edof][:, :, None].repeat(d, axis=2)
+        cols = index[self.edof][:, None, :].repeat(d, axis=1)
+        keep = ((rows >= 0) & (cols >= 0)).ravel()
+        keys, self._slot = unique(rows.ravel()[keep] * n + cols.ravel()[keep], return_inverse=True)
+        self._keep = keep
+        self._indices = keys % n
+        self._indptr = concatenate(([0], bincount(keys // n, minlength=n).cumsum()))
+        self._renumber = renumber
+
+    def stiffness(self, x):
+        """Assemble the stiffness matrix of the free degrees of freedom.
+
+        Parameters
+        ----------
+        x : array
+            The densities of the elements.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The stiffness matrix, with the free degrees of freedom in the order of the factorization.
+
+        """
+        n = len(self.free)
+        Ee = self.Emin + ravel(x, order='F') ** self.penal * (self.E - self.Emin)
+        sK = (Ee[:, None] * self.Ke.ravel()[None, :]).ravel()[self._keep]
+        data = bincount(self._slot, weights=sK, minlength=len(self._indices))
+        return csr_matrix((data, self._indices, self._indptr), shape=(n, n))
+
+    def factorize(self, K):
+        """Compute the numerical factorization of a stiffness matrix, reusing the ordering of the first factorization.
+
+        Parameters
+        ----------
+        K : scipy.sparse.csr_matrix
+            The stiffness matrix.
+
+        """
+        if cholesky is not None:
+            # the matrix is symmetric, such that its compressed rows are also its compressed columns
+            K = K.tocsc()
+            if self._factor is None:
+                self._factor = cholesky(K)
+            else:
+                self._factor.cholesky_inplace(K)
+            self._solve = self._factor
+        else:
+            options = {'SymmetricMode': True}
+            if self._order is None:
+                lu = splu(K.tocsc(), permc_spec='MMD_AT_PLUS_A', options=options)
+                # renumber the free degrees of freedom,
+                # such that all following matrices are assembled in the fill-reducing order
+                self._order = argsort(lu.perm_c)
+                renumber = empty(len(self.free), dtype=int64)
+                renumber[self._order] = arange(len(self.free))
+                self._assembly(renumber)
+                self._solve = lu.solve
+            else:
+                lu = splu(K.tocsc(), permc_spec='NATURAL', options=options)
+                self._solve = lambda b: lu.solve(b[self._order])[self._renumber]
+        self.factorizations += 1
+
+    def displacements(self, x):
+        """Compute the displacements for given densities.
+
+        Parameters
+        ----------
+        x : array
+            The densities of the elements.
+
+        Returns
+        -------
+        array
+            The displacements of all degrees of freedom.
+
+        """
+        U = zeros(self.dim * self.num_nodes)
+        self.factorize(self.stiffness(x))
+        U[self.free] = self._solve(self.F[self.free])
+        return U
+
+    def optimize(self, volfrac=0.5, move=0.2, tol=0.1, kmax=1000, callback=None, callback_args=None):
+        """Optimise the distribution of material.
+
+        Parameters
+        ----------
+        volfrac : float, optional
+            Volume fraction.
+        move : float, optional
+            The largest change of the densities per iteration.
+        tol : float, optional
+            The optimisation stops when the largest change of the densities is not larger than the tolerance.
+        kmax : int, optional
+            The maximum number of iterations.
+        callback : callable, optional
+            User-defined function that is called at every iteration,
+            with the iteration number, the densities, a dict with the compliance, the volume fraction,
+            the largest change and the solution time of the iteration, and the callback arguments.
+        callback_args : tuple, optional
+            Additional arguments passed to the callback.
+
+        Returns
+        -------
+        array
+            Density array.
+
+        """
+        if callback and not callable(callback):
+            raise Exception("The provided callback is not callable.")
+        shape = self.shape[1:2] + self.shape[0:1] + self.shape[2:]
+        ne = prod(shape)
+        penal = self.penal
+        E = self.E
+        Emin = self.Emin
+        history = {'compliance': [], 'volume': [], 'change': [], 'time': []}
+        self.history = history
+        x = full(shape, float(volfrac))
+        xP = x * 1.
+        change = 1
+        k = 0
+        while change > tol and k < kmax:
+            t0 = time.time()
+            U = self.displacements(xP)
+            t1 = time.time()
+            Ue = U[self.edof]
+            ce = einsum('ij,jk,ik->i', Ue, self.Ke, Ue).reshape(shape, order='F')
+            c = sum((Emin + xP**penal * (E - Emin)) * ce)
+            dc = -penal * (E - Emin) * xP**(penal - 1) * ce
+            xdc = self.H.dot(ravel(x * dc, order='F'))
+            dc = reshape(xdc / self.Hs / maximum(0.001, ravel(x, order='F')), shape, order='F')
+            l1 = 0
+            l2 = 10**9
+            while (l2 - l1) / (l1 + l2) > 0.001:
+                lmid = 0.5 * (l2 + l1)
+                sdv = sqrt(-dc / lmid)
+                xn = maximum(0, maximum(x - move, minimum(1, minimum(x + move, x * sdv))))
+                if sum(xn) > volfrac * ne:
+                    l1 = lmid
+                else:
+                    l2 = lmid
+            change = max(abs(xn - x))
+            x = xn * 1.
+            xP = xn * 1.
+            history['compliance'].append(c)
+            history['volume'].append(sum(x) / ne)
+            history['change'].append(change)
+            history['time'].append(t1 - t0)
+            if callback:
+                callback(k, x, {key: values[-1] for key, values in history.items()}, callback_args)
+            k += 1
+        for key in history:
+            history[key] = asarray(history[key])
+        return x
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import os
+    import sys
+
+    def cantilever(shape):
+        # supports along the left side, and a load in the middle of the right side
+        nelx, nely = shape[:2]
+        if len(shape) == 2:
+            loads = {'{}-{}'.format(nelx, nely // 2): [0, -1]}
+            supports = {'0-{}'.format(j): [1, 1] for j in range(nely + 1)}
+        else:
+            nelz = shape[2]
+            loads = {'{}-{}-{}'.format(nelx, nely // 2, k): [0, -1, 0] for k in range(nelz + 1)}
+            supports = {'0-{}-{}'.format(j, k): [1, 1, 1] for j in range(nely + 1) for k in range(nelz + 1)}
+        return loads, supports
+
+    for shape in ((60, 20), (120, 40), (240, 80), (20, 10, 5), (30, 10, 6)):
+        loads, supports = cantilever(shape)
+        line = 'grid: {0:<14}'.format('x'.join(str(n) for n in shape))
+        if len(shape) == 2:
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w')
+            t0 = time.time()
+            topop_numpy(shape[0], shape[1], loads, supports, volfrac=0.4)
+            t1 = time.time()
+            sys.stdout.close()
+            sys.stdout = stdout
+            line += ' topop_numpy: {0:>7.2f}s'.format(t1 - t0)
+        else:
+            line += ' ' * 22
+        t0 = time.time()
+        solver = TopopNumpy(shape, loads, supports)
+        solver.optimize(volfrac=0.4)
+        t1 = time.time()
+        history = solver.history
+        line += ' TopopNumpy: {0:>7.2f}s iterations: {1:>3} solve: {2:>6.3f}s/it compliance: {3:.4g}'.format(
+            t1 - t0, len(history['time']), history['time'].mean(), history['compliance'][-1])
+        print(line)
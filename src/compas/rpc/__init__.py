@@ -34,6 +34,42 @@ of the proxied package are available as if they were directly present in our env
     :nosignatures:
 
     Proxy
+    Batch
+    Future
+
+A proxy can also submit calls without waiting for the results,
+and collect calls in a batch that is sent in a single request.
+
+Large objects can be kept on the server, and passed to remote functions by handle,
+such that they are not sent and decoded for every call.
+With ``cache = True``, the server answers repeated identical calls from a cache of results.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Handle
+    ObjectStore
+
+Server
+======
+
+The default service starts a :class:`Server`, which executes all calls in its own process,
+one after the other.
+A :class:`PoolServer` handles the requests of concurrent clients in threads,
+and executes the calls in a pool of worker processes.
+Both accept calls in the binary encoding of :func:`encode_binary`,
+which is used by a proxy with ``binary=True``.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Server
+    PoolServer
+    Dispatcher
+    encode_binary
+    decode_binary
 
 RPC Command-line utility
 ========================
@@ -47,6 +83,12 @@ To start a new RPC server use the following command (default port is ``1753``):
 
     $ compas_rpc start <port>
 
+To start a server with a pool of worker processes:
+
+::
+
+    $ compas_rpc start --port <port> --processes <processes>
+
 Conversely, to stop an existing RPC server:
 
 ::
@@ -65,6 +107,9 @@ from __future__ import division
 from __future__ import print_function
 
 from .errors import *  # noqa: F401 F403
+from .encoding import *  # noqa: F401 F403
+from .futures import *  # noqa: F401 F403
+from .store import *  # noqa: F401 F403
 from .proxy import *  # noqa: F401 F403
 from .server import *  # noqa: F401 F403
 from .dispatcher import *  # noqa: F401 F403
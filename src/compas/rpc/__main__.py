@@ -8,8 +8,8 @@ except ImportError:
     from xmlrpc.client import ServerProxy
 
 
-def start(port, **kwargs):
-    start_service(port)
+def start(port, processes=None, **kwargs):
+    start_service(port, processes)
 
 
 def stop(port, **kwargs):
@@ -48,6 +48,8 @@ def main():
     start_command = commands.add_parser('start', help='Start RPC server')
     start_command.add_argument(
         '--port', '-p', action='store', default=1753, type=int, help='RPC port number')
+    start_command.add_argument(
+        '--processes', action='store', default=None, type=int, help='Number of worker processes')
     start_command.set_defaults(func=start)
 
     # Command: stop
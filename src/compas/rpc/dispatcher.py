@@ -2,6 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
+import hashlib
 import json
 import importlib
 
@@ -24,13 +25,39 @@ import traceback
 from compas.utilities import DataEncoder
 from compas.utilities import DataDecoder
 
+from compas.rpc.encoding import decode_binary
+from compas.rpc.encoding import encode_binary
+from compas.rpc.store import Handle
+from compas.rpc.store import ObjectStore
+
 
 __all__ = ['Dispatcher']
 
 
+# the name of the XMLRPC method for a batch of API calls
+BATCH = '__batch__'
+
+# the names of the XMLRPC methods of the object store
+IDENTITY = '__identity__'
+RELEASE = '__release__'
+
+
+def _identity(obj):
+    return obj
+
+
 class Dispatcher(object):
     """Base class for remote services.
 
+    Parameters
+    ----------
+    objects : :class:`compas.rpc.ObjectStore`, optional
+        The store of the objects that are kept for clients, and referred to by handles.
+        Default is ``None``, in which case a store with a limit of 1 GB is used.
+    results : :class:`compas.rpc.ObjectStore`, optional
+        The cache of the encoded results of calls.
+        Default is ``None``, in which case a cache of at most 1000 results and 256 MB is used.
+
     Examples
     --------
     >>>
@@ -42,8 +69,90 @@ class Dispatcher(object):
     message strings assigned to the `'error'` key of the output dictionary
     such that the errors can be rethrown on the client side.
 
+    The functions are looked up once per name, and kept for all following calls.
+
+    The input dictionary of a call can have an `'options'` dictionary.
+    With the option `'handle'`, the result is kept in the object store,
+    and a :class:`compas.rpc.Handle` is returned instead.
+    Handles passed as arguments, directly or as items of lists, tuples and dicts,
+    are replaced by the objects they refer to.
+    With the option `'cache'`, the output of the call is cached,
+    with the hash of the name of the function and the encoded arguments as key,
+    and identical calls are answered from the cache without executing the function.
+    This is only correct for functions that do not depend on, or modify, anything but their arguments.
+
+    Both stores remove the least recently used objects if they exceed their limits.
+
     """
 
+    # the index of the worker process of a pool server that runs the dispatcher
+    worker = None
+
+    def __init__(self, objects=None, results=None):
+        self._objects = objects
+        self._results = results
+
+    @property
+    def objects(self):
+        """:class:`compas.rpc.ObjectStore` : The objects that are referred to by handles."""
+        if self.__dict__.get('_objects') is None:
+            self._objects = ObjectStore(max_bytes=2**30)
+        return self._objects
+
+    @property
+    def results(self):
+        """:class:`compas.rpc.ObjectStore` : The cached outputs of calls."""
+        if self.__dict__.get('_results') is None:
+            self._results = ObjectStore(max_items=1000, max_bytes=2**28)
+        return self._results
+
+    def _resolve(self, name, odict):
+        """Find the function corresponding to an API call.
+
+        Parameters
+        ----------
+        name : str
+            Name of the function, including the name of its module.
+        odict : dict
+            The output dictionary, to which the error message is assigned if the function cannot be found.
+
+        Returns
+        -------
+        callable
+            The function, or ``None``.
+
+        """
+        functions = self.__dict__.setdefault('_functions', {})
+        if name in functions:
+            return functions[name]
+        if name == IDENTITY:
+            return _identity
+        if name == RELEASE:
+            return self._release
+
+        parts = name.split('.')
+
+        functionname = parts[-1]
+
+        try:
+            if len(parts) > 1:
+                modulename = ".".join(parts[:-1])
+                module = importlib.import_module(modulename)
+            else:
+                module = self
+        except Exception:
+            odict['error'] = traceback.format_exc()
+            return None
+
+        try:
+            function = getattr(module, functionname)
+        except AttributeError:
+            odict['error'] = "This function is not part of the API: {0}".format(functionname)
+            return None
+
+        functions[name] = function
+        return function
+
     def _dispatch(self, name, args):
         """Dispatcher method for XMLRPC API calls.
 
@@ -72,44 +181,115 @@ class Dispatcher(object):
             * `'error'`   : The error message of any error that may have been thrown in the processes of dispatching to or execution of the API function.
             * `'profile'` : A profile of the function execution.
 
+        Notes
+        -----
+        For a batch of API calls, the name is ``'__batch__'``,
+        and every argument is a list with the name of a function and its JSON serialised input dictionary.
+        The calls are executed in order, and the output is the list of their output strings.
+
+        A second argument, after the input dictionary, is the index of the worker process
+        that keeps the objects of the handles in the input.
+        It is used by :class:`compas.rpc.PoolServer` to send the call to that process.
+
         """
+        if name == BATCH:
+            return [self._dispatch(item[0], item[1:]) for item in args]
+
         odict = {
             'data': None,
             'error': None,
             'profile': None
         }
 
-        parts = name.split('.')
+        function = self._resolve(name, odict)
 
-        functionname = parts[-1]
+        if function is not None:
+            try:
+                idict = json.loads(args[0], cls=DataDecoder)
+            except (IndexError, TypeError):
+                odict['error'] = (
+                    "API methods require a single JSON encoded dictionary as input.\n"
+                    "For example: input = json.dumps({'param_1': 1, 'param_2': [2, 3]})")
 
-        try:
-            if len(parts) > 1:
-                modulename = ".".join(parts[:-1])
-                module = importlib.import_module(modulename)
             else:
-                module = self
+                cache = (idict.get('options') or {}).get('cache')
+                if cache:
+                    key = self._key(name.encode('utf-8') + b'\0' + args[0].encode('utf-8'))
+                    if key in self.results:
+                        return self.results.get(key)
+
+                self._call(function, idict, odict)
+
+                if cache and not odict['error']:
+                    ostring = json.dumps(odict, cls=DataEncoder)
+                    self._cache_result(key, ostring)
+                    return ostring
+
+        return json.dumps(odict, cls=DataEncoder)
+
+    def _dispatch_binary(self, data):
+        """Dispatcher method for API calls in the binary encoding of :func:`compas.rpc.encode_binary`.
+
+        Parameters
+        ----------
+        data : bytes
+            The encoded input dictionary, with the name of the function (`'function'`),
+            the positional arguments (`'args'`), the named arguments (`'kwargs'`),
+            and optionally the options (`'options'`).
+
+        Returns
+        -------
+        bytes
+            The encoded output dictionary, with the same structure as the output of :meth:`_dispatch`.
+
+        """
+        odict = {
+            'data': None,
+            'error': None,
+            'profile': None
+        }
+        cache = False
+
+        try:
+            idict = decode_binary(data)
+            name = idict['function']
+            idict.setdefault('args', [])
+            idict.setdefault('kwargs', {})
         except Exception:
             odict['error'] = traceback.format_exc()
 
         else:
-            try:
-                function = getattr(module, functionname)
-            except AttributeError:
-                odict['error'] = "This function is not part of the API: {0}".format(functionname)
+            cache = (idict.get('options') or {}).get('cache')
+            if cache:
+                key = self._key(data)
+                if key in self.results:
+                    return self.results.get(key)
 
-            else:
-                try:
-                    idict = json.loads(args[0], cls=DataDecoder)
-                except (IndexError, TypeError):
-                    odict['error'] = (
-                        "API methods require a single JSON encoded dictionary as input.\n"
-                        "For example: input = json.dumps({'param_1': 1, 'param_2': [2, 3]})")
+            function = self._resolve(name, odict)
 
-                else:
-                    self._call(function, idict, odict)
+            if function is not None:
+                self._call(function, idict, odict)
 
-        return json.dumps(odict, cls=DataEncoder)
+        try:
+            odata = encode_binary(odict)
+        except Exception:
+            odict['data'] = None
+            odict['error'] = traceback.format_exc()
+            return encode_binary(odict)
+
+        if cache and not odict['error']:
+            self._cache_result(key, odata)
+        return odata
+
+    def _cache_result(self, key, result):
+        """Cache an encoded result, unless it is too large for the result cache."""
+        try:
+            self.results.put(result, key=key, size=len(result))
+        except ValueError:
+            pass
+
+    def _key(self, data):
+        return hashlib.sha1(data).hexdigest()
 
     def _call(self, function, idict, odict):
         """Method that handles tha actual call to the function corresponding to the API call.
@@ -130,14 +310,43 @@ class Dispatcher(object):
         """
         args = idict['args']
         kwargs = idict['kwargs']
+        options = idict.get('options') or {}
 
         try:
+            args, kwargs = self._load(args, kwargs)
             data = function(*args, **kwargs)
+            if options.get('handle'):
+                data = self._keep(data)
         except Exception:
             odict['error'] = traceback.format_exc()
         else:
             odict['data'] = data
 
+    def _load(self, args, kwargs):
+        """Replace the handles among the arguments of a call by the objects they refer to."""
+
+        def load(obj):
+            if isinstance(obj, Handle):
+                try:
+                    return self.objects.get(obj.id)
+                except KeyError:
+                    raise KeyError("The object of {0!r} is not available, it has been released or evicted.".format(obj))
+            if isinstance(obj, (list, tuple)) and any(isinstance(item, Handle) for item in obj):
+                return type(obj)(load(item) for item in obj)
+            if isinstance(obj, dict) and any(isinstance(item, Handle) for item in obj.values()):
+                return dict((key, load(value)) for key, value in obj.items())
+            return obj
+
+        return [load(arg) for arg in args], dict((name, load(arg)) for name, arg in kwargs.items())
+
+    def _keep(self, obj):
+        """Keep an object in the object store, and return a handle to it."""
+        return Handle(self.objects.put(obj), self.worker, type(obj).__name__)
+
+    def _release(self, *ids):
+        """Remove the objects of handles from the object store."""
+        return len([key for key in ids if self.objects.remove(key)])
+
     def _call_wrapped(self, function, idict, odict):
         args = idict['args']
         kwargs = idict['kwargs']
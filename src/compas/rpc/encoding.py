@@ -0,0 +1,305 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import struct
+import sys
+
+
+__all__ = ['encode_binary', 'decode_binary']
+
+
+PY3 = sys.version_info[0] >= 3
+
+if PY3:
+    basestring = str
+    long = int
+    unicode = str
+
+NONE = b'N'
+TRUE = b'T'
+FALSE = b'F'
+INT = b'i'
+BIGINT = b'I'
+FLOAT = b'f'
+STRING = b's'
+BYTES = b'b'
+LIST = b'l'
+TUPLE = b't'
+DICT = b'd'
+FLOATS = b'D'
+INTS = b'Q'
+ARRAY = b'a'
+DATA = b'o'
+
+SIZE = struct.Struct('<I')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+# struct format characters of the array types that can be decoded without NumPy
+FORMATS = {
+    'f8': 'd', 'f4': 'f',
+    'i8': 'q', 'i4': 'i', 'i2': 'h', 'i1': 'b',
+    'u8': 'Q', 'u4': 'I', 'u2': 'H', 'u1': 'B',
+    'b1': '?',
+}
+
+
+def encode_binary(obj):
+    """Encode an object in the compact binary format of the RPC services.
+
+    Parameters
+    ----------
+    obj : object
+        The object.
+        Supported are ``None``, booleans, numbers, strings, bytes, lists, tuples and dicts of supported objects,
+        NumPy arrays, and objects with a ``to_data`` method and a ``from_data`` class method, such as COMPAS data structures.
+
+    Returns
+    -------
+    bytes
+        The encoded object.
+
+    Raises
+    ------
+    TypeError
+        If the object, or any of its items, is not supported.
+
+    Notes
+    -----
+    Every value starts with a single byte tag.
+    Numbers are stored as little-endian 64-bit integers and floats,
+    lists of only floats or only integers as packed arrays,
+    and NumPy arrays as their type, shape and raw data.
+    The encoding is implemented in pure Python, such that it also works in IronPython.
+    Without NumPy, arrays are decoded as nested lists.
+
+    Examples
+    --------
+    >>> data = encode_binary({'points': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], 'fixed': (0, 1)})
+    >>> decode_binary(data)
+    {'points': [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], 'fixed': (0, 1)}
+
+    """
+    chunks = []
+    _encode(obj, chunks)
+    return b''.join(chunks)
+
+
+def decode_binary(data):
+    """Decode an object from the compact binary format of the RPC services.
+
+    Parameters
+    ----------
+    data : bytes
+        The encoded object.
+
+    Returns
+    -------
+    object
+        The decoded object.
+
+    Raises
+    ------
+    ValueError
+        If the data is not a valid encoding.
+
+    """
+    obj, offset = _decode(data, 0)
+    if offset != len(data):
+        raise ValueError('Unexpected data after the encoded object.')
+    return obj
+
+
+def _encode_size(size, chunks):
+    chunks.append(SIZE.pack(size))
+
+
+def _encode_string(string, chunks):
+    data = string.encode('utf-8')
+    _encode_size(len(data), chunks)
+    chunks.append(data)
+
+
+def _encode(obj, chunks):
+    if obj is None:
+        chunks.append(NONE)
+    elif obj is True:
+        chunks.append(TRUE)
+    elif obj is False:
+        chunks.append(FALSE)
+    elif isinstance(obj, float):
+        chunks.append(FLOAT)
+        chunks.append(FLOAT64.pack(obj))
+    elif isinstance(obj, (int, long)):
+        if INT64_MIN <= obj <= INT64_MAX:
+            chunks.append(INT)
+            chunks.append(INT64.pack(obj))
+        else:
+            chunks.append(BIGINT)
+            _encode_string(str(obj), chunks)
+    elif isinstance(obj, basestring) and not (PY3 and isinstance(obj, bytes)):
+        chunks.append(STRING)
+        _encode_string(unicode(obj), chunks)
+    elif isinstance(obj, (bytes, bytearray)):
+        chunks.append(BYTES)
+        _encode_size(len(obj), chunks)
+        chunks.append(bytes(obj))
+    elif isinstance(obj, list):
+        _encode_list(obj, chunks)
+    elif isinstance(obj, tuple):
+        chunks.append(TUPLE)
+        _encode_size(len(obj), chunks)
+        for item in obj:
+            _encode(item, chunks)
+    elif isinstance(obj, dict):
+        chunks.append(DICT)
+        _encode_size(len(obj), chunks)
+        for key, value in obj.items():
+            _encode(key, chunks)
+            _encode(value, chunks)
+    elif hasattr(obj, 'to_data'):
+        chunks.append(DATA)
+        _encode_string('{}/{}'.format(obj.__class__.__module__, obj.__class__.__name__), chunks)
+        _encode(obj.to_data(), chunks)
+    elif hasattr(obj, 'dtype') and hasattr(obj, 'shape'):
+        _encode_array(obj, chunks)
+    else:
+        raise TypeError('Object of type {} cannot be encoded.'.format(type(obj).__name__))
+
+
+def _encode_list(obj, chunks):
+    # lists of only floats or only integers are packed
+    if obj and all(type(item) is float for item in obj):
+        chunks.append(FLOATS)
+        _encode_size(len(obj), chunks)
+        chunks.append(struct.pack('<%dd' % len(obj), *obj))
+    elif obj and all(type(item) in (int, long) for item in obj) and INT64_MIN <= min(obj) and max(obj) <= INT64_MAX:
+        chunks.append(INTS)
+        _encode_size(len(obj), chunks)
+        chunks.append(struct.pack('<%dq' % len(obj), *obj))
+    else:
+        chunks.append(LIST)
+        _encode_size(len(obj), chunks)
+        for item in obj:
+            _encode(item, chunks)
+
+
+def _encode_array(obj, chunks):
+    if obj.shape == ():
+        # NumPy scalars
+        _encode(obj.item(), chunks)
+        return
+    if obj.dtype.hasobject:
+        _encode(obj.tolist(), chunks)
+        return
+    dtype = obj.dtype.newbyteorder('<') if obj.dtype.byteorder == '>' else obj.dtype
+    chunks.append(ARRAY)
+    _encode_string(dtype.str, chunks)
+    _encode_size(len(obj.shape), chunks)
+    chunks.append(struct.pack('<%dq' % len(obj.shape), *obj.shape))
+    chunks.append(obj.astype(dtype, order='C', copy=False).tobytes(order='C'))
+
+
+def _decode_size(data, offset):
+    return SIZE.unpack_from(data, offset)[0], offset + SIZE.size
+
+
+def _decode_string(data, offset):
+    size, offset = _decode_size(data, offset)
+    return data[offset:offset + size].decode('utf-8'), offset + size
+
+
+def _decode(data, offset):
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == NONE:
+        return None, offset
+    if tag == TRUE:
+        return True, offset
+    if tag == FALSE:
+        return False, offset
+    if tag == INT:
+        return INT64.unpack_from(data, offset)[0], offset + INT64.size
+    if tag == BIGINT:
+        string, offset = _decode_string(data, offset)
+        return int(string), offset
+    if tag == FLOAT:
+        return FLOAT64.unpack_from(data, offset)[0], offset + FLOAT64.size
+    if tag == STRING:
+        return _decode_string(data, offset)
+    if tag == BYTES:
+        size, offset = _decode_size(data, offset)
+        return bytes(data[offset:offset + size]), offset + size
+    if tag == FLOATS:
+        size, offset = _decode_size(data, offset)
+        return list(struct.unpack_from('<%dd' % size, data, offset)), offset + 8 * size
+    if tag == INTS:
+        size, offset = _decode_size(data, offset)
+        return list(struct.unpack_from('<%dq' % size, data, offset)), offset + 8 * size
+    if tag == LIST or tag == TUPLE:
+        size, offset = _decode_size(data, offset)
+        items = []
+        for _ in range(size):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (items if tag == LIST else tuple(items)), offset
+    if tag == DICT:
+        size, offset = _decode_size(data, offset)
+        obj = {}
+        for _ in range(size):
+            key, offset = _decode(data, offset)
+            obj[key], offset = _decode(data, offset)
+        return obj, offset
+    if tag == DATA:
+        dtype, offset = _decode_string(data, offset)
+        value, offset = _decode(data, offset)
+        module, attr = dtype.split('/')
+        cls = getattr(__import__(module, fromlist=[attr]), attr)
+        return cls.from_data(value), offset
+    if tag == ARRAY:
+        return _decode_array(data, offset)
+    raise ValueError('Invalid tag at position {}: {!r}'.format(offset - 1, tag))
+
+
+def _decode_array(data, offset):
+    dtype, offset = _decode_string(data, offset)
+    ndim, offset = _decode_size(data, offset)
+    shape = struct.unpack_from('<%dq' % ndim, data, offset)
+    offset += 8 * ndim
+    size = 1
+    for n in shape:
+        size *= n
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        dtype = numpy.dtype(dtype)
+        if not size:
+            return numpy.zeros(shape, dtype=dtype), offset
+        array = numpy.frombuffer(data, dtype=dtype, count=size, offset=offset).reshape(shape).copy()
+        return array, offset + size * dtype.itemsize
+    key = dtype[1:]
+    if key not in FORMATS:
+        raise ValueError('Arrays of type {} cannot be decoded without NumPy.'.format(dtype))
+    fmt = FORMATS[key]
+    values = list(struct.unpack_from('<%d%s' % (size, fmt), data, offset))
+    offset += struct.calcsize('<' + fmt) * size
+    for n in reversed(shape[1:]):
+        values = [values[i:i + n] for i in range(0, len(values), n)]
+    return values, offset
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+
+    doctest.testmod(globs=globals())
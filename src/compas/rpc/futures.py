@@ -0,0 +1,158 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import threading
+
+
+__all__ = ['Future']
+
+
+class Future(object):
+    """The pending result of a remote call.
+
+    Notes
+    -----
+    This is a minimal version of :class:`concurrent.futures.Future`,
+    which is not available in IronPython.
+    The result is set by the thread that executes the call,
+    and can be retrieved from any other thread.
+
+    Examples
+    --------
+    >>> future = Future()
+    >>> future.add_done_callback(lambda f: print(f.result()))
+    >>> future.set_result(1)
+    1
+    >>> future.done()
+    True
+
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    def done(self):
+        """Verify that the call has completed.
+
+        Returns
+        -------
+        bool
+            True if the call has completed, successfully or not.
+
+        """
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """Wait for the result of the call.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait.
+            Default is ``None``, in which case there is no limit.
+
+        Returns
+        -------
+        object
+            The result of the call.
+
+        Raises
+        ------
+        Exception
+            The error of the call, if it failed.
+        RuntimeError
+            If the call did not complete within the timeout.
+
+        """
+        exception = self.exception(timeout)
+        if exception is not None:
+            raise exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """Wait for the error of the call.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait.
+            Default is ``None``, in which case there is no limit.
+
+        Returns
+        -------
+        Exception
+            The error of the call, or ``None`` if the call was successful.
+
+        Raises
+        ------
+        RuntimeError
+            If the call did not complete within the timeout.
+
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError('The call did not complete within {} seconds.'.format(timeout))
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """Add a function that is called with the future when the call completes.
+
+        Parameters
+        ----------
+        fn : callable
+            The function.
+            If the call has already completed, it is called immediately.
+
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def set_result(self, result):
+        """Set the result of a successful call.
+
+        Parameters
+        ----------
+        result : object
+            The result.
+
+        """
+        self._result = result
+        self._complete()
+
+    def set_exception(self, exception):
+        """Set the error of a failed call.
+
+        Parameters
+        ----------
+        exception : Exception
+            The error.
+
+        """
+        self._exception = exception
+        self._complete()
+
+    def _complete(self):
+        with self._lock:
+            self._event.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+        for fn in callbacks:
+            fn(self)
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+
+    doctest.testmod(globs=globals())
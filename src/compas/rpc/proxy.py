@@ -2,8 +2,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import time
 import json
+import threading
+import time
 
 import compas
 
@@ -12,6 +13,16 @@ try:
 except ImportError:
     from xmlrpc.client import ServerProxy
 
+try:
+    from httplib import HTTPConnection
+except ImportError:
+    from http.client import HTTPConnection
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
 try:
     from subprocess import Popen
     from subprocess import PIPE
@@ -26,10 +37,22 @@ import compas._os
 
 from compas.utilities import DataEncoder
 
+from compas.rpc import RPCClientError
 from compas.rpc import RPCServerError
+from compas.rpc.encoding import decode_binary
+from compas.rpc.encoding import encode_binary
+from compas.rpc.dispatcher import BATCH
+from compas.rpc.dispatcher import IDENTITY
+from compas.rpc.dispatcher import RELEASE
+from compas.rpc.futures import Future
+from compas.rpc.server import BINARY_BATCH_PATH
+from compas.rpc.server import BINARY_PATH
+from compas.rpc.server import WORKER_HEADER
+from compas.rpc.store import Handle
+from compas.rpc.store import handles
 
 
-__all__ = ['Proxy']
+__all__ = ['Proxy', 'Batch']
 
 
 class Proxy(object):
@@ -55,6 +78,28 @@ class Proxy(object):
     port : int, optional
         The port number on the remote server.
         Default is ``1753``.
+    service : string, optional
+        The module of the service that is started if no server is running.
+        Default is ``'compas.rpc.services.default'``.
+    binary : bool, optional
+        If True, the arguments and results of the remote calls are sent in the binary encoding of :func:`compas.rpc.encode_binary`,
+        instead of JSON in XMLRPC messages.
+        This supports NumPy arrays, and is faster for large numerical data.
+        Default is ``False``.
+    processes : int, optional
+        The number of worker processes of a server started by the proxy.
+        Default is ``None``, in which case the server executes all calls in its own process.
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of submitted calls that are sent to the server at the same time.
+        Default is ``4``.
+    cache : bool
+        If True, the server caches the results of the calls,
+        and answers identical calls from the cache.
+        Only use this for functions that do not depend on, or modify, anything but their arguments.
+        Default is ``False``.
 
     Notes
     -----
@@ -81,9 +126,30 @@ class Proxy(object):
         with Proxy('compas.numerical') as numerical:
             pass
 
+    With binary payloads, and a server with a pool of worker processes:
+
+    .. code-block:: python
+
+        from compas.rpc import Proxy
+
+        with Proxy('numpy', binary=True, processes=4) as np:
+            c = np.mean(points, axis=0)
+
+    Keeping a large object on the server, and passing it to remote functions by handle:
+
+    .. code-block:: python
+
+        from compas.rpc import Proxy
+
+        with Proxy('compas.datastructures') as datastructures:
+            handle = datastructures.upload(mesh)
+            subd = datastructures.keep('mesh_subdivide', handle, k=2)
+            area = datastructures.download(subd).area()
+            datastructures.release(handle, subd)
+
     """
 
-    def __init__(self, package=None, python=None, url='http://127.0.0.1', port=1753, service=None):
+    def __init__(self, package=None, python=None, url='http://127.0.0.1', port=1753, service=None, binary=False, processes=None):
         self._package = None
         self._python = compas._os.select_python(python)
         self._url = url
@@ -91,7 +157,18 @@ class Proxy(object):
         self._service = None
         self._process = None
         self._function = None
+        self._name = None
         self._profile = None
+        # the connection and server proxy of every thread
+        self._local = threading.local()
+        self._tasks = None
+        self._workers = []
+
+        self.max_workers = 4
+        self.cache = False
+
+        self.binary = binary
+        self.processes = processes
 
         self.service = service
         self.package = package
@@ -108,6 +185,8 @@ class Proxy(object):
     def __exit__(self, *args):
         # If we started the RPC server, we will try to clean up and stop it
         # otherwise we just disconnect from it
+        self._disconnect()
+        self._stop_workers()
         if self._implicitely_started_server:
             self.stop_server()
         else:
@@ -213,9 +292,13 @@ class Proxy(object):
             self._process.StartInfo.RedirectStandardError = True
             self._process.StartInfo.FileName = self.python
             self._process.StartInfo.Arguments = '-m {0} {1}'.format(self.service, str(self._port))
+            if self.processes:
+                self._process.StartInfo.Arguments += ' {0}'.format(self.processes)
             self._process.Start()
         else:
             args = [self.python, '-m', self.service, str(self._port)]
+            if self.processes:
+                args.append(str(self.processes))
             self._process = Popen(args, stdout=PIPE, stderr=PIPE, env=env)
         # this starts the client side
         # it creates a proxy for the server
@@ -250,6 +333,8 @@ class Proxy(object):
         >>> p.start_server()
         """
         print("Stopping the server proxy.")
+        self._disconnect()
+        self._stop_workers()
         try:
             self._server.remote_shutdown()
         except Exception:
@@ -280,52 +365,498 @@ class Proxy(object):
             self._function = getattr(self._server, name)
         except Exception:
             raise RPCServerError()
+        self._name = name
         return self._proxy
 
-    def _proxy(self, *args, **kwargs):
-        """Callable replacement for the requested functionality.
+    def _disconnect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connect(self):
+        return HTTPConnection(self._url.split('://')[-1], self._port)
+
+    def _request(self, connection, path, data, worker=None):
+        headers = {'Content-Type': 'application/octet-stream'}
+        if worker is not None:
+            headers[WORKER_HEADER] = str(worker)
+        connection.request('POST', path, data, headers)
+        response = connection.getresponse()
+        odata = response.read()
+        if response.status != 200:
+            raise RPCServerError("The server could not process the request: {0} {1}".format(response.status, response.reason))
+        return odata
+
+    def _post(self, data, path=BINARY_PATH, worker=None):
+        """Send a binary API call to the server.
 
         Parameters
         ----------
+        data : bytes
+            The encoded input dictionary.
+        path : str, optional
+            The path of the request.
+        worker : int, optional
+            The index of the worker process of the server that should execute the call.
+
+        Returns
+        -------
+        bytes
+            The encoded output dictionary.
+
+        Notes
+        -----
+        Every thread has its own connection.
+        The connection is kept open for following calls, if the server allows it.
+        If a connection that was kept open has been closed by the server in the meantime,
+        the call is sent again over a new connection.
+
+        """
+        for attempt in range(2):
+            connection = getattr(self._local, 'connection', None)
+            reused = connection is not None
+            if not reused:
+                connection = self._local.connection = self._connect()
+            try:
+                return self._request(connection, path, data, worker)
+            except RPCServerError:
+                raise
+            except Exception:
+                self._disconnect()
+                if reused:
+                    continue
+                raise
+
+    def _route(self, args, kwargs):
+        """Find the worker process of the server that keeps the objects of the handles among the arguments of a call.
+
+        Returns
+        -------
+        int
+            The index of the worker process, or ``None``.
+
+        Raises
+        ------
+        RPCClientError
+            If the handles belong to different worker processes.
+
+        """
+        workers = set(handle.worker for handle in handles(args, kwargs))
+        workers.discard(None)
+        if len(workers) > 1:
+            raise RPCClientError("The handles of a call belong to different worker processes of the server.")
+        return workers.pop() if workers else None
+
+    def _options(self, handle=False):
+        if handle:
+            return {'handle': True}
+        if self.cache:
+            return {'cache': True}
+        return {}
+
+    def _execute(self, name, args, kwargs, server=None, options=None, worker=None):
+        """Execute a remote call.
+
+        Parameters
+        ----------
+        name : str
+            The full name of the remote function.
         args : list
             Positional arguments to be passed to the remote function.
         kwargs : dict
             Named arguments to be passed to the remote function.
+        server : ServerProxy, optional
+            A dedicated server proxy for JSON calls.
+            Default is ``None``, in which case the server proxy of the proxy is used.
+        options : dict, optional
+            The options of the call.
+            Default is ``None``, in which case the options follow from the attributes of the proxy.
+        worker : int, optional
+            The index of the worker process of the server that should execute the call.
+            Default is ``None``, in which case it follows from the handles among the arguments.
 
         Returns
         -------
-        object
-            The result returned by the remote function.
+        dict
+            The output dictionary.
 
-        Warning
-        -------
-        The `args` and `kwargs` have to be JSON-serialisable.
-        This means that, currently, only native Python objects are supported.
-        The returned results will also always be in the form of built-in Python objects.
         """
+        if worker is None:
+            worker = self._route(args, kwargs)
+        if options is None:
+            options = self._options()
+
+        if self.binary:
+            idict = {'function': name, 'args': args, 'kwargs': kwargs}
+            if options:
+                idict['options'] = options
+            return decode_binary(self._post(encode_binary(idict), worker=worker))
+
         idict = {'args': args, 'kwargs': kwargs}
+        if options:
+            idict['options'] = options
         istring = json.dumps(idict, cls=DataEncoder)
         # it makes sense that there is a broken pipe error
         # because the process is not the one receiving the feedback
         # when there is a print statement on the server side
         # this counts as output
         # it should be sent as part of RPC communication
-        try:
-            ostring = self._function(istring)
-        except Exception:
-            # not clear what the point of this is
-            # self.stop_server()
-            # if this goes wrong, it means a Fault error was generated by the server
-            # no need to stop the server for this
-            raise
+        # if this goes wrong, it means a Fault error was generated by the server
+        # no need to stop the server for this
+        params = (istring, ) if worker is None else (istring, worker)
+        ostring = getattr(server or self._server, name)(*params)
         if not ostring:
             raise RPCServerError("No output was generated.")
-        result = json.loads(ostring)
+        return json.loads(ostring)
+
+    def _proxy(self, *args, **kwargs):
+        """Callable replacement for the requested functionality.
+
+        Parameters
+        ----------
+        args : list
+            Positional arguments to be passed to the remote function.
+        kwargs : dict
+            Named arguments to be passed to the remote function.
+
+        Returns
+        -------
+        object
+            The result returned by the remote function.
+
+        Warning
+        -------
+        The `args` and `kwargs` have to be JSON-serialisable.
+        This means that, currently, only native Python objects are supported.
+        The returned results will also always be in the form of built-in Python objects.
+
+        With binary payloads, the `args` and `kwargs` can also contain NumPy arrays,
+        and the returned results keep their types, as far as supported by :func:`compas.rpc.encode_binary`.
+        """
+        return self._call(self._name, args, kwargs)
+
+    def _call(self, name, args, kwargs, options=None, worker=None):
+        result = self._execute(name, args, kwargs, options=options, worker=worker)
         if result['error']:
             raise RPCServerError(result['error'])
         self.profile = result['profile']
         return result['data']
 
+    def _handle(self, data):
+        # without binary payloads, the handle is returned in its JSON representation
+        if isinstance(data, Handle):
+            return data
+        return Handle.from_data(data['value'])
+
+    def upload(self, obj):
+        """Keep an object on the server.
+
+        Parameters
+        ----------
+        obj : object
+            The object.
+
+        Returns
+        -------
+        :class:`compas.rpc.Handle`
+            The handle of the object, which can be passed to remote functions instead of the object.
+
+        Notes
+        -----
+        The server removes the least recently used objects if it runs out of space,
+        after which their handles are no longer valid.
+
+        """
+        return self._handle(self._call(IDENTITY, [obj], {}, options={'handle': True}))
+
+    def download(self, handle):
+        """Retrieve an object that is kept on the server.
+
+        Parameters
+        ----------
+        handle : :class:`compas.rpc.Handle`
+            The handle of the object.
+
+        Returns
+        -------
+        object
+            The object.
+
+        """
+        return self._call(IDENTITY, [handle], {}, options={})
+
+    def keep(self, name, *args, **kwargs):
+        """Call a remote function, and keep the result on the server.
+
+        Parameters
+        ----------
+        name : str
+            The name of the function, relative to the package of the proxy.
+        args : list
+            Positional arguments to be passed to the remote function.
+        kwargs : dict
+            Named arguments to be passed to the remote function.
+
+        Returns
+        -------
+        :class:`compas.rpc.Handle`
+            The handle of the result.
+
+        Notes
+        -----
+        With a :class:`PoolServer`, the result is kept by the worker process that executed the call,
+        and all calls with its handle are executed by the same process.
+        Handles of different worker processes cannot be combined in a single call.
+
+        """
+        if self.package:
+            name = "{}.{}".format(self.package, name)
+        return self._handle(self._call(name, args, kwargs, options={'handle': True}))
+
+    def release(self, *handles):
+        """Remove objects that are kept on the server.
+
+        Parameters
+        ----------
+        handles : list of :class:`compas.rpc.Handle`
+            The handles of the objects.
+
+        Returns
+        -------
+        int
+            The number of objects that were removed.
+
+        """
+        ids = {}
+        for handle in handles:
+            ids.setdefault(handle.worker, []).append(handle.id)
+        return sum(self._call(RELEASE, ids[worker], {}, options={}, worker=worker) for worker in ids)
+
+    def submit(self, name, *args, **kwargs):
+        """Call a remote function without waiting for the result.
+
+        Parameters
+        ----------
+        name : str
+            The name of the function, relative to the package of the proxy.
+        args : list
+            Positional arguments to be passed to the remote function.
+        kwargs : dict
+            Named arguments to be passed to the remote function,
+            except for ``callback`` and ``errback``.
+        callback : callable, optional
+            A function that is called with the result, when the call completes successfully.
+        errback : callable, optional
+            A function that is called with the error, when the call fails.
+
+        Returns
+        -------
+        :class:`compas.rpc.Future`
+            The pending result.
+
+        Notes
+        -----
+        The submitted calls are sent to the server by a number of worker threads,
+        at most :attr:`max_workers`, each with its own connection.
+        A :class:`PoolServer` executes concurrent calls in parallel,
+        a :class:`Server` one after the other.
+
+        The callbacks are called in a worker thread.
+        If a callback is provided without an errback, the error of a failed call is raised in that thread,
+        such that it is re-raised by :func:`compas.utilities.await_callback`.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            from compas.utilities import await_callback
+
+            with Proxy('numpy', binary=True) as np:
+                future = np.submit('mean', points, axis=0)
+                centroid = future.result()
+
+                centroid = await_callback(np.submit, 'callback', 'errback', 'mean', points, axis=0)
+
+        """
+        callback = kwargs.pop('callback', None)
+        errback = kwargs.pop('errback', None)
+        if self.package:
+            name = "{}.{}".format(self.package, name)
+        future = Future()
+        if self._tasks is None:
+            self._tasks = Queue()
+        self._tasks.put((name, args, kwargs, future))
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        if callback or errback:
+            # wait for the result in a separate thread
+            # such that an error without errback is raised in a thread created during this call
+            thread = threading.Thread(target=self._complete, args=(future, callback, errback))
+            thread.daemon = True
+            thread.start()
+        return future
+
+    def _complete(self, future, callback, errback):
+        error = future.exception()
+        if error is None:
+            if callback:
+                callback(future.result())
+        elif errback:
+            errback(error)
+        else:
+            raise error
+
+    def _work(self):
+        # a worker thread of the submitted calls
+        server = None if self.binary else ServerProxy(self.address)
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            name, args, kwargs, future = task
+            try:
+                result = self._execute(name, args, kwargs, server=server)
+                if result['error']:
+                    raise RPCServerError(result['error'])
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result['data'])
+        self._disconnect()
+
+    def _stop_workers(self):
+        for _ in self._workers:
+            self._tasks.put(None)
+        self._workers = []
+
+    def batch(self):
+        """Create a batch of remote calls, which are sent to the server in a single request.
+
+        Returns
+        -------
+        :class:`compas.rpc.Batch`
+            The batch.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            with Proxy('numpy', binary=True) as np:
+                with np.batch() as batch:
+                    futures = [batch.mean(points, axis=0) for points in clouds]
+
+                centroids = [future.result() for future in futures]
+
+        """
+        return Batch(self)
+
+
+class Batch(object):
+    """A batch of remote calls, which are sent to the server in a single request.
+
+    Parameters
+    ----------
+    proxy : :class:`compas.rpc.Proxy`
+        The proxy of the server.
+
+    Notes
+    -----
+    The functions of the proxied package are available as attributes of the batch.
+    Calling them adds a call to the batch, and returns a :class:`compas.rpc.Future`,
+    which receives the result when the batch is sent.
+    As a context manager, the batch is sent at the end of the ``with`` statement.
+
+    A :class:`PoolServer` executes the calls of a batch in parallel, in its worker processes,
+    such that the calls should not depend on each other.
+    A :class:`Server` executes them one after the other, in the order in which they were added.
+
+    """
+
+    def __init__(self, proxy):
+        self._proxy = proxy
+        self._calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.send()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if self._proxy.package:
+            name = "{}.{}".format(self._proxy.package, name)
+
+        def call(*args, **kwargs):
+            future = Future()
+            self._calls.append((name, args, kwargs, future))
+            return future
+
+        return call
+
+    def send(self):
+        """Send the calls of the batch to the server, and wait for the results.
+
+        Returns
+        -------
+        list
+            The results of the calls.
+
+        Raises
+        ------
+        RPCServerError
+            If any of the calls failed.
+            The results of the other calls are still available through their futures.
+
+        """
+        calls = self._calls
+        self._calls = []
+        if not calls:
+            return []
+        proxy = self._proxy
+        options = proxy._options()
+        items = []
+        for name, args, kwargs, _ in calls:
+            idict = {'args': args, 'kwargs': kwargs}
+            if options:
+                idict['options'] = options
+            worker = proxy._route(args, kwargs)
+            if proxy.binary:
+                idict['function'] = name
+                items.append((encode_binary(idict), worker))
+            else:
+                item = [name, json.dumps(idict, cls=DataEncoder)]
+                if worker is not None:
+                    item.append(worker)
+                items.append(item)
+        if proxy.binary:
+            results = [decode_binary(odata) for odata in decode_binary(proxy._post(encode_binary(items), BINARY_BATCH_PATH))]
+        else:
+            ostrings = getattr(proxy._server, BATCH)(*items)
+            if not isinstance(ostrings, list):
+                raise RPCServerError(json.loads(ostrings)['error'])
+            results = [json.loads(ostring) for ostring in ostrings]
+        errors = []
+        for (_, _, _, future), result in zip(calls, results):
+            if result['error']:
+                error = RPCServerError(result['error'])
+                errors.append(error)
+                future.set_exception(error)
+            else:
+                future.set_result(result['data'])
+        if errors:
+            raise errors[0]
+        return [result['data'] for result in results]
+
 
 # ==============================================================================
 # Main
@@ -6,11 +6,82 @@ import threading
 
 try:
     from SimpleXMLRPCServer import SimpleXMLRPCServer
+    from SimpleXMLRPCServer import SimpleXMLRPCRequestHandler
 except ImportError:
     from xmlrpc.server import SimpleXMLRPCServer
+    from xmlrpc.server import SimpleXMLRPCRequestHandler
 
+try:
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from socketserver import ThreadingMixIn
+
+
+from compas.rpc.dispatcher import BATCH
+from compas.rpc.encoding import decode_binary
+from compas.rpc.encoding import encode_binary
+
+
+__all__ = ['Server', 'PoolServer', 'RequestHandler']
 
-__all__ = ['Server']
+
+BINARY_PATH = '/binary'
+BINARY_BATCH_PATH = '/binary/batch'
+
+# the header with the index of the worker process that keeps the objects of the handles of a binary API call
+WORKER_HEADER = 'X-Worker'
+
+
+class RequestHandler(SimpleXMLRPCRequestHandler):
+    """Request handler for XMLRPC requests, and for API calls in the binary encoding of :func:`compas.rpc.encode_binary`.
+
+    Notes
+    -----
+    Binary API calls are HTTP POST requests to the path ``/binary``,
+    with the encoded input dictionary as body.
+    They are dispatched to the ``_dispatch_binary`` method of the server,
+    together with the index of the worker process in the ``X-Worker`` header, if any.
+    Batches of binary API calls are sent to the path ``/binary/batch``,
+    as an encoded list of pairs of an encoded input dictionary and a worker index or ``None``,
+    and are dispatched to the ``_dispatch_binary_batch`` method of the server.
+
+    """
+
+    rpc_paths = ('/', '/RPC2', BINARY_PATH, BINARY_BATCH_PATH)
+
+    def do_POST(self):
+        if self.path not in (BINARY_PATH, BINARY_BATCH_PATH):
+            return SimpleXMLRPCRequestHandler.do_POST(self)
+
+        try:
+            size_remaining = int(self.headers["content-length"])
+            chunks = []
+            while size_remaining:
+                chunk = self.rfile.read(min(size_remaining, 10 * 1024 * 1024))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size_remaining -= len(chunk)
+            data = b''.join(chunks)
+            if self.path == BINARY_PATH:
+                worker = self.headers.get(WORKER_HEADER)
+                response = self.server._dispatch_binary(data, None if worker is None else int(worker))
+            else:
+                response = self.server._dispatch_binary_batch(data)
+        except Exception:
+            self.send_response(500)
+            self.send_header("Content-length", "0")
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("Content-type", "application/octet-stream")
+            self.send_header("Content-length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+
+class _KeepAliveRequestHandler(RequestHandler):
+    protocol_version = 'HTTP/1.1'
 
 
 class Server(SimpleXMLRPCServer):
@@ -44,8 +115,20 @@ class Server(SimpleXMLRPCServer):
     This class has to be used by a service to start the XMLRPC server in a way
     that can be pinged to check if the server is live, and can be cleanly terminated.
 
+    Besides XMLRPC requests, the server accepts API calls in the binary encoding of :func:`compas.rpc.encode_binary`,
+    which are dispatched to the registered instance.
+
     """
 
+    def __init__(self, addr, requestHandler=RequestHandler, **kwargs):
+        SimpleXMLRPCServer.__init__(self, addr, requestHandler=requestHandler, **kwargs)
+
+    def _dispatch_binary(self, data, worker=None):
+        return self.instance._dispatch_binary(data)
+
+    def _dispatch_binary_batch(self, data):
+        return encode_binary([self._dispatch_binary(item, worker) for item, worker in decode_binary(data)])
+
     def ping(self):
         """Simple function used to check if a remote server can be reached.
 
@@ -64,9 +147,219 @@ class Server(SimpleXMLRPCServer):
         self.shutdown()
 
 
+# the dispatcher of a worker process of a pool server
+_dispatcher = None
+
+
+def _initialize_worker(dispatcher, worker):
+    global _dispatcher
+    _dispatcher = dispatcher
+    _dispatcher.worker = worker
+
+
+def _work(name, args):
+    return _dispatcher._dispatch(name, args)
+
+
+def _work_binary(data):
+    return _dispatcher._dispatch_binary(data)
+
+
+def _work_batch_item(item):
+    return _dispatcher._dispatch(item[0], item[1:])
+
+
+class PoolServer(ThreadingMixIn, Server):
+    """Version of :class:`Server` that handles requests of concurrent clients in threads,
+    and executes the API calls in a pool of worker processes.
+
+    Parameters
+    ----------
+    addr : tuple
+        The host and port of the server.
+    processes : int, optional
+        The number of worker processes.
+        Default is ``None``, in which case the number of CPUs is used.
+    kwargs : dict, optional
+        Additional keyword arguments passed to :class:`Server`.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from compas.rpc import PoolServer
+        from compas.rpc import Dispatcher
+
+
+        class DefaultService(Dispatcher):
+            pass
+
+
+        if __name__ == '__main__':
+
+            server = PoolServer(("localhost", 8888), processes=4)
+
+            server.register_function(server.ping)
+            server.register_function(server.remote_shutdown)
+            server.register_instance(DefaultService())
+            server.serve_forever()
+            server.server_close()
+
+    Notes
+    -----
+    Every worker process receives a copy of the registered instance when the instance is registered.
+    The worker processes are started once, and keep the modules of the called functions imported.
+    Registered functions, such as ``ping`` and ``remote_shutdown``, are executed in the server process.
+
+    Every request is handled in a thread, and waits for a worker process to execute the API call.
+    Every worker process has its own queue of calls.
+    A call is sent to the worker process with the fewest pending calls,
+    unless it has handles as arguments, in which case it is sent to the worker process that keeps their objects.
+    The calls of a batch are distributed over all worker processes in the same way.
+    Connections are kept alive between requests.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, addr, processes=None, requestHandler=_KeepAliveRequestHandler, **kwargs):
+        Server.__init__(self, addr, requestHandler=requestHandler, **kwargs)
+        self.processes = processes
+        self.pools = []
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def register_instance(self, instance, *args, **kwargs):
+        from multiprocessing import Pool
+        from multiprocessing import cpu_count
+
+        Server.register_instance(self, instance, *args, **kwargs)
+        self._terminate()
+        processes = self.processes or cpu_count()
+        self.pools = [Pool(1, initializer=_initialize_worker, initargs=(instance, index)) for index in range(processes)]
+        self._pending = [0] * processes
+
+    def _submit(self, worker, function, args):
+        with self._lock:
+            if worker is None:
+                worker = min(range(len(self.pools)), key=self._pending.__getitem__)
+            elif not 0 <= worker < len(self.pools):
+                raise ValueError('There is no worker process with index {0}.'.format(worker))
+            self._pending[worker] += 1
+        return worker, self.pools[worker].apply_async(function, args)
+
+    def _wait(self, worker, result):
+        try:
+            return result.get()
+        finally:
+            with self._lock:
+                self._pending[worker] -= 1
+
+    def _dispatch(self, method, params):
+        if method in self.funcs or not self.pools:
+            return Server._dispatch(self, method, params)
+        if method == BATCH:
+            tasks = [self._submit(item[2] if len(item) > 2 else None, _work_batch_item, (item, )) for item in params]
+            return [self._wait(*task) for task in tasks]
+        return self._wait(*self._submit(params[1] if len(params) > 1 else None, _work, (method, params)))
+
+    def _dispatch_binary(self, data, worker=None):
+        return self._wait(*self._submit(worker, _work_binary, (data, )))
+
+    def _dispatch_binary_batch(self, data):
+        tasks = [self._submit(worker, _work_binary, (item, )) for item, worker in decode_binary(data)]
+        return encode_binary([self._wait(*task) for task in tasks])
+
+    def _terminate(self):
+        for pool in self.pools:
+            pool.terminate()
+            pool.join()
+        self.pools = []
+
+    def server_close(self):
+        Server.server_close(self)
+        self._terminate()
+
+
 # ==============================================================================
 # Main
 # ==============================================================================
 
 if __name__ == "__main__":
-    pass
+
+    import time
+
+    import numpy
+
+    from compas.rpc import Proxy
+    from compas.rpc.services.default import DefaultService
+
+    def serve(server):
+        server.register_function(server.ping)
+        server.register_function(server.remote_shutdown)
+        server.register_instance(DefaultService())
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server.server_address[1]
+
+    def clients(port, binary, points, n, num_clients):
+        # concurrent clients, each with its own proxy
+        proxies = [Proxy('numpy', port=port, binary=binary) for _ in range(num_clients)]
+
+        def run(proxy):
+            for _ in range(n):
+                proxy.mean(points, axis=0)
+
+        threads = [threading.Thread(target=run, args=(proxy, )) for proxy in proxies]
+        t0 = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return num_clients * n / (time.time() - t0)
+
+    server = Server(('127.0.0.1', 0), logRequests=False)
+    pool = PoolServer(('127.0.0.1', 0), logRequests=False)
+
+    points = numpy.random.rand(10000, 3)
+
+    for name, port, binary in (('json', serve(server), False), ('binary pool', serve(pool), True)):
+        proxy = Proxy('numpy', port=port, binary=binary)
+        data = points if binary else points.tolist()
+        t0 = time.time()
+        for _ in range(500):
+            proxy.sum([1.0, 2.0])
+        t1 = time.time()
+        for _ in range(20):
+            proxy.mean(data, axis=0)
+        t2 = time.time()
+        throughput = clients(port, binary, data, 20, 4)
+        print('{0:<12} latency: {1:.2f}ms 10000 points: {2:.1f}ms 4 clients: {3:.1f} calls/s'.format(
+            name, (t1 - t0) / 500 * 1e3, (t2 - t1) / 20 * 1e3, throughput))
+        t0 = time.time()
+        with proxy.batch() as batch:
+            for _ in range(500):
+                batch.sum([1.0, 2.0])
+        t1 = time.time()
+        futures = [proxy.submit('sum', [1.0, 2.0]) for _ in range(500)]
+        for future in futures:
+            future.result()
+        t2 = time.time()
+        print('{0:<12} 500 calls in a batch: {1:.1f}ms submitted: {2:.1f}ms'.format(name, (t1 - t0) * 1e3, (t2 - t1) * 1e3))
+        cloud = numpy.random.rand(100000, 3)
+        data = cloud if binary else cloud.tolist()
+        t0 = time.time()
+        for _ in range(10):
+            proxy.mean(data, axis=0)
+        t1 = time.time()
+        handle = proxy.upload(data)
+        for _ in range(10):
+            proxy.mean(handle, axis=0)
+        t2 = time.time()
+        proxy.release(handle)
+        print('{0:<12} 100000 points by value: {1:.1f}ms by handle: {2:.1f}ms'.format(name, (t1 - t0) / 10 * 1e3, (t2 - t1) / 10 * 1e3))
+
+    for server in (server, pool):
+        server.shutdown()
+        server.server_close()
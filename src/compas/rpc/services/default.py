@@ -6,6 +6,7 @@ it listens to requests on port ``1753``.
 """
 
 from compas.rpc import Dispatcher
+from compas.rpc import PoolServer
 from compas.rpc import Server
 
 
@@ -15,12 +16,18 @@ class DefaultService(Dispatcher):
         super(DefaultService, self).__init__()
 
 
-def start_service(port):
+def start_service(port, processes=None):
     print('Starting default RPC service on port {0}...'.format(port))
 
     # start the server on *localhost*
     # and listen to requests on port *1753*
-    server = Server(("0.0.0.0", port))
+    # with a pool of worker processes if requested
+    # requests are not logged
+    # because nobody reads the output of a server started by a proxy
+    if processes:
+        server = PoolServer(("0.0.0.0", port), processes=processes, logRequests=False)
+    else:
+        server = Server(("0.0.0.0", port), logRequests=False)
 
     # register a few utility functions
     server.register_function(server.ping)
@@ -35,7 +42,10 @@ def start_service(port):
     server.register_instance(DefaultService())
 
     print('Listening, press CTRL+C to abort...')
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
 
 
 # ==============================================================================
@@ -46,8 +56,13 @@ if __name__ == '__main__':
     import sys
 
     try:
-        port = int(sys.argv[3])
+        port = int(sys.argv[1])
     except Exception:
         port = 1753
 
-    start_service(port)
+    try:
+        processes = int(sys.argv[2])
+    except Exception:
+        processes = None
+
+    start_service(port, processes)
@@ -0,0 +1,274 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import sys
+import uuid
+
+from collections import OrderedDict
+
+from compas.rpc.encoding import encode_binary
+
+
+__all__ = ['Handle', 'ObjectStore']
+
+
+class Handle(object):
+    """Reference to an object that is kept by an RPC service.
+
+    Parameters
+    ----------
+    id : str
+        The identifier of the object.
+    worker : int, optional
+        The index of the worker process of a :class:`compas.rpc.PoolServer` that keeps the object.
+    typename : str, optional
+        The name of the type of the object.
+
+    Notes
+    -----
+    Handles are returned by :meth:`compas.rpc.Proxy.upload` and :meth:`compas.rpc.Proxy.keep`,
+    and can be passed as arguments to remote functions,
+    directly or as items of lists, tuples and dicts.
+    The service replaces them by the objects they refer to.
+
+    """
+
+    def __init__(self, id, worker=None, typename=None):
+        self.id = id
+        self.worker = worker
+        self.typename = typename
+
+    def __repr__(self):
+        return 'Handle({0!r}, worker={1!r}, typename={2!r})'.format(self.id, self.worker, self.typename)
+
+    def __eq__(self, other):
+        return isinstance(other, Handle) and self.id == other.id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def to_data(self):
+        return {'id': self.id, 'worker': self.worker, 'typename': self.typename}
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(data['id'], data['worker'], data['typename'])
+
+
+def handles(args, kwargs):
+    """Find the handles among the arguments of a call.
+
+    Parameters
+    ----------
+    args : list
+        Positional arguments.
+    kwargs : dict
+        Named arguments.
+
+    Returns
+    -------
+    list
+        The handles passed as arguments, or as items of lists, tuples and dicts passed as arguments.
+
+    """
+    found = []
+    for arg in list(args) + list(kwargs.values()):
+        if isinstance(arg, Handle):
+            found.append(arg)
+        elif isinstance(arg, (list, tuple)):
+            found += [item for item in arg if isinstance(item, Handle)]
+        elif isinstance(arg, dict):
+            found += [item for item in arg.values() if isinstance(item, Handle)]
+    return found
+
+
+def sizeof(obj):
+    """Estimate the memory size of an object, as the size of its binary encoding.
+
+    Parameters
+    ----------
+    obj : object
+        The object.
+
+    Returns
+    -------
+    int
+        The size in bytes.
+
+    """
+    try:
+        return len(encode_binary(obj))
+    except TypeError:
+        return sys.getsizeof(obj)
+
+
+class ObjectStore(object):
+    """Storage of objects with least-recently-used eviction.
+
+    Parameters
+    ----------
+    max_items : int, optional
+        The maximum number of objects.
+        Default is ``None``, in which case there is no limit.
+    max_bytes : int, optional
+        The maximum total size of the objects, in bytes.
+        Default is ``None``, in which case there is no limit.
+
+    Attributes
+    ----------
+    nbytes : int
+        The total size of the stored objects.
+    hits : int
+        The number of successful lookups.
+    misses : int
+        The number of lookups of keys that are not in the store.
+    evictions : int
+        The number of objects that were removed to stay within the limits.
+
+    Notes
+    -----
+    Every lookup marks the object as most recently used.
+    When an object is added and the store exceeds a limit,
+    the least recently used objects are removed until it does not.
+    An object that alone exceeds the size limit cannot be stored.
+
+    Examples
+    --------
+    >>> store = ObjectStore(max_items=2)
+    >>> a = store.put([1, 2, 3])
+    >>> b = store.put('b', key='b')
+    >>> store.get(a)
+    [1, 2, 3]
+    >>> c = store.put('c', key='c')
+    >>> 'b' in store
+    False
+
+    """
+
+    def __init__(self, max_items=None, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def put(self, obj, key=None, size=None):
+        """Add an object to the store.
+
+        Parameters
+        ----------
+        obj : object
+            The object.
+        key : str, optional
+            The key of the object.
+            Default is ``None``, in which case a unique key is generated.
+        size : int, optional
+            The size of the object in bytes.
+            Default is ``None``, in which case the size is estimated.
+
+        Returns
+        -------
+        str
+            The key of the object.
+
+        Raises
+        ------
+        ValueError
+            If the size of the object exceeds the size limit of the store.
+
+        """
+        if key is None:
+            key = uuid.uuid4().hex
+        if size is None:
+            size = sizeof(obj)
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise ValueError('The size of the object ({0} bytes) exceeds the size limit of the store ({1} bytes).'.format(size, self.max_bytes))
+        self.remove(key)
+        self._items[key] = obj, size
+        self.nbytes += size
+        while self._items and self._exceeded():
+            _, (_, size) = self._items.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+        return key
+
+    def _exceeded(self):
+        if self.max_items is not None and len(self._items) > self.max_items:
+            return True
+        return self.max_bytes is not None and self.nbytes > self.max_bytes
+
+    def get(self, key):
+        """Look up an object.
+
+        Parameters
+        ----------
+        key : str
+            The key of the object.
+
+        Returns
+        -------
+        object
+            The object.
+
+        Raises
+        ------
+        KeyError
+            If there is no object with the key in the store.
+
+        """
+        try:
+            obj, size = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self._items[key] = obj, size
+        self.hits += 1
+        return obj
+
+    def remove(self, key):
+        """Remove an object from the store.
+
+        Parameters
+        ----------
+        key : str
+            The key of the object.
+
+        Returns
+        -------
+        bool
+            True if the object was in the store.
+
+        """
+        if key not in self._items:
+            return False
+        _, size = self._items.pop(key)
+        self.nbytes -= size
+        return True
+
+    def clear(self):
+        """Remove all objects from the store."""
+        self._items.clear()
+        self.nbytes = 0
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+
+    doctest.testmod(globs=globals())
@@ -22,6 +22,9 @@ combinatorics
     :nosignatures:
 
     vertex_coloring
+    vertex_coloring_numpy
+    color_classes
+    color_classes_numpy
     connected_components
 
 orientation
@@ -44,12 +47,16 @@ traversal
     :nosignatures:
 
     astar_shortest_path
+    astar_path
     breadth_first_ordering
     breadth_first_traverse
     breadth_first_paths
     depth_first_ordering
     dijkstra_distances
     dijkstra_path
+    dijkstra_tree
+    dijkstra_tree_numpy
+    dijkstra_path_numpy
     shortest_path
 
 """
@@ -66,7 +73,9 @@ from .orientation import *  # noqa: F401 F403
 if compas.IPY:
     from .orientation_rhino import *  # noqa: F401 F403
 else:
+    from .combinatorics_numpy import *  # noqa: F401 F403
     from .orientation_numpy import *  # noqa: F401 F403
+    from .traversal_numpy import *  # noqa: F401 F403
 
 from .connectivity import *  # noqa: F401 F403
 
@@ -0,0 +1,293 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+
+from numpy import argmin
+from numpy import argsort
+from numpy import arange
+from numpy import array
+from numpy import asarray
+from numpy import bincount
+from numpy import cumsum
+from numpy import diff
+from numpy import empty
+from numpy import full
+from numpy import int64
+from numpy import nonzero
+from numpy import repeat
+from numpy import split
+from numpy import unique
+from numpy import zeros
+from numpy.random import RandomState
+
+from scipy.sparse import issparse
+
+
+__all__ = [
+    'vertex_coloring_numpy',
+    'color_classes_numpy',
+]
+
+
+def _csr(adjacency):
+    # the row pointers and column indices of the adjacency
+    # of a sparse matrix or a list of lists of neighbor indices
+    if issparse(adjacency):
+        A = adjacency.tocsr()
+        return A.indptr.astype(int64), A.indices.astype(int64)
+    indptr = cumsum([0] + [len(nbrs) for nbrs in adjacency]).astype(int64)
+    indices = array([nbr for nbrs in adjacency for nbr in nbrs], dtype=int64)
+    return indptr, indices
+
+
+def _rows_edges(indptr, rows):
+    # for the given rows, the positions of the rows and the indices of their entries
+    start = indptr[rows]
+    count = indptr[rows + 1] - start
+    position = repeat(arange(len(rows)), count)
+    offset = repeat(start - (cumsum(count) - count), count)
+    return position, arange(count.sum()) + offset
+
+
+def _greedy_coloring(indptr, indices, rank):
+    # Jones-Plassmann coloring
+    # in every round, the vertices whose neighbors with a lower rank are all colored
+    # get the smallest color that is not used by those neighbors, all at once
+    # this is the same coloring as with a sequential scan of the vertices in order of rank
+    n = len(rank)
+    rows = repeat(arange(n), diff(indptr))
+    before = rank[indices] < rank[rows]
+    waiting = bincount(rows[before], minlength=n)
+    colors = full(n, -1, dtype=int64)
+    current = nonzero(waiting == 0)[0]
+    while len(current):
+        position, edges = _rows_edges(indptr, current)
+        nbrs = indices[edges]
+        colored = colors[nbrs] >= 0
+        used = zeros((len(current), colors.max() + 2), dtype=bool)
+        used[position[colored], colors[nbrs[colored]]] = True
+        colors[current] = argmin(used, axis=1)
+        # the neighbors that are colored after the current vertices
+        # wait for one vertex less
+        after = nbrs[colors[nbrs] < 0]
+        waiting -= bincount(after, minlength=n)
+        after = unique(after)
+        current = after[waiting[after] == 0]
+    return colors
+
+
+def _dsatur_coloring(indptr, indices):
+    # the same as compas.topology.combinatorics._dsatur_coloring,
+    # with lists of indices instead of dictionaries
+    n = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    degree = [indptr[i + 1] - indptr[i] for i in range(n)]
+    saturation = [set() for _ in range(n)]
+    heap = [(0, -degree[i], i) for i in range(n)]
+    heapify(heap)
+    colors = [-1] * n
+    while heap:
+        i = heappop(heap)[2]
+        if colors[i] >= 0:
+            continue
+        used = saturation[i]
+        color = 0
+        while color in used:
+            color += 1
+        colors[i] = color
+        for j in indices[indptr[i]:indptr[i + 1]]:
+            if colors[j] >= 0 or color in saturation[j]:
+                continue
+            saturation[j].add(color)
+            heappush(heap, (-len(saturation[j]), -degree[j], j))
+    return array(colors, dtype=int64)
+
+
+def vertex_coloring_numpy(adjacency, strategy='largest_first', seed=0):
+    """Color the vertices of a graph with adjacency arrays such that no two colors are adjacent.
+
+    Parameters
+    ----------
+    adjacency : list or scipy.sparse.spmatrix
+        For every vertex a list of neighbor indices,
+        or a symmetric sparse adjacency matrix.
+    strategy : {'largest_first', 'dsatur'}, optional
+        The order in which the vertices are colored.
+        Default is ``'largest_first'``.
+    seed : int, optional
+        The seed of the random order of vertices with the same degree,
+        for the ``'largest_first'`` strategy.
+        Default is ``0``.
+
+    Returns
+    -------
+    array
+        The color of every vertex.
+        The colors are consecutive integers, starting from zero.
+
+    Notes
+    -----
+    Every vertex gets the smallest color that is not used by one of its neighbors,
+    as with :func:`compas.topology.vertex_coloring`.
+
+    With ``'largest_first'``, the vertices are colored in order of decreasing degree,
+    and in random order if they have the same degree.
+    All vertices whose neighbors earlier in this order are colored
+    get their color at the same time [1]_.
+    The number of such rounds is usually small,
+    such that this is much faster than the sequential coloring for large graphs.
+
+    With ``'dsatur'``, the vertices are colored one by one,
+    as with the ``'dsatur'`` strategy of :func:`compas.topology.vertex_coloring`.
+
+    References
+    ----------
+    .. [1] Jones, M. T. and Plassmann, P. E. *A parallel graph coloring heuristic*.
+           SIAM Journal on Scientific Computing 14(3), 654-669, 1993.
+
+    Examples
+    --------
+    >>> adjacency = [[1, 2], [0, 2], [0, 1, 3], [2]]
+    >>> vertex_coloring_numpy(adjacency)
+    array([1, 2, 0, 1])
+    >>> vertex_coloring_numpy(adjacency, strategy='dsatur')
+    array([1, 2, 0, 1])
+    """
+    indptr, indices = _csr(adjacency)
+    n = len(indptr) - 1
+    if strategy == 'largest_first':
+        # decreasing degree first, and a random permutation second
+        degree = diff(indptr)
+        order = argsort((degree.max() - degree) * n + RandomState(seed).permutation(n)) if n else arange(0)
+        rank = empty(n, dtype=int64)
+        rank[order] = arange(n)
+        return _greedy_coloring(indptr, indices, rank)
+    if strategy == 'dsatur':
+        return _dsatur_coloring(indptr, indices)
+    raise ValueError('Unknown coloring strategy: {}'.format(strategy))
+
+
+def color_classes_numpy(colors):
+    """Collect the vertices of every color of a vertex coloring.
+
+    Parameters
+    ----------
+    colors : array-like
+        The color of every vertex,
+        as returned by :func:`vertex_coloring_numpy`.
+
+    Returns
+    -------
+    list of array
+        For every color, in order, the sorted indices of the vertices with that color.
+
+    Notes
+    -----
+    The vertices of one color are not adjacent,
+    such that their values can be updated all at once,
+    for example in a Gauss-Seidel iteration of smoothing or relaxation.
+
+    Examples
+    --------
+    >>> color_classes_numpy([1, 2, 0, 1])
+    [array([2]), array([0, 3]), array([1])]
+    """
+    colors = asarray(colors, dtype=int64)
+    if not len(colors):
+        return []
+    order = argsort(colors, kind='stable')
+    return split(order, cumsum(bincount(colors))[:-1])
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == "__main__":
+
+    import doctest
+    import time
+
+    from numpy import concatenate
+    from numpy import ones
+    from scipy.sparse import coo_matrix
+
+    from compas.topology import vertex_coloring
+
+    doctest.testmod(globs=globals())
+
+    def grid(n):
+        # the adjacency matrix of the vertices of a grid of n * n triangulated quads
+        i, j = divmod(arange(n * n), n)
+        a = i * (n + 1) + j
+        b, c, d = a + 1, a + n + 2, a + n + 1
+        u = concatenate([a, b, c, c, d])
+        v = concatenate([b, c, a, d, a])
+        m = (n + 1) ** 2
+        A = coo_matrix((ones(2 * len(u)), (concatenate([u, v]), concatenate([v, u]))), shape=(m, m)).tocsr()
+        A.data[:] = 1.0
+        return A
+
+    def previous_vertex_coloring(adjacency):
+        # the previous greedy coloring, with a scan over all uncolored vertices per color
+        from collections import deque
+        key_to_color = {}
+        vertices = sorted(adjacency.keys(), key=lambda key: len(adjacency[key]))
+        uncolored = deque(vertices[::-1])
+        current_color = 0
+        while uncolored:
+            a = uncolored.popleft()
+            key_to_color[a] = current_color
+            colored_with_current = [a]
+            for b in uncolored:
+                if not any(b in adjacency[key] for key in colored_with_current):
+                    key_to_color[b] = current_color
+                    colored_with_current.append(b)
+            for key in colored_with_current[1:]:
+                uncolored.remove(key)
+            current_color += 1
+        return key_to_color
+
+    def is_valid(A, colors):
+        A = A.tocoo()
+        return not (colors[A.row] == colors[A.col]).any()
+
+    for n in (40, 300, 1000):
+        A = grid(n)
+        adjacency = {i: A.indices[A.indptr[i]:A.indptr[i + 1]].tolist() for i in range(A.shape[0])}
+
+        timings = []
+        if n <= 40:
+            t0 = time.time()
+            previous = previous_vertex_coloring(adjacency)
+            timings.append('previous {0:.2f}s ({1} colors)'.format(time.time() - t0, max(previous.values()) + 1))
+
+        for strategy in ('largest_first', 'dsatur'):
+            t0 = time.time()
+            key_color = vertex_coloring(adjacency, strategy=strategy)
+            t1 = time.time()
+            colors = vertex_coloring_numpy(A, strategy=strategy)
+            t2 = time.time()
+            assert is_valid(A, array([key_color[i] for i in range(A.shape[0])]))
+            assert is_valid(A, colors)
+            timings.append('{0} {1:.2f}s ({2} colors) numpy {3:.2f}s ({4} colors)'.format(
+                strategy, t1 - t0, max(key_color.values()) + 1, t2 - t1, colors.max() + 1))
+
+        print('{0} vertices: {1}'.format(A.shape[0], ', '.join(timings)))
+
+    # Gauss-Seidel smoothing of the heights of the grid vertices, one color at a time
+    A = grid(300)
+    degree = diff(A.indptr)
+    z = RandomState(0).rand(A.shape[0])
+    classes = color_classes_numpy(vertex_coloring_numpy(A))
+    t0 = time.time()
+    for k in range(10):
+        for vertices in classes:
+            z[vertices] = A[vertices].dot(z) / degree[vertices]
+    t1 = time.time()
+    print('{0} vertices, {1} colors: 10 Gauss-Seidel sweeps {2:.2f}s'.format(A.shape[0], len(classes), t1 - t0))
@@ -2,11 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from compas.geometry import KDTree
-
-from compas.utilities import pairwise
-from compas.geometry import centroid_points
-from compas.topology import breadth_first_traverse
+from collections import deque
 
 
 __all__ = [
@@ -15,6 +11,36 @@ __all__ = [
 ]
 
 
+def _items(faces):
+    # the faces as pairs of identifier and vertices, for lists and mappings of faces
+    if hasattr(faces, 'items'):
+        return list(faces.items())
+    return list(enumerate(faces))
+
+
+def _halfedge_faces(items):
+    # map every halfedge to the face that contains it
+    # and to the other faces that contain it, if any
+    halfedges = {}
+    others = {}
+    for face, vertices in items:
+        for halfedge in zip(vertices, vertices[1:] + vertices[:1]):
+            if halfedge in halfedges:
+                others.setdefault(halfedge, []).append(face)
+            else:
+                halfedges[halfedge] = face
+    return halfedges, others
+
+
+def _faces(halfedges, others, halfedge):
+    # the faces that contain a halfedge
+    if halfedge not in halfedges:
+        return ()
+    if halfedge in others:
+        return [halfedges[halfedge]] + others[halfedge]
+    return (halfedges[halfedge], )
+
+
 def unify_cycles(vertices, faces, root=0):
     """Unify the cycle directions of the given faces such that adjacent faces share opposite halfedges.
 
@@ -22,21 +48,31 @@ def unify_cycles(vertices, faces, root=0):
     ----------
     vertices : list
         A list of vertex coordinates.
-    faces : list
-        A list of lists of face vertex indices.
+    faces : list or dict
+        A list of lists of face vertex indices,
+        or a dictionary mapping face identifiers to lists of face vertex identifiers.
     root : int, optional
         The starting face.
 
     Returns
     -------
-    list
-        A list of faces with the same orientation as the root face.
+    list or dict
+        The faces with the same orientation as the root face.
 
     Raises
     ------
     AssertionError
         If not all faces were visited.
 
+    Notes
+    -----
+    The faces are traversed in breadth-first order.
+    A neighbor is flipped if it has a halfedge in common with the current face,
+    in the same direction after the current face was flipped or not.
+    The faces that contain a halfedge are found in a dictionary of halfedges,
+    such that this takes linear time.
+    The flipped faces are reversed copies of the original faces.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
@@ -44,22 +80,28 @@ def unify_cycles(vertices, faces, root=0):
     >>> unify_cycles(vertices, faces)
     [[0, 1, 2], [2, 3, 0]]
     """
-    def unify(node, nbr):
-        # find the common edge
-        for u, v in pairwise(faces[nbr] + faces[nbr][0:1]):
-            if u in faces[node] and v in faces[node]:
-                # node and nbr have edge u-v in common
-                i = faces[node].index(u)
-                j = faces[node].index(v)
-                if i == j - 1 or (j == 0 and u == faces[node][-1]):
-                    # if the traversal of a neighboring halfedge
-                    # is in the same direction
-                    # flip the neighbor
-                    faces[nbr][:] = faces[nbr][::-1]
-                    return
-    adj = face_adjacency(vertices, faces)
-    visited = breadth_first_traverse(adj, root, unify)
-    assert len(list(visited)) == len(faces), 'Not all faces were visited'
+    items = _items(faces)
+    halfedges, others = _halfedge_faces(items)
+    flipped = {root: False}
+    tovisit = deque([root])
+    while tovisit:
+        face = tovisit.popleft()
+        vertices = faces[face]
+        for u, v in zip(vertices, vertices[1:] + vertices[:1]):
+            # faces with the same halfedge should have the opposite orientation
+            for nbr in _faces(halfedges, others, (u, v)):
+                if nbr not in flipped:
+                    flipped[nbr] = not flipped[face]
+                    tovisit.append(nbr)
+            # faces with the opposite halfedge should have the same orientation
+            for nbr in _faces(halfedges, others, (v, u)):
+                if nbr not in flipped:
+                    flipped[nbr] = flipped[face]
+                    tovisit.append(nbr)
+    assert len(flipped) == len(items), 'Not all faces were visited'
+    for face in flipped:
+        if flipped[face]:
+            faces[face] = faces[face][::-1]
     return faces
 
 
@@ -70,14 +112,22 @@ def face_adjacency(xyz, faces):
     ----------
     xyz : list
         The coordinates of the face vertices.
-    faces : list
-        The indices of the face vertices in the coordinates list.
+        They are not used, since the adjacency follows from the face vertices only.
+    faces : list or dict
+        The indices of the face vertices in the coordinates list,
+        or a dictionary mapping face identifiers to lists of face vertex identifiers.
 
     Returns
     -------
     dict
         For every face a list of neighbouring faces.
 
+    Notes
+    -----
+    Two faces are neighbors if they have an edge in common, in the same or in the opposite direction.
+    The faces of every edge are found in a dictionary of halfedges,
+    which is constructed in a single pass over the faces.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
@@ -85,59 +135,21 @@ def face_adjacency(xyz, faces):
     >>> face_adjacency(vertices, faces)
     {0: [1], 1: [0]}
     """
-    f = len(faces)
-    if f > 100:
-        return _face_adjacency(xyz, faces)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr, _ in enumerate(faces):
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
-    return adjacency
-
-
-def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
-    points = [centroid_points([xyz[index] for index in face]) for face in faces]
-    tree = KDTree(points)
-    closest = [tree.nearest_neighbors(point, nmax) for point in points]
-    closest = [[index for _, index, _ in nnbrs] for nnbrs in closest]
+    items = _items(faces)
+    halfedges, others = _halfedge_faces(items)
     adjacency = {}
-    for face, vertices in enumerate(faces):
+    for face, vertices in items:
         nbrs = []
-        found = set()
-        nnbrs = set(closest[face])
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr in nnbrs:
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
+        found = set([face])
+        for u, v in zip(vertices, vertices[1:] + vertices[:1]):
+            for nbr in _faces(halfedges, others, (v, u)):
+                if nbr not in found:
+                    nbrs.append(nbr)
+                    found.add(nbr)
+            for nbr in _faces(halfedges, others, (u, v)):
+                if nbr not in found:
+                    nbrs.append(nbr)
+                    found.add(nbr)
         adjacency[face] = nbrs
     return adjacency
 
@@ -2,11 +2,21 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-from scipy.spatial import cKDTree
+from itertools import compress
 
-from compas.utilities import pairwise
-from compas.geometry import centroid_points
-from compas.topology import breadth_first_traverse
+from numpy import arange
+from numpy import array
+from numpy import cumsum
+from numpy import int64
+from numpy import lexsort
+from numpy import ones
+from numpy import repeat
+from numpy import searchsorted
+
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import breadth_first_order
+
+from compas.topology import face_adjacency
 
 
 __all__ = [
@@ -37,29 +47,61 @@ def unify_cycles_numpy(vertices, faces, root=0):
     AssertionError
         If not all faces were visited.
 
+    Notes
+    -----
+    This has the same result as :func:`compas.topology.unify_cycles`,
+    but matches the halfedges of the faces by sorting,
+    and traverses the faces with :func:`scipy.sparse.csgraph.breadth_first_order`.
+    The vertex indices should be integers.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
     >>> faces = [[0, 1, 2], [0, 3, 2]]
-    >>> unify_cycles(vertices, faces)
+    >>> unify_cycles_numpy(vertices, faces)
     [[0, 1, 2], [2, 3, 0]]
     """
-    def unify(node, nbr):
-        # find the common edge
-        for u, v in pairwise(faces[nbr] + faces[nbr][0:1]):
-            if u in faces[node] and v in faces[node]:
-                # node and nbr have edge u-v in common
-                i = faces[node].index(u)
-                j = faces[node].index(v)
-                if i == j - 1 or (j == 0 and u == faces[node][-1]):
-                    # if the traversal of a neighboring halfedge
-                    # is in the same direction
-                    # flip the neighbor
-                    faces[nbr][:] = faces[nbr][::-1]
-                    return
-    adj = face_adjacency_numpy(vertices, faces)
-    visited = breadth_first_traverse(adj, root, unify)
-    assert len(list(visited)) == len(faces), 'Not all faces were visited'
+    f = len(faces)
+    sizes = array([len(face) for face in faces], dtype=int64)
+    ends = cumsum(sizes)
+    starts = ends - sizes
+    # the halfedges u-v of all faces, and the faces they belong to
+    u = array([key for face in faces for key in face], dtype=int64)
+    after = arange(1, len(u) + 1)
+    after[ends - 1] = starts
+    v = u[after]
+    face = repeat(arange(f), sizes)
+    # halfedges of the same edge are consecutive after sorting by the sorted vertex pair
+    a = u.clip(max=v)
+    b = u.clip(min=v)
+    order = lexsort((b, a))
+    a = a[order]
+    b = b[order]
+    shared = (a[1:] == a[:-1]) & (b[1:] == b[:-1])
+    i = order[:-1][shared]
+    j = order[1:][shared]
+    # the faces of consecutive halfedges of the same edge are adjacent
+    # and they should have the opposite orientation if the halfedges have the same direction
+    fi = face[i]
+    fj = face[j]
+    same = u[i] == u[j]
+    graph = coo_matrix((ones(len(i)), (fi, fj)), shape=(f, f)).tocsr()
+    traversal, predecessors = breadth_first_order(graph, root, directed=False, return_predecessors=True)
+    assert len(traversal) == f, 'Not all faces were visited'
+    # every face is flipped with respect to its predecessor in the traversal
+    # if the halfedge they have in common has the same direction in both
+    keys = fi.clip(max=fj) * f + fi.clip(min=fj)
+    order = keys.argsort()
+    keys = keys[order]
+    same = same[order]
+    nodes = traversal[1:].astype(int64)
+    parents = predecessors[nodes].astype(int64)
+    relative = same[searchsorted(keys, nodes.clip(max=parents) * f + nodes.clip(min=parents))]
+    flipped = [False] * f
+    for node, parent, flip in zip(nodes.tolist(), parents.tolist(), relative.tolist()):
+        flipped[node] = flipped[parent] != flip
+    for index in compress(range(f), flipped):
+        faces[index] = faces[index][::-1]
     return faces
 
 
@@ -78,68 +120,19 @@ def face_adjacency_numpy(xyz, faces):
     dict
         For every face a list of neighbouring faces.
 
+    Notes
+    -----
+    This is the same as :func:`compas.topology.face_adjacency`,
+    which finds the neighbors of the faces through a dictionary of halfedges.
+
     Examples
     --------
     >>> vertices = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 1.0]]
     >>> faces = [[0, 1, 2], [0, 3, 2]]
-    >>> face_adjacency(vertices, faces)
+    >>> face_adjacency_numpy(vertices, faces)
     {0: [1], 1: [0]}
     """
-    f = len(faces)
-    if f > 100:
-        return _face_adjacency(xyz, faces)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr, _ in enumerate(faces):
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
-    return adjacency
-
-
-def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
-    points = [centroid_points([xyz[index] for index in face]) for face in faces]
-    k = min(len(faces), nmax)
-    tree = cKDTree(points)
-    _, closest = tree.query(points, k=k, n_jobs=-1)
-    adjacency = {}
-    for face, vertices in enumerate(faces):
-        nbrs = []
-        found = set()
-        nnbrs = set(closest[face])
-        for u, v in pairwise(vertices + vertices[0:1]):
-            for nbr in nnbrs:
-                if nbr == face:
-                    continue
-                if nbr in found:
-                    continue
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if v == a and u == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-                for a, b in pairwise(faces[nbr] + faces[nbr][0:1]):
-                    if u == a and v == b:
-                        nbrs.append(nbr)
-                        found.add(nbr)
-                        break
-        adjacency[face] = nbrs
-    return adjacency
+    return face_adjacency(xyz, faces)
 
 
 # ==============================================================================
@@ -148,4 +141,43 @@ def _face_adjacency(xyz, faces, nmax=10, radius=2.0):
 
 if __name__ == "__main__":
 
-    pass
+    import doctest
+    import random
+    import time
+
+    from compas.topology import unify_cycles
+
+    doctest.testmod(globs=globals())
+
+    def soup(n):
+        # the triangles of an n * n grid with random cycle directions
+        random.seed(0)
+        faces = []
+        for i in range(n):
+            for j in range(n):
+                a = i * (n + 1) + j
+                b = a + 1
+                c = a + n + 2
+                d = a + n + 1
+                faces.append([a, b, c])
+                faces.append([a, c, d])
+        return [face[::-1] if random.random() < 0.5 else face for face in faces]
+
+    def is_unified(faces):
+        halfedges = set()
+        for face in faces:
+            for u, v in zip(face, face[1:] + face[:1]):
+                if (u, v) in halfedges:
+                    return False
+                halfedges.add((u, v))
+        return True
+
+    for n in (100, 710):
+        faces = soup(n)
+        t0 = time.time()
+        result = unify_cycles(None, [face[:] for face in faces])
+        t1 = time.time()
+        result_numpy = unify_cycles_numpy(None, [face[:] for face in faces])
+        t2 = time.time()
+        assert is_unified(result) and result == result_numpy
+        print('{0} faces: unify_cycles {1:.2f}s unify_cycles_numpy {2:.2f}s'.format(len(faces), t1 - t0, t2 - t1))
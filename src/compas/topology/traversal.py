@@ -2,14 +2,13 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-try:
-    from queue import PriorityQueue
-except ImportError:
-    from Queue import PriorityQueue
+import itertools
 
 from collections import deque
-
-from compas.geometry import distance_point_point
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from math import sqrt
 
 
 __all__ = [
@@ -19,6 +18,8 @@ __all__ = [
     'breadth_first_paths',
     'shortest_path',
     'astar_shortest_path',
+    'astar_path',
+    'dijkstra_tree',
     'dijkstra_distances',
     'dijkstra_path'
 ]
@@ -325,6 +326,13 @@ def astar_shortest_path(network, root, goal):
     list, None
         The path from root to goal, or None, if no path exists between the vertices.
 
+    Notes
+    -----
+    The length of the edges is used as weight,
+    and the distance to the goal as heuristic.
+    The coordinates of the vertices are looked up once.
+    For many searches in the same network, use :func:`astar_path` directly.
+
     Examples
     --------
     >>>
@@ -333,68 +341,169 @@ def astar_shortest_path(network, root, goal):
     ----------
     https://en.wikipedia.org/wiki/A*_search_algorithm
     """
-    root_coords = network.vertex_coordinates(root)
-    goal_coords = network.vertex_coordinates(goal)
-
-    # The set of nodes already evaluated
-    visited_set = set()
-
-    # The set of currently discovered nodes that are not evaluated yet.
-    # Initially, only the start node is known.
-    candidates_set = {root}
-    best_candidate_heap = PriorityQueue()
-    best_candidate_heap.put((0, root))
-
-    # For each node, which node it can most efficiently be reached from.
-    # If a node can be reached from many nodes, came_from will eventually contain the
-    # most efficient previous step.
-    came_from = dict()
-
-    # g_score is a dict mapping node index to the cost of getting from the root node to that node.
-    # The default value is Infinity.
-    # The cost of going from start to start is zero.
-    g_score = dict()
-
-    for v in network.vertices():
-        g_score[v] = float("inf")
-
-    g_score[root] = 0
-
-    # For each node, the total cost of getting from the start node to the goal
-    # by passing by that node. That value is partly known, partly heuristic.
-    # The default value of f_score is Infinity
-    f_score = dict()
-
-    for v in network.vertices():
-        f_score[v] = float("inf")
-
-    # For the first node, that value is completely heuristic.
-    f_score[root] = distance_point_point(root_coords, goal_coords)
-
-    while not best_candidate_heap.empty():
-        _, current = best_candidate_heap.get()
-        if current == goal:
-            return reconstruct_path(came_from, current)
-        visited_set.add(current)
-        current_coords = network.vertex_coordinates(current)
-        for neighbor in network.vertex_neighbors(current):
-            if neighbor in visited_set:
-                continue  # Ignore the neighbor which is already evaluated.
-
-            # The distance from start to a neighbor
-            neighbor_coords = network.vertex_coordinates(neighbor)
-            tentative_gScore = g_score[current] + distance_point_point(current_coords, neighbor_coords)
-            if neighbor not in candidates_set:  # Discover a new node
-                candidates_set.add(neighbor)
-            elif tentative_gScore >= g_score[neighbor]:
+    xyz = {key: (attr['x'], attr['y'], attr['z']) for key, attr in network.vertices(True)}
+    return astar_path(network.adjacency, xyz, root, goal)
+
+
+def astar_path(adjacency, xyz, root, goal, weight=None):
+    """Find the shortest path between two vertices using the A* search algorithm.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    xyz : dict or list
+        The coordinates of the vertices, by vertex key.
+    root : hashable
+        The identifier of the starting node.
+    goal : hashable
+        The identifier of the ending node.
+    weight : dict, optional
+        A dictionary of edge weights.
+        Default is ``None``, in which case the length of the edges is used.
+
+    Returns
+    -------
+    list, None
+        The path from root to goal, or None, if no path exists between the vertices.
+
+    Notes
+    -----
+    The straight-line distance to the goal is used as heuristic.
+    The weights should therefore not be smaller than the lengths of the edges,
+    otherwise the path is not necessarily the shortest.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1, 2], 1: [0, 3], 2: [0, 3], 3: [1, 2]}
+    >>> xyz = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 1.0, 0.0]]
+    >>> astar_path(adjacency, xyz, 0, 3)
+    [0, 1, 3]
+
+    """
+    gx, gy, gz = xyz[goal]
+
+    def heuristic(key):
+        x, y, z = xyz[key]
+        return sqrt((x - gx) ** 2 + (y - gy) ** 2 + (z - gz) ** 2)
+
+    if weight is None:
+        def cost(u, v):
+            ux, uy, uz = xyz[u]
+            vx, vy, vz = xyz[v]
+            return sqrt((ux - vx) ** 2 + (uy - vy) ** 2 + (uz - vz) ** 2)
+    else:
+        def cost(u, v):
+            return weight[(u, v)]
+
+    distance, predecessors = _dijkstra(adjacency, cost, [root], set([goal]), None, heuristic)
+    if goal not in distance:
+        return None
+    return _path(predecessors, goal)
+
+
+# ==============================================================================
+# Dijkstra
+# ==============================================================================
+
+
+def _dijkstra(adjacency, cost, sources, targets, cutoff, heuristic=None):
+    # binary heap search with lazy deletion of outdated entries
+    # the counter breaks ties without comparing the vertex keys
+    # with a heuristic this is A*
+    count = itertools.count()
+    distance = {}
+    predecessors = {}
+    best = {}
+    heap = []
+    for key in sources:
+        best[key] = 0
+        predecessors[key] = None
+        heap.append((heuristic(key) if heuristic else 0, next(count), 0, key))
+    heapify(heap)
+    targets = set(targets) if targets else None
+
+    while heap:
+        _, _, d, u = heappop(heap)
+        if u in distance:
+            continue
+        if cutoff is not None and d > cutoff:
+            break
+        distance[u] = d
+        if targets is not None:
+            targets.discard(u)
+            if not targets:
+                break
+        for v in adjacency[u]:
+            if v in distance:
                 continue
+            dv = d + cost(u, v)
+            if v not in best or dv < best[v]:
+                best[v] = dv
+                predecessors[v] = u
+                heappush(heap, (dv + heuristic(v) if heuristic else dv, next(count), dv, v))
 
-            # This path is the best until now. Record it!
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_gScore
-            new_fscore = g_score[neighbor] + distance_point_point(neighbor_coords, goal_coords)
-            f_score[neighbor] = new_fscore
-            best_candidate_heap.put((new_fscore, neighbor))
+    return distance, dict((key, predecessors[key]) for key in distance)
+
+
+def _path(predecessors, target):
+    path = [target]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+def dijkstra_tree(adjacency, weight, sources, targets=None, cutoff=None):
+    """Compute the shortest-path tree from one or more source vertices.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    sources : list
+        The keys of the vertices from which the distances are computed.
+    targets : list, optional
+        The keys of vertices at which the search can stop.
+        Default is ``None``, in which case the search continues until all reachable vertices are found.
+    cutoff : float, optional
+        The maximum distance.
+        Default is ``None``, in which case there is no limit.
+
+    Returns
+    -------
+    dict
+        For every vertex that was reached, the distance to the nearest source.
+    dict
+        For every vertex that was reached, the previous vertex on its shortest path,
+        or ``None`` for the sources.
+
+    Notes
+    -----
+    The vertices are visited in order of distance, using a binary heap.
+    The search stops when all targets have been reached,
+    or when the next vertex is farther than the cutoff.
+    The distances of all visited vertices are final.
+
+    The edge weights should all be positive.
+    The weight of the edge from ``u`` to ``v`` is ``weight[(u, v)]``.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (0, 2): 3.0, (2, 0): 3.0}
+    >>> distance, predecessors = dijkstra_tree(adjacency, weight, [0])
+    >>> distance[2]
+    2.0
+    >>> predecessors[2]
+    1
+
+    """
+    return _dijkstra(adjacency, lambda u, v: weight[(u, v)], sources, targets, cutoff)
 
 
 def dijkstra_distances(adjacency, weight, target):
@@ -415,26 +524,18 @@ def dijkstra_distances(adjacency, weight, target):
     dict
         A dictionary of distances to the target.
 
-    Notes:
-        ...
+    Notes
+    -----
+    The distance of vertices that cannot be reached is ``1e+17``.
+    To compute the distances of multiple sources,
+    or to stop the search early, use :func:`dijkstra_tree`.
 
     Examples
     --------
     >>>
     """
-    adjacency = {key: set(nbrs) for key, nbrs in adjacency.items()}
-    distance = {key: (0 if key == target else 1e+17) for key in adjacency}
-    tovisit = set(adjacency.keys())
-    visited = set()
-
-    while tovisit:
-        u = min(tovisit, key=lambda k: distance[k])
-        tovisit.remove(u)
-        visited.add(u)
-        for v in adjacency[u] - visited:
-            d = distance[u] + weight[(u, v)]
-            if d < distance[v]:
-                distance[v] = d
+    distance = dict.fromkeys(adjacency, 1e+17)
+    distance.update(dijkstra_tree(adjacency, weight, [target])[0])
     return distance
 
 
@@ -453,11 +554,14 @@ def dijkstra_path(adjacency, weight, source, target, dist=None):
         The start vertex.
     target : str
         The end vertex.
+    dist : dict, optional
+        The distances of all vertices to the target, as computed by :func:`dijkstra_distances`.
+        Default is ``None``, in which case the search stops as soon as the target is reached.
 
     Returns
     -------
-    list
-        The shortest path.
+    list, None
+        The shortest path, or None, if no path exists between the vertices.
 
     Notes
     -----
@@ -470,7 +574,12 @@ def dijkstra_path(adjacency, weight, source, target, dist=None):
     >>>
     """
     if not dist:
-        dist = dijkstra_distances(adjacency, weight, target)
+        distance, predecessors = dijkstra_tree(adjacency, weight, [source], [target])
+        if target not in predecessors:
+            return None
+        return _path(predecessors, target)
+    if dist[source] >= 1e+17:
+        return None
     path = [source]
     node = source
     node = min(adjacency[node], key=lambda nbr: dist[nbr] + weight[(node, nbr)])
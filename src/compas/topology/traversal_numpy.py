@@ -0,0 +1,237 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from numpy import arange
+from numpy import array
+from numpy import cumsum
+from numpy import float64
+from numpy import int32
+from numpy import isinf
+from numpy import nonzero
+
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+__all__ = [
+    'dijkstra_tree_numpy',
+    'dijkstra_path_numpy',
+]
+
+
+def _graph(adjacency, weight):
+    # sparse matrix of the edge weights
+    # with the vertex keys in the order of the adjacency dict
+    # the rows are the neighbors of the vertices, in order
+    keys = list(adjacency)
+    key_index = {key: index for index, key in enumerate(keys)}
+    indptr = cumsum([0] + [len(adjacency[key]) for key in keys])
+    indices = array([key_index[v] for u in keys for v in adjacency[u]], dtype=int32)
+    data = array([weight[u, v] for u in keys for v in adjacency[u]], dtype=float64)
+    n = len(keys)
+    return keys, key_index, csr_matrix((data, indices, indptr), shape=(n, n))
+
+
+def dijkstra_tree_numpy(adjacency, weight, sources, cutoff=None):
+    """Compute the shortest-path tree from one or more source vertices with the Dijkstra solver of SciPy.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    sources : list
+        The keys of the vertices from which the distances are computed.
+    cutoff : float, optional
+        The maximum distance.
+        Default is ``None``, in which case there is no limit.
+
+    Returns
+    -------
+    dict
+        For every vertex that was reached, the distance to the nearest source.
+    dict
+        For every vertex that was reached, the previous vertex on its shortest path,
+        or ``None`` for the sources.
+
+    Notes
+    -----
+    This has the same result as :func:`compas.topology.dijkstra_tree`,
+    but runs the search in compiled code of :func:`scipy.sparse.csgraph.dijkstra`.
+    With SciPy 1.3 or later, all sources are searched at once.
+    With earlier versions, every source is searched separately.
+    Most of the time is spent converting the adjacency and weight dictionaries to a sparse matrix,
+    such that this is only faster than the pure Python search for very large networks with many sources.
+
+    The edge weights should all be positive.
+    The weight of the edge from ``u`` to ``v`` is ``weight[(u, v)]``.
+    Edges with zero weight are ignored by SciPy.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (0, 2): 3.0, (2, 0): 3.0}
+    >>> distance, predecessors = dijkstra_tree_numpy(adjacency, weight, [0])
+    >>> distance[2]
+    2.0
+    >>> predecessors[2]
+    1
+
+    """
+    keys, key_index, graph = _graph(adjacency, weight)
+    indices = [key_index[key] for key in sources]
+    limit = float('inf') if cutoff is None else cutoff
+    try:
+        d, p, _ = dijkstra(graph, directed=True, indices=indices, return_predecessors=True, limit=limit, min_only=True)
+    except TypeError:
+        # SciPy < 1.3 has no min_only
+        # compute the distances from every source separately and keep the nearest
+        D, P = dijkstra(graph, directed=True, indices=indices, return_predecessors=True, limit=limit)
+        nearest = D.argmin(axis=0)
+        columns = arange(len(keys))
+        d, p = D[nearest, columns], P[nearest, columns]
+    reached = nonzero(~isinf(d))[0].tolist()
+    d = d.tolist()
+    p = p.tolist()
+    distance = {keys[i]: d[i] for i in reached}
+    predecessors = {keys[i]: (None if p[i] < 0 else keys[p[i]]) for i in reached}
+    return distance, predecessors
+
+
+def dijkstra_path_numpy(adjacency, weight, source, target):
+    """Find the shortest path between two vertices with the Dijkstra solver of SciPy.
+
+    Parameters
+    ----------
+    adjacency : dict
+        An adjacency dictionary. Each key represents a vertex
+        and maps to a list of neighboring vertex keys.
+    weight : dict
+        A dictionary of edge weights.
+    source : hashable
+        The start vertex.
+    target : hashable
+        The end vertex.
+
+    Returns
+    -------
+    list, None
+        The shortest path, or None, if no path exists between the vertices.
+
+    Examples
+    --------
+    >>> adjacency = {0: [1, 2], 1: [0, 2], 2: [0, 1]}
+    >>> weight = {(0, 1): 1.0, (1, 0): 1.0, (1, 2): 1.0, (2, 1): 1.0, (0, 2): 3.0, (2, 0): 3.0}
+    >>> dijkstra_path_numpy(adjacency, weight, 0, 2)
+    [0, 1, 2]
+
+    """
+    keys, key_index, graph = _graph(adjacency, weight)
+    d, p = dijkstra(graph, directed=True, indices=key_index[source], return_predecessors=True)
+    i = key_index[target]
+    if isinf(d[i]):
+        return None
+    p = p.tolist()
+    path = [i]
+    while p[path[-1]] >= 0:
+        path.append(p[path[-1]])
+    path.reverse()
+    return [keys[i] for i in path]
+
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    import doctest
+    import random
+    import time
+
+    from math import sqrt
+
+    from compas.topology import astar_path
+    from compas.topology import dijkstra_distances
+    from compas.topology import dijkstra_path
+    from compas.topology import dijkstra_tree
+
+    doctest.testmod(globs=globals())
+
+    def grid(n):
+        # a square grid network of n * n vertices with random edge lengths
+        random.seed(0)
+        xyz = [(i + random.random() * 0.3, j + random.random() * 0.3, 0.0) for i in range(n) for j in range(n)]
+        adjacency = {key: [] for key in range(n * n)}
+        weight = {}
+        for i in range(n):
+            for j in range(n):
+                u = i * n + j
+                for v in ((u + n) if i < n - 1 else None, (u + 1) if j < n - 1 else None):
+                    if v is None:
+                        continue
+                    adjacency[u].append(v)
+                    adjacency[v].append(u)
+                    ux, uy, uz = xyz[u]
+                    vx, vy, vz = xyz[v]
+                    weight[u, v] = weight[v, u] = sqrt((ux - vx) ** 2 + (uy - vy) ** 2)
+        return xyz, adjacency, weight
+
+    def previous_dijkstra_distances(adjacency, weight, target):
+        # the previous implementation, with a linear search for the nearest vertex
+        adjacency = {key: set(nbrs) for key, nbrs in adjacency.items()}
+        distance = {key: (0 if key == target else 1e+17) for key in adjacency}
+        tovisit = set(adjacency.keys())
+        visited = set()
+        while tovisit:
+            u = min(tovisit, key=lambda k: distance[k])
+            tovisit.remove(u)
+            visited.add(u)
+            for v in adjacency[u] - visited:
+                d = distance[u] + weight[(u, v)]
+                if d < distance[v]:
+                    distance[v] = d
+        return distance
+
+    xyz, adjacency, weight = grid(50)
+    t0 = time.time()
+    previous = previous_dijkstra_distances(adjacency, weight, 0)
+    t1 = time.time()
+    current = dijkstra_distances(adjacency, weight, 0)
+    t2 = time.time()
+    assert all(abs(previous[key] - current[key]) < 1e-9 for key in adjacency)
+    print('2500 vertices, all distances: previous {0:.3f}s heap {1:.3f}s'.format(t1 - t0, t2 - t1))
+
+    for n in (320, 500):
+        xyz, adjacency, weight = grid(n)
+        source = 0
+        target = n * n // 2 + n // 2
+
+        t0 = time.time()
+        distance, _ = dijkstra_tree(adjacency, weight, [source])
+        t1 = time.time()
+        distance_numpy, _ = dijkstra_tree_numpy(adjacency, weight, [source])
+        t2 = time.time()
+        assert all(abs(distance[key] - distance_numpy[key]) < 1e-9 for key in distance)
+
+        path = dijkstra_path(adjacency, weight, source, target)
+        t3 = time.time()
+        path_astar = astar_path(adjacency, xyz, source, target, weight)
+        t4 = time.time()
+        path_numpy = dijkstra_path_numpy(adjacency, weight, source, target)
+        t5 = time.time()
+        assert path == path_astar == path_numpy
+
+        sources = random.sample(range(n * n), 10)
+        t6 = time.time()
+        dijkstra_tree(adjacency, weight, sources)
+        t7 = time.time()
+        dijkstra_tree_numpy(adjacency, weight, sources)
+        t8 = time.time()
+
+        print('{0} vertices, all distances: heap {1:.2f}s csgraph {2:.2f}s'.format(n * n, t1 - t0, t2 - t1))
+        print('{0} vertices, path to the center: heap {1:.2f}s A* {2:.2f}s csgraph {3:.2f}s'.format(n * n, t3 - t2, t4 - t3, t5 - t4))
+        print('{0} vertices, 10 sources: heap {1:.2f}s csgraph {2:.2f}s'.format(n * n, t7 - t6, t8 - t7))
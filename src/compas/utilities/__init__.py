@@ -69,6 +69,7 @@ maps
     reverse_geometric_key
     geometric_key_xy
     normalize_values
+    tolerance_from_precision
 
 
 profiling
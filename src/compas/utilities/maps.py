@@ -10,6 +10,7 @@ __all__ = [
     'geometric_key',
     'reverse_geometric_key',
     'geometric_key_xy',
+    'tolerance_from_precision',
     'normalize_values',
 ]
 
@@ -130,6 +131,38 @@ def geometric_key_xy(xy, precision=None, sanitize=True):
     return '{0:.{2}},{1:.{2}}'.format(x, y, precision)
 
 
+def tolerance_from_precision(precision=None):
+    """Convert a precision formatting option to a distance tolerance.
+
+    Parameters
+    ----------
+    precision : str, optional
+        A formatting option that specifies the precision of the
+        individual numbers in geometric keys.
+        Supported values are any float precision, or decimal integer (``'d'``).
+        Default is ``None``, in which case the global precision setting will be used (``compas.PRECISION``).
+
+    Returns
+    -------
+    float
+        The corresponding distance tolerance,
+        i.e. half a unit of the last digit of the geometric keys.
+
+    Examples
+    --------
+    >>> tolerance_from_precision('3f')
+    0.0005
+    >>> tolerance_from_precision('d')
+    0.5
+
+    """
+    if not precision:
+        precision = compas.PRECISION
+    if precision == 'd':
+        return 0.5
+    return 0.5 * 10 ** -int(precision.rstrip('f'))
+
+
 def normalize_values(values, new_min=0.0, new_max=1.0):
     """Normalize a list of numbers to the range between new_min and new_max.
 
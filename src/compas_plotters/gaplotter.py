@@ -8,6 +8,8 @@ import math
 import os
 import matplotlib.pyplot as plt
 
+from compas.numerical.ga.checkpoint import GACheckpoint
+
 
 __all__ = ['GaPlotter']
 
@@ -106,8 +108,20 @@ class GaPlotter(object):
             if ga['start_from_gen']:
                 self.start_from_gen = ga['start_from_gen']
 
-    def get_pop_from_pop_file(self):
+    def get_pop_from_pop_file(self, scaled=True):
         file_pop = {'binary': {}, 'decoded': {}, 'scaled': {}, 'fit_value': {}, 'pf': {}}
+        checkpoint = GACheckpoint(self.input_path + self.fit_name + '.galog')
+        if checkpoint.exists():
+            # only the requested data of a single generation is read from the log
+            if scaled:
+                pop = checkpoint.read(self.generation)
+                file_pop['scaled'] = {i: dict(enumerate(values)) for i, values in enumerate(pop['scaled'])}
+                fit_values = pop['fit_value']
+            else:
+                fit_values = checkpoint.fit_values(self.generation)
+            file_pop['fit_value'] = dict(enumerate(fit_values))
+            return file_pop
+
         filename = 'generation_' + "%05d" % self.generation + '_population' + ".txt"
         filename = self.input_path + filename
         pf_file = open(filename, 'r')
@@ -163,7 +177,7 @@ class GaPlotter(object):
             # print('reading gen ',i)
             self.generation = i
             try:
-                fpop = self.get_pop_from_pop_file()
+                fpop = self.get_pop_from_pop_file(scaled=False)
                 min_, max_, avg_ = self.get_min_max_avg(fpop)
                 if self.conversion_function:
                     min_ = self.conversion_function(min_)
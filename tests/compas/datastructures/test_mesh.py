@@ -3,6 +3,9 @@ import compas
 import json
 
 from compas.datastructures import Mesh
+from compas.datastructures import mesh_delete_duplicate_vertices
+from compas.datastructures import mesh_weld
+from compas.geometry import allclose
 
 # --------------------------------------------------------------------------
 # constructors
@@ -125,6 +128,28 @@ def test_to_vertices_and_faces():
     assert len(faces) == 25
 
 
+def test_to_arrays():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    vertices, faces, offsets = mesh.to_arrays()
+    assert vertices.shape == (36, 3)
+    assert faces.shape == (25, 4)
+    assert offsets is None
+
+
+def test_from_arrays():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh1.insert_vertex(0)
+    vertices, faces, offsets = mesh1.to_arrays()
+    assert len(offsets) == mesh1.number_of_faces() + 1
+    mesh2 = Mesh.from_arrays(vertices, faces, offsets)
+    assert mesh2.number_of_faces() == mesh1.number_of_faces()
+    assert mesh2.number_of_vertices() == mesh1.number_of_vertices()
+    assert mesh2.number_of_edges() == mesh1.number_of_edges()
+    vertices, faces = mesh1.to_vertices_and_faces()
+    mesh3 = Mesh.from_vertices_and_faces(vertices, faces)
+    assert mesh2.halfedge == mesh3.halfedge
+
+
 # --------------------------------------------------------------------------
 # helpers
 # --------------------------------------------------------------------------
@@ -145,6 +170,115 @@ def test_clear():
     assert mesh.number_of_edges() == 0
 
 
+def test_binary(tmp_path):
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh1.insert_vertex(0)
+    mesh1.vertex_attribute(0, 'is_fixed', True)
+    mesh1.vertex_attribute(1, 'name', 'support')
+    mesh1.face_attribute(1, 'color', [255, 0, 0])
+    mesh1.edge_attribute((0, 1), 'q', 2.0)
+    filepath = str(tmp_path / 'mesh.cbin')
+    mesh1.to_binary(filepath)
+    mesh2 = Mesh.from_binary(filepath)
+    assert mesh2.vertex == mesh1.vertex
+    assert mesh2.face == mesh1.face
+    assert mesh2.halfedge == mesh1.halfedge
+    assert mesh2.facedata == mesh1.facedata
+    assert mesh2.edgedata == mesh1.edgedata
+    assert mesh2.attributes == mesh1.attributes
+    assert mesh2.data == mesh1.data
+
+
+def test_smooth_numpy():
+    from compas.datastructures import mesh_smooth_area
+    from compas.datastructures import mesh_smooth_area_numpy
+    from compas.datastructures import mesh_smooth_centroid
+    from compas.datastructures import mesh_smooth_centroid_numpy
+
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    for key, attr in mesh.vertices(True):
+        attr['z'] = 0.1 * (key % 7)
+    fixed = [key for key in mesh.vertices() if mesh.vertex_degree(key) == 2]
+    for smooth, smooth_numpy in ((mesh_smooth_centroid, mesh_smooth_centroid_numpy), (mesh_smooth_area, mesh_smooth_area_numpy)):
+        mesh1 = mesh.copy()
+        mesh2 = mesh.copy()
+        iterations = []
+        smooth(mesh1, fixed=fixed, kmax=10)
+        smooth_numpy(mesh2, fixed=fixed, kmax=10, callback=lambda k, args: iterations.append(k))
+        assert iterations == list(range(10))
+        xyz1 = [value for xyz in mesh1.vertices_attributes('xyz') for value in xyz]
+        xyz2 = [value for xyz in mesh2.vertices_attributes('xyz') for value in xyz]
+        assert allclose(xyz1, xyz2)
+
+
+def test_cache():
+    mesh = Mesh.from_obj(compas.get('faces.obj'))
+    key_index = mesh.key_index()
+    normals = mesh.faces_normals()
+    assert mesh.key_index() is key_index
+    assert mesh.faces_normals() == normals
+    # changes to the returned list do not affect the cache
+    mesh.faces_normals()[0][0] = 99
+    assert mesh.faces_normals()[0][0] != 99
+    mesh.faces_normals().append(None)
+    assert len(mesh.faces_normals()) == mesh.number_of_faces()
+    mesh.vertex_attribute(0, 'z', 1.0)
+    assert mesh.key_index() is key_index
+    assert mesh.faces_normals() != normals
+    mesh.add_vertex(x=0.0, y=0.0, z=0.0)
+    assert mesh.key_index() is not key_index
+    # the lookups of the face normals also look up the cached face arrays
+    assert mesh.cache.stats()['hits'] == 9
+
+
+def test_cache_vertex_dicts():
+    if compas.IPY:
+        return
+    from compas.datastructures import CompactMesh
+    from compas.datastructures import trimesh_vertexarea_matrix
+    for cls in (Mesh, CompactMesh):
+        mesh = cls.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2], [0, 2, 3]])
+        A = trimesh_vertexarea_matrix(mesh)
+        assert allclose([A.diagonal().sum()], [1.0])
+        # changes to the returned matrix do not affect the cache
+        A.data[:] = 0.0
+        assert allclose([trimesh_vertexarea_matrix(mesh).diagonal().sum()], [1.0])
+        # changes to the coordinates through the vertex dicts invalidate the cache
+        for key in mesh.vertices():
+            mesh.vertex[key]['x'] *= 3
+        assert allclose([trimesh_vertexarea_matrix(mesh).diagonal().sum()], [3.0])
+        assert allclose([sum(mesh.faces_areas())], [3.0])
+
+
+def test_cache_geometry_counter():
+    from copy import deepcopy
+    from compas.datastructures import CompactMesh
+    from compas.geometry import Scale
+    for cls in (Mesh, CompactMesh):
+        mesh = cls.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+        assert mesh.faces_areas() == [1.0]
+        # unchanged coordinates are a hit, without comparing the coordinates themselves
+        geometry = mesh.cache.geometry
+        hits = mesh.cache.hits
+        assert mesh.faces_areas() == [1.0]
+        assert mesh.cache.hits == hits + 1
+        assert mesh.cache.geometry == geometry
+        mesh.vertex[2] = {'x': 2.0, 'y': 1.0, 'z': 0.0}
+        assert mesh.cache.geometry > geometry
+        assert mesh.faces_areas() == [1.5]
+        mesh.vertex[2].update(x=1.0)
+        assert mesh.faces_areas() == [1.0]
+        mesh.transform(Scale([2.0, 2.0, 2.0]))
+        assert mesh.faces_areas() == [4.0]
+        mesh.vertex = {key: {'x': x, 'y': y, 'z': z} for key, (x, y, z) in enumerate([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])}
+        assert mesh.faces_areas() == [1.0]
+        # a deep copy has its own cache, which is invalidated by changes to the copy
+        other = deepcopy(mesh)
+        other.vertex[2]['x'] = 2.0
+        assert other.faces_areas() == [1.5]
+        assert mesh.faces_areas() == [1.0]
+
+
 # --------------------------------------------------------------------------
 # builders
 # --------------------------------------------------------------------------
@@ -206,6 +340,30 @@ def test_cull_vertices():
     assert mesh.number_of_vertices() == n - 1
 
 
+def test_weld():
+    # merged vertices take the coordinates of the last of them
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1.0002, 0, 0], [1, 1, 0], [0, 1.0001, 0]]
+    mesh = mesh_weld(Mesh.from_vertices_and_faces(vertices, [[0, 1, 2], [3, 4, 5]]), precision='3f')
+    assert mesh.number_of_vertices() == 4
+    assert [mesh.vertex_coordinates(key) for key in mesh.vertices()] == [[0, 0, 0], [1.0002, 0, 0], [0, 1.0001, 0], [1, 1, 0]]
+    assert [mesh.face_vertices(fkey) for fkey in mesh.faces()] == [[0, 1, 2], [1, 3, 2]]
+    # vertices that are distinct at the given precision are not merged
+    mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    assert mesh_weld(mesh, precision='d').number_of_vertices() == 4
+
+
+def test_delete_duplicate_vertices():
+    # of every group of duplicates, the last vertex is kept
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1.0002, 0, 0], [1, 1, 0], [0, 1.0001, 0]]
+    mesh = Mesh.from_vertices_and_faces(vertices, [[0, 1, 2], [3, 4, 5]])
+    mesh_delete_duplicate_vertices(mesh, precision='3f')
+    assert sorted(mesh.vertices()) == [0, 3, 4, 5]
+    assert [mesh.face_vertices(fkey) for fkey in mesh.faces()] == [[0, 3, 5], [3, 4, 5]]
+    assert mesh.vertex_coordinates(3) == [1.0002, 0, 0]
+    assert sorted(mesh.halfedge[3]) == [0, 4, 5]
+    assert mesh.is_valid()
+
+
 # --------------------------------------------------------------------------
 # info
 # --------------------------------------------------------------------------
@@ -454,6 +612,19 @@ def test_normal():
     assert mesh.normal() == [-2.380849234996509e-06, 4.1056122145028854e-05, 0.8077953732329284]
 
 
+def test_bulk_geometry():
+    mesh = Mesh.from_obj(compas.get('quadmesh.obj'))
+    mesh.split_face(0, *mesh.face_vertices(0)[::2])
+    mesh.insert_vertex(1)
+    for fkey, normal, area, centroid in zip(mesh.faces(), mesh.faces_normals(), mesh.faces_areas(), mesh.faces_centroids()):
+        assert allclose(normal, mesh.face_normal(fkey))
+        assert allclose([area], [mesh.face_area(fkey)])
+        assert allclose(centroid, mesh.face_centroid(fkey))
+    for key, normal, area in zip(mesh.vertices(), mesh.vertices_normals(), mesh.vertices_areas()):
+        assert allclose(normal, mesh.vertex_normal(key))
+        assert allclose([area], [mesh.vertex_area(key)])
+
+
 # --------------------------------------------------------------------------
 # vertex geometry
 # --------------------------------------------------------------------------
@@ -0,0 +1,115 @@
+import compas
+
+from compas.datastructures import Mesh
+from compas.datastructures import CompactMesh
+from compas.datastructures import mesh_face_adjacency
+from compas.datastructures import mesh_unify_cycles
+
+
+# --------------------------------------------------------------------------
+# constructors
+# --------------------------------------------------------------------------
+
+def test_from_obj():
+    mesh = CompactMesh.from_obj(compas.get('faces.obj'))
+    assert mesh.number_of_faces() == 25
+    assert mesh.number_of_vertices() == 36
+    assert mesh.number_of_edges() == 60
+
+
+def test_same_topology():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh2 = CompactMesh.from_obj(compas.get('faces.obj'))
+    assert list(mesh1.vertices()) == list(mesh2.vertices())
+    assert list(mesh1.faces()) == list(mesh2.faces())
+    assert list(mesh1.edges()) == list(mesh2.edges())
+    for key in mesh1.vertices():
+        assert mesh1.vertex_neighbors(key, ordered=True) == mesh2.vertex_neighbors(key, ordered=True)
+        assert mesh1.vertex_faces(key, ordered=True) == mesh2.vertex_faces(key, ordered=True)
+
+
+def test_copy():
+    mesh1 = CompactMesh.from_obj(compas.get('faces.obj'))
+    mesh1.vertex_attribute(0, 'x', 3.0)
+    mesh1.vertex_attribute(0, 'is_fixed', True)
+    mesh2 = mesh1.copy()
+    assert isinstance(mesh2, CompactMesh)
+    assert mesh2.vertex_coordinates(0)[0] == 3.0
+    assert mesh2.vertex_attribute(0, 'is_fixed')
+    assert mesh1.number_of_edges() == mesh2.number_of_edges()
+
+
+def test_binary(tmp_path):
+    if compas.IPY:
+        return
+    mesh1 = CompactMesh.from_obj(compas.get('faces.obj'))
+    mesh1.vertex_attribute(1, 'name', 'support')
+    mesh1.face_attribute(1, 'color', [255, 0, 0])
+    mesh1.edge_attribute((0, 1), 'q', 2.0)
+    filepath = str(tmp_path / 'mesh.cbin')
+    mesh1.to_binary(filepath)
+    mesh2 = CompactMesh.from_binary(filepath)
+    assert isinstance(mesh2, CompactMesh)
+    assert mesh2.facedata == mesh1.facedata
+    assert mesh2.data == mesh1.data
+
+
+# --------------------------------------------------------------------------
+# builders and modifiers
+# --------------------------------------------------------------------------
+
+def test_add_vertex():
+    mesh = CompactMesh.from_stl(compas.get('cube_binary.stl'))
+    n = mesh.number_of_vertices()
+    key = mesh.add_vertex(x=0, y=1, z=2)
+    assert mesh.vertex[key] == {'x': 0, 'y': 1, 'z': 2}
+    assert mesh.number_of_vertices() == n + 1
+
+
+def test_delete_vertex():
+    mesh = CompactMesh.from_stl(compas.get('cube_binary.stl'))
+    n = mesh.number_of_vertices()
+    fn = mesh.number_of_faces()
+    en = mesh.number_of_edges()
+    mesh.delete_vertex(0)
+    assert mesh.number_of_vertices() == n - 1
+    assert mesh.number_of_faces() == fn - 4
+    assert mesh.number_of_edges() == en - 4
+    assert mesh.is_valid()
+
+
+def test_split_edge():
+    mesh = CompactMesh.from_obj(compas.get('faces.obj'))
+    u, v = mesh.get_any_edge()
+    w = mesh.split_edge(u, v, allow_boundary=True)
+    assert w in mesh.vertex_neighbors(u)
+    assert w in mesh.vertex_neighbors(v)
+    assert mesh.is_valid()
+
+
+def test_collapse_edge():
+    mesh1 = Mesh.from_obj(compas.get('faces.obj'))
+    mesh2 = CompactMesh.from_obj(compas.get('faces.obj'))
+    u, v = 7, 8
+    mesh1.collapse_edge(u, v)
+    mesh2.collapse_edge(u, v)
+    assert v not in mesh2.vertex
+    assert all(v not in mesh2.face_vertices(fkey) for fkey in mesh2.faces())
+    assert [mesh1.face_vertices(fkey) for fkey in mesh1.faces()] == [mesh2.face_vertices(fkey) for fkey in mesh2.faces()]
+    assert mesh2.is_valid()
+
+
+# --------------------------------------------------------------------------
+# algorithms
+# --------------------------------------------------------------------------
+
+def test_unify_cycles():
+    mesh = CompactMesh.from_obj(compas.get('faces.obj'))
+    expected = {fkey: mesh.face_vertices(fkey) for fkey in mesh.faces()}
+    adjacency = mesh_face_adjacency(mesh)
+    assert all(sorted(adjacency[fkey]) == sorted(mesh.face_neighbors(fkey)) for fkey in mesh.faces())
+    for fkey in list(mesh.faces())[1::2]:
+        mesh.face[fkey] = mesh.face[fkey][::-1]
+    mesh_unify_cycles(mesh, root=0)
+    assert {fkey: mesh.face_vertices(fkey) for fkey in mesh.faces()} == expected
+    assert mesh.is_valid()
@@ -1,6 +1,9 @@
 import pytest
 
 from compas.datastructures import Network
+from compas.datastructures import network_count_crossings
+from compas.datastructures import network_find_crossings
+from compas.datastructures import network_is_crossed
 from compas.datastructures import network_is_planar
 
 
@@ -39,3 +42,64 @@ def test_non_planar(k5_network):
 def test_planar(k5_network):
     k5_network.delete_edge('a', 'b')  # Delete (a, b) edge to make K5 planar
     assert network_is_planar(k5_network) is True
+
+
+def test_crossings():
+    network = Network()
+    for key, (x, y) in enumerate([(0, 0), (2, 0), (2, 2), (0, 2), (1, 3), (3, 0)]):
+        network.add_vertex(key, x=x, y=y, z=0)
+    network.add_edge(0, 1)
+    network.add_edge(1, 2)
+    network.add_edge(2, 3)
+    network.add_edge(3, 0)
+    assert not network_is_crossed(network)
+    network.add_edge(0, 2)
+    network.add_edge(1, 3)
+    network.add_edge(4, 5)
+    crossings = set(frozenset(pair) for pair in network_find_crossings(network))
+    assert crossings == set([
+        frozenset([(0, 2), (1, 3)]),
+        frozenset([(0, 2), (4, 5)]),
+        frozenset([(1, 2), (4, 5)]),
+        frozenset([(2, 3), (4, 5)])])
+    assert network_is_crossed(network)
+    assert network_count_crossings(network) == 4
+
+
+def test_from_lines():
+    lines = [[[0, 0, 0], [1, 0, 0]], [[1.0002, 0, 0], [1, 1, 0]], [[0.9999, 1, 0], [0, 0.0001, 0]]]
+    network = Network.from_lines(lines, precision='3f')
+    assert network.number_of_vertices() == 3
+    assert network.number_of_edges() == 3
+
+
+def test_binary(k5_network, tmp_path):
+    k5_network.edge['a']['b']['weight'] = 2.0
+    filepath = str(tmp_path / 'network.cbin')
+    k5_network.to_binary(filepath)
+    network = Network.from_binary(filepath)
+    assert network.vertex == k5_network.vertex
+    assert network.edge == k5_network.edge
+    assert network.halfedge == k5_network.halfedge
+
+
+def test_from_lines_coordinates():
+    # merged end points take the coordinates of the last of them
+    lines = [[[0, 0, 0], [1, 0, 0]], [[1.0002, 0, 0], [1, 1, 0]], [[0.9999, 1, 0], [0, 0.0001, 0]]]
+    network = Network.from_lines(lines, precision='3f')
+    assert [network.vertex_coordinates(key) for key in range(3)] == [[0, 0.0001, 0], [1.0002, 0, 0], [0.9999, 1, 0]]
+    assert sorted(sorted(edge) for edge in network.edges()) == [[0, 1], [0, 2], [1, 2]]
+
+
+def test_from_lines_precision():
+    # points that are distinct at the given precision are not merged
+    lines = [[[i, 0, 0], [i + 1, 0, 0]] for i in range(3)]
+    network = Network.from_lines(lines, precision='d')
+    assert network.number_of_vertices() == 4
+    assert network.number_of_edges() == 3
+    lines = [[[i * 0.001, 0, 0], [(i + 1) * 0.001, 0, 0]] for i in range(2)]
+    assert Network.from_lines(lines, precision='3f').number_of_vertices() == 3
+    lines = [[[i * 0.0006, 0, 0], [(i + 1) * 0.0006, 0, 0]] for i in range(10)]
+    network = Network.from_lines(lines, precision='3f')
+    assert network.number_of_vertices() == 11
+    assert network.number_of_edges() == 10
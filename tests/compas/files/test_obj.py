@@ -0,0 +1,32 @@
+import compas
+from compas.files import OBJ
+from compas.files import OBJParserNumpy
+from compas.files import OBJReaderNumpy
+
+
+def test_obj_numpy():
+    for name in ('faces.obj', 'lines.obj'):
+        obj = OBJ(compas.get(name), '3f')
+        obj.read()
+        reader = OBJReaderNumpy(compas.get(name), chunksize=100)
+        reader.read()
+        parser = OBJParserNumpy(reader, '3f')
+        parser.parse()
+        offsets = parser.face_offsets.tolist()
+        assert parser.vertices.tolist() == obj.vertices
+        assert [parser.faces[i:j].tolist() for i, j in zip(offsets[:-1], offsets[1:])] == obj.faces
+        assert parser.lines.tolist() == obj.lines
+
+
+def test_obj_numpy_statements(tmp_path):
+    filepath = str(tmp_path / 'statements.obj')
+    with open(filepath, 'w') as fo:
+        fo.write('v 0 0 0\nv 1 0 0 0.5\nvt 0 0\nvn 0 0 1\n  v 1 1 0\n')
+        fo.write('f 1/1/1 2//1 \\\n 3/1\nv 0 1 0\nf -4 -2 -1\nl 1 2\nf 1 2')
+    reader = OBJReaderNumpy(filepath, chunksize=8)
+    reader.read()
+    assert reader.vertices.tolist() == [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    assert reader.weights.tolist() == [1.0, 0.5, 1.0, 1.0]
+    assert reader.faces.tolist() == [0, 1, 2, 0, 2, 3]
+    assert reader.face_offsets.tolist() == [0, 3, 6]
+    assert reader.lines.tolist() == [0, 1]
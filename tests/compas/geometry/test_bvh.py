@@ -0,0 +1,81 @@
+import random
+
+import compas
+
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_bvh_numpy
+from compas.datastructures import mesh_pull_points_numpy
+from compas.datastructures import mesh_quads_to_triangles
+from compas.geometry import BVHNumpy
+from compas.geometry import distance_point_point
+from compas.geometry import intersection_line_triangle
+
+
+random.seed(0)
+
+MESH = Mesh.from_obj(compas.get('faces.obj'))
+for key, attr in MESH.vertices(True):
+    attr['z'] = random.random()
+mesh_quads_to_triangles(MESH)
+
+TRIANGLES = [MESH.face_coordinates(fkey) for fkey in MESH.faces()]
+
+POINTS = [[10 * random.random(), 10 * random.random(), 2 * random.random() - 0.5] for _ in range(50)]
+
+
+def test_intersect_rays():
+    bvh = BVHNumpy.from_mesh(MESH)
+    faces, t, points = bvh.intersect_rays(POINTS, [[0, 0, -1]] * len(POINTS))
+    for point, face, hit in zip(POINTS, faces.tolist(), points.tolist()):
+        line = point, [point[0], point[1], point[2] - 1]
+        hits = []
+        for index, triangle in enumerate(TRIANGLES):
+            x = intersection_line_triangle(line, triangle)
+            if x and x[2] <= point[2]:
+                hits.append((point[2] - x[2], index))
+        if not hits:
+            assert face == -1
+            continue
+        distance, index = min(hits)
+        assert abs(point[2] - hit[2] - distance) < 1e-6
+
+
+def test_closest_points():
+    bvh = BVHNumpy.from_mesh(MESH, leafsize=2)
+    faces, closest, distances = bvh.closest_points(POINTS)
+    brute = BVHNumpy.from_mesh(MESH, leafsize=len(TRIANGLES))
+    _, expected, _ = brute.closest_points(POINTS)
+    for point, x, y, d in zip(POINTS, closest.tolist(), expected.tolist(), distances.tolist()):
+        assert distance_point_point(x, y) < 1e-9
+        assert abs(distance_point_point(point, x) - d) < 1e-9
+
+
+def test_signed_distances():
+    mesh = Mesh.from_polyhedron(6)
+    bvh = BVHNumpy.from_mesh(mesh)
+    distances = bvh.signed_distances([[0, 0, 0], [2, 0, 0], [2, 2, 2]])
+    assert distances[0] < 0
+    assert distances[1] > 0
+    assert distances[2] > 0
+
+
+def test_mesh_bvh_refit():
+    mesh = Mesh.from_polyhedron(6)
+    bvh = mesh_bvh_numpy(mesh)
+    assert mesh_bvh_numpy(mesh) is bvh
+    for key in mesh.vertices():
+        mesh.vertex_attribute(key, 'z', mesh.vertex_attribute(key, 'z') + 10)
+    assert mesh_bvh_numpy(mesh) is bvh
+    assert bvh.bmin[0][2] > 5
+    pulled = mesh_pull_points_numpy(mesh, [[0, 0, 20]], bvh=True)
+    assert abs(pulled[0][2] - max(mesh.vertex_attribute(key, 'z') for key in mesh.vertices())) < 1e-9
+
+
+def test_intersect_rays_miss():
+    # the rays pass through the box of the leaf, but miss the triangle
+    bvh = BVHNumpy([[0, 0, 0], [1, 0, 0], [0, 1, 1]], [[0, 1, 2]])
+    faces, t, points = bvh.intersect_rays([[0.9, 0.9, 5], [0.1, 0.1, 5]], [[0, 0, -1], [0, 0, -1]])
+    assert faces.tolist() == [-1, 0]
+    assert t[0] == float('inf')
+    faces, closest, distances = bvh.closest_points([])
+    assert len(faces) == 0
@@ -0,0 +1,55 @@
+import random
+
+from compas.geometry import KDTree
+from compas.geometry import KDTreeNumpy
+from compas.geometry import distance_point_point
+
+
+random.seed(0)
+
+CLOUD = [[random.random(), random.random(), 0.0] for _ in range(500)]
+
+
+def brute_force(point, number):
+    return sorted(range(len(CLOUD)), key=lambda i: distance_point_point(point, CLOUD[i]))[:number]
+
+
+def test_nearest_neighbor():
+    tree = KDTree(CLOUD)
+    xyz, label, distance = tree.nearest_neighbor([0.5, 0.5, 0.0])
+    assert label == brute_force([0.5, 0.5, 0.0], 1)[0]
+    xyz, label, distance = tree.nearest_neighbor(CLOUD[0], exclude={0})
+    assert label == brute_force(CLOUD[0], 2)[1]
+
+
+def test_nearest_neighbors():
+    tree = KDTree(CLOUD)
+    for point in CLOUD[:10]:
+        nnbrs = tree.nearest_neighbors(point, 5)
+        assert [label for _, label, _ in nnbrs] == brute_force(point, 5)
+
+
+def test_radius_neighbors():
+    tree = KDTree(CLOUD)
+    point = [0.5, 0.5, 0.0]
+    nbrs = tree.radius_neighbors(point, 0.1, distance_sort=True)
+    expected = [i for i in range(len(CLOUD)) if distance_point_point(point, CLOUD[i]) <= 0.1]
+    assert sorted(label for _, label, _ in nbrs) == sorted(expected)
+    assert all(a[2] <= b[2] for a, b in zip(nbrs[:-1], nbrs[1:]))
+
+
+def test_nearest_neighbors_batch():
+    tree = KDTree(CLOUD)
+    labels, distances = tree.nearest_neighbors_batch(CLOUD[:10], 5)
+    tree_numpy = KDTreeNumpy(CLOUD)
+    labels_numpy, distances_numpy = tree_numpy.nearest_neighbors_batch(CLOUD[:10], 5)
+    assert labels == labels_numpy.tolist()
+    assert labels == [brute_force(point, 5) for point in CLOUD[:10]]
+
+
+def test_radius_neighbors_batch():
+    tree = KDTreeNumpy(CLOUD, leafsize=4)
+    labels, distances = tree.radius_neighbors_batch(CLOUD[:10], 0.1)
+    for point, nbrs in zip(CLOUD[:10], labels):
+        expected = [i for i in range(len(CLOUD)) if distance_point_point(point, CLOUD[i]) <= 0.1]
+        assert sorted(nbrs.tolist()) == sorted(expected)
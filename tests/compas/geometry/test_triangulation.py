@@ -0,0 +1,45 @@
+import random
+
+from compas.geometry import area_polygon_xy
+from compas.geometry import delaunay_from_points
+from compas.geometry import delaunay_from_points_numpy
+from compas.geometry import delaunay_incremental_numpy
+from compas.geometry import is_ccw_xy
+
+
+def sorted_faces(faces):
+    return sorted(tuple(sorted(face)) for face in faces)
+
+
+def test_delaunay_from_points():
+    random.seed(0)
+    points = [[random.random(), random.random(), 0.0] for _ in range(2000)]
+    faces = delaunay_from_points(points)
+    assert sorted_faces(faces) == sorted_faces(delaunay_from_points_numpy(points).tolist())
+    assert sorted_faces(faces) == sorted_faces(delaunay_incremental_numpy(points).tolist())
+
+
+def test_delaunay_from_points_degenerate():
+    # a grid with collinear and cocircular points, and duplicates
+    points = [[i, j, 0.0] for i in range(10) for j in range(10)]
+    faces = delaunay_from_points(points + points[:10])
+    assert len(faces) == 2 * 9 * 9
+    assert all(i < 100 for face in faces for i in face)
+    assert all(is_ccw_xy(*[points[i] for i in face]) for face in faces)
+    assert delaunay_from_points(points[:10]) == []
+
+
+def test_delaunay_from_points_constrained():
+    # a square with a square hole, and points everywhere
+    boundary = [[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [10.0, 10.0, 0.0], [0.0, 10.0, 0.0]]
+    hole = [[4.0, 4.0, 0.0], [6.0, 4.0, 0.0], [6.0, 6.0, 0.0], [4.0, 6.0, 0.0]]
+    random.seed(0)
+    points = boundary + hole + [[random.uniform(-2, 12), random.uniform(-2, 12), 0.0] for _ in range(300)]
+    faces = delaunay_from_points(points, boundary=boundary, holes=[hole])
+    area = sum(area_polygon_xy([points[i] for i in face]) for face in faces)
+    assert abs(area - 96.0) < 1e-9
+    edges = set(frozenset(edge) for face in faces for edge in zip(face, face[1:] + face[:1]))
+    for polygon in ([0, 1, 2, 3], [4, 5, 6, 7]):
+        for edge in zip(polygon, polygon[1:] + polygon[:1]):
+            assert frozenset(edge) in edges
+    assert sorted_faces(faces) == sorted_faces(delaunay_incremental_numpy(points, boundary=boundary, holes=[hole]).tolist())
@@ -0,0 +1,36 @@
+import random
+
+from compas.geometry import weld_points
+from compas.geometry import weld_points_numpy
+
+
+def test_weld_points_cell_boundary():
+    # points on both sides of a cell boundary are merged
+    points = [[0.0009999, 0, 0], [0.0010001, 0, 0], [0.5, 0.5, 0.5]]
+    unique, remap = weld_points(points, 0.001)
+    assert unique == [0, 2]
+    assert remap == [0, 0, 1]
+
+
+def test_weld_points_numpy():
+    random.seed(0)
+    points = [[random.randint(0, 10) * 0.01 + random.random() * 0.0005 for _ in range(3)] for _ in range(2000)]
+    unique, remap = weld_points(points, 0.001)
+    unique_numpy, remap_numpy = weld_points_numpy(points, 0.001)
+    assert unique == unique_numpy.tolist()
+    assert remap == remap_numpy.tolist()
+    assert len(unique) <= 11 ** 3
+
+
+def test_weld_points_chain():
+    # merging is not transitive, every point is within the tolerance of the first point of its group
+    points = [[i * 0.0004, 0, 0] for i in range(10)]
+    unique, remap = weld_points(points, 0.0005)
+    assert unique == [0, 2, 4, 6, 8]
+    assert remap == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    unique_numpy, remap_numpy = weld_points_numpy(points, 0.0005)
+    assert unique == unique_numpy.tolist()
+    assert remap == remap_numpy.tolist()
+    # points at exactly the tolerance are not merged
+    assert weld_points([[0, 0, 0], [0.5, 0, 0]], 0.5) == ([0, 1], [0, 1])
+    assert weld_points_numpy([[0, 0, 0], [0.5, 0, 0]], 0.5)[1].tolist() == [0, 1]
@@ -0,0 +1,44 @@
+import compas
+
+import pytest
+
+if not compas.IPY:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from scipy.optimize import rosen
+
+    from compas.numerical import devo_numpy
+    from compas.numerical import devo_numpy_multistart
+
+
+BOUNDS = [[-10.0, 10.0]] * 3
+
+
+def f(u, *args):
+    return rosen(u.ravel())
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_devo_numpy_elites():
+    # the population is reduced to four elite agents, three candidates and the agent itself
+    fopt, xopt = devo_numpy(f, BOUNDS, 20, 20, elites=0.2, printout=0)
+    assert len(xopt) == 3
+    assert fopt == rosen(xopt)
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_devo_numpy_vectorized():
+    fopt, xopt = devo_numpy(rosen, BOUNDS, 50, 50, printout=0, vectorized=True)
+    assert fopt == rosen(xopt)
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_devo_numpy_multistart():
+    seeds = [1, 2, 3, 4]
+    serial = devo_numpy_multistart(f, BOUNDS, 20, 20, starts=4, seeds=seeds)
+    with ThreadPoolExecutor(4) as executor:
+        threaded = devo_numpy_multistart(f, BOUNDS, 20, 20, starts=4, seeds=seeds, executor=executor)
+    assert serial == threaded
+    assert [result[0] for result in serial] == sorted(result[0] for result in serial)
+    with pytest.raises(ValueError):
+        devo_numpy_multistart(f, BOUNDS, 20, 20, starts=2, seeds=seeds)
@@ -0,0 +1,104 @@
+import compas
+
+import pytest
+
+if not compas.IPY:
+    from numpy import allclose
+    from numpy import concatenate
+    from numpy import isnan
+    from numpy import zeros
+    from numpy.random import RandomState
+
+    from compas.files import CBIN
+    from compas.numerical import DRNumpy
+    from compas.numerical import dr_numpy
+
+
+def grid(n):
+    # a cable net on a square grid, supported along its boundary
+    vertices = [[i, j, 0] for i in range(n) for j in range(n)]
+    edges = [(i * n + j, (i + 1) * n + j) for i in range(n - 1) for j in range(n)]
+    edges += [(i * n + j, i * n + j + 1) for i in range(n) for j in range(n - 1)]
+    fixed = [i * n + j for i in range(n) for j in range(n) if i in (0, n - 1) or j in (0, n - 1)]
+    return vertices, edges, fixed
+
+
+@pytest.fixture
+def structures():
+    random = RandomState(0)
+    structures = []
+    for n in (6, 8, 10):
+        vertices, edges, fixed = grid(n)
+        loads = zeros((len(vertices), 3))
+        loads[:, 2] = -0.1 * random.rand(len(vertices))
+        qpre = random.rand(len(edges)) + 0.5
+        structures.append((vertices, edges, fixed, loads, qpre))
+    return structures
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_drnumpy(structures):
+    vertices, edges, fixed, loads, qpre = structures[0]
+    m = len(edges)
+    xyz, q, f, l, r = dr_numpy(vertices, edges, fixed, loads, qpre, zeros(m), zeros(m), zeros(m), zeros(m), zeros(m))
+    solver = DRNumpy(vertices, edges, fixed, qpre=qpre)
+    result = solver.relax(loads)
+    for a, b in zip(result, (xyz, q, f, l, r)):
+        assert allclose(a, b, rtol=0, atol=1e-12)
+    assert solver.xyz is result[0]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_drnumpy_batch(structures):
+    solvers = [DRNumpy(vertices, edges, fixed, qpre=qpre) for vertices, edges, fixed, loads, qpre in structures]
+    separate = [solver.relax(loads)[:3] for solver, (_, _, _, loads, _) in zip(solvers, structures)]
+    iterations = [solver.history['iterations'][0] for solver in solvers]
+
+    batch = DRNumpy.from_solvers(solvers)
+    xyz, q, f, l, r = batch.relax(concatenate([loads for _, _, _, loads, _ in structures]))
+    assert len(batch.split_vertices(xyz)) == 3
+    for (xyz_, q_, f_), x, qi, fi in zip(separate, batch.split_vertices(xyz), batch.split_edges(q), batch.split_edges(f)):
+        assert allclose(x, xyz_, rtol=0, atol=1e-12)
+        assert allclose(qi, q_, rtol=0, atol=1e-12)
+        assert allclose(fi, f_, rtol=0, atol=1e-12)
+
+    # every structure stops when it converges
+    history = batch.history
+    assert history['iterations'].tolist() == iterations
+    assert len(set(iterations)) > 1
+    assert history['residual'].shape == (max(iterations), 3)
+    assert len(history['time']) == max(iterations)
+    for i, k in enumerate(iterations):
+        for name in ('residual', 'displacement', 'kinetic'):
+            assert not isnan(history[name][:k, i]).any()
+            assert isnan(history[name][k:, i]).all()
+        assert history['residual'][k - 1, i] < 1e-3 or history['displacement'][k - 1, i] < 1e-6
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_drnumpy_warmstart(structures):
+    vertices, edges, fixed, loads, qpre = structures[2]
+    solver = DRNumpy(vertices, edges, fixed, qpre=qpre)
+    xyz = solver.relax(1.01 * loads)[0].copy()
+    cold = solver.history['iterations'][0]
+    solver.relax(loads)
+    warm = solver.relax(1.01 * loads, warmstart=True)[0]
+    assert solver.history['iterations'][0] < cold
+    assert allclose(warm, xyz, rtol=0, atol=1e-3)
+    # without a warm start, the run starts from the initial geometry again
+    assert allclose(solver.relax(1.01 * loads)[0], xyz, rtol=0, atol=1e-12)
+    assert solver.history['iterations'][0] == cold
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_drnumpy_write_history(structures, tmp_path):
+    solvers = [DRNumpy(vertices, edges, fixed, qpre=qpre) for vertices, edges, fixed, loads, qpre in structures]
+    batch = DRNumpy.from_solvers(solvers)
+    batch.relax(concatenate([loads for _, _, _, loads, _ in structures]))
+    filepath = str(tmp_path / 'history.cbin')
+    batch.write_history(filepath)
+    cbin = CBIN(filepath)
+    assert cbin.meta == {'vertices': [len(vertices) for vertices, _, _, _, _ in structures],
+                         'edges': [len(edges) for _, edges, _, _, _ in structures]}
+    for name in ('residual', 'displacement', 'kinetic', 'time', 'iterations'):
+        assert allclose(cbin.arrays[name], batch.history[name], equal_nan=True)
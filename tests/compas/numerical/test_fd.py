@@ -0,0 +1,55 @@
+import compas
+
+import pytest
+
+if not compas.IPY:
+    from numpy import allclose
+    from numpy.random import RandomState
+
+    from compas.numerical import FDNumpy
+    from compas.numerical import fd_numpy
+
+
+@pytest.fixture
+def net():
+    # a cable net on a square grid, supported along its boundary
+    n = 8
+    vertices = [[i, j, 0] for i in range(n) for j in range(n)]
+    edges = [(i * n + j, (i + 1) * n + j) for i in range(n - 1) for j in range(n)]
+    edges += [(i * n + j, i * n + j + 1) for i in range(n) for j in range(n - 1)]
+    fixed = [i * n + j for i in range(n) for j in range(n) if i in (0, n - 1) or j in (0, n - 1)]
+    return vertices, edges, fixed
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_fd_numpy_load_cases(net):
+    vertices, edges, fixed = net
+    random = RandomState(0)
+    q = random.rand(len(edges)) + 0.5
+    loads = -random.rand(3, len(vertices), 3)
+    solver = FDNumpy(vertices, edges, fixed, q)
+    xyz, _, f, l, r = solver.solve(loads)
+    assert xyz.shape == (3, len(vertices), 3)
+    for i in range(3):
+        expected = fd_numpy(vertices, edges, fixed, q, loads[i])
+        assert allclose(xyz[i], expected[0])
+        assert allclose(f[i], expected[2])
+        assert allclose(l[i], expected[3])
+        assert allclose(r[i], expected[4])
+    xyz, _, _, _, r = solver.solve(loads[0])
+    assert xyz.shape == (len(vertices), 3)
+    assert solver.factorizations == 1
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_fd_numpy_force_densities(net):
+    vertices, edges, fixed = net
+    random = RandomState(0)
+    loads = -random.rand(len(vertices), 3)
+    solver = FDNumpy(vertices, edges, fixed, [1.0] * len(edges))
+    solver.solve(loads)
+    for _ in range(3):
+        q = random.rand(len(edges)) + 0.5
+        solver.q = q
+        assert allclose(solver.solve(loads)[0], fd_numpy(vertices, edges, fixed, q, loads)[0])
+    assert solver.factorizations == 4
@@ -0,0 +1,154 @@
+import random
+
+import compas
+
+from compas.numerical.ga.ga import GA
+from compas.numerical import FitnessEvaluator
+from compas.numerical import ga
+from compas.numerical import moga
+
+import pytest
+
+if not compas.IPY:
+    from numpy import random as nprandom
+
+    from compas.numerical import GANumpy
+    from compas.numerical import ga_numpy
+
+
+class Executor(object):
+    # an executor that counts the individuals it evaluates
+
+    def __init__(self):
+        self.count = 0
+
+    def map(self, func, iterable):
+        values = [func(item) for item in iterable]
+        self.count += len(values)
+        return values
+
+
+def distance(X, a=0.0):
+    return sum((x - a) ** 2 for x in X)
+
+
+def opposite(X, a=0.0):
+    return sum((x + a) ** 2 for x in X)
+
+
+def test_fitness_evaluator():
+    executor = Executor()
+    evaluator = FitnessEvaluator(executor)
+    values = evaluator.evaluate([distance], [[0], [1], [0]], [[0.0], [1.0], [0.0]], fargs=[1.0], generation=0)
+    assert values == [[1.0], [0.0], [1.0]]
+    assert executor.count == 2
+    values = evaluator.evaluate([distance], [[1], [2]], [[1.0], [2.0]], fargs=[1.0], generation=0)
+    assert values == [[0.0], [1.0]]
+    assert executor.count == 3
+    stats = evaluator.stats[-1]
+    assert stats['individuals'] == 5
+    assert stats['evaluations'] == 3
+    assert stats['hits'] == 2
+    assert 'evaluations 3 cached 2' in evaluator.report()
+
+
+def test_ga_evaluator(tmp_path):
+    output_path = str(tmp_path) + '/'
+    boundaries = [(-1.0, 1.0)] * 3
+    random.seed(0)
+    serial = ga(distance, 'min', 3, boundaries, num_gen=10, num_pop=20, num_elite=4,
+                output_path=output_path, print_refresh=100)
+    executor = Executor()
+    evaluator = FitnessEvaluator(executor)
+    random.seed(0)
+    parallel = ga(distance, 'min', 3, boundaries, num_gen=10, num_pop=20, num_elite=4,
+                  output_path=output_path, print_refresh=100, evaluator=evaluator)
+    assert parallel.best_fit == serial.best_fit
+    assert parallel.ind_fit_dict is evaluator.cache
+    assert executor.count == len(evaluator.cache)
+    assert sum(stats['evaluations'] for stats in evaluator.stats) == executor.count
+
+
+def test_moga_evaluator(tmp_path):
+    output_path = str(tmp_path) + '/'
+    evaluator = FitnessEvaluator()
+    random.seed(0)
+    moga_ = moga([distance, opposite], ['min', 'min'], 3, [(-1.0, 1.0)] * 3, num_gen=5, num_pop=20,
+                 fargs=[0.5], output_path=output_path, evaluator=evaluator)
+    for scaled, values in zip(moga_.parent_pop['scaled'], moga_.parent_pop['fit_values']):
+        assert values == [distance(scaled, 0.5), opposite(scaled, 0.5)]
+    assert sum(stats['hits'] for stats in evaluator.stats) > 0
+
+
+def setup_ga(ga_, num_pop=20):
+    ga_.num_pop = num_pop
+    ga_.num_var = 3
+    ga_.num_elite = 4
+    ga_.n_cross = 3
+    ga_.num_bin_dig = [4, 6, 8]
+    ga_.total_bin_dig = sum(ga_.num_bin_dig)
+    ga_.boundaries = [(-1.0, 1.0), (0.0, 2.0), (-5.0, 5.0)]
+    return ga_
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_ganumpy_decode():
+    ga_ = setup_ga(GA())
+    ganp = setup_ga(GANumpy())
+    nprandom.seed(0)
+    binary = ganp.generate_random_bin_pop()
+    assert binary.shape == (20, 18)
+    start = [0, 4, 10, 18]
+    chromosomes = [[row[start[i]:start[i + 1]] for i in range(3)] for row in binary.tolist()]
+    decoded = ganp.decode_binary_pop(binary)
+    assert decoded.tolist() == ga_.decode_binary_pop(chromosomes)
+    scaled = ga_.scale_population(decoded.tolist())
+    for row, expected in zip(ganp.scale_population(decoded).tolist(), scaled):
+        assert row == pytest.approx(expected)
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_ganumpy_sorting_indices():
+    ga_ = GA()
+    ganp = GANumpy()
+    values = [3.0, 1.0, 2.0, 1.0, 5.0, 3.0, 0.5]
+    for reverse in (False, True):
+        index = ganp.get_sorting_indices(values, reverse=reverse)
+        assert index.tolist() == ga_.get_sorting_indices(values, reverse=reverse)
+    # the duplicates are at the end
+    assert sorted(ganp.get_sorting_indices(values)[-2:].tolist()) == [3, 5]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_ganumpy_npoint_crossover():
+    ganp = setup_ga(GANumpy())
+    nprandom.seed(0)
+    a = ganp.generate_random_bin_pop()[:8]
+    b = 1 - a
+    ganp.mating_pool_a = a
+    ganp.mating_pool_b = b
+    ganp.npoint_crossover()
+    children = ganp.current_pop['binary']
+    assert children.shape == (20, 18)
+    # the genes of the children come from either parent, and the children are complementary
+    assert ((children[:8] == a) | (children[:8] == b)).all()
+    assert (children[8:16] == 1 - children[:8]).all()
+    # every pair of children swaps its genes at n_cross distinct points
+    swapped = children[:8] != a
+    assert ((swapped[:, 1:] != swapped[:, :-1]).sum(axis=1) == 3).all()
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_ga_numpy(tmp_path):
+    output_path = str(tmp_path) + '/'
+    boundaries = [(-1.0, 1.0)] * 3
+    nprandom.seed(0)
+    first = ga_numpy(distance, 'min', 3, boundaries, num_gen=20, num_pop=20, num_elite=4,
+                     fargs=[0.5], output_path=output_path, print_refresh=100)
+    nprandom.seed(0)
+    second = ga_numpy(distance, 'min', 3, boundaries, num_gen=20, num_pop=20, num_elite=4,
+                      fargs=[0.5], output_path=output_path, print_refresh=100)
+    assert first.best_fit == second.best_fit
+    assert first.best_fit < 0.05
+    best = first.current_pop['scaled'][first.best_individual_index]
+    assert distance(best, 0.5) == pytest.approx(first.best_fit)
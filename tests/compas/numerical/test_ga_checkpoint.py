@@ -0,0 +1,124 @@
+import os
+import random
+
+import compas
+
+from compas.numerical import GACheckpoint
+from compas.numerical import ga
+
+import pytest
+
+if not compas.IPY:
+    from numpy import random as nprandom
+
+    from compas.numerical import ga_numpy
+
+
+def distance(X):
+    return sum(x ** 2 for x in X)
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    checkpoint = GACheckpoint(os.path.join(str(tmp_path), 'test.galog'))
+    checkpoint.create({'num_var': 2, 'num_bin_dig': [3, 7], 'boundaries': [[0.0, 7.0], [-1.0, 1.0]]})
+    return checkpoint
+
+
+def population(num_pop):
+    binary = [[[random.randint(0, 1) for _ in range(3)], [random.randint(0, 1) for _ in range(7)]] for _ in range(num_pop)]
+    fit_values = [random.random() for _ in range(num_pop)]
+    return binary, fit_values
+
+
+def test_checkpoint_roundtrip(checkpoint):
+    assert checkpoint.exists()
+    assert checkpoint.generations() == []
+    assert checkpoint.num_bytes == 2
+    random.seed(0)
+    populations = [population(5) for _ in range(3)]
+    for generation, (binary, fit_values) in enumerate(populations):
+        checkpoint.append(generation, binary, fit_values)
+    assert checkpoint.generations() == [0, 1, 2]
+    for generation, (binary, fit_values) in enumerate(populations):
+        pop = checkpoint.read(generation)
+        assert pop['binary'] == binary
+        assert pop['fit_value'] == fit_values
+        assert checkpoint.fit_values(generation) == fit_values
+        for genes, decoded, scaled in zip(binary, pop['decoded'], pop['scaled']):
+            assert decoded == [sum(2 ** u for u, gene in enumerate(variable) if gene) for variable in genes]
+            assert scaled[0] == decoded[0]
+            assert scaled[1] == pytest.approx(-1.0 + 2.0 * decoded[1] / 127)
+
+
+def test_checkpoint_consecutive(checkpoint):
+    random.seed(0)
+    for generation in range(4):
+        checkpoint.append(generation, *population(3))
+    with pytest.raises(ValueError):
+        checkpoint.append(5, *population(3))
+    with pytest.raises(ValueError):
+        checkpoint.write(4, 3, b'\x00' * 5, b'\x00' * 24)
+    with pytest.raises(KeyError):
+        checkpoint.read(4)
+    fit_values = checkpoint.fit_values(1)
+    checkpoint.truncate(1)
+    assert checkpoint.generations() == [0, 1]
+    assert checkpoint.fit_values(1) == fit_values
+    checkpoint.append(2, *population(4))
+    assert checkpoint.generations() == [0, 1, 2]
+    assert len(checkpoint.read(2)['binary']) == 4
+
+
+def test_checkpoint_header(tmp_path):
+    filepath = os.path.join(str(tmp_path), 'test.galog')
+    with open(filepath, 'wb') as fo:
+        fo.write(b'generation 0\n')
+    with pytest.raises(ValueError):
+        GACheckpoint(filepath).meta
+
+
+def test_ga_restart(tmp_path):
+    output_path = str(tmp_path) + '/'
+    boundaries = [(-1.0, 1.0)] * 3
+    random.seed(0)
+    ga(distance, 'min', 3, boundaries, num_gen=10, num_pop=20, num_elite=4, output_path=output_path, print_refresh=100)
+    checkpoint = GACheckpoint(output_path + 'distance.galog')
+    assert checkpoint.generations() == list(range(10))
+    records = [checkpoint.read(generation) for generation in range(10)]
+    for pop in records:
+        assert len(pop['binary']) == 20
+        assert pop['fit_value'] == [distance(scaled) for scaled in pop['scaled']]
+
+    # the records after the generation of the restart are replaced
+    random.seed(1)
+    ga(distance, 'min', 3, boundaries, num_gen=8, num_pop=20, num_elite=4, start_from_gen=5,
+       output_path=output_path, input_path=output_path, print_refresh=100)
+    assert checkpoint.generations() == list(range(8))
+    for generation in range(6):
+        assert checkpoint.read(generation) == records[generation]
+    elite = sorted(records[5]['fit_value'])[:4]
+    assert min(checkpoint.fit_values(6)) <= elite[0]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_ga_numpy_restart(tmp_path):
+    output_path = str(tmp_path) + '/'
+    boundaries = [(-1.0, 1.0)] * 3
+    random.seed(0)
+    ga(distance, 'min', 3, boundaries, num_gen=6, num_pop=20, num_elite=4, output_path=output_path, print_refresh=100)
+    checkpoint = GACheckpoint(output_path + 'distance.galog')
+    records = [checkpoint.read(generation) for generation in range(6)]
+
+    # the logs of GA and GANumpy are interchangeable
+    nprandom.seed(0)
+    ga_ = ga_numpy(distance, 'min', 3, boundaries, num_gen=8, num_pop=20, num_elite=4, start_from_gen=5,
+                   output_path=output_path, input_path=output_path, print_refresh=100)
+    pop = ga_.get_pop_from_pop_file(5)
+    assert pop['binary'].tolist() == [[bit for variable in binary for bit in variable] for binary in records[5]['binary']]
+    assert pop['fit_value'].tolist() == records[5]['fit_value']
+    assert checkpoint.generations() == list(range(8))
+    for generation in range(6):
+        assert checkpoint.read(generation) == records[generation]
+    for pop in (checkpoint.read(6), checkpoint.read(7)):
+        assert pop['fit_value'] == pytest.approx([distance(scaled) for scaled in pop['scaled']])
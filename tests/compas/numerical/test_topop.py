@@ -0,0 +1,101 @@
+import compas
+
+import pytest
+
+if not compas.IPY:
+    from numpy import allclose
+    from numpy import ix_
+    from numpy import ones
+    from numpy import zeros
+    from numpy.linalg import matrix_rank
+    from numpy.random import RandomState
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.linalg import spsolve
+
+    from compas.numerical import TopopNumpy
+    from compas.numerical import topop_numpy
+
+
+def cantilever(shape):
+    # supports along the left side, and a load in the middle of the right side
+    nelx, nely = shape[:2]
+    if len(shape) == 2:
+        loads = {'{}-{}'.format(nelx, nely // 2): [0, -1]}
+        supports = {'0-{}'.format(j): [1, 1] for j in range(nely + 1)}
+    else:
+        nelz = shape[2]
+        loads = {'{}-{}-{}'.format(nelx, nely // 2, k): [0, -1, 0] for k in range(nelz + 1)}
+        supports = {'0-{}-{}'.format(j, k): [1, 1, 1] for j in range(nely + 1) for k in range(nelz + 1)}
+    return loads, supports
+
+
+def stiffness(solver, x):
+    # the stiffness matrix of the free degrees of freedom, assembled element by element
+    ndof = solver.dim * solver.num_nodes
+    d = solver.edof.shape[1]
+    Ee = solver.Emin + x.ravel(order='F') ** solver.penal * (solver.E - solver.Emin)
+    rows = solver.edof[:, :, None].repeat(d, axis=2).ravel()
+    cols = solver.edof[:, None, :].repeat(d, axis=1).ravel()
+    data = (Ee[:, None] * solver.Ke.ravel()[None, :]).ravel()
+    K = coo_matrix((data, (rows, cols)), shape=(ndof, ndof)).tocsr()
+    return K[solver.free][:, solver.free]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_topop_numpy(capsys):
+    loads, supports = cantilever((30, 10))
+    x = topop_numpy(30, 10, loads, supports, volfrac=0.4)
+    iterations = []
+    solver = TopopNumpy((30, 10), loads, supports)
+    result = solver.optimize(volfrac=0.4, callback=lambda k, x, values, args: iterations.append(k))
+    assert result.shape == (10, 30)
+    assert allclose(result, x, rtol=0, atol=1e-6)
+    assert iterations == list(range(len(solver.history['compliance'])))
+    assert solver.factorizations == len(iterations)
+    assert allclose(solver.history['volume'], 0.4, atol=1e-2)
+    assert solver.history['change'][-1] <= 0.1
+
+
+@pytest.mark.parametrize('shape', [(12, 6), (6, 4, 3)])
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_topopnumpy_stiffness(shape):
+    loads, supports = cantilever(shape)
+    solver = TopopNumpy(shape, loads, supports)
+    random = RandomState(0)
+    densities = shape[1:2] + shape[0:1] + shape[2:]
+    for i in range(3):
+        x = random.rand(*densities)
+        K = stiffness(solver, x)
+        # before the first factorization the free degrees of freedom are in their original order,
+        # afterwards in the fill-reducing order of the first factorization
+        order = solver._renumber
+        assert abs(solver.stiffness(x)[ix_(order, order)] - K).max() < 1e-12
+        U = solver.displacements(x)
+        assert allclose(U[solver.free], spsolve(K.tocsc(), solver.F[solver.free]), rtol=1e-8, atol=1e-12)
+        assert (U[solver.fixed] == 0).all()
+    assert solver.factorizations == 3
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_topopnumpy_3d():
+    # the stiffness of a hexahedral element is symmetric, and has six rigid body modes
+    loads, supports = cantilever((8, 4, 2))
+    solver = TopopNumpy((8, 4, 2), loads, supports)
+    assert allclose(solver.Ke, solver.Ke.T)
+    assert matrix_rank(solver.Ke) == 18
+    translation = zeros(24)
+    translation[1::3] = 1
+    assert allclose(solver.Ke.dot(translation), 0)
+    x = solver.optimize(volfrac=0.4)
+    assert x.shape == (4, 8, 2)
+    assert abs(x.mean() - 0.4) < 1e-2
+    assert solver.history['compliance'][-1] < solver.history['compliance'][0]
+    # a denser grid is stiffer
+    U = solver.displacements(ones(x.shape))
+    assert solver.F.dot(U) < solver.history['compliance'][-1]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_topopnumpy_shape():
+    with pytest.raises(ValueError):
+        TopopNumpy((4, ), {}, {})
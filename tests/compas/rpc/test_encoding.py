@@ -0,0 +1,69 @@
+from compas.datastructures import Mesh
+from compas.geometry import Point
+from compas.rpc import decode_binary
+from compas.rpc import encode_binary
+
+import pytest
+
+
+@pytest.mark.parametrize('obj', [
+    None,
+    True,
+    0,
+    -2**63,
+    2**70,
+    1.5,
+    '',
+    u'été',
+    b'\x00\x01',
+    [],
+    [1.0, 2.0, 3.0],
+    [1, 2, 3],
+    [1, 2.0, 'a', None],
+    [[0.0, 0.0, 0.0], [1.0, 2.0, 3.0]],
+    (1, (2, 3)),
+    {'a': 1, 2: [3.0], (4, 5): {'b': None}},
+])
+def test_roundtrip(obj):
+    assert decode_binary(encode_binary(obj)) == obj
+
+
+def test_roundtrip_types():
+    obj = decode_binary(encode_binary([(1, 2), [True, 1], 1.0]))
+    assert type(obj[0]) is tuple
+    assert type(obj[1][0]) is bool
+    assert type(obj[2]) is float
+
+
+def test_data_objects():
+    point = decode_binary(encode_binary(Point(1.0, 2.0, 3.0)))
+    assert isinstance(point, Point)
+    assert point == [1.0, 2.0, 3.0]
+
+    mesh = Mesh.from_polyhedron(6)
+    other = decode_binary(encode_binary({'mesh': mesh}))['mesh']
+    assert isinstance(other, Mesh)
+    assert other.number_of_faces() == mesh.number_of_faces()
+
+
+def test_arrays():
+    np = pytest.importorskip('numpy')
+    for array in (np.arange(12, dtype=float).reshape((3, 4)),
+                  np.arange(6, dtype=np.int32)[::2],
+                  np.array([True, False]),
+                  np.zeros((0, 3))):
+        other = decode_binary(encode_binary(array))
+        assert other.dtype == array.dtype
+        assert other.shape == array.shape
+        assert np.array_equal(other, array)
+    assert decode_binary(encode_binary(np.float64(1.5))) == 1.5
+    assert decode_binary(encode_binary(np.int64(3))) == 3
+
+
+def test_invalid():
+    with pytest.raises(TypeError):
+        encode_binary(object())
+    with pytest.raises(ValueError):
+        decode_binary(b'x')
+    with pytest.raises(ValueError):
+        decode_binary(encode_binary(1) + b'N')
@@ -0,0 +1,48 @@
+from threading import Thread
+
+from compas.rpc import Future
+from compas.utilities import await_callback
+
+import pytest
+
+
+def test_result():
+    future = Future()
+    Thread(target=future.set_result, args=(42, )).start()
+    assert future.result(timeout=1) == 42
+    assert future.done()
+    assert future.exception() is None
+
+
+def test_exception():
+    future = Future()
+    future.set_exception(ValueError('failed'))
+    with pytest.raises(ValueError):
+        future.result()
+    assert isinstance(future.exception(), ValueError)
+
+
+def test_timeout():
+    future = Future()
+    with pytest.raises(RuntimeError):
+        future.result(timeout=0.01)
+    assert not future.done()
+
+
+def test_done_callbacks():
+    future = Future()
+    results = []
+    future.add_done_callback(lambda f: results.append(f.result()))
+    future.set_result(1)
+    future.add_done_callback(lambda f: results.append(f.result() + 1))
+    assert results == [1, 2]
+
+
+def test_await_callback():
+    def submit(value, callback=None):
+        future = Future()
+        future.add_done_callback(lambda f: callback(f.result()))
+        Thread(target=future.set_result, args=(value, )).start()
+        return future
+
+    assert await_callback(submit, 'callback', None, 'value') == 'value'
@@ -0,0 +1,84 @@
+from compas.rpc import Dispatcher
+from compas.rpc import Handle
+from compas.rpc import ObjectStore
+from compas.rpc import decode_binary
+from compas.rpc import encode_binary
+
+import pytest
+
+
+class Service(Dispatcher):
+
+    def __init__(self):
+        super(Service, self).__init__()
+        self.calls = 0
+
+    def count(self, values):
+        self.calls += 1
+        return len(values)
+
+
+def call(service, name, *args, **options):
+    return decode_binary(service._dispatch_binary(encode_binary({'function': name, 'args': args, 'options': options})))
+
+
+def test_store_eviction():
+    store = ObjectStore(max_items=2)
+    a = store.put('a')
+    b = store.put('b')
+    store.get(a)
+    store.put('c')
+    assert a in store
+    assert b not in store
+    assert store.evictions == 1
+    with pytest.raises(KeyError):
+        store.get(b)
+
+
+def test_store_max_bytes():
+    store = ObjectStore(max_bytes=100)
+    a = store.put('a', size=60)
+    b = store.put('b', size=60)
+    assert a not in store
+    assert b in store
+    assert store.nbytes == 60
+    with pytest.raises(ValueError):
+        store.put('c', key='c', size=200)
+    assert 'c' not in store
+    assert b in store
+    assert store.remove(b)
+    assert store.nbytes == 0
+
+
+def test_handles():
+    service = Service()
+    handle = call(service, '__identity__', list(range(1000)), handle=True)['data']
+    assert isinstance(handle, Handle)
+    assert call(service, 'count', handle)['data'] == 1000
+    assert call(service, 'count', [handle, handle])['data'] == 2
+    assert call(service, '__release__', handle.id)['data'] == 1
+    assert call(service, 'count', handle)['error']
+
+
+def test_handles_max_bytes():
+    service = Service()
+    service.objects.max_bytes = 100
+    result = call(service, '__identity__', list(range(1000)), handle=True)
+    assert result['data'] is None
+    assert 'ValueError' in result['error']
+    assert len(service.objects) == 0
+
+
+def test_cache():
+    service = Service()
+    assert call(service, 'count', [1, 2, 3], cache=True)['data'] == 3
+    assert call(service, 'count', [1, 2, 3], cache=True)['data'] == 3
+    assert service.calls == 1
+    assert service.results.hits == 1
+    assert call(service, 'count', [1, 2], cache=True)['data'] == 2
+    assert service.calls == 2
+    # results that are too large for the cache are returned, but not cached
+    service.results.max_bytes = 10
+    assert call(service, 'count', [1, 2, 3, 4], cache=True)['data'] == 4
+    assert call(service, 'count', [1, 2, 3, 4], cache=True)['data'] == 4
+    assert service.calls == 4
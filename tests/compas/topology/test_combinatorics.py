@@ -0,0 +1,48 @@
+import compas
+
+from compas.datastructures import Mesh
+from compas.topology import color_classes
+from compas.topology import vertex_coloring
+
+import pytest
+
+if not compas.IPY:
+    from compas.topology import color_classes_numpy
+    from compas.topology import vertex_coloring_numpy
+
+
+@pytest.fixture
+def mesh():
+    return Mesh.from_obj(compas.get('faces.obj'))
+
+
+@pytest.mark.parametrize('strategy', ['largest_first', 'dsatur'])
+def test_vertex_coloring(mesh, strategy):
+    key_color = vertex_coloring(mesh.adjacency, strategy=strategy)
+    assert set(key_color) == set(mesh.vertices())
+    for u, v in mesh.edges():
+        assert key_color[u] != key_color[v]
+    classes = color_classes(key_color)
+    assert sorted(key for keys in classes for key in keys) == sorted(mesh.vertices())
+    assert all(classes)
+
+
+def test_vertex_coloring_dsatur():
+    # a cycle of six vertices is bipartite
+    adjacency = {i: [(i - 1) % 6, (i + 1) % 6] for i in range(6)}
+    assert len(color_classes(vertex_coloring(adjacency, strategy='dsatur'))) == 2
+    with pytest.raises(ValueError):
+        vertex_coloring(adjacency, strategy='unknown')
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+@pytest.mark.parametrize('strategy', ['largest_first', 'dsatur'])
+def test_vertex_coloring_numpy(mesh, strategy):
+    key_index = mesh.key_index()
+    adjacency = [[key_index[nbr] for nbr in mesh.vertex_neighbors(key)] for key in mesh.vertices()]
+    colors = vertex_coloring_numpy(adjacency, strategy=strategy)
+    for u, v in mesh.edges():
+        assert colors[key_index[u]] != colors[key_index[v]]
+    classes = color_classes_numpy(colors)
+    assert len(classes) == colors.max() + 1
+    assert sorted(index for indices in classes for index in indices.tolist()) == list(range(len(adjacency)))
@@ -0,0 +1,53 @@
+import random
+
+import compas
+
+from compas.topology import face_adjacency
+from compas.topology import unify_cycles
+
+import pytest
+
+if not compas.IPY:
+    from compas.topology import unify_cycles_numpy
+
+
+@pytest.fixture
+def faces():
+    # a strip of long and thin triangles with random orientation,
+    # for which the nearest face centroids are not the neighbors
+    random.seed(0)
+    faces = []
+    for i in range(20):
+        a, b, c, d = 2 * i, 2 * i + 1, 2 * i + 3, 2 * i + 2
+        faces.append([a, b, c])
+        faces.append([a, c, d])
+    return [face[::-1] if random.random() < 0.5 else face for face in faces]
+
+
+def is_unified(faces):
+    halfedges = set()
+    for face in faces:
+        for u, v in zip(face, face[1:] + face[:1]):
+            if (u, v) in halfedges:
+                return False
+            halfedges.add((u, v))
+    return True
+
+
+def test_face_adjacency(faces):
+    adjacency = face_adjacency(None, faces)
+    assert adjacency[0] == [1]
+    assert sorted(adjacency[1]) == [0, 2]
+    assert sum(len(nbrs) for nbrs in adjacency.values()) == 2 * (len(faces) - 1)
+
+
+def test_unify_cycles(faces):
+    unified = unify_cycles(None, [face[:] for face in faces])
+    assert is_unified(unified)
+    assert unified[0] == faces[0]
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_unify_cycles_numpy(faces):
+    unified = unify_cycles(None, [face[:] for face in faces])
+    assert unify_cycles_numpy(None, faces) == unified
@@ -0,0 +1,84 @@
+import compas
+
+from compas.datastructures import Network
+from compas.topology import astar_shortest_path
+from compas.topology import dijkstra_distances
+from compas.topology import dijkstra_path
+from compas.topology import dijkstra_tree
+
+import pytest
+
+if not compas.IPY:
+    from compas.topology import dijkstra_path_numpy
+    from compas.topology import dijkstra_tree_numpy
+
+
+@pytest.fixture
+def network():
+    return Network.from_obj(compas.get('lines.obj'))
+
+
+@pytest.fixture
+def weight(network):
+    weight = {(u, v): network.edge_length(u, v) for u, v in network.edges()}
+    weight.update({(v, u): w for (u, v), w in weight.items()})
+    return weight
+
+
+def test_dijkstra_path(network, weight):
+    distance = dijkstra_distances(network.adjacency, weight, 0)
+    for key in network.vertices():
+        path = dijkstra_path(network.adjacency, weight, key, 0)
+        assert path[0] == key and path[-1] == 0
+        length = sum(weight[u, v] for u, v in zip(path[:-1], path[1:]))
+        assert length == pytest.approx(distance[key])
+
+
+def test_dijkstra_path_unreachable():
+    adjacency = {0: [1], 1: [0], 2: [3], 3: [2]}
+    weight = {(u, v): 1.0 for u in adjacency for v in adjacency[u]}
+    assert dijkstra_path(adjacency, weight, 0, 3) is None
+    assert dijkstra_path(adjacency, weight, 0, 3, dist=dijkstra_distances(adjacency, weight, 3)) is None
+    assert dijkstra_path(adjacency, weight, 0, 1) == [0, 1]
+    if not compas.IPY:
+        assert dijkstra_path_numpy(adjacency, weight, 0, 3) is None
+
+
+def test_dijkstra_tree(network, weight):
+    distance = dijkstra_distances(network.adjacency, weight, 0)
+    nearest, predecessors = dijkstra_tree(network.adjacency, weight, [0, 10])
+    assert predecessors[0] is None and predecessors[10] is None
+    assert all(nearest[key] <= distance[key] + 1e-9 for key in nearest)
+    cutoff = sorted(distance.values())[10]
+    nearby, _ = dijkstra_tree(network.adjacency, weight, [0], cutoff=cutoff)
+    assert set(nearby) == set(key for key in distance if distance[key] <= cutoff)
+
+
+def test_astar_shortest_path(network, weight):
+    distance = dijkstra_distances(network.adjacency, weight, 0)
+    for key in network.vertices():
+        path = astar_shortest_path(network, key, 0)
+        length = sum(weight[u, v] for u, v in zip(path[:-1], path[1:]))
+        assert length == pytest.approx(distance[key])
+
+
+@pytest.mark.skipif(compas.IPY, reason='NumPy is not available in IronPython')
+def test_dijkstra_tree_numpy(network, weight, monkeypatch):
+    nearest, predecessors = dijkstra_tree(network.adjacency, weight, [0, 10])
+    distance, _ = dijkstra_tree_numpy(network.adjacency, weight, [0, 10])
+    assert distance == pytest.approx(nearest)
+
+    # without the min_only option of SciPy < 1.3
+    import compas.topology.traversal_numpy
+    dijkstra = compas.topology.traversal_numpy.dijkstra
+
+    def dijkstra_without_min_only(*args, **kwargs):
+        if 'min_only' in kwargs:
+            raise TypeError
+        return dijkstra(*args, **kwargs)
+
+    monkeypatch.setattr(compas.topology.traversal_numpy, 'dijkstra', dijkstra_without_min_only)
+    distance, tree = dijkstra_tree_numpy(network.adjacency, weight, [0, 10])
+    assert distance == pytest.approx(nearest)
+    assert tree[0] is None and tree[10] is None
+    assert all(distance[tree[key]] + weight[tree[key], key] == pytest.approx(distance[key]) for key in tree if tree[key] is not None)